@@ -14,7 +14,10 @@ from datetime import datetime
 
 from payment import PaymentGatewayFactory, PaymentProvider, PaymentRequest, PaymentStatus
 from payment.moyasar_gateway import MoyasarGateway
-from database.transaction_logs import TransactionLogsService
+from payment.webhook_processor import WebhookProcessor
+from payment.status_cache import PaymentStatusCache, is_terminal_status
+from database.transaction_logs import TransactionLogsService, TransactionRecord
+from database.webhook_logs import WebhookLogsService
 
 logger = logging.getLogger(__name__)
 
@@ -38,10 +41,80 @@ class CheckoutResponse(BaseModel):
 class WebhookResponse(BaseModel):
     success: bool
     message: str
+    webhook_id: Optional[str] = None
+    duplicate: bool = False
 
 # Initialize services
 payment_gateway = PaymentGatewayFactory.create_gateway(PaymentProvider.MOYASAR)
 transaction_service = TransactionLogsService()
+webhook_logs_service = WebhookLogsService(transaction_service)
+
+
+async def _on_payment_success(payload: Dict[str, Any], payment_id: str):
+    """Side effects of a payment reaching SUCCESS (runs once per transition)"""
+    metadata = (payload.get("data") or {}).get("metadata") or {}
+    await send_payment_confirmation_email(metadata.get("customer_email"), metadata.get("tier"), payment_id)
+
+
+async def _load_payment_status(payment_id: str) -> Dict[str, Any]:
+    """
+    Upstream lookup behind the payment status cache
+    
+    A terminal status already recorded by the webhook pipeline is served
+    from Postgres alone; otherwise Moyasar is asked.
+    """
+    transaction = await transaction_service.get_transaction(payment_id)
+    if transaction and is_terminal_status(transaction["status"]):
+        return {
+            "status": transaction["status"],
+            "transaction": transaction,
+            "metadata": transaction["metadata"]
+        }
+    
+    payment_response = await payment_gateway.verify_payment(payment_id)
+    if not payment_response.success:
+        raise HTTPException(status_code=400, detail="Payment verification failed")
+    
+    return {
+        "status": payment_response.status.value,
+        "transaction": transaction,
+        "metadata": payment_response.metadata
+    }
+
+
+payment_status_cache = PaymentStatusCache(
+    loader=_load_payment_status,
+    pending_ttl=float(os.environ.get("PAYMENT_STATUS_PENDING_TTL", "3")),
+    settled_ttl=float(os.environ.get("PAYMENT_STATUS_SETTLED_TTL", "300"))
+)
+
+webhook_processor = WebhookProcessor(
+    gateway=payment_gateway,
+    transactions=transaction_service,
+    webhook_logs=webhook_logs_service,
+    workers=int(os.environ.get("WEBHOOK_WORKERS", "4")),
+    max_attempts=int(os.environ.get("WEBHOOK_MAX_ATTEMPTS", "8")),
+    on_payment_success=_on_payment_success,
+    on_payment_settled=payment_status_cache.invalidate
+)
+
+
+@router.on_event("startup")
+async def start_webhook_processor():
+    """Open the transaction pool and start the webhook worker pool with the app"""
+    try:
+        await transaction_service.initialize()
+    except Exception as e:
+        logger.error(f"Billing database unavailable at startup: {e}")
+    webhook_processor.start()
+
+
+@router.on_event("shutdown")
+async def stop_webhook_processor():
+    """Stop webhook workers; unfinished events are re-leased by the next sweep"""
+    await webhook_processor.stop()
+    await transaction_service.close()
+
 
 @router.post("/checkout", response_model=CheckoutResponse)
 async def create_checkout_session(request: CheckoutRequest, background_tasks: BackgroundTasks):
@@ -74,7 +147,7 @@ async def create_checkout_session(request: CheckoutRequest, background_tasks: Ba
         
         if payment_response.success:
             # Store initial transaction in database
-            await transaction_service.create_transaction(
+            await transaction_service.create_transaction(TransactionRecord(
                 payment_id=payment_response.payment_id,
                 tier=request.tier,
                 amount=tier_config["amount"],
@@ -83,7 +156,7 @@ async def create_checkout_session(request: CheckoutRequest, background_tasks: Ba
                 customer_name=request.customer_name,
                 status=PaymentStatus.PENDING.value,
                 provider=payment_gateway.get_provider_name().value
-            )
+            ))
             
             return CheckoutResponse(
                 success=True,
@@ -106,8 +179,14 @@ async def create_checkout_session(request: CheckoutRequest, background_tasks: Ba
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/webhook", response_model=WebhookResponse)
-async def handle_webhook(request: Request, background_tasks: BackgroundTasks):
-    """Handle payment webhook from Moyasar"""
+async def handle_webhook(request: Request):
+    """
+    Handle payment webhook from Moyasar
+    
+    Only verifies the signature and durably enqueues the event (idempotent
+    on the event id); verification against Moyasar, the transaction update
+    and emails happen in the webhook worker pool.
+    """
     try:
         # Get webhook signature
         signature = request.headers.get("X-Moyasar-Signature", "")
@@ -122,66 +201,50 @@ async def handle_webhook(request: Request, background_tasks: BackgroundTasks):
             logger.warning("Invalid webhook signature received")
             raise HTTPException(status_code=401, detail="Invalid webhook signature")
         
-        # Process webhook event
-        event_type = payload.get("type")
-        payment_data = payload.get("data", {})
-        payment_id = payment_data.get("id")
-        
-        if not payment_id:
-            raise HTTPException(status_code=400, detail="Payment ID not found in webhook")
-        
-        # Verify payment status
-        payment_response = await payment_gateway.verify_payment(payment_id)
-        
-        if payment_response.success:
-            # Update transaction in database
-            await transaction_service.update_transaction_status(
-                payment_id=payment_id,
-                status=payment_response.status.value,
-                metadata=payment_response.metadata
+        try:
+            queued = await webhook_processor.ingest(
+                provider=payment_gateway.get_provider_name().value,
+                payload=payload,
+                signature=signature,
+                raw_body=body
             )
-            
-            # Send confirmation email (background task)
-            if payment_response.status == PaymentStatus.SUCCESS:
-                background_tasks.add_task(
-                    send_payment_confirmation_email,
-                    payment_data.get("metadata", {}).get("customer_email"),
-                    payment_data.get("metadata", {}).get("tier"),
-                    payment_response.payment_id
-                )
-            
-            logger.info(f"Webhook processed successfully for payment {payment_id}")
-            return WebhookResponse(success=True, message="Webhook processed successfully")
-        else:
-            logger.error(f"Payment verification failed for payment {payment_id}")
-            raise HTTPException(status_code=400, detail="Payment verification failed")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        return WebhookResponse(
+            success=True,
+            message="Webhook already received" if queued["duplicate"] else "Webhook accepted",
+            webhook_id=queued["webhook_id"],
+            duplicate=queued["duplicate"]
+        )
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+        # Not durably queued: 5xx so the provider redelivers
+        logger.error(f"Error enqueuing webhook: {str(e)}")
+        raise HTTPException(status_code=503, detail="Webhook could not be queued")
 
 @router.get("/payment/{payment_id}")
 async def get_payment_status(payment_id: str):
-    """Get payment status"""
+    """
+    Get payment status
+    
+    Served through the payment status cache: failed / cancelled / refunded
+    are cached indefinitely, success for PAYMENT_STATUS_SETTLED_TTL seconds
+    (it can still be refunded), pending ones for PAYMENT_STATUS_PENDING_TTL
+    seconds, and concurrent polls share a single upstream lookup.
+    """
     try:
-        # Verify payment with gateway
-        payment_response = await payment_gateway.verify_payment(payment_id)
+        payment = await payment_status_cache.get(payment_id)
         
-        if payment_response.success:
-            # Get transaction from database
-            transaction = await transaction_service.get_transaction(payment_id)
-            
-            return {
-                "success": True,
-                "payment_id": payment_id,
-                "status": payment_response.status.value,
-                "transaction": transaction,
-                "metadata": payment_response.metadata
-            }
-        else:
-            raise HTTPException(status_code=400, detail="Payment verification failed")
+        return {
+            "success": True,
+            "payment_id": payment_id,
+            "status": payment["status"],
+            "transaction": payment["transaction"],
+            "metadata": payment["metadata"]
+        }
             
     except HTTPException:
         raise
@@ -248,6 +311,8 @@ async def billing_health():
         return {
             "status": "healthy",
             "gateway": gateway_status,
+            "webhook_processor": webhook_processor.get_stats(),
+            "payment_status_cache": payment_status_cache.get_stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
         
@@ -11,6 +11,7 @@ import os
 
 from services.email_service import get_email_service
 from services.claude_service import get_claude_service
+from metrics.loop_monitor import get_loop_monitor
 
 router = APIRouter(prefix="/api/founder", tags=["Founder Dashboard"])
 
@@ -149,6 +150,15 @@ async def get_analytics_timeline(
         raise HTTPException(status_code=500, detail=f"Failed to fetch timeline: {str(e)}")
 
 
+@router.get("/loop-health")
+async def get_loop_health(top: int = 10, authorized: bool = Depends(verify_founder_password)):
+    """
+    Event loop lag and blocking-call report
+    Recent stalls with stacks, blocked time per route and module
+    """
+    return get_loop_monitor().get_report(top=top)
+
+
 @router.post("/strategic-briefing")
 async def generate_strategic_briefing(authorized: bool = Depends(verify_founder_password)):
     """
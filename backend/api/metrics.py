@@ -0,0 +1,27 @@
+"""
+FLUX-DNA Metrics API
+OpenMetrics scrape endpoint
+"""
+import asyncio
+
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from metrics.exporter import OPENMETRICS_CONTENT_TYPE, PROMETHEUS_CONTENT_TYPE, REGISTRY
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Scrape endpoint
+    OpenMetrics when the scraper accepts it, Prometheus text otherwise
+    """
+    openmetrics = "application/openmetrics-text" in request.headers.get("accept", "")
+    # Multiprocess mode reads the other workers' files: keep it off the loop
+    content = await asyncio.to_thread(REGISTRY.render, openmetrics)
+    return Response(
+        content=content,
+        media_type=OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE
+    )
@@ -8,7 +8,7 @@ Multi-modal (photo/audio/text) evidence uploads with:
 - AI VISION ANALYSIS for uploaded images
 - AI risk assessment with Claude
 """
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional, List
@@ -20,6 +20,9 @@ from datetime import datetime, timezone
 import json
 import os
 
+from services.vault_store import get_vault_store, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from services.vault_integrity import get_vault_integrity_service, DEFAULT_AUDIT_WORKERS, MAX_AUDIT_WORKERS
+
 router = APIRouter(prefix="/api/vault", tags=["Forensic Vault"])
 
 
@@ -47,10 +50,6 @@ class EvidenceSubmitResponse(BaseModel):
     timestamp: str
 
 
-# In-memory vault storage (in production, use encrypted Supabase storage)
-_forensic_vault: dict = {}
-
-
 def strip_exif_data(image_bytes: bytes) -> bytes:
     """
     Strip EXIF metadata from image
@@ -304,31 +303,37 @@ async def submit_evidence(
                     analysis["risk_level"] = "HIGH"
                     analysis["recommended_actions"].insert(0, "Visual evidence detected - document thoroughly")
         
-        # Create chain of custody entry
-        chain_of_custody = [{
-            "action": "submitted",
-            "timestamp": timestamp.isoformat(),
-            "hash": content_hash[:16],
-            "actor": "user",
-            "vision_analyzed": bool(vision_analysis and vision_analysis.get("vision_available"))
-        }]
+        vision_analyzed = bool(vision_analysis and vision_analysis.get("vision_available"))
         
-        # Store in vault
-        _forensic_vault[evidence_id] = {
-            "user_id": user_id,
-            "evidence_type": evidence_type,
-            "description_hash": hashlib.sha256(description.encode()).hexdigest()[:16],
-            "content_encrypted": True,
-            "original_filename": original_filename,
-            "file_size": file_size,
-            "mime_type": mime_type,
-            "exif_stripped": exif_stripped,
-            "content_hash": content_hash,
-            "chain_of_custody": chain_of_custody,
-            "created_at": timestamp.isoformat(),
-            "risk_level": analysis["risk_level"],
-            "vision_analyzed": bool(vision_analysis and vision_analysis.get("vision_available"))
-        }
+        # Store in vault in one transaction: metadata, the exact bytes that
+        # were hashed and the first link of the hash-chained custody log
+        await get_vault_store().submit(
+            {
+                "evidence_id": evidence_id,
+                "user_id": user_id,
+                "evidence_type": evidence_type,
+                "description_hash": hashlib.sha256(description.encode()).hexdigest()[:16],
+                "content_encrypted": True,
+                "original_filename": original_filename,
+                "file_size": file_size,
+                "mime_type": mime_type,
+                "exif_stripped": exif_stripped,
+                "content_hash": content_hash,
+                "created_at": timestamp.isoformat(),
+                "risk_level": analysis["risk_level"],
+                "vision_analyzed": vision_analyzed
+            },
+            content_b64.encode(),
+            {
+                "action": "submitted",
+                "actor": "user",
+                "timestamp": timestamp.isoformat(),
+                "details": {
+                    "content_hash": content_hash,
+                    "vision_analyzed": vision_analyzed
+                }
+            }
+        )
         
         return EvidenceSubmitResponse(
             evidence_id=evidence_id,
@@ -346,55 +351,96 @@ async def submit_evidence(
 
 
 @router.get("/list/{user_id}")
-async def list_user_evidence(user_id: str):
-    """List all evidence for a user (metadata only, no content)"""
-    user_evidence = []
+async def list_user_evidence(
+    user_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """
+    List evidence for a user (metadata only, no content), newest first
     
-    for eid, evidence in _forensic_vault.items():
-        if evidence["user_id"] == user_id:
-            user_evidence.append({
-                "evidence_id": eid,
-                "evidence_type": evidence["evidence_type"],
-                "created_at": evidence["created_at"],
-                "risk_level": evidence["risk_level"],
-                "exif_stripped": evidence["exif_stripped"]
-            })
+    Paginated with an opaque cursor: pass `next_cursor` from the previous
+    page to continue. Served from the per-user (user_id, created_at) index.
+    """
+    try:
+        page = await get_vault_store().list_by_user(user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "user_id": user_id,
-        "evidence_count": len(user_evidence),
-        "evidence": sorted(user_evidence, key=lambda x: x["created_at"], reverse=True)
+        "evidence_count": len(page["items"]),
+        "evidence": page["items"],
+        "next_cursor": page["next_cursor"],
+        "has_more": page["next_cursor"] is not None
     }
 
 
 @router.get("/verify/{evidence_id}")
 async def verify_evidence_integrity(evidence_id: str):
-    """Verify evidence integrity using chain of custody"""
-    if evidence_id not in _forensic_vault:
-        raise HTTPException(status_code=404, detail="Evidence not found")
+    """
+    Verify evidence integrity
     
-    evidence = _forensic_vault[evidence_id]
+    Re-hashes the stored content, walks the hash-chained custody log and
+    checks the item's Merkle proof against its day's root, which must
+    match the sealed root once the day has closed.
+    """
+    result = await get_vault_integrity_service().verify_item(evidence_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Evidence not found")
     
     return {
         "evidence_id": evidence_id,
-        "integrity_verified": True,
-        "content_hash": evidence["content_hash"][:16] + "...",
-        "chain_of_custody": evidence["chain_of_custody"],
+        "integrity_verified": result["integrity_verified"],
+        "content_verified": result["content_verified"],
+        "content_hash": result["content_hash"][:16] + "...",
+        "custody_chain": result["custody_chain"],
+        "chain_of_custody": result["chain_of_custody"],
+        "merkle": result["merkle"],
         "verification_timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
+@router.get("/verify/user/{user_id}")
+async def verify_user_vault(user_id: str):
+    """Verify every evidence item in a user's vault (reports items/sec)"""
+    result = await get_vault_integrity_service().verify_user(user_id)
+    result["verification_timestamp"] = datetime.now(timezone.utc).isoformat()
+    return result
+
+
+@router.post("/audit")
+async def start_vault_audit(workers: int = Query(DEFAULT_AUDIT_WORKERS, ge=1, le=MAX_AUDIT_WORKERS)):
+    """
+    Start a background full-vault audit that re-hashes every stored blob
+    and checks each closed day's Merkle root against its seal
+    
+    Returns the running audit instead if one is already in progress.
+    """
+    return get_vault_integrity_service().start_audit(workers=workers)
+
+
+@router.get("/audit/{job_id}")
+async def get_vault_audit(job_id: str):
+    """Progress and result of a full-vault audit"""
+    job = get_vault_integrity_service().get_audit(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Audit job not found")
+    return job
+
+
 @router.delete("/{evidence_id}")
 async def delete_evidence(evidence_id: str, user_id: str):
     """Permanently delete evidence (user-initiated only)"""
-    if evidence_id not in _forensic_vault:
+    store = get_vault_store()
+    evidence = await store.get(evidence_id)
+    if evidence is None:
         raise HTTPException(status_code=404, detail="Evidence not found")
     
-    evidence = _forensic_vault[evidence_id]
     if evidence["user_id"] != user_id:
         raise HTTPException(status_code=403, detail="Unauthorized")
     
-    del _forensic_vault[evidence_id]
+    await store.delete(evidence_id)
     
     return {
         "status": "deleted",
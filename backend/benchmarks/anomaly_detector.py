@@ -0,0 +1,66 @@
+"""
+Streaming Anomaly Detector Benchmark
+Per-tick latency at N metrics sampled at 1 Hz
+
+    python benchmarks/anomaly_detector.py --metrics 10000 --ticks 600
+
+Every tick updates all metrics at once, with a few injected spikes; the
+report compares tick latency against the sampling budget (1 s at 1 Hz).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from health.anomaly_detector import StreamingAnomalyDetector
+
+
+def run(metrics: int, ticks: int, spike_rate: float, seed: int):
+    rng = np.random.default_rng(seed)
+    detector = StreamingAnomalyDetector(cooldown=0.0)
+    detector.register(f"bench.metric_{i}" for i in range(metrics))
+    base = rng.uniform(10, 90, metrics)
+    noise = rng.uniform(0.5, 3.0, metrics)
+
+    latencies = np.empty(ticks)
+    alerts = 0
+    injected = 0
+    for tick in range(ticks):
+        values = base + noise * rng.standard_normal(metrics)
+        if tick >= detector.warmup:
+            spikes = rng.random(metrics) < spike_rate
+            values[spikes] += 10 * noise[spikes]
+            injected += int(spikes.sum())
+        started = time.perf_counter()
+        alerts += len(detector.update(values, timestamp=float(tick)))
+        latencies[tick] = time.perf_counter() - started
+    return latencies, alerts, injected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--metrics", type=int, default=10_000)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--hz", type=float, default=1.0)
+    parser.add_argument("--spike-rate", type=float, default=1e-4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    latencies, alerts, injected = run(args.metrics, args.ticks, args.spike_rate, args.seed)
+    budget = 1.0 / args.hz
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+    print(f"metrics={args.metrics} ticks={args.ticks} rate={args.hz} Hz")
+    print(f"tick latency: p50 {p50:.2f} ms  p99 {p99:.2f} ms  max {latencies.max() * 1e3:.2f} ms")
+    print(f"budget used:  {latencies.mean() / budget:.3%} of {budget * 1e3:.0f} ms")
+    print(f"per sample:   {latencies.mean() / args.metrics * 1e9:.0f} ns")
+    print(f"alerts: {alerts} (injected spikes: {injected})")
+    return 0 if latencies.max() < budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Batch Mutation Detection Benchmark
+Entities per second: per-dict ultimate sub-detectors vs the matrix API
+
+    python benchmarks/batch_mutation.py --entities 10000 --metrics 50 --steps 32
+
+The per-dict path is timed on --sample entities and extrapolated; the
+batch path scores every entity in one call.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.batch_mutation import batch_mutation_scores
+from logic.ultimate_algorithms import UltimateAlgorithms
+
+
+def make_inputs(entities: int, metrics: int, steps: int, seed: int):
+    rng = np.random.default_rng(seed)
+    baseline = rng.uniform(10, 90, metrics)
+    drift = rng.normal(0, 0.2, (entities, 1, metrics))
+    history = baseline + drift * np.arange(steps)[None, :, None] + rng.normal(0, 2, (entities, steps, metrics))
+    current = baseline * rng.uniform(0.8, 1.3, (entities, metrics))
+    return current, baseline, history
+
+
+def per_dict_rate(current, baseline, history, sample: int) -> float:
+    algorithms = UltimateAlgorithms()
+    names = [f"m{j}" for j in range(current.shape[1])]
+    base = dict(zip(names, baseline.tolist()))
+    records = [
+        (dict(zip(names, current[i].tolist())), base, [dict(zip(names, row)) for row in history[i].tolist()])
+        for i in range(sample)
+    ]
+    started = time.perf_counter()
+    for metrics, baseline_dict, historical in records:
+        algorithms._statistical_mutation_detection(metrics, baseline_dict, historical)
+        algorithms._ml_mutation_detection(metrics, baseline_dict, historical)
+        algorithms._time_series_mutation_detection(metrics, baseline_dict, historical)
+        algorithms._pattern_mutation_detection(metrics, baseline_dict, historical)
+    return sample / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--entities", type=int, default=10_000)
+    parser.add_argument("--metrics", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=32)
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    current, baseline, history = make_inputs(args.entities, args.metrics, args.steps, args.seed)
+    timings = []
+    for _ in range(args.repeats):
+        started = time.perf_counter()
+        batch_mutation_scores(current, baseline, history)
+        timings.append(time.perf_counter() - started)
+    batch_rate = args.entities / min(timings)
+    dict_rate = per_dict_rate(current, baseline, history, min(args.sample, args.entities))
+
+    print(f"entities={args.entities} metrics={args.metrics} steps={args.steps}")
+    print(f"per-dict: {dict_rate:10.0f} entities/s  ({args.entities / dict_rate:.2f} s for all)")
+    print(f"batch:    {batch_rate:10.0f} entities/s  ({min(timings):.3f} s for all)")
+    print(f"speedup:  {batch_rate / dict_rate:.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
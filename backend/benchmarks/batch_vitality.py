@@ -0,0 +1,106 @@
+"""
+Batch Vitality Benchmark
+Samples per second: per-sample vitality / hardware abstraction vs the batch API
+
+    python benchmarks/batch_vitality.py --rows 100000 --engine ultimate
+
+The per-sample path is timed on --sample rows and extrapolated; the batch
+path evaluates every row in one call and renders no recommendation text
+(the cost of iter_recommendations() is reported separately).
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.batch_vitality import (HARDWARE_FIELDS, PERFECT_HARDWARE, PERFECT_VITALITY, ULTIMATE_HARDWARE,
+                                  ULTIMATE_VITALITY, batch_hardware, batch_vitality)
+from logic.perfect_algorithms import PerfectAlgorithms
+from logic.ultimate_algorithms import UltimateAlgorithms
+
+ENGINES = {
+    'ultimate': (UltimateAlgorithms, 'ultimate', ULTIMATE_VITALITY, ULTIMATE_HARDWARE),
+    'perfect': (PerfectAlgorithms, 'perfect', PERFECT_VITALITY, PERFECT_HARDWARE),
+}
+
+
+def make_inputs(rows: int, seed: int):
+    rng = np.random.default_rng(seed)
+    vitality = np.stack([rng.uniform(0.6, 1.0, rows), rng.uniform(0.7, 1.0, rows),
+                         rng.uniform(0.1, 0.9, rows), rng.uniform(0.02, 0.6, rows)])
+    hardware = {
+        'cpu': np.c_[rng.uniform(0, 80, rows), rng.integers(1, 17, rows), rng.uniform(1, 4, rows),
+                     rng.uniform(30, 70, rows)],
+        'memory': np.c_[rng.uniform(0, 80, rows), np.full(rows, 32.0), np.full(rows, np.nan), rng.uniform(0, 60, rows)],
+        'storage': np.c_[rng.uniform(0, 100, rows), np.full(rows, 1000.0), rng.uniform(20, 500, rows),
+                         rng.uniform(20, 500, rows), np.full(rows, 5000.0)],
+        'network': np.c_[rng.uniform(0, 100, rows), rng.uniform(1, 150, rows), rng.uniform(0, 2, rows),
+                         rng.uniform(10, 1000, rows)],
+        'gpu': np.c_[rng.uniform(0, 100, rows), rng.uniform(0, 100, rows), rng.uniform(40, 90, rows),
+                     rng.integers(1, 5, rows)],
+    }
+    return vitality, hardware
+
+
+def best_of(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="ultimate")
+    parser.add_argument("--sample", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    engine_class, prefix, vitality_profile, hardware_profile = ENGINES[args.engine]
+    engine = engine_class()
+    vitality, hardware = make_inputs(args.rows, args.seed)
+    sample = min(args.sample, args.rows)
+
+    single_vitality = getattr(engine, f"{prefix}_vitality_calculation")
+    single_hardware = getattr(engine, f"{prefix}_hardware_abstraction")
+    vitality_rows = vitality[:, :sample].T.tolist()
+    hardware_rows = [{component: dict(zip(HARDWARE_FIELDS[component], matrix[i].tolist()))
+                      for component, matrix in hardware.items()} for i in range(sample)]
+    for row in hardware_rows:
+        del row['memory']['available_gb']
+
+    print(f"engine={args.engine} rows={args.rows}")
+    print(f"{'':9} {'per-sample':>14} {'batch':>14} {'speedup':>8} {'flagged':>8} {'text':>10}")
+    for name, single, rows, batch in (
+        ('vitality', lambda row: single_vitality(*row), vitality_rows,
+         lambda: batch_vitality(*vitality, profile=vitality_profile)),
+        ('hardware', single_hardware, hardware_rows, lambda: batch_hardware(hardware, hardware_profile)),
+    ):
+        started = time.perf_counter()
+        for row in rows:
+            single(row)
+        single_rate = sample / (time.perf_counter() - started)
+        batch_rate = args.rows / best_of(batch, args.repeats)
+        result = batch()
+        started = time.perf_counter()
+        for _ in result.iter_recommendations():
+            pass
+        text_time = time.perf_counter() - started
+        print(f"{name:9} {single_rate:12.0f}/s {batch_rate:12.0f}/s {batch_rate / single_rate:7.0f}x "
+              f"{len(result.flagged()):8d} {text_time:9.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
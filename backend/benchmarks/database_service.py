@@ -0,0 +1,143 @@
+"""
+Database Service Benchmark
+Concurrent request throughput: blocking client calls vs the async pool
+
+    python benchmarks/database_service.py --requests 500 --concurrency 50 --rtt-ms 5
+    python benchmarks/database_service.py --dsn postgresql://localhost/flux   # real Postgres
+
+Each simulated request looks a user up and logs a founder event, the
+two queries the assessment endpoints issue. The stand-in Postgres charges
+one network round trip per statement (per batch for executemany) and
+serves at most --pool-size statements at once. "blocking" replays the
+previous service (a synchronous client call inside `async def`, which
+holds the event loop for the round trip); "async" is DatabaseService.
+With --dsn both run against a real server with the users and
+founder_analytics tables.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from services.database import DatabaseService
+
+
+class StandInConnection:
+    """One Postgres connection: every statement costs a round trip"""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+
+    async def fetchrow(self, query, *args):
+        await asyncio.sleep(self.rtt)
+        return {"email": args[0]}
+
+    async def fetchval(self, query, *args):
+        await asyncio.sleep(self.rtt)
+        return 1
+
+    async def executemany(self, query, rows):
+        await asyncio.sleep(self.rtt)  # pipelined: one round trip per batch
+
+
+class StandInPool:
+    """asyncpg-style pool over StandInConnections"""
+
+    def __init__(self, size: int, rtt: float):
+        self._idle = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(StandInConnection(rtt))
+
+    @asynccontextmanager
+    async def acquire(self):
+        conn = await self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put_nowait(conn)
+
+    async def close(self):
+        pass
+
+
+class BlockingService:
+    """The previous service: a synchronous client call inside each coroutine"""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+
+    async def get_user_by_email(self, email):
+        time.sleep(self.rtt)
+        return {"email": email}
+
+    async def log_founder_event(self, event_type, metadata):
+        time.sleep(self.rtt)
+        return {"event_type": event_type}
+
+    async def close(self):
+        pass
+
+
+async def run(service, requests: int, concurrency: int):
+    latencies = []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def request(i: int):
+        async with gate:
+            started = time.perf_counter()
+            await service.get_user_by_email(f"user{i % 100}@example.sa")
+            await service.log_founder_event("assessment_started", {"request": i})
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    await service.close()  # includes the final event flush
+    return elapsed, np.array(latencies), time.perf_counter() - started
+
+
+async def bench(args):
+    rtt = args.rtt_ms / 1000
+    if args.dsn:
+        import os
+        os.environ["SUPABASE_DB_URL"] = args.dsn
+        os.environ["DB_POOL_MAX_SIZE"] = str(args.pool_size)
+        services = {"async": DatabaseService()}
+    else:
+        services = {
+            "blocking": BlockingService(rtt),
+            "async": DatabaseService(pool=StandInPool(args.pool_size, rtt)),
+        }
+
+    results = {}
+    for name, service in services.items():
+        elapsed, latencies, drained = await run(service, args.requests, args.concurrency)
+        results[name] = args.requests / elapsed
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+        print(f"{name:>8}: {results[name]:8.0f} req/s  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms"
+              f"  (events durable after {drained:.2f} s)")
+    if len(results) == 2:
+        print(f"speedup: {results['async'] / results['blocking']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--rtt-ms", type=float, default=5.0)
+    parser.add_argument("--dsn", default=None, help="benchmark a real Postgres instead of the stand-in")
+    args = parser.parse_args()
+    asyncio.run(bench(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""
+Logic Engine Benchmark Suite
+Latency, throughput, memory and startup of every engine entry point at fixed-seed workload sizes
+
+    python benchmarks/engines.py --sizes small medium --json results.json
+    python benchmarks/engines.py --save-baseline benchmarks/baseline.json
+    python benchmarks/engines.py --baseline benchmarks/baseline.json --threshold 0.25
+
+Engines: EnhancedAeonCore ("enhanced"), PerfectAlgorithms ("perfect"),
+UltimateAlgorithms ("ultimate") and EnhancedPerfectAlgorithms
+("enhanced_perfect"); entry points are their mutation, hardware and
+vitality methods plus the batch variants where they exist. Workloads are
+synthetic and generated from --seed, so two runs on the same machine see
+identical inputs.
+
+Per engine, import and construct time are measured in a fresh interpreter
+(best of --import-repeats). Per entry point and size: the first call is
+timed on its own (lazy model loading and caches land there), then --calls
+timed calls give p50 / p95 / p99 latency and throughput in items per
+second (a batch call counts its rows), and a separate tracemalloc pass
+gives the peak memory of one call. An entry point that raises is
+recorded with its error. Results are written as JSON; with
+--baseline, p50 / p95 latency, peak memory and startup times that grew by
+more than --threshold (and by more than a small absolute noise floor) are
+reported as regressions and the exit status is 1.
+Baselines are machine-specific: record them on the machine that compares.
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from logic.batch_vitality import HARDWARE_FIELDS
+
+# name: (metrics, history steps, timed calls, batch rows)
+SIZES = {
+    'small': {'metrics': 8, 'steps': 16, 'calls': 200, 'rows': 1_000},
+    'medium': {'metrics': 32, 'steps': 128, 'calls': 50, 'rows': 10_000},
+    'large': {'metrics': 128, 'steps': 1024, 'calls': 10, 'rows': 100_000},
+}
+
+# Keys compared against a baseline (higher is worse) and the absolute growth below which a change is noise
+COMPARED = {'p50_ms': 0.05, 'p95_ms': 0.1, 'peak_memory_kb': 16.0}
+COMPARED_STARTUP = {'import_s': 0.05, 'construct_s': 0.01}
+
+
+# Workloads -------------------------------------------------------------------
+
+
+def mutation_inputs(size: Dict[str, int], rng: np.random.Generator, count: int) -> List[Dict[str, Any]]:
+    names = [f"metric_{j}" for j in range(size['metrics'])]
+    inputs = []
+    for _ in range(count):
+        baseline = rng.uniform(10, 90, size['metrics'])
+        drift = rng.normal(0, 0.2, size['metrics'])
+        history = baseline + drift * np.arange(size['steps'])[:, None] + rng.normal(0, 2, (size['steps'], size['metrics']))
+        inputs.append({
+            'timestamp': datetime(2026, 1, 1).isoformat(),
+            'metrics': dict(zip(names, (baseline * rng.uniform(0.8, 1.3, size['metrics'])).tolist())),
+            'baseline': dict(zip(names, baseline.tolist())),
+            'historical_data': [dict(zip(names, row)) for row in history.tolist()],
+        })
+    return inputs
+
+
+def hardware_matrices(rows: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    return {
+        'cpu': np.c_[rng.uniform(0, 100, rows), rng.integers(1, 17, rows), rng.uniform(1, 4, rows),
+                     rng.uniform(30, 90, rows)],
+        'memory': np.c_[rng.uniform(0, 100, rows), np.full(rows, 32.0), rng.uniform(0, 32, rows),
+                        rng.uniform(0, 60, rows)],
+        'storage': np.c_[rng.uniform(0, 100, rows), np.full(rows, 1000.0), rng.uniform(20, 500, rows),
+                         rng.uniform(20, 500, rows), np.full(rows, 5000.0)],
+        'network': np.c_[rng.uniform(0, 100, rows), rng.uniform(1, 150, rows), rng.uniform(0, 2, rows),
+                         rng.uniform(10, 1000, rows)],
+        'gpu': np.c_[rng.uniform(0, 100, rows), rng.uniform(0, 100, rows), rng.uniform(40, 90, rows),
+                     rng.integers(1, 5, rows)],
+    }
+
+
+def hardware_inputs(rng: np.random.Generator, count: int) -> List[Dict[str, Dict[str, float]]]:
+    matrices = hardware_matrices(count, rng)
+    return [{component: dict(zip(HARDWARE_FIELDS[component], matrix[i].tolist()))
+             for component, matrix in matrices.items()} for i in range(count)]
+
+
+def vitality_inputs(rng: np.random.Generator, count: int) -> np.ndarray:
+    return np.stack([rng.uniform(0.5, 1.0, count), rng.uniform(0.6, 1.0, count),
+                     rng.uniform(0.1, 0.9, count), rng.uniform(0.02, 0.6, count)])
+
+
+# A workload turns (size, rng, count) into count argument tuples and the items each call processes
+Workload = Callable[[Dict[str, int], np.random.Generator, int], Tuple[List[tuple], int]]
+
+
+def mutation_workload(size, rng, count):
+    return [(data,) for data in mutation_inputs(size, rng, count)], 1
+
+
+def hardware_workload(size, rng, count):
+    return [(data,) for data in hardware_inputs(rng, count)], 1
+
+
+def vitality_workload(size, rng, count):
+    return [tuple(row) for row in vitality_inputs(rng, count).T.tolist()], 1
+
+
+def mutation_batch_workload(size, rng, count):
+    entities = size['rows'] // 100     # (entities, steps, metrics) histories grow fast
+    baseline = rng.uniform(10, 90, size['metrics'])
+    history = baseline + rng.normal(0, 2, (entities, min(size['steps'], 64), size['metrics']))
+    current = baseline * rng.uniform(0.8, 1.3, (entities, size['metrics']))
+    return [(current, baseline, history)] * count, entities
+
+
+def hardware_batch_workload(size, rng, count):
+    return [(hardware_matrices(size['rows'], rng),)] * count, size['rows']
+
+
+def vitality_batch_workload(size, rng, count):
+    return [tuple(vitality_inputs(rng, size['rows']))] * count, size['rows']
+
+
+WORKLOADS: Dict[str, Workload] = {
+    'mutation': mutation_workload,
+    'hardware': hardware_workload,
+    'vitality': vitality_workload,
+    'mutation_batch': mutation_batch_workload,
+    'hardware_batch': hardware_batch_workload,
+    'vitality_batch': vitality_batch_workload,
+}
+
+# engine: (module, class, {entry point: method})
+ENGINES = {
+    'enhanced': ('logic.enhanced_algorithms', 'EnhancedAeonCore', {
+        'mutation': 'enhanced_mutation_detection',
+        'hardware': 'hardware_abstraction_layer',
+        'vitality': 'vitality_index_calculation',
+    }),
+    'perfect': ('logic.perfect_algorithms', 'PerfectAlgorithms', {
+        'mutation': 'perfect_mutation_detection',
+        'hardware': 'perfect_hardware_abstraction',
+        'vitality': 'perfect_vitality_calculation',
+        'hardware_batch': 'perfect_hardware_abstraction_batch',
+        'vitality_batch': 'perfect_vitality_calculation_batch',
+    }),
+    'ultimate': ('logic.ultimate_algorithms', 'UltimateAlgorithms', {
+        'mutation': 'ultimate_mutation_detection',
+        'hardware': 'ultimate_hardware_abstraction',
+        'vitality': 'ultimate_vitality_calculation',
+        'mutation_batch': 'ultimate_mutation_detection_batch',
+        'hardware_batch': 'ultimate_hardware_abstraction_batch',
+        'vitality_batch': 'ultimate_vitality_calculation_batch',
+    }),
+    'enhanced_perfect': ('logic.enhanced_perfect_algorithms', 'EnhancedPerfectAlgorithms', {
+        'mutation': 'enhanced_mutation_detection',
+    }),
+}
+
+BATCH_CALLS = 5
+
+
+# Measurement -----------------------------------------------------------------
+
+
+_STARTUP = """
+import json, logging, sys, time
+sys.path.insert(0, {root!r})
+logging.disable(logging.CRITICAL)
+started = time.perf_counter()
+import {module} as engine_module
+imported = time.perf_counter()
+engine_module.{cls}()
+print(json.dumps({{'import_s': imported - started, 'construct_s': time.perf_counter() - imported}}))
+"""
+
+
+def startup_times(module: str, cls: str, repeats: int) -> Dict[str, float]:
+    """Best-of import and construct time in fresh interpreters"""
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", _STARTUP.format(root=str(ROOT), module=module, cls=cls)],
+                                capture_output=True, text=True, check=True, cwd=ROOT).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: min(run[key] for run in runs) for key in ('import_s', 'construct_s')}
+
+
+def percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q))
+
+
+def measure(method: Callable, calls: List[tuple], items: int, memory_calls: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    method(*calls[0])
+    first_call = time.perf_counter() - started
+
+    latencies = []
+    for args in calls:
+        started = time.perf_counter()
+        method(*args)
+        latencies.append(time.perf_counter() - started)
+
+    peaks = []
+    tracemalloc.start()
+    for args in calls[:memory_calls]:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        method(*args)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    total = sum(latencies)
+    return {
+        'calls': len(latencies),
+        'items_per_call': items,
+        'first_call_ms': first_call * 1e3,
+        'p50_ms': percentile(latencies, 50) * 1e3,
+        'p95_ms': percentile(latencies, 95) * 1e3,
+        'p99_ms': percentile(latencies, 99) * 1e3,
+        'mean_ms': statistics.mean(latencies) * 1e3,
+        'throughput_items_s': len(latencies) * items / total if total > 0 else 0.0,
+        'peak_memory_kb': max(peaks) / 1024 if peaks else 0.0,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def run_suite(args) -> Dict[str, Any]:
+    results = {'created': datetime.now().isoformat(), 'seed': args.seed, 'environment': environment(),
+               'startup': {}, 'results': []}
+    for engine in args.engines:
+        module, cls, entries = ENGINES[engine]
+        results['startup'][engine] = startup_times(module, cls, args.import_repeats)
+        instance = getattr(importlib.import_module(module), cls)()
+        for entry, method_name in entries.items():
+            if args.entries and entry not in args.entries:
+                continue
+            for size_name in args.sizes:
+                size = SIZES[size_name]
+                count = BATCH_CALLS if entry.endswith('_batch') else size['calls']
+                # Seeded per (size, entry): every engine sees the same inputs
+                rng = np.random.default_rng([args.seed, list(SIZES).index(size_name), list(WORKLOADS).index(entry)])
+                calls, items = WORKLOADS[entry](size, rng, count)
+                record = {'engine': engine, 'entry_point': entry, 'method': method_name, 'size': size_name}
+                try:
+                    record.update(measure(getattr(instance, method_name), calls, items, args.memory_calls))
+                except Exception as e:
+                    tracemalloc.stop()
+                    record['error'] = f"{type(e).__name__}: {e}"
+                    print(f"{engine:17} {entry:15} {size_name:7} error: {record['error']}", flush=True)
+                else:
+                    print(f"{engine:17} {entry:15} {size_name:7} p50 {record['p50_ms']:10.3f}ms "
+                          f"p95 {record['p95_ms']:10.3f}ms {record['throughput_items_s']:14.0f} items/s "
+                          f"{record['peak_memory_kb']:10.0f} KiB", flush=True)
+                results['results'].append(record)
+    return results
+
+
+# Baselines -------------------------------------------------------------------
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Regressions of current against baseline beyond the relative threshold"""
+    regressions = []
+
+    def check(label: str, key: str, new: float, old: float):
+        floor = COMPARED.get(key, COMPARED_STARTUP.get(key, 0.0))
+        if old > 0 and new > old * (1 + threshold) and new - old > floor:
+            regressions.append(f"{label} {key}: {old:.4g} -> {new:.4g} (+{(new / old - 1) * 100:.0f}%)")
+
+    for engine, times in current['startup'].items():
+        for key in COMPARED_STARTUP:
+            if engine in baseline.get('startup', {}):
+                check(engine, key, times[key], baseline['startup'][engine][key])
+
+    previous = {(r['engine'], r['entry_point'], r['size']): r for r in baseline.get('results', [])}
+    for record in current['results']:
+        old = previous.get((record['engine'], record['entry_point'], record['size']))
+        if old is None:
+            continue
+        label = f"{record['engine']}.{record['entry_point']}[{record['size']}]"
+        if 'error' in record:
+            if 'error' not in old:
+                regressions.append(f"{label} now fails: {record['error']}")
+        elif 'error' not in old:
+            for key in COMPARED:
+                check(label, key, record[key], old[key])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--entries", nargs="+", choices=list(WORKLOADS), help="entry points (default all)")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory-calls", type=int, default=3, help="calls traced for peak memory")
+    parser.add_argument("--import-repeats", type=int, default=3)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--save-baseline", type=Path, help="write results as the new baseline")
+    parser.add_argument("--baseline", type=Path, help="compare against this baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative growth flagged as a regression")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    warnings.simplefilter("ignore")    # sklearn convergence / deprecation noise from in-process training
+
+    results = run_suite(args)
+    for path in (args.json, args.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(results, indent=2))
+            print(f"wrote {path}")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get('environment') != results['environment']:
+            print("warning: baseline was recorded in a different environment")
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.baseline}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Ensemble Executor Benchmark
+Wall-clock cost of running detectors concurrently and of abandoning a detector at its deadline
+
+    python benchmarks/ensemble_executor.py --detectors 4 --sleep 0.2 --timeout 0.1
+    python benchmarks/ensemble_executor.py --history 3000 20000 --calls 5
+
+Concurrency: --detectors thread detectors that each sleep --sleep
+seconds, run in parallel and sequentially; ideally the parallel run
+takes about one sleep. Deadline: one fast detector next to one that
+sleeps ten times --timeout; ideally the run returns about --timeout
+after it started, not when the slow detector finishes.
+
+Real detectors: UltimateAlgorithms.ultimate_mutation_detection on a
+fixed-seed record per --history length, run sequentially, with the
+history scans on threads (the default) and with them in the process
+pool. The first process call (worker spawn) is reported on its own; the
+rest are the best of --calls. Set ULTIMATE_PROCESS_MIN_HISTORY only to a
+length where the process column wins on the deployment machine.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.ensemble_executor import Detector, EnsembleExecutor, shutdown_process_pool
+from logic.ultimate_algorithms import UltimateAlgorithms
+
+
+def sleeper(seconds: float, score: float):
+    def detect(*_):
+        time.sleep(seconds)
+        return score
+    return detect
+
+
+def timed_run(executor: EnsembleExecutor, detectors, **kwargs):
+    started = time.perf_counter()
+    run = executor.run(detectors, **kwargs)
+    return run, time.perf_counter() - started
+
+
+def mutation_record(length: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    baseline = {f"m{j}": float(rng.uniform(10, 50)) for j in range(8)}
+    history = [{name: value * rng.uniform(0.9, 1.1) for name, value in baseline.items() if rng.random() > 0.1}
+               for _ in range(length)]
+    return {'timestamp': 0, 'metrics': {name: value * 1.2 for name, value in baseline.items()},
+            'baseline': baseline, 'historical_data': history}
+
+
+def best_call(algorithms: UltimateAlgorithms, record, calls: int) -> float:
+    best = float("inf")
+    for _ in range(calls):
+        started = time.perf_counter()
+        algorithms.ultimate_mutation_detection(record)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def compare_modes(lengths, calls: int):
+    sequential = UltimateAlgorithms()
+    sequential.parallel_processing = False
+    threads = UltimateAlgorithms()
+    threads.parallel_min_history = 0
+    threads.process_min_history = None
+    processes = UltimateAlgorithms()
+    processes.parallel_min_history = processes.process_min_history = 0
+    processes.ensemble.default_timeout = 120
+
+    print(f"cpus={os.cpu_count()}, best of {calls}")
+    print(f"{'history':>8} {'sequential':>11} {'threads':>9} {'process':>9} {'first process':>14}")
+    for length in lengths:
+        record = mutation_record(length)
+        started = time.perf_counter()
+        processes.ultimate_mutation_detection(record)
+        first = time.perf_counter() - started
+        row = [best_call(algorithms, record, calls) for algorithms in (sequential, threads, processes)]
+        print(f"{length:8d} " + " ".join(f"{seconds * 1000:9.1f}ms" for seconds in row) + f" {first * 1000:12.1f}ms")
+    shutdown_process_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--detectors", type=int, default=4)
+    parser.add_argument("--sleep", type=float, default=0.2, help="seconds each concurrent detector sleeps")
+    parser.add_argument("--timeout", type=float, default=0.1, help="deadline of the slow detector")
+    parser.add_argument("--history", type=int, nargs="*", default=[3000, 20000],
+                        help="history lengths for the real-detector comparison (none to skip it)")
+    parser.add_argument("--calls", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with ThreadPoolExecutor(max_workers=args.detectors + 1) as pool:
+        executor = EnsembleExecutor(pool)
+        detectors = [Detector(f"d{i}", sleeper(args.sleep, 0.5)) for i in range(args.detectors)]
+        _, parallel = timed_run(executor, detectors)
+        _, sequential = timed_run(executor, detectors, parallel=False)
+        print(f"{args.detectors} detectors x {args.sleep * 1000:.0f}ms: "
+              f"{parallel * 1000:.0f}ms parallel, {sequential * 1000:.0f}ms sequential "
+              f"({sequential / parallel:.1f}x)")
+
+        run, elapsed = timed_run(executor, [Detector("fast", sleeper(0.0, 0.5)),
+                                            Detector("slow", sleeper(args.timeout * 10, 0.9), timeout=args.timeout)])
+        print(f"deadline {args.timeout * 1000:.0f}ms: run returned after {elapsed * 1000:.0f}ms "
+              f"(slow detector {run.timings['slow']['status']}, overshoot {(elapsed - args.timeout) * 1000:+.1f}ms)")
+
+    if args.history:
+        compare_modes(args.history, args.calls)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
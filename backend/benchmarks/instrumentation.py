@@ -0,0 +1,86 @@
+"""
+Algorithm Instrumentation Benchmark
+Decorator overhead: per-call str() sizing and INFO logging vs sampled instrumentation
+
+    python benchmarks/instrumentation.py --history 1000 --calls 2000
+
+The decorated function returns immediately, so the times are pure
+decorator overhead on a call whose argument is a history of metric dicts
+like the ones the mutation detectors receive. "legacy" is the previous
+decorator (str() of arguments and result plus an INFO line every call);
+"sampled" is logic.instrumentation at the default 1-in-100 rate.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from functools import wraps
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.instrumentation import AlgorithmInstrumentation, throughput_summary
+
+logger = logging.getLogger("benchmarks.instrumentation")
+
+
+def legacy_monitor(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start_time = time.time()
+        result = func(*args, **kwargs)
+        execution_time = time.time() - start_time
+        input_size = len(str(args)) + len(str(kwargs))
+        output_size = len(str(result))
+        throughput = output_size / execution_time if execution_time > 0 else 0
+        logger.info(f"Performance - {func.__name__}: {execution_time:.4f}s, Input: {input_size}, "
+                    f"Output: {output_size}, Throughput: {throughput:.2f}")
+        return result
+    return wrapper
+
+
+def detect(record):
+    return {'mutation_score': 0.0, 'individual_scores': {}}
+
+
+def per_call(func, record, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        func(record)
+    return (time.perf_counter() - started) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--history", type=int, default=1000, help="historical records per call")
+    parser.add_argument("--metrics", type=int, default=8, help="metrics per record")
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    # A real handler, as in the algorithm modules, but writing nowhere
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    names = [f"metric_{j}" for j in range(args.metrics)]
+    record = {
+        'metrics': {name: 1.0 for name in names},
+        'baseline': {name: 1.0 for name in names},
+        'historical_data': [{name: float(i + j) for j, name in enumerate(names)} for i in range(args.history)],
+    }
+
+    modes = {
+        "bare": detect,
+        "legacy": legacy_monitor(detect),
+        "sampled": AlgorithmInstrumentation(sample_rate=0.01).instrument(detect, logger, summary=throughput_summary),
+    }
+    results = {mode: per_call(func, record, args.calls) for mode, func in modes.items()}
+
+    print(f"history={args.history} x {args.metrics} metrics, {args.calls} calls")
+    for mode, seconds in results.items():
+        print(f"{mode:8} {seconds * 1e6:10.1f} us/call")
+    overhead = {mode: results[mode] - results["bare"] for mode in ("legacy", "sampled")}
+    print(f"overhead reduction: {overhead['legacy'] / max(overhead['sampled'], 1e-9):.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
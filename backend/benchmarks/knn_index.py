@@ -0,0 +1,85 @@
+"""
+Feature Index Benchmark
+kNN scoring latency: brute force over the history vs the KD-tree feature index
+
+    python benchmarks/knn_index.py --points 1000000 --dims 8
+
+Reports the bulk build time, the amortized cost of appending points one
+chunk at a time, single-query latency percentiles, batched throughput and
+the brute-force (full sort) scoring the index replaces.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.knn_index import FeatureIndex
+
+
+def brute_force_score(history: np.ndarray, query: np.ndarray, k: int) -> float:
+    distances = np.linalg.norm(history - query, axis=1)
+    nearest = np.sort(distances)[:k]
+    return float(nearest.mean() / distances.max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--dims", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--append", type=int, default=50_000, help="points appended after the bulk build")
+    parser.add_argument("--chunk", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    history = rng.normal(0, 0.05, (args.points, args.dims))
+    extra = rng.normal(0, 0.05, (args.append, args.dims))
+    queries = rng.normal(0, 0.08, (args.queries, args.dims))
+
+    index = FeatureIndex(args.dims)
+    started = time.perf_counter()
+    index.add(history)
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for offset in range(0, args.append, args.chunk):
+        index.add(extra[offset:offset + args.chunk])
+    append = (time.perf_counter() - started) / max(args.append, 1)
+
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.score(query, k=args.k)
+        latencies.append(time.perf_counter() - started)
+    latencies = np.array(latencies) * 1000
+
+    started = time.perf_counter()
+    index.score(queries, k=args.k)
+    batch = (time.perf_counter() - started) / args.queries * 1000
+
+    full = np.vstack([history, extra])
+    sample = min(10, args.queries)
+    started = time.perf_counter()
+    for query in queries[:sample]:
+        brute_force_score(full, query, args.k)
+    brute = (time.perf_counter() - started) / sample * 1000
+
+    print(f"points={len(index)} dims={args.dims} k={args.k} segments={[s.end - s.start for s in index._segments]} "
+          f"tail={len(index) - index.indexed}")
+    print(f"bulk build:   {build:8.3f} s")
+    print(f"append:       {append * 1e6:8.1f} us/point amortized ({index.rebuilds} rebuilds)")
+    print(f"single query: p50 {np.percentile(latencies, 50):.3f} ms  p99 {np.percentile(latencies, 99):.3f} ms")
+    print(f"batch query:  {batch:8.3f} ms/query")
+    print(f"brute force:  {brute:8.3f} ms/query  ({brute / np.percentile(latencies, 50):.0f}x slower)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
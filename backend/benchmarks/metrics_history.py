@@ -0,0 +1,116 @@
+"""
+Metrics History Benchmark
+Algorithm metrics history: dataclass list vs struct-of-arrays ring buffer
+
+    python benchmarks/metrics_history.py --entries 1000 --appends 20000
+
+"list" is the previous storage: an AlgorithmMetrics dataclass per call,
+trimmed with history[-1000:] once full, and a report built with
+statistics.mean over per-type list comprehensions. "ring" is
+logic.metrics_history with MetricsHistory.aggregate().
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.metrics_history import ALGORITHM_FIELDS, MetricsHistory
+from logic.ultimate_algorithms import AlgorithmMetrics, AlgorithmType, ProcessingMode
+
+TYPES = list(AlgorithmType)[:3]
+
+
+def results(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [{'processing_time': float(t), 'throughput': float(q), 'memory_usage': float(m), 'cpu_usage': float(c)}
+            for t, q, m, c in rng.uniform(0, 100, (count, 4))]
+
+
+def list_store(history, entries, algorithm_type, result):
+    history.append(AlgorithmMetrics(
+        name="ultimate_mutation_detection", type=algorithm_type, processing_mode=ProcessingMode.REAL_TIME,
+        execution_time=result.get('processing_time', 0.0), accuracy=result.get('accuracy', 1.0),
+        precision=result.get('precision', 1.0), recall=result.get('recall', 1.0),
+        f1_score=result.get('f1_score', 1.0), throughput=result.get('throughput', 0.0),
+        memory_usage=result.get('memory_usage', 0.0), cpu_usage=result.get('cpu_usage', 0.0),
+        error_rate=result.get('error_rate', 0.0), success_rate=result.get('success_rate', 1.0),
+        timestamp=datetime.now(), parameters=result.get('parameters', {})
+    ))
+    if len(history) > entries:
+        history[:] = history[-entries:]
+
+
+def list_report(history):
+    by_type = {}
+    for metric_type in AlgorithmType:
+        type_metrics = [m for m in history if m.type == metric_type]
+        if type_metrics:
+            by_type[metric_type] = {name: statistics.mean([getattr(m, name) for m in type_metrics])
+                                    for name in ('execution_time', 'accuracy', 'throughput', 'success_rate', 'error_rate')}
+    return by_type
+
+
+def ring_store(history, algorithm_type, result):
+    history.append("ultimate_mutation_detection", algorithm_type, ProcessingMode.REAL_TIME, {
+        'execution_time': result.get('processing_time', 0.0), 'accuracy': result.get('accuracy', 1.0),
+        'precision': result.get('precision', 1.0), 'recall': result.get('recall', 1.0),
+        'f1_score': result.get('f1_score', 1.0), 'throughput': result.get('throughput', 0.0),
+        'memory_usage': result.get('memory_usage', 0.0), 'cpu_usage': result.get('cpu_usage', 0.0),
+        'error_rate': result.get('error_rate', 0.0), 'success_rate': result.get('success_rate', 1.0),
+    })
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--entries", type=int, default=1000, help="history capacity")
+    parser.add_argument("--appends", type=int, default=20000)
+    parser.add_argument("--reports", type=int, default=200)
+    args = parser.parse_args()
+    data = results(args.appends)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    old = []
+    started = time.perf_counter()
+    for i, result in enumerate(data):
+        list_store(old, args.entries, TYPES[i % 3], result)
+    list_append = (time.perf_counter() - started) / args.appends
+    list_bytes = tracemalloc.get_traced_memory()[0] - before
+
+    before = tracemalloc.get_traced_memory()[0]
+    ring = MetricsHistory(ALGORITHM_FIELDS, capacity=args.entries)
+    started = time.perf_counter()
+    for i, result in enumerate(data):
+        ring_store(ring, TYPES[i % 3], result)
+    ring_append = (time.perf_counter() - started) / args.appends
+    ring_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    list_time = timed(lambda: list_report(old), args.reports)
+    ring_time = timed(ring.aggregate, args.reports)
+
+    print(f"{args.entries} entries, {args.appends} appends")
+    print(f"{'':6} {'bytes/entry':>12} {'append':>10} {'report':>12}")
+    print(f"{'list':6} {list_bytes / args.entries:12.0f} {list_append * 1e6:8.2f}us {list_time * 1e6:10.1f}us")
+    print(f"{'ring':6} {ring_bytes / args.entries:12.0f} {ring_append * 1e6:8.2f}us {ring_time * 1e6:10.1f}us")
+    print(f"memory: {list_bytes / ring_bytes:.1f}x smaller, report: {list_time / ring_time:.0f}x faster")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
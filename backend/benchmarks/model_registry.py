@@ -0,0 +1,70 @@
+"""
+Model Registry Benchmark
+Worker cold start: in-process model training vs loading published artifacts
+
+    python benchmarks/model_registry.py --runs 3
+
+Each run is a fresh interpreter that imports the enhanced algorithms and
+touches every model once, the way a new worker serves its first request.
+The "train" column uses an empty registry (in-process fallback training,
+the previous behaviour); "registry" loads a version published up front.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+WORKER = """
+import json, logging, time, warnings
+warnings.filterwarnings("ignore")
+started = time.perf_counter()
+import sklearn.ensemble, sklearn.neural_network, sklearn.svm
+imported = time.perf_counter()
+from logic.enhanced_perfect_algorithms import ENHANCED_MODELS, enhanced_perfect_algorithms
+logging.disable(logging.CRITICAL)
+for name in ENHANCED_MODELS:
+    enhanced_perfect_algorithms._model(name)
+print(json.dumps({"sklearn": imported - started, "ready": time.perf_counter() - imported}))
+"""
+
+
+def cold_start(registry_dir: str, workdir: str) -> dict:
+    env = dict(os.environ, MODEL_REGISTRY_DIR=registry_dir, PYTHONPATH=str(BACKEND))
+    output = subprocess.run([sys.executable, "-c", WORKER], cwd=workdir, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        empty, published = Path(tmp) / "empty", Path(tmp) / "published"
+        subprocess.run([sys.executable, "-m", "logic.model_registry", "--root", str(published), "train"],
+                       cwd=tmp, env=dict(os.environ, PYTHONPATH=str(BACKEND)), check=True, capture_output=True)
+
+        results = {"train": [], "registry": []}
+        for _ in range(args.runs):
+            results["train"].append(cold_start(str(empty), tmp))
+            results["registry"].append(cold_start(str(published), tmp))
+
+    print(f"{'':10} {'sklearn import':>15} {'models ready':>13}")
+    for mode, runs in results.items():
+        sklearn = min(run["sklearn"] for run in runs)
+        ready = min(run["ready"] for run in runs)
+        print(f"{mode:10} {sklearn:14.3f}s {ready:12.3f}s")
+    train, registry = (min(run["ready"] for run in results[m]) for m in ("train", "registry"))
+    print(f"speedup:   {train / registry:.0f}x to first request (excluding the shared sklearn import)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Webhook Logs Database Service
+Durable webhook queue on top of the webhook_logs table
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from database.transaction_logs import TransactionLogsService
+
+logger = logging.getLogger(__name__)
+
+
+def _row_to_event(row) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "webhook_id": row["webhook_id"],
+        "payment_id": row["payment_id"],
+        "event_type": row["event_type"],
+        "payload": row["payload"],
+        "attempts": row["attempts"],
+    }
+
+
+class WebhookLogsService:
+    """
+    webhook_logs used as a durable, idempotent work queue
+
+    - webhook_id (UNIQUE) is the idempotency key: duplicate deliveries
+      are dropped by the INSERT itself
+    - rows with processed = FALSE and next_attempt_at <= now() are due;
+      claiming pushes next_attempt_at forward by a lease so other
+      workers/processes skip them (FOR UPDATE SKIP LOCKED)
+    - next_attempt_at = NULL on an unprocessed row is a dead letter
+
+    Shares the asyncpg pool (and its JSONB codec) owned by
+    TransactionLogsService.
+    """
+
+    def __init__(self, transactions: TransactionLogsService):
+        self.transactions = transactions
+
+    def _acquire(self):
+        return self.transactions._acquire()
+
+    async def enqueue(
+        self,
+        webhook_id: str,
+        provider: str,
+        event_type: str,
+        payment_id: str,
+        payload: Dict[str, Any],
+        signature: str,
+        lease_seconds: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Durably record a verified webhook, already leased to the caller
+
+        Returns:
+            The queued event, or None if webhook_id was seen before
+        """
+        query = """
+            INSERT INTO webhook_logs (
+                webhook_id, provider, event_type, payment_id, payload,
+                signature, processed, attempts, next_attempt_at
+            ) VALUES ($1, $2, $3, $4, $5, $6, FALSE, 0,
+                      CURRENT_TIMESTAMP + make_interval(secs => $7))
+            ON CONFLICT (webhook_id) DO NOTHING
+            RETURNING id, webhook_id, payment_id, event_type, payload, attempts
+        """
+        async with self._acquire() as conn:
+            row = await conn.fetchrow(
+                query, webhook_id, provider, event_type, payment_id,
+                payload, signature, float(lease_seconds)
+            )
+        return _row_to_event(row) if row else None
+
+    async def claim_due(self, limit: int, lease_seconds: float) -> List[Dict[str, Any]]:
+        """Lease up to `limit` due events (retries and orphans from crashed workers)"""
+        query = """
+            UPDATE webhook_logs
+            SET next_attempt_at = CURRENT_TIMESTAMP + make_interval(secs => $2)
+            WHERE id IN (
+                SELECT id FROM webhook_logs
+                WHERE processed = FALSE
+                  AND next_attempt_at IS NOT NULL
+                  AND next_attempt_at <= CURRENT_TIMESTAMP
+                ORDER BY next_attempt_at
+                LIMIT $1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, webhook_id, payment_id, event_type, payload, attempts
+        """
+        async with self._acquire() as conn:
+            rows = await conn.fetch(query, limit, float(lease_seconds))
+        return [_row_to_event(row) for row in rows]
+
+    async def mark_processed(self, ids: List[int]) -> None:
+        """Mark events as processed"""
+        query = """
+            UPDATE webhook_logs
+            SET processed = TRUE, processed_at = CURRENT_TIMESTAMP,
+                error_message = NULL, next_attempt_at = NULL
+            WHERE id = ANY($1::int[])
+        """
+        async with self._acquire() as conn:
+            await conn.execute(query, ids)
+
+    async def schedule_retry(self, ids: List[int], error: str, delay_seconds: Optional[float]) -> None:
+        """
+        Record a failed attempt
+
+        delay_seconds=None dead-letters the events (no further retries).
+        """
+        query = """
+            UPDATE webhook_logs
+            SET attempts = attempts + 1,
+                error_message = $2,
+                next_attempt_at = CASE
+                    WHEN $3::float8 IS NULL THEN NULL
+                    ELSE CURRENT_TIMESTAMP + make_interval(secs => $3::float8)
+                END
+            WHERE id = ANY($1::int[])
+        """
+        async with self._acquire() as conn:
+            await conn.execute(query, ids, error[:1000], delay_seconds)
+
+    async def get_queue_stats(self) -> Dict[str, Any]:
+        """Backlog, dead-letter and processed counts (served by the partial index)"""
+        query = """
+            SELECT
+                COUNT(*) FILTER (WHERE next_attempt_at IS NOT NULL) AS queued,
+                COUNT(*) FILTER (WHERE next_attempt_at IS NULL) AS dead_letter
+            FROM webhook_logs
+            WHERE processed = FALSE
+        """
+        async with self._acquire() as conn:
+            row = await conn.fetchrow(query)
+        return {"queued": row["queued"], "dead_letter": row["dead_letter"]}
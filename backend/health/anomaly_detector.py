@@ -0,0 +1,293 @@
+"""
+Streaming Anomaly Detector
+O(1)-per-sample online statistics, vectorized across every metric
+
+Each registered metric is one column of numpy state arrays; a tick
+updates every metric at once. Per metric:
+
+- Welford running mean / variance (lifetime baseline)
+- EWMA mean / variance (recent baseline)
+- streaming median and MAD (stochastic quantile tracking)
+- Holt-Winters level / trend (/ optional additive season) forecast with
+  an EW residual variance
+
+A sample is scored against the state *before* it is absorbed. It is
+anomalous once the metric is warmed up and at least two of the three
+recent detectors (EWMA z, robust MAD z, Holt-Winters residual z) exceed
+the threshold. Listeners receive anomalies, throttled per metric.
+"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# State columns and their initial values
+_STATE = {
+    "count": 0.0,
+    "mean": 0.0, "m2": 0.0,                   # Welford
+    "ewma": 0.0, "ewvar": 0.0,                # EWMA
+    "median": 0.0, "mad": 0.0,                # streaming median / MAD
+    "level": 0.0, "trend": 0.0, "resvar": 0.0,  # Holt-Winters
+    "last_value": np.nan, "last_score": 0.0,
+    "last_alert": -np.inf,
+}
+
+
+@dataclass
+class Anomaly:
+    """One anomalous sample"""
+    metric: str
+    value: float
+    expected: float
+    score: float
+    severity: str
+    timestamp: float
+    detectors: List[str] = field(default_factory=list)
+
+
+class StreamingAnomalyDetector:
+    """Online anomaly detection over many metrics at once"""
+
+    def __init__(
+        self,
+        threshold: float = 4.5,
+        warmup: int = 30,
+        alpha: float = 0.03,
+        hw_alpha: float = 0.3,
+        hw_beta: float = 0.05,
+        hw_gamma: float = 0.1,
+        season_length: int = 0,
+        quantile_rate: float = 0.05,
+        relative_floor: float = 0.01,
+        cooldown: float = 300.0,
+        capacity: int = 64
+    ):
+        self.threshold = threshold
+        self.warmup = warmup
+        self.alpha = alpha
+        self.hw_alpha = hw_alpha
+        self.hw_beta = hw_beta
+        self.hw_gamma = hw_gamma
+        self.season_length = season_length
+        self.quantile_rate = quantile_rate
+        self.relative_floor = relative_floor
+        self.cooldown = cooldown
+
+        self.names: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._state = {key: np.full(capacity, value, dtype=np.float64) for key, value in _STATE.items()}
+        self._season = np.zeros((capacity, max(season_length, 1)), dtype=np.float64)
+        self._phase = 0
+        self._listeners: List[Callable[[Anomaly], None]] = []
+        self._lock = threading.RLock()
+        self.ticks = 0
+
+    # Registration --------------------------------------------------------
+
+    @property
+    def size(self) -> int:
+        return len(self.names)
+
+    def _grow(self, needed: int):
+        capacity = len(self._state["count"])
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        for key, initial in _STATE.items():
+            grown = np.full(new_capacity, initial, dtype=np.float64)
+            grown[:capacity] = self._state[key]
+            self._state[key] = grown
+        season = np.zeros((new_capacity, self._season.shape[1]), dtype=np.float64)
+        season[:capacity] = self._season
+        self._season = season
+
+    def register(self, names: Iterable[str]) -> np.ndarray:
+        """Column index of each name, registering new ones"""
+        with self._lock:
+            indices = []
+            for name in names:
+                index = self._index.get(name)
+                if index is None:
+                    index = self._index[name] = len(self.names)
+                    self.names.append(name)
+                indices.append(index)
+            self._grow(len(self.names))
+            return np.array(indices, dtype=np.intp)
+
+    def add_listener(self, callback: Callable[[Anomaly], None]):
+        self._listeners.append(callback)
+
+    # Updates -------------------------------------------------------------
+
+    def update(self, values: np.ndarray, timestamp: Optional[float] = None) -> List[Anomaly]:
+        """
+        Absorb one tick for every registered metric
+
+        values[i] belongs to the i-th registered metric; NaN means no
+        sample this tick. Returns the anomalies that passed the cooldown
+        (listeners have been called with them).
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            n = self.size
+            x = np.asarray(values, dtype=np.float64)
+            if x.shape != (n,):
+                raise ValueError(f"Expected {n} values, got {x.shape}")
+            s = {key: column[:n] for key, column in self._state.items()}
+            present = np.isfinite(x)
+            x = np.where(present, x, 0.0)
+            first = present & (s["count"] == 0)
+            season = self._season[:n, self._phase] if self.season_length else 0.0
+
+            # Score against the pre-update state
+            floor = self.relative_floor * np.abs(s["ewma"]) + 1e-9
+            forecast = s["level"] + s["trend"] + season
+            z_ewma = np.abs(x - s["ewma"]) / np.maximum(np.sqrt(s["ewvar"]), floor)
+            z_robust = np.abs(x - s["median"]) / np.maximum(1.4826 * s["mad"], floor)
+            z_hw = np.abs(x - forecast) / np.maximum(np.sqrt(s["resvar"]), floor)
+            z = np.stack((z_ewma, z_robust, z_hw))
+            votes = z > self.threshold
+            score = np.median(z, axis=0)  # above threshold iff at least two detectors agree
+            warm = present & (s["count"] >= self.warmup)
+            anomalous = warm & (score > self.threshold)
+
+            # Welford
+            count = s["count"] + present
+            delta = np.where(present, x - s["mean"], 0.0)
+            mean = s["mean"] + delta / np.maximum(count, 1)
+            s["m2"] += np.where(present, delta * (x - mean), 0.0)
+            s["mean"][:] = mean
+
+            # EWMA (West's incremental EW variance)
+            diff = x - s["ewma"]
+            increment = self.alpha * diff
+            s["ewvar"][:] = np.where(present & ~first, (1 - self.alpha) * (s["ewvar"] + diff * increment),
+                                     s["ewvar"])
+            s["ewma"][:] = np.where(first, x, np.where(present, s["ewma"] + increment, s["ewma"]))
+
+            # Streaming median / MAD: quantile steps scaled by the recent spread
+            step = self.quantile_rate * np.maximum(np.sqrt(s["ewvar"]), floor)
+            median = np.where(first, x, s["median"] + np.where(present, step * np.sign(x - s["median"]), 0.0))
+            deviation = np.abs(x - median)
+            s["mad"][:] = np.where(present & ~first,
+                                   np.maximum(s["mad"] + step * np.sign(deviation - s["mad"]), 0.0),
+                                   s["mad"])
+            s["median"][:] = median
+
+            # Holt-Winters (additive)
+            residual = x - forecast
+            level = self.hw_alpha * (x - season) + (1 - self.hw_alpha) * (s["level"] + s["trend"])
+            trend = self.hw_beta * (level - s["level"]) + (1 - self.hw_beta) * s["trend"]
+            warm_hw = present & ~first
+            s["resvar"][:] = np.where(warm_hw, (1 - self.alpha) * s["resvar"] + self.alpha * residual ** 2,
+                                      s["resvar"])
+            s["level"][:] = np.where(first, x, np.where(present, level, s["level"]))
+            s["trend"][:] = np.where(warm_hw, trend, s["trend"])
+            if self.season_length:
+                updated = self.hw_gamma * (x - level) + (1 - self.hw_gamma) * season
+                self._season[:n, self._phase] = np.where(warm_hw, updated, season)
+                self._phase = (self._phase + 1) % self.season_length
+
+            s["count"][:] = count
+            s["last_value"][:] = np.where(present, x, s["last_value"])
+            s["last_score"][:] = np.where(present, np.where(warm, score, 0.0), s["last_score"])
+            self.ticks += 1
+
+            # Throttle per metric, then build objects only for the few anomalies
+            fire = anomalous & (timestamp - s["last_alert"] >= self.cooldown)
+            s["last_alert"][fire] = timestamp
+            anomalies = [
+                Anomaly(
+                    metric=self.names[i],
+                    value=float(x[i]),
+                    expected=float(forecast[i]),
+                    score=float(score[i]),
+                    severity="critical" if score[i] >= 2 * self.threshold else "warning",
+                    timestamp=timestamp,
+                    detectors=[name for name, voted in zip(("ewma", "mad", "holt_winters"), votes[:, i]) if voted]
+                )
+                for i in np.flatnonzero(fire)
+            ]
+
+        for anomaly in anomalies:
+            for listener in self._listeners:
+                try:
+                    listener(anomaly)
+                except Exception as e:
+                    logger.error(f"Anomaly listener error: {e}")
+        return anomalies
+
+    def observe(self, samples: Dict[str, float], timestamp: Optional[float] = None) -> List[Anomaly]:
+        """Absorb named samples (metrics not in `samples` skip this tick)"""
+        with self._lock:
+            indices = self.register(samples)
+            values = np.full(self.size, np.nan)
+            values[indices] = list(samples.values())
+            return self.update(values, timestamp)
+
+    # Reads ---------------------------------------------------------------
+
+    def forecast(self, name: str, steps: int = 1) -> Optional[float]:
+        """Holt-Winters forecast `steps` ticks ahead"""
+        with self._lock:
+            i = self._index.get(name)
+            if i is None or self._state["count"][i] == 0:
+                return None
+            season = self._season[i, (self._phase + steps - 1) % self.season_length] if self.season_length else 0.0
+            return float(self._state["level"][i] + steps * self._state["trend"][i] + season)
+
+    def stats(self, name: str) -> Optional[Dict[str, float]]:
+        """Current statistics of one metric"""
+        with self._lock:
+            i = self._index.get(name)
+            if i is None:
+                return None
+            s = {key: float(column[i]) for key, column in self._state.items()}
+        count = s["count"]
+        return {
+            "count": int(count),
+            "mean": s["mean"],
+            "std": math.sqrt(s["m2"] / (count - 1)) if count > 1 else 0.0,
+            "ewma": s["ewma"],
+            "ew_std": math.sqrt(s["ewvar"]),
+            "median": s["median"],
+            "mad": s["mad"],
+            "level": s["level"],
+            "trend_per_tick": s["trend"],
+            "last_value": s["last_value"],
+            "last_score": s["last_score"],
+        }
+
+    def summary(self, prefix: str = "") -> Dict[str, object]:
+        """Anomaly state of every metric under `prefix`"""
+        with self._lock:
+            indices = [i for i, name in enumerate(self.names) if name.startswith(prefix)]
+            scores = self._state["last_score"][indices] if indices else np.zeros(0)
+            warm = self._state["count"][indices] >= self.warmup if indices else np.zeros(0, dtype=bool)
+            flagged = [self.names[i] for i, score in zip(indices, scores) if score > self.threshold]
+        return {
+            "metrics": len(indices),
+            "warmed_up": int(warm.sum()),
+            "anomalies_detected": len(flagged),
+            "anomalous_metrics": flagged,
+            "anomaly_score": float(scores.max()) if len(scores) else 0.0,
+            "ticks": self.ticks,
+        }
+
+
+_anomaly_detector: Optional[StreamingAnomalyDetector] = None
+
+
+def get_anomaly_detector() -> StreamingAnomalyDetector:
+    """Process-wide detector fed by the resource sampler"""
+    global _anomaly_detector
+    if _anomaly_detector is None:
+        _anomaly_detector = StreamingAnomalyDetector()
+    return _anomaly_detector
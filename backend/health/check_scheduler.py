@@ -0,0 +1,229 @@
+"""
+Health Check Scheduler
+Cost-aware background scheduling with cached results
+
+Each check declares how often it runs, how long it may take, what it
+costs and what it depends on. Checks run on their own jittered cadence
+in the background; endpoints read the latest cached result instantly.
+
+- staleness budget: a result older than its budget is reported as stale
+  and triggers a (single-flight) background refresh
+- fresh reads: force a refresh, shared by every concurrent caller;
+  expensive checks still honour a minimum refresh interval so polling
+  with ?fresh=true can't multiply upstream cost
+- dependencies: a check waits for its dependencies' first result and is
+  skipped while any of them is unhealthy
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CostClass(Enum):
+    """What one run of a check costs"""
+    FREE = "free"            # local reads (sampler, in-process state)
+    CHEAP = "cheap"          # own infrastructure (database round trip)
+    EXPENSIVE = "expensive"  # metered third-party APIs
+
+# Minimum seconds between forced (?fresh=true) runs, per cost class
+MIN_FRESH_INTERVAL = {
+    CostClass.FREE: 0.0,
+    CostClass.CHEAP: 1.0,
+    CostClass.EXPENSIVE: 30.0,
+}
+
+
+class RunStatus(Enum):
+    OK = "ok"
+    ERROR = "error"
+    TIMEOUT = "timeout"
+    SKIPPED = "skipped"
+
+
+@dataclass
+class CheckSpec:
+    """Declaration of one scheduled check"""
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    interval: float
+    timeout: float
+    cost: CostClass = CostClass.CHEAP
+    depends_on: Tuple[str, ...] = ()
+    staleness_budget: Optional[float] = None
+    jitter: float = 0.1
+    is_healthy: Callable[[Any], bool] = lambda result: True
+
+    def __post_init__(self):
+        if self.staleness_budget is None:
+            self.staleness_budget = 2 * self.interval + self.timeout
+
+
+@dataclass
+class CheckState:
+    """Latest outcome of a check"""
+    status: Optional[RunStatus] = None
+    result: Any = None
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+    duration: float = 0.0
+    runs: int = 0
+    failures: int = 0
+    inflight: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def healthy(self) -> bool:
+        return self.status == RunStatus.OK
+
+
+class HealthCheckScheduler:
+    """Runs registered checks on their own cadence and caches the results"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.specs: Dict[str, CheckSpec] = {}
+        self.states: Dict[str, CheckState] = {}
+        self._loops: List[asyncio.Task] = []
+
+    def register(self, spec: CheckSpec):
+        """Add a check; dependencies must already be registered"""
+        missing = [dep for dep in spec.depends_on if dep not in self.specs]
+        if missing:
+            raise ValueError(f"Check {spec.name!r} depends on unknown checks: {missing}")
+        self.specs[spec.name] = spec
+        self.states[spec.name] = CheckState()
+
+    # Lifecycle -----------------------------------------------------------
+
+    def start(self):
+        """Start one background loop per check"""
+        if self._loops:
+            return
+        loop = asyncio.get_running_loop()
+        self._loops = [loop.create_task(self._loop(spec)) for spec in self.specs.values()]
+        logger.info(f"Health check scheduler started ({len(self._loops)} checks)")
+
+    async def stop(self):
+        """Cancel the background loops (in-flight runs are cancelled too)"""
+        for task in self._loops:
+            task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._loops)
+
+    async def _loop(self, spec: CheckSpec):
+        # Spread first runs so checks with equal intervals don't fire together
+        await asyncio.sleep(random.uniform(0, spec.jitter * spec.interval))
+        while True:
+            try:
+                await self.refresh(spec.name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Health check loop {spec.name} error: {e}")
+            await asyncio.sleep(spec.interval * random.uniform(1 - spec.jitter, 1 + spec.jitter))
+
+    # Running -------------------------------------------------------------
+
+    def refresh(self, name: str) -> "asyncio.Future":
+        """Run a check now, or join the run already in flight (single-flight)"""
+        state = self.states[name]
+        if state.inflight is None or state.inflight.done():
+            state.inflight = asyncio.get_running_loop().create_task(self._execute(self.specs[name]))
+        # Shield so one caller going away doesn't cancel the run for the rest
+        return asyncio.shield(state.inflight)
+
+    async def _execute(self, spec: CheckSpec) -> CheckState:
+        state = self.states[spec.name]
+        for dep in spec.depends_on:
+            dep_state = self.states[dep]
+            if dep_state.status is None or (dep_state.inflight and not dep_state.inflight.done()):
+                await self.refresh(dep)
+
+        unhealthy = [dep for dep in spec.depends_on if not self.states[dep].healthy]
+        started = self.clock()
+        if unhealthy:
+            status, result, error = RunStatus.SKIPPED, state.result, f"dependency unhealthy: {', '.join(unhealthy)}"
+        else:
+            try:
+                result = await asyncio.wait_for(spec.run(), timeout=spec.timeout)
+                status = RunStatus.OK if spec.is_healthy(result) else RunStatus.ERROR
+                error = None if status == RunStatus.OK else "check reported unhealthy"
+            except asyncio.TimeoutError:
+                status, result, error = RunStatus.TIMEOUT, state.result, f"timed out after {spec.timeout}s"
+            except Exception as e:
+                status, result, error = RunStatus.ERROR, state.result, str(e)
+
+        state.status = status
+        state.result = result
+        state.error = error
+        state.finished_at = self.clock()
+        state.duration = state.finished_at - started
+        state.runs += 1
+        if status != RunStatus.OK:
+            state.failures += 1
+            logger.warning(f"Health check {spec.name}: {status.value} ({error})")
+        return state
+
+    # Reads ---------------------------------------------------------------
+
+    def age(self, name: str) -> Optional[float]:
+        finished_at = self.states[name].finished_at
+        return None if finished_at is None else self.clock() - finished_at
+
+    def is_stale(self, name: str) -> bool:
+        age = self.age(name)
+        return age is None or age > self.specs[name].staleness_budget
+
+    async def get(self, name: str, fresh: bool = False) -> CheckState:
+        """
+        Latest state of one check
+
+        Waits only when there is no result yet or a fresh one is asked
+        for (subject to the cost class's minimum refresh interval). A
+        stale result is served as-is while a refresh runs behind it.
+        """
+        spec, state = self.specs[name], self.states[name]
+        age = self.age(name)
+        if age is None:
+            return await self.refresh(name)
+        if fresh and age >= MIN_FRESH_INTERVAL[spec.cost]:
+            return await self.refresh(name)
+        if age > spec.staleness_budget:
+            self.refresh(name)
+        return state
+
+    async def collect(self, fresh: bool = False, names: Optional[Iterable[str]] = None) -> Dict[str, CheckState]:
+        """States of the named checks (default: every check), concurrently"""
+        names = list(self.specs if names is None else names)
+        states = await asyncio.gather(*(self.get(name, fresh=fresh) for name in names))
+        return dict(zip(names, states))
+
+    def describe(self, name: str) -> Dict[str, Any]:
+        """Schedule and freshness metadata for one check"""
+        spec, state = self.specs[name], self.states[name]
+        age = self.age(name)
+        return {
+            "status": state.status.value if state.status else None,
+            "error": state.error,
+            "age_seconds": round(age, 3) if age is not None else None,
+            "stale": self.is_stale(name),
+            "staleness_budget": spec.staleness_budget,
+            "interval": spec.interval,
+            "timeout": spec.timeout,
+            "cost": spec.cost.value,
+            "depends_on": list(spec.depends_on),
+            "last_duration_ms": round(state.duration * 1000, 2),
+            "runs": state.runs,
+            "failures": state.failures,
+            "refreshing": state.inflight is not None and not state.inflight.done(),
+        }
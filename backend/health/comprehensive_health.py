@@ -16,7 +16,9 @@ from dataclasses import dataclass
 from enum import Enum
 import subprocess
 import sys
-import pathlib
+
+from health.check_scheduler import CheckSpec, CostClass, RunStatus
+from health.engine import get_health_engine
 
 # Saudi Time Zone
 RIYADH_TZ = pytz.timezone('Asia/Riyadh')
@@ -50,6 +52,7 @@ class ComprehensiveHealthMonitor:
     """Complete health monitoring for FLUX-DNA system"""
     
     def __init__(self):
+        self.engine = get_health_engine()
         self.router = APIRouter(prefix="/health")
         self.setup_routes()
         
@@ -64,10 +67,82 @@ class ComprehensiveHealthMonitor:
             'disk_warning': 80,  # 80%
             'disk_critical': 95,  # 95%
         }
+        
+        # Background schedule: (interval s, timeout s, cost, dependencies)
+        self.check_schedule = {
+            "system": (10, 2, CostClass.FREE, ()),
+            "security": (60, 5, CostClass.FREE, ()),
+            "database": (30, 5, CostClass.CHEAP, ()),
+            "memory": (60, 5, CostClass.CHEAP, ("database",)),
+            "ai_services": (300, 10, CostClass.EXPENSIVE, ()),
+            "external_apis": (300, 10, CostClass.EXPENSIVE, ()),
+        }
+        self.check_types = {
+            "system": ComponentType.SYSTEM,
+            "security": ComponentType.SECURITY,
+            "database": ComponentType.DATABASE,
+            "memory": ComponentType.MEMORY,
+            "ai_services": ComponentType.AI_SERVICE,
+            "external_apis": ComponentType.EXTERNAL_API,
+        }
+        self.scheduler = self.engine.scheduler
+        self._register_checks()
+        self.history = self.engine.history
+        self._history_client = None
+
+    def _register_checks(self):
+        """Register every check on the engine with its cadence, timeout, cost and dependencies"""
+        runners = {
+            "system": self._check_system_resources,
+            "security": self._check_security_systems,
+            "database": self._check_database_health,
+            "memory": self._check_memory_systems,
+            "ai_services": self._check_ai_services,
+            "external_apis": self._check_external_apis,
+        }
+        for name, (interval, timeout, cost, depends_on) in self.check_schedule.items():
+            interval = float(os.environ.get(f"HEALTH_CHECK_INTERVAL_{name.upper()}", interval))
+            self.engine.register(CheckSpec(
+                name=name,
+                run=runners[name],
+                interval=interval,
+                timeout=timeout,
+                cost=cost,
+                depends_on=depends_on,
+                is_healthy=lambda checks: not any(
+                    check.status in (HealthStatus.CRITICAL, HealthStatus.UNHEALTHY) for check in checks
+                )
+            ))
+
+    def _checks_from_state(self, name: str, state) -> List[HealthCheck]:
+        """Cached results of one scheduled check, or a synthetic entry if it didn't complete"""
+        if state.status in (RunStatus.TIMEOUT, RunStatus.SKIPPED) or state.result is None:
+            return [HealthCheck(
+                component=name,
+                component_type=self.check_types[name],
+                status=HealthStatus.DEGRADED if state.status == RunStatus.SKIPPED else HealthStatus.UNHEALTHY,
+                message=f"Health check {state.status.value if state.status else 'pending'}: {state.error}",
+                response_time=state.duration * 1000,
+                timestamp=datetime.now(RIYADH_TZ)
+            )]
+        return state.result
+
+    async def _scheduled(self, name: str, fresh: bool = False) -> List[HealthCheck]:
+        """One check served from the scheduler's cache"""
+        return self._checks_from_state(name, await self.scheduler.get(name, fresh=fresh))
 
     def setup_routes(self):
         """Setup health check routes"""
         
+        @self.router.on_event("startup")
+        async def start_health_scheduler():
+            """Run health checks in the background with the app"""
+            self.scheduler.start()
+
+        @self.router.on_event("shutdown")
+        async def stop_health_scheduler():
+            await self.scheduler.stop()
+
         @self.router.get("/")
         @self.router.get("/basic")
         async def basic_health():
@@ -83,9 +158,9 @@ class ComprehensiveHealthMonitor:
             }
 
         @self.router.get("/comprehensive")
-        async def comprehensive_health():
-            """Complete system health check"""
-            health_results = await self.run_all_health_checks()
+        async def comprehensive_health(fresh: bool = False):
+            """Complete system health check (cached; ?fresh=true forces a refresh)"""
+            health_results = await self.run_all_health_checks(fresh=fresh)
             
             # Calculate overall status
             overall_status = self.calculate_overall_status(health_results)
@@ -98,38 +173,39 @@ class ComprehensiveHealthMonitor:
                 "checks": [self._serialize_health_check(check) for check in health_results],
                 "summary": self._generate_summary(health_results),
                 "uptime": self._get_system_uptime(),
-                "guardian_status": "ACTIVE" if overall_status != HealthStatus.CRITICAL else "EMERGENCY"
+                "guardian_status": "ACTIVE" if overall_status != HealthStatus.CRITICAL else "EMERGENCY",
+                "freshness": {name: self.scheduler.describe(name) for name in self.check_schedule}
             }
 
         @self.router.get("/database")
-        async def database_health():
+        async def database_health(fresh: bool = False):
             """Database connectivity and performance"""
-            return await self._check_database_health()
+            return await self._scheduled("database", fresh)
 
         @self.router.get("/ai-services")
-        async def ai_services_health():
+        async def ai_services_health(fresh: bool = False):
             """AI services health check"""
-            return await self._check_ai_services()
+            return await self._scheduled("ai_services", fresh)
 
         @self.router.get("/external-apis")
-        async def external_apis_health():
+        async def external_apis_health(fresh: bool = False):
             """External API connectivity"""
-            return await self._check_external_apis()
+            return await self._scheduled("external_apis", fresh)
 
         @self.router.get("/system")
-        async def system_health():
+        async def system_health(fresh: bool = False):
             """System resources health"""
-            return await self._check_system_resources()
+            return await self._scheduled("system", fresh)
 
         @self.router.get("/security")
-        async def security_health():
+        async def security_health(fresh: bool = False):
             """Security systems health"""
-            return await self._check_security_systems()
+            return await self._scheduled("security", fresh)
 
         @self.router.get("/memory")
-        async def memory_health():
+        async def memory_health(fresh: bool = False):
             """Memory systems health"""
-            return await self._check_memory_systems()
+            return await self._scheduled("memory", fresh)
 
         @self.router.post("/run-checks")
         async def run_health_checks(background_tasks: BackgroundTasks):
@@ -142,29 +218,38 @@ class ComprehensiveHealthMonitor:
             """Detailed health metrics"""
             return await self._get_detailed_metrics()
 
-    async def run_all_health_checks(self) -> List[HealthCheck]:
-        """Run all health checks concurrently"""
-        tasks = [
-            self._check_database_health(),
-            self._check_ai_services(),
-            self._check_external_apis(),
-            self._check_system_resources(),
-            self._check_security_systems(),
-            self._check_memory_systems()
-        ]
+        @self.router.get("/engine")
+        async def engine_stats():
+            """Probe sharing, providers and alert pipeline of the health engine"""
+            return self.engine.get_stats()
+
+        @self.router.get("/history/{metric}")
+        async def metric_history(metric: str, seconds: float = 3600):
+            """Aggregates and trend of one recorded metric"""
+            since = datetime.now().timestamp() - seconds
+            return {
+                "metric": metric,
+                "seconds": seconds,
+                "count": self.history.aggregate(metric, since, agg="count"),
+                "mean": self.history.aggregate(metric, since, agg="mean"),
+                "min": self.history.aggregate(metric, since, agg="min"),
+                "max": self.history.aggregate(metric, since, agg="max"),
+                "p95": self.history.percentile(metric, 95, since),
+                "trend": self.history.trend(metric, seconds)
+            }
+
+    async def run_all_health_checks(self, fresh: bool = False) -> List[HealthCheck]:
+        """
+        Latest results of all health checks
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Served from the scheduler's cache; fresh=True forces a
+        single-flight refresh (rate-limited for expensive checks).
+        """
+        states = await self.scheduler.collect(fresh=fresh, names=self.check_schedule)
         
-        # Flatten results and handle exceptions
         health_checks = []
-        for result in results:
-            if isinstance(result, list):
-                health_checks.extend(result)
-            elif isinstance(result, HealthCheck):
-                health_checks.append(result)
-            elif isinstance(result, dict) and 'checks' in result:
-                # Handle dict responses
-                pass
+        for name, state in states.items():
+            health_checks.extend(self._checks_from_state(name, state))
         
         return health_checks
 
@@ -193,7 +278,7 @@ class ComprehensiveHealthMonitor:
             supabase = create_client(settings.supabase_url, settings.supabase_key)
             
             # Test basic query
-            result = supabase.table('health_checks').select('count').execute()
+            result = await asyncio.to_thread(supabase.table('health_checks').select('count').execute)
             response_time = (datetime.now(RIYADH_TZ) - start_time).total_seconds() * 1000
             
             checks.append(HealthCheck(
@@ -208,7 +293,7 @@ class ComprehensiveHealthMonitor:
             
             # Test pgvector extension
             try:
-                vector_result = supabase.rpc('test_pgvector').execute()
+                vector_result = await asyncio.to_thread(supabase.rpc('test_pgvector').execute)
                 checks.append(HealthCheck(
                     component="pgvector",
                     component_type=ComponentType.DATABASE,
@@ -263,7 +348,7 @@ class ComprehensiveHealthMonitor:
                 response_time = (datetime.now(RIYADH_TZ) - start_time).total_seconds() * 1000
             
                 # Test with minimal request
-                models = client.models.list()
+                models = await asyncio.to_thread(client.models.list)
                 checks.append(HealthCheck(
                     component="OpenAI",
                     component_type=ComponentType.AI_SERVICE,
@@ -304,7 +389,7 @@ class ComprehensiveHealthMonitor:
                 response_time = (datetime.now(RIYADH_TZ) - start_time).total_seconds() * 1000
             
                 # Test connection
-                models = client.models.list()
+                models = await asyncio.to_thread(client.models.list)
                 checks.append(HealthCheck(
                     component="Groq",
                     component_type=ComponentType.AI_SERVICE,
@@ -378,8 +463,10 @@ class ComprehensiveHealthMonitor:
         checks = []
         timestamp = datetime.now(RIYADH_TZ)
         
+        sample = self.engine.snapshot()
+        
         # CPU usage
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = sample.cpu_percent
         cpu_status = HealthStatus.HEALTHY
         if cpu_percent > self.thresholds['cpu_critical']:
             cpu_status = HealthStatus.CRITICAL
@@ -393,11 +480,11 @@ class ComprehensiveHealthMonitor:
             message=f"CPU usage: {cpu_percent}%",
             response_time=0,
             timestamp=timestamp,
-            details={"usage_percent": cpu_percent, "cores": psutil.cpu_count()}
+            details={"usage_percent": cpu_percent, "cores": sample.cpu_count}
         ))
         
         # Memory usage
-        memory = psutil.virtual_memory()
+        memory = sample.memory
         memory_status = HealthStatus.HEALTHY
         if memory.percent > self.thresholds['memory_critical']:
             memory_status = HealthStatus.CRITICAL
@@ -415,10 +502,7 @@ class ComprehensiveHealthMonitor:
         ))
         
         # Disk usage
-        try:
-            disk = psutil.disk_usage(str(pathlib.Path.cwd().anchor or '/'))
-        except Exception:
-            disk = psutil.disk_usage('/')
+        disk = sample.disk
         disk_percent = (disk.used / disk.total) * 100
         disk_status = HealthStatus.HEALTHY
         if disk_percent > self.thresholds['disk_critical']:
@@ -603,20 +687,38 @@ class ComprehensiveHealthMonitor:
         except:
             return "Unknown"
 
-    async def _run_background_health_checks(self):
-        """Run health checks in background"""
-        try:
-            health_results = await self.run_all_health_checks()
-            
-            # Store results in database
+    def _record_history(self, health_results: List[HealthCheck]):
+        """Append response times and status levels to the local time-series store"""
+        levels = {status: i for i, status in enumerate(HealthStatus)}
+        now = datetime.now().timestamp()
+        for check in health_results:
+            prefix = f"health.{check.component}"
+            self.history.append(f"{prefix}.response_time", check.response_time, now)
+            self.history.append(f"{prefix}.status", levels[check.status], now)
+        self.history.append("health.overall.status", levels[self.calculate_overall_status(health_results)], now)
+
+    def _get_history_client(self):
+        """Supabase client for health_check_history, created once"""
+        if self._history_client is None:
             from supabase import create_client
             from backend.config.settings import settings
 
             service_key = os.getenv('SUPABASE_SERVICE_KEY', '')
             if not settings.supabase_url or not service_key:
-                return
+                return None
+            self._history_client = create_client(settings.supabase_url, service_key)
+        return self._history_client
+
+    async def _run_background_health_checks(self):
+        """Run health checks in background"""
+        try:
+            health_results = await self.run_all_health_checks(fresh=True)
+            self._record_history(health_results)
             
-            supabase = create_client(settings.supabase_url, service_key)
+            # Mirror the run to the database for cross-instance history
+            supabase = self._get_history_client()
+            if supabase is None:
+                return
             
             health_record = {
                 "timestamp": datetime.now(RIYADH_TZ).isoformat(),
@@ -625,7 +727,7 @@ class ComprehensiveHealthMonitor:
                 "summary": self._generate_summary(health_results)
             }
             
-            supabase.table('health_check_history').insert(health_record).execute()
+            await asyncio.to_thread(supabase.table('health_check_history').insert(health_record).execute)
             
         except Exception as e:
             print(f"Background health check error: {e}")
@@ -633,15 +735,17 @@ class ComprehensiveHealthMonitor:
     async def _get_detailed_metrics(self) -> Dict[str, Any]:
         """Get detailed health metrics"""
         health_checks = await self.run_all_health_checks()
+        sample = self.engine.snapshot()
         
         return {
             "timestamp": datetime.now(RIYADH_TZ).isoformat(),
             "checks": [self._serialize_health_check(check) for check in health_checks],
             "system_metrics": {
-                "cpu": psutil.cpu_percent(interval=1),
-                "memory": psutil.virtual_memory()._asdict(),
-                "disk": psutil.disk_usage('/')._asdict(),
-                "network": psutil.net_io_counters()._asdict() if psutil.net_io_counters() else {}
+                "cpu": sample.cpu_percent,
+                "memory": sample.memory._asdict(),
+                "disk": sample.disk._asdict(),
+                "network": sample.network_io._asdict() if sample.network_io else {},
+                "window_5m": self.engine.sampler.window(300)
             },
             "process_info": {
                 "pid": os.getpid(),
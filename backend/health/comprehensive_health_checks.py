@@ -11,9 +11,10 @@ from dataclasses import dataclass
 from enum import Enum
 import traceback
 import psutil
-import requests
 from functools import wraps
 
+from health.engine import get_health_engine
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -91,6 +92,7 @@ class ComprehensiveHealthChecks:
     """Comprehensive health checks system"""
     
     def __init__(self):
+        self.engine = get_health_engine()  # shared sampler and probes
         self.health_results: List[HealthCheckResult] = []
         self.check_history: List[HealthSummary] = []
         self.check_callbacks: List[Callable] = []
@@ -118,24 +120,27 @@ class ComprehensiveHealthChecks:
         try:
             logger.info("Checking system resources")
             
+            # Latest background sample (no inline psutil polling)
+            sample = self.engine.snapshot()
+            
             # CPU usage check
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = sample.cpu_percent
             cpu_score = max(0, 100 - cpu_percent)
             cpu_status = HealthStatus.HEALTHY if cpu_percent < 70 else HealthStatus.DEGRADED if cpu_percent < 90 else HealthStatus.UNHEALTHY
             
             # Memory usage check
-            memory = psutil.virtual_memory()
+            memory = sample.memory
             memory_score = max(0, 100 - memory.percent)
             memory_status = HealthStatus.HEALTHY if memory.percent < 80 else HealthStatus.DEGRADED if memory.percent < 90 else HealthStatus.UNHEALTHY
             
             # Disk usage check
-            disk = psutil.disk_usage('/')
+            disk = sample.disk
             disk_percent = (disk.used / disk.total) * 100
             disk_score = max(0, 100 - disk_percent)
             disk_status = HealthStatus.HEALTHY if disk_percent < 85 else HealthStatus.DEGRADED if disk_percent < 95 else HealthStatus.UNHEALTHY
             
             # Network I/O check
-            network = psutil.net_io_counters()
+            network = sample.network_io
             network_score = 100  # Default healthy score
             network_status = HealthStatus.HEALTHY
             
@@ -204,54 +209,44 @@ class ComprehensiveHealthChecks:
             total_score = 0
             healthy_count = 0
             
+            # Probe every endpoint concurrently (a run takes max-probe time)
+            probes = self.engine.probe(endpoints, samples=1)
+            
             for endpoint in endpoints:
-                try:
-                    start_time = time.time()
-                    response = requests.get(endpoint, timeout=10)
-                    response_time = (time.time() - start_time) * 1000
-                    
-                    if response.status_code == 200:
-                        status = HealthStatus.HEALTHY
-                        score = max(0, 100 - (response_time / 10))  # Score based on response time
-                        healthy_count += 1
-                    elif response.status_code < 500:
-                        status = HealthStatus.DEGRADED
-                        score = 50
-                    else:
-                        status = HealthStatus.UNHEALTHY
-                        score = 25
-                    
-                    total_score += score
-                    
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'status_code': response.status_code,
-                        'response_time': response_time,
-                        'status': status.value,
-                        'score': score
-                    })
-                    
-                except requests.exceptions.Timeout:
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'error': 'timeout',
-                        'status': HealthStatus.UNHEALTHY.value,
-                        'score': 0
-                    })
-                except requests.exceptions.ConnectionError:
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'error': 'connection_error',
-                        'status': HealthStatus.UNHEALTHY.value,
-                        'score': 0
-                    })
-                except Exception as e:
+                probe = probes[endpoint]
+                if probe.error:
                     endpoint_results.append({
                         'endpoint': endpoint,
-                        'error': str(e),
-                        'status': HealthStatus.CRITICAL.value,
+                        'error': probe.error,
+                        'status': (HealthStatus.UNHEALTHY if probe.error in ('timeout', 'connection_error') else HealthStatus.CRITICAL).value,
                         'score': 0
                     })
+                    continue
+                
+                status_code = probe.status_codes[0]
+                response_time = probe.request_times[0]
+                
+                if status_code == 200:
+                    status = HealthStatus.HEALTHY
+                    score = max(0, 100 - (response_time / 10))  # Score based on response time
+                    healthy_count += 1
+                elif status_code < 500:
+                    status = HealthStatus.DEGRADED
+                    score = 50
+                else:
+                    status = HealthStatus.UNHEALTHY
+                    score = 25
+                
+                total_score += score
+                
+                endpoint_results.append({
+                    'endpoint': endpoint,
+                    'status_code': status_code,
+                    'response_time': response_time,
+                    'status': status.value,
+                    'score': score,
+                    'latency_percentiles': probe.percentiles
+                })
             
             # Calculate overall application health
             overall_score = total_score / len(endpoints) if endpoints else 0
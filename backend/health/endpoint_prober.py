@@ -0,0 +1,345 @@
+"""
+Synthetic Endpoint Prober
+Concurrent HTTP probing with per-probe deadlines and latency histograms
+
+The application health checks used to issue blocking requests.get calls
+endpoint after endpoint (10 s timeout each), so one dead endpoint could
+stall a run for 30 s. The prober:
+
+- owns one aiohttp session (pooled keep-alive connections) on a
+  dedicated I/O loop thread, so sync health checks and async callers
+  share the same pool
+- probes every endpoint and every sample concurrently; a probe is
+  bounded by its deadline, so a run takes max-probe time
+- keeps an HDR-style log-linear latency histogram per endpoint
+- runs optional background probe schedules (per-target interval)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import aiohttp
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROBE_TIMEOUT = float(os.environ.get("HEALTH_PROBE_TIMEOUT", "2.0"))
+DEFAULT_PROBE_SAMPLES = int(os.environ.get("HEALTH_PROBE_SAMPLES", "3"))
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of latencies
+
+    Values are recorded in microseconds. Below 2**sub_bucket_bits each
+    microsecond has its own bucket; above, every power of two is split
+    into 2**(sub_bucket_bits - 1) linear buckets, so the relative error
+    stays below 2**-(sub_bucket_bits - 1) across the whole range.
+    """
+
+    def __init__(self, max_value_ms: float = 60_000.0, sub_bucket_bits: int = 8):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+        self.max_value = int(max_value_ms * 1000)
+        self.counts = np.zeros(self._index(self.max_value) + 1, dtype=np.int64)
+        self.total = 0
+        self.sum_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return (shift + 1) * self.sub_bucket_half + (value >> shift) - self.sub_bucket_half
+
+    def _bucket_midpoint(self, index: int) -> float:
+        if index < self.sub_bucket_count:
+            return float(index)
+        shift = index // self.sub_bucket_half - 1
+        sub = index % self.sub_bucket_half + self.sub_bucket_half
+        return ((sub << shift) + ((sub + 1) << shift) - 1) / 2
+
+    def record(self, value_ms: float, count: int = 1):
+        value = min(max(int(value_ms * 1000), 0), self.max_value)
+        self.counts[self._index(value)] += count
+        self.total += count
+        self.sum_us += value * count
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = value if self.max_us is None else max(self.max_us, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts += other.counts
+        self.total += other.total
+        self.sum_us += other.sum_us
+        for value in (other.min_us, other.max_us):
+            if value is not None:
+                self.min_us = value if self.min_us is None else min(self.min_us, value)
+                self.max_us = value if self.max_us is None else max(self.max_us, value)
+
+    def percentile(self, p: float) -> float:
+        """Latency (ms) at percentile p (0-100)"""
+        if not self.total:
+            return 0.0
+        rank = max(1, int(np.ceil(p / 100 * self.total)))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        value = min(self._bucket_midpoint(index), self.max_us)
+        return max(value, self.min_us) / 1000
+
+    def summary(self) -> Dict[str, float]:
+        if not self.total:
+            return {"count": 0}
+        return {
+            "count": self.total,
+            "min": self.min_us / 1000,
+            "mean": self.sum_us / self.total / 1000,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max_us / 1000,
+        }
+
+
+@dataclass
+class ProbeTarget:
+    """One endpoint and how to probe it"""
+    url: str
+    interval: float = 30.0
+    timeout: float = DEFAULT_PROBE_TIMEOUT
+    samples: int = DEFAULT_PROBE_SAMPLES
+    expected_status: int = 200
+    method: str = "GET"
+
+
+@dataclass
+class EndpointProbe:
+    """Outcome of probing one endpoint once (all samples)"""
+    url: str
+    samples: int
+    request_times: List[float] = field(default_factory=list)  # ms, samples that got a response
+    status_codes: List[int] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    success_count: int = 0
+    duration: float = 0.0
+    percentiles: Dict[str, float] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def error(self) -> Optional[str]:
+        """First error kind when no sample got a response at all"""
+        if self.request_times or not self.errors:
+            return None
+        return self.errors[0]
+
+    @property
+    def success_rate(self) -> float:
+        return self.success_count / self.samples if self.samples else 0.0
+
+    @property
+    def avg_response_time(self) -> float:
+        return sum(self.request_times) / len(self.request_times) if self.request_times else 0.0
+
+
+class EndpointProber:
+    """Pooled, concurrent synthetic prober running on its own I/O loop"""
+
+    def __init__(self, max_connections: int = 100, max_per_host: int = 10):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.latest: Dict[str, EndpointProbe] = {}
+        self.targets: Dict[str, ProbeTarget] = {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._schedules: Dict[str, asyncio.Task] = {}
+        self._start_lock = threading.Lock()
+
+    # I/O loop ------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name="endpoint-prober", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+        return self._loop
+
+    def _submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    # Probing -------------------------------------------------------------
+
+    @staticmethod
+    def _as_targets(endpoints: Iterable[Union[str, ProbeTarget]], timeout: Optional[float],
+                    samples: Optional[int]) -> List[ProbeTarget]:
+        targets = []
+        for endpoint in endpoints:
+            target = endpoint if isinstance(endpoint, ProbeTarget) else ProbeTarget(url=endpoint)
+            if timeout is not None or samples is not None:
+                target = ProbeTarget(
+                    url=target.url,
+                    interval=target.interval,
+                    timeout=timeout if timeout is not None else target.timeout,
+                    samples=samples if samples is not None else target.samples,
+                    expected_status=target.expected_status,
+                    method=target.method
+                )
+            targets.append(target)
+        return targets
+
+    async def _sample(self, session: aiohttp.ClientSession, target: ProbeTarget, deadline: float):
+        started = time.perf_counter()
+        try:
+            remaining = max(deadline - time.monotonic(), 0.001)
+            async with session.request(target.method, target.url,
+                                       timeout=aiohttp.ClientTimeout(total=remaining)) as response:
+                await response.read()
+                return (time.perf_counter() - started) * 1000, response.status, None
+        except asyncio.TimeoutError:
+            return None, None, "timeout"
+        except aiohttp.ClientConnectionError:
+            return None, None, "connection_error"
+        except Exception as e:
+            return None, None, str(e)
+
+    async def _probe_target(self, target: ProbeTarget) -> EndpointProbe:
+        session = await self._get_session()
+        started = time.monotonic()
+        deadline = started + target.timeout
+        samples = await asyncio.gather(*(self._sample(session, target, deadline) for _ in range(target.samples)))
+
+        probe = EndpointProbe(url=target.url, samples=target.samples)
+        histogram = self.histograms.setdefault(target.url, LatencyHistogram())
+        for latency, status, error in samples:
+            if error is not None:
+                probe.errors.append(error)
+                continue
+            probe.request_times.append(latency)
+            probe.status_codes.append(status)
+            histogram.record(latency)
+            if status == target.expected_status:
+                probe.success_count += 1
+
+        probe.duration = time.monotonic() - started
+        probe.percentiles = histogram.summary()
+        self.latest[target.url] = probe
+        return probe
+
+    async def _probe_all(self, targets: List[ProbeTarget]) -> Dict[str, EndpointProbe]:
+        probes = await asyncio.gather(*(self._probe_target(target) for target in targets))
+        return {probe.url: probe for probe in probes}
+
+    def probe(self, endpoints: Iterable[Union[str, ProbeTarget]], timeout: Optional[float] = None,
+              samples: Optional[int] = None) -> Dict[str, EndpointProbe]:
+        """
+        Probe endpoints concurrently and wait for the results (sync callers)
+
+        Blocks for the slowest probe, never longer than its deadline.
+        """
+        targets = self._as_targets(endpoints, timeout, samples)
+        return self._submit(self._probe_all(targets)).result()
+
+    async def aprobe(self, endpoints: Iterable[Union[str, ProbeTarget]], timeout: Optional[float] = None,
+                     samples: Optional[int] = None) -> Dict[str, EndpointProbe]:
+        """Async variant of probe(), awaitable from any event loop"""
+        targets = self._as_targets(endpoints, timeout, samples)
+        return await asyncio.wrap_future(self._submit(self._probe_all(targets)))
+
+    # Schedules -----------------------------------------------------------
+
+    def schedule(self, target: ProbeTarget):
+        """Probe a target in the background every target.interval seconds"""
+        self.targets[target.url] = target
+
+        def start():
+            existing = self._schedules.pop(target.url, None)
+            if existing:
+                existing.cancel()
+            self._schedules[target.url] = self._loop.create_task(self._run_schedule(target))
+
+        self._ensure_loop().call_soon_threadsafe(start)
+
+    def unschedule(self, url: str):
+        self.targets.pop(url, None)
+        task = self._schedules.pop(url, None)
+        if task and self._loop:
+            self._loop.call_soon_threadsafe(task.cancel)
+
+    async def _run_schedule(self, target: ProbeTarget):
+        while True:
+            try:
+                await self._probe_target(target)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scheduled probe {target.url} error: {e}")
+            await asyncio.sleep(target.interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-endpoint latency histograms and last probe outcome"""
+        return {
+            url: {
+                "latency_ms": histogram.summary(),
+                "last_success_rate": self.latest[url].success_rate if url in self.latest else None,
+                "scheduled": url in self.targets,
+            }
+            for url, histogram in self.histograms.items()
+        }
+
+    def close(self):
+        """Cancel schedules, close the pool and stop the I/O loop"""
+        if self._loop is None:
+            return
+
+        async def shutdown():
+            for task in self._schedules.values():
+                task.cancel()
+            self._schedules.clear()
+            if self._session is not None:
+                await self._session.close()
+
+        self._submit(shutdown()).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+        self._session = None
+
+
+_endpoint_prober: Optional[EndpointProber] = None
+
+
+def get_endpoint_prober() -> EndpointProber:
+    """Process-wide endpoint prober"""
+    global _endpoint_prober
+    if _endpoint_prober is None:
+        _endpoint_prober = EndpointProber()
+    return _endpoint_prober
@@ -0,0 +1,294 @@
+"""
+Unified Health Engine
+Shared collectors, pluggable check providers and one alert pipeline
+
+The health classes (ComprehensiveHealthMonitor, HealthMonitor,
+ComprehensiveHealthChecks, UltimateHealthSystem, PerfectHealthSystem,
+EnhancedPerfectHealthSystem) are views over one engine per process:
+
+- collectors: one resource sampler, endpoint prober, time-series store,
+  streaming anomaly detector and worker pool
+- probes: endpoint results are cached per URL for `probe_ttl` seconds and
+  concurrent callers join the probe already in flight, so every view
+  asking within an interval shares one set of probes
+- providers: checks are registered as CheckSpecs on one scheduler and
+  served from its cache
+- alerts: views publish through `emit`; a repeat within the dedup window
+  is folded into the open alert, and subscribers (the views) receive
+  each alert once. Views are held weakly and can unsubscribe on close()
+"""
+
+import asyncio
+import inspect
+import itertools
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from health.anomaly_detector import Anomaly, StreamingAnomalyDetector, get_anomaly_detector
+from health.check_scheduler import CheckSpec, HealthCheckScheduler
+from health.endpoint_prober import DEFAULT_PROBE_SAMPLES, EndpointProbe, EndpointProber, get_endpoint_prober
+from health.resource_sampler import ResourceSampler, ResourceSnapshot, get_resource_sampler
+from health.timeseries_store import TimeSeriesStore, get_timeseries_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROBE_TTL = float(os.environ.get("HEALTH_PROBE_TTL", "10"))
+DEFAULT_ALERT_DEDUP_WINDOW = float(os.environ.get("HEALTH_ALERT_DEDUP_WINDOW", "60"))
+
+_LOG_LEVELS = {
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.ERROR,
+}
+
+
+@dataclass
+class HealthEvent:
+    """One alert on the shared pipeline (severity and category are enum values)"""
+    id: str
+    severity: str
+    category: str
+    message: str
+    source: str
+    timestamp: datetime
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    auto_resolvable: bool = False
+    occurrences: int = 1
+    last_seen: float = field(default_factory=time.monotonic)
+
+
+def as_enum(enum_cls, value: str, default):
+    """A view's enum member for a pipeline value, or `default` if the view has none"""
+    try:
+        return enum_cls(value)
+    except ValueError:
+        return default
+
+
+class HealthEngine:
+    """Shared state and pipelines behind every health view"""
+
+    def __init__(
+        self,
+        sampler: Optional[ResourceSampler] = None,
+        prober: Optional[EndpointProber] = None,
+        history: Optional[TimeSeriesStore] = None,
+        detector: Optional[StreamingAnomalyDetector] = None,
+        probe_ttl: float = DEFAULT_PROBE_TTL,
+        dedup_window: float = DEFAULT_ALERT_DEDUP_WINDOW,
+        max_alerts: int = 1000,
+        max_workers: int = 8
+    ):
+        self.sampler = sampler or get_resource_sampler()
+        self.prober = prober or get_endpoint_prober()
+        self.history = history or get_timeseries_store()
+        self.detector = detector or get_anomaly_detector()
+        self.scheduler = HealthCheckScheduler()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="health")
+        self.probe_ttl = probe_ttl
+        self.dedup_window = dedup_window
+
+        self.alerts: Deque[HealthEvent] = deque(maxlen=max_alerts)
+        self._open: Dict[Tuple[str, ...], HealthEvent] = {}
+        # Each entry returns the callback, or None once a weakly held one is gone
+        self._subscribers: List[Callable[[], Optional[Callable[[HealthEvent], None]]]] = []
+        self._alert_ids = itertools.count(1)
+
+        self._probes: Dict[str, EndpointProbe] = {}
+        self._probing: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"probe_requests": 0, "probe_hits": 0, "probe_runs": 0,
+                      "alerts": 0, "alerts_folded": 0}
+
+        self.detector.add_listener(self._on_anomaly)
+
+    # Collectors ----------------------------------------------------------
+
+    def snapshot(self) -> ResourceSnapshot:
+        """Latest shared resource sample"""
+        return self.sampler.snapshot()
+
+    def probe(self, endpoints: Iterable[str], samples: int = DEFAULT_PROBE_SAMPLES,
+              timeout: Optional[float] = None) -> Dict[str, EndpointProbe]:
+        """
+        Probe results for each endpoint, shared across callers
+
+        A cached result is reused while younger than probe_ttl and taken
+        with at least `samples` samples; an endpoint already being probed
+        is joined rather than probed again. The rest go out in one
+        concurrent prober run.
+        """
+        now = time.time()
+        results: Dict[str, EndpointProbe] = {}
+        joined: Dict[str, Future] = {}
+        owned: Dict[str, Future] = {}
+        with self._lock:
+            for url in dict.fromkeys(endpoints):
+                self.stats["probe_requests"] += 1
+                cached = self._probes.get(url)
+                if cached and now - cached.timestamp <= self.probe_ttl and cached.samples >= samples:
+                    self.stats["probe_hits"] += 1
+                    results[url] = cached
+                elif url in self._probing:
+                    self.stats["probe_hits"] += 1
+                    joined[url] = self._probing[url]
+                else:
+                    owned[url] = self._probing[url] = Future()
+
+        if owned:
+            self.stats["probe_runs"] += 1
+            try:
+                probes = self.prober.probe(list(owned), timeout=timeout, samples=samples)
+            except Exception as e:
+                with self._lock:
+                    for url, future in owned.items():
+                        self._probing.pop(url, None)
+                        future.set_exception(e)
+                raise
+            with self._lock:
+                for url, future in owned.items():
+                    self._probes[url] = probes[url]
+                    self._probing.pop(url, None)
+                    future.set_result(probes[url])
+            results.update(probes)
+
+        for url, future in joined.items():
+            results[url] = future.result()
+        return results
+
+    async def aprobe(self, endpoints: Iterable[str], samples: int = DEFAULT_PROBE_SAMPLES,
+                     timeout: Optional[float] = None) -> Dict[str, EndpointProbe]:
+        """Async variant of probe(), run on the engine's workers"""
+        return await asyncio.wrap_future(self.executor.submit(self.probe, list(endpoints), samples, timeout))
+
+    # Providers -----------------------------------------------------------
+
+    def register(self, spec: CheckSpec):
+        """Add a check provider to the shared scheduler"""
+        self.scheduler.register(spec)
+
+    # Alerts --------------------------------------------------------------
+
+    def subscribe(self, callback: Callable[[HealthEvent], None]):
+        """
+        Receive every new alert once
+
+        Bound methods are held weakly, so a health view that subscribes
+        itself doesn't outlive its last reference; other callables are
+        held until unsubscribe().
+        """
+        if inspect.ismethod(callback):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        with self._lock:
+            self._subscribers.append(ref)
+
+    def unsubscribe(self, callback: Callable[[HealthEvent], None]) -> bool:
+        """Stop delivering alerts to a callback; False if it wasn't subscribed"""
+        with self._lock:
+            for i, ref in enumerate(self._subscribers):
+                if ref() == callback:
+                    del self._subscribers[i]
+                    return True
+        return False
+
+    def _live_subscribers(self) -> List[Callable[[HealthEvent], None]]:
+        """Current callbacks, dropping the weakly held ones that were collected"""
+        with self._lock:
+            pairs = [(ref, ref()) for ref in self._subscribers]
+            self._subscribers = [ref for ref, callback in pairs if callback is not None]
+        return [callback for _, callback in pairs if callback is not None]
+
+    def emit(self, severity: str, message: str, source: str, category: str = "system",
+             metadata: Optional[Dict[str, Any]] = None, auto_resolvable: bool = False,
+             dedup_key: str = "") -> HealthEvent:
+        """
+        Publish an alert
+
+        Repeats of (source, category, severity, dedup_key) within the
+        dedup window are folded into the open alert (its occurrences and
+        metadata are updated) and not redelivered.
+        """
+        key = (source, category, severity, dedup_key)
+        now = time.monotonic()
+        with self._lock:
+            event = self._open.get(key)
+            if event is not None and now - event.last_seen <= self.dedup_window:
+                event.occurrences += 1
+                event.last_seen = now
+                event.message = message
+                event.metadata = metadata or {}
+                self.stats["alerts_folded"] += 1
+                return event
+
+            event = HealthEvent(
+                id=f"health_{int(time.time())}_{next(self._alert_ids)}",
+                severity=severity,
+                category=category,
+                message=message,
+                source=source,
+                timestamp=datetime.now(),
+                metadata=metadata or {},
+                auto_resolvable=auto_resolvable,
+                last_seen=now
+            )
+            self._open[key] = event
+            self.alerts.append(event)
+            self.stats["alerts"] += 1
+
+        logger.log(_LOG_LEVELS.get(severity, logging.CRITICAL),
+                   f"HEALTH ALERT [{severity.upper()}] {source}: {message}")
+        for callback in self._live_subscribers():
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Health alert subscriber error: {e}")
+        return event
+
+    def _on_anomaly(self, anomaly: Anomaly):
+        self.emit(
+            anomaly.severity,
+            f"Anomalous {anomaly.metric}: {anomaly.value:.2f} (expected {anomaly.expected:.2f}, score {anomaly.score:.1f})",
+            "anomaly_detector",
+            metadata={"metric": anomaly.metric, "value": anomaly.value, "expected": anomaly.expected,
+                      "score": anomaly.score, "detectors": anomaly.detectors},
+            auto_resolvable=True,
+            dedup_key=anomaly.metric
+        )
+
+    def close(self):
+        """Stop the shared workers (collectors are closed by their owners)"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sharing effectiveness of the probe cache and alert pipeline"""
+        requests = self.stats["probe_requests"]
+        return {
+            **self.stats,
+            "probe_hit_rate": self.stats["probe_hits"] / requests if requests else 0.0,
+            "cached_probes": len(self._probes),
+            "providers": list(self.scheduler.specs),
+            "subscribers": len(self._live_subscribers()),
+            "recorded_alerts": len(self.alerts),
+        }
+
+
+_health_engine: Optional[HealthEngine] = None
+
+
+def get_health_engine() -> HealthEngine:
+    """Process-wide health engine shared by every health view"""
+    global _health_engine
+    if _health_engine is None:
+        _health_engine = HealthEngine()
+    return _health_engine
@@ -14,7 +14,6 @@ from enum import Enum
 from functools import wraps
 import traceback
 import psutil
-import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 from sklearn.preprocessing import StandardScaler
@@ -22,6 +21,8 @@ from sklearn.ensemble import IsolationForest
 from sklearn.cluster import DBSCAN
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 
+from health.engine import HealthEvent, as_enum, get_health_engine
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -171,7 +172,8 @@ class EnhancedPerfectHealthSystem:
         self.health_history: List[EnhancedHealthSummary] = []
         self.health_alerts: List[EnhancedHealthAlert] = []
         self.health_callbacks: List[Callable] = []
-        self.executor = ThreadPoolExecutor(max_workers=12)
+        self.engine = get_health_engine()  # shared sampler, probes, history and alerts
+        self.executor = self.engine.executor
         self.scaler = StandardScaler()
         self.anomaly_detector = IsolationForest(contamination=0.02, random_state=42)
         self.cluster_analyzer = DBSCAN(eps=0.5, min_samples=5)
@@ -180,6 +182,7 @@ class EnhancedPerfectHealthSystem:
         # Enhanced health monitoring configuration
         self.check_interval = 30  # seconds
         self.prediction_horizon = 7200  # 2 hours
+        self.history = self.engine.history  # recorded metrics behind the predictions
         self.anomaly_threshold = 0.02  # Lower threshold for enhanced detection
         self.auto_healing_enabled = True
         self.precision_mode = True
@@ -189,6 +192,7 @@ class EnhancedPerfectHealthSystem:
         
         # Initialize enhanced health baseline
         self._initialize_enhanced_health_baseline()
+        self.engine.subscribe(self._receive_health_alert)
         
     def _initialize_enhanced_health_baseline(self) -> None:
         """Initialize enhanced health baseline"""
@@ -292,96 +296,90 @@ class EnhancedPerfectHealthSystem:
     def _create_enhanced_health_alert(self, severity: AlertSeverity, category: CheckCategory, 
                                        message: str, source: str, metadata: Dict[str, Any] = None,
                                        auto_resolvable: bool = False) -> EnhancedHealthAlert:
-        """Create enhanced perfect health alert"""
-        try:
-            alert_id = f"enhanced_health_{int(time.time())}_{len(self.health_alerts)}"
-            alert = EnhancedHealthAlert(
-                id=alert_id,
-                severity=severity,
-                category=category,
-                message=message,
-                source=source,
-                timestamp=datetime.now(),
-                resolved=False,
-                metadata=metadata or {},
-                forensics_data={},
-                precision_metrics={
-                    'detection_accuracy': 1.0,
-                    'alert_precision': 1.0,
-                    'response_time': 0.0,
-                    'false_positive_rate': 0.0
-                },
-                enhanced_metrics={
-                    'enhanced_detection': True,
-                    'predictive_analysis': True,
-                    'auto_healing_capable': auto_resolvable,
-                    'confidence_level': 1.0
-                },
-                auto_resolvable=auto_resolvable,
-                resolution_time=None
-            )
-            
-            self.health_alerts.append(alert)
-            
-            # Log enhanced alert
-            log_level = {
-                AlertSeverity.INFO: logging.INFO,
-                AlertSeverity.WARNING: logging.WARNING,
-                AlertSeverity.ERROR: logging.ERROR,
-                AlertSeverity.CRITICAL: logging.ERROR,
-                AlertSeverity.EMERGENCY: logging.CRITICAL,
-                AlertSeverity.CATASTROPHIC: logging.CRITICAL
-            }.get(severity, logging.INFO)
-            
-            logger.log(log_level, f"ENHANCED PERFECT HEALTH ALERT [{severity.value.upper()}] {source}: {message}")
-            
-            return alert
-            
+        """Publish an enhanced perfect health alert on the engine's pipeline"""
+        try:
+            event = self.engine.emit(severity.value, message, source, category.value, metadata, auto_resolvable)
+            return next((alert for alert in reversed(self.health_alerts) if alert.id == event.id), None)
         except Exception as e:
             logger.error(f"Error creating enhanced perfect health alert: {str(e)}")
             return None
     
+    def close(self) -> None:
+        """Stop receiving alerts from the shared health engine"""
+        self.engine.unsubscribe(self._receive_health_alert)
+    
+    def _receive_health_alert(self, event: HealthEvent) -> None:
+        """Record an alert from the engine's pipeline, whichever view raised it"""
+        alert = EnhancedHealthAlert(
+            id=event.id,
+            severity=as_enum(AlertSeverity, event.severity, AlertSeverity.CATASTROPHIC),
+            category=as_enum(CheckCategory, event.category, CheckCategory.SYSTEM),
+            message=event.message,
+            source=event.source,
+            timestamp=event.timestamp,
+            resolved=False,
+            metadata=event.metadata,
+            forensics_data={},
+            precision_metrics={
+                'detection_accuracy': 1.0,
+                'alert_precision': 1.0,
+                'response_time': 0.0,
+                'false_positive_rate': 0.0
+            },
+            enhanced_metrics={
+                'enhanced_detection': True,
+                'predictive_analysis': True,
+                'auto_healing_capable': event.auto_resolvable,
+                'confidence_level': 1.0
+            },
+            auto_resolvable=event.auto_resolvable,
+            resolution_time=None
+        )
+        self.health_alerts.append(alert)
+    
     @enhanced_health_monitor
     def check_enhanced_system_health(self) -> Dict[str, Any]:
         """Check enhanced perfect system health"""
         try:
             logger.info("Starting enhanced perfect system health check")
             
+            # Latest background sample (no inline psutil polling)
+            sample = self.engine.snapshot()
+            
             # Enhanced CPU health check
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
-            cpu_freq = psutil.cpu_freq()
-            load_avg = psutil.getloadavg()
+            cpu_percent = sample.cpu_percent
+            cpu_count = sample.cpu_count
+            cpu_freq = sample.cpu_freq
+            load_avg = sample.load_avg
             cpu_temp = self._get_cpu_temperature()
             
             cpu_health_score = self._enhanced_calculate_cpu_health(cpu_percent, cpu_count, cpu_freq, load_avg, cpu_temp)
             cpu_status = self._enhanced_classify_health_status(cpu_health_score)
             
             # Enhanced memory health check
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
+            memory = sample.memory
+            swap = sample.swap
             
             memory_health_score = self._enhanced_calculate_memory_health(memory, swap)
             memory_status = self._enhanced_classify_health_status(memory_health_score)
             
             # Enhanced disk health check
-            disk = psutil.disk_usage('/')
-            disk_io = psutil.disk_io_counters()
+            disk = sample.disk
+            disk_io = sample.disk_io
             
             disk_health_score = self._enhanced_calculate_disk_health(disk, disk_io)
             disk_status = self._enhanced_classify_health_status(disk_health_score)
             
             # Enhanced network health check
-            network_io = psutil.net_io_counters()
-            network_connections = len(psutil.net_connections())
+            network_io = sample.network_io
+            network_connections = sample.network_connections
             network_stats = self._get_network_statistics()
             
             network_health_score = self._enhanced_calculate_network_health(network_io, network_connections, network_stats)
             network_status = self._enhanced_classify_health_status(network_health_score)
             
             # Enhanced process health check
-            processes = list(psutil.process_iter())
-            process_health_score = self._enhanced_calculate_process_health(processes)
+            process_health_score = self._enhanced_calculate_process_health(sample.process_count, sample.process_status_counts)
             process_status = self._enhanced_classify_health_status(process_health_score)
             
             # Enhanced overall system health
@@ -499,7 +497,7 @@ class EnhancedPerfectHealthSystem:
                         'enhanced_features': ['connection_tracking', 'bandwidth_analysis', 'latency_monitoring']
                     },
                     'processes': {
-                        'count': len(processes),
+                        'count': sample.process_count,
                         'score': process_health_score,
                         'status': process_status.value,
                         'precision': 1.0,
@@ -559,7 +557,7 @@ class EnhancedPerfectHealthSystem:
         try:
             # In a real implementation, this would use platform-specific APIs
             # For now, simulate based on CPU usage
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            cpu_percent = self.engine.snapshot().cpu_percent
             # Simulate temperature based on usage
             base_temp = 45.0  # Base temperature in Celsius
             temp_increase = cpu_percent * 0.5  # 0.5°C per percent usage
@@ -702,34 +700,17 @@ class EnhancedPerfectHealthSystem:
             logger.error(f"Error calculating enhanced network health: {str(e)}")
             return 0.0
     
-    def _enhanced_calculate_process_health(self, processes: List) -> float:
+    def _enhanced_calculate_process_health(self, total_count: int, status_counts: Dict[str, int]) -> float:
         """Calculate enhanced process health score"""
         try:
-            if not processes:
+            if not total_count:
                 return 100
             
-            # Count process states with enhanced precision
-            running_count = 0
-            sleeping_count = 0
-            zombie_count = 0
-            blocked_count = 0
-            
-            for proc in processes:
-                try:
-                    status = proc.status()
-                    if status == psutil.STATUS_RUNNING:
-                        running_count += 1
-                    elif status == psutil.STATUS_SLEEPING:
-                        sleeping_count += 1
-                    elif status == psutil.STATUS_ZOMBIE:
-                        zombie_count += 1
-                    elif status == psutil.STATUS_BLOCKED:
-                        blocked_count += 1
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            running_count = status_counts.get(psutil.STATUS_RUNNING, 0)
+            zombie_count = status_counts.get(psutil.STATUS_ZOMBIE, 0)
+            blocked_count = status_counts.get(getattr(psutil, "STATUS_BLOCKED", "blocked"), 0)
             
             # Calculate health with enhanced precision
-            total_count = len(processes)
             running_ratio = running_count / total_count
             zombie_ratio = zombie_count / total_count
             blocked_ratio = blocked_count / total_count
@@ -872,6 +853,18 @@ class EnhancedPerfectHealthSystem:
             current_health = statistics.mean(system_scores)
             predicted_health = max(0, current_health - 0.5)  # Assume minimal degradation
             
+            # Project from recorded history; the thresholds above only cover a cold start
+            self.history.append('enhanced.system.health_score', current_health)
+            cpu_trend, cpu_prediction, cpu_confidence = self.history.project(
+                'system.cpu_percent', cpu_percent, self.prediction_horizon, (cpu_trend, cpu_prediction), lower=0, upper=100)
+            memory_trend, memory_prediction, memory_confidence = self.history.project(
+                'system.memory_percent', memory_percent, self.prediction_horizon, (memory_trend, memory_prediction), lower=0, upper=100)
+            disk_trend, disk_prediction, disk_confidence = self.history.project(
+                'system.disk_percent', disk_percent, self.prediction_horizon, (disk_trend, disk_prediction), lower=0, upper=100)
+            _, predicted_health, health_confidence = self.history.project(
+                'enhanced.system.health_score', current_health, self.prediction_horizon, ('stable', predicted_health), lower=0, upper=100)
+            history_confidence = statistics.mean([cpu_confidence, memory_confidence, disk_confidence, health_confidence])
+            
             # Enhanced predictive analysis
             return {
                 'trends': {
@@ -885,7 +878,7 @@ class EnhancedPerfectHealthSystem:
                     'disk_usage': disk_prediction,
                     'health_score': predicted_health
                 },
-                'confidence': 0.9999,  # Enhanced confidence
+                'confidence': history_confidence or 0.9999,  # Enhanced confidence
                 'time_horizon': self.prediction_horizon,
                 'prediction_accuracy': 0.9999,  # Enhanced prediction accuracy
                 'model_type': 'enhanced_predictive',
@@ -935,37 +928,66 @@ class EnhancedPerfectHealthSystem:
             return 0.0
     
     def _calculate_health_trend(self) -> str:
-        """Calculate health trend"""
+        """Calculate health trend from the Holt-Winters trend of CPU and memory"""
         try:
-            # Simulate enhanced health trend analysis
-            return "improving"
+            ticks_per_hour = 3600 / self.engine.sampler.interval
+            slopes = [
+                stats['trend_per_tick'] * ticks_per_hour
+                for stats in (self.engine.detector.stats(f"system.{name}") for name in ('cpu_percent', 'memory_percent'))
+                if stats and stats['count'] >= self.engine.detector.warmup
+            ]
+            if not slopes:
+                return "stable"
+            slope = sum(slopes) / len(slopes)  # utilization points per hour
+            if slope > 1.0:
+                return "degrading"
+            if slope < -1.0:
+                return "improving"
+            return "stable"
         except Exception as e:
             logger.error(f"Error calculating health trend: {str(e)}")
             return "stable"
     
     def _detect_system_anomalies(self) -> Dict[str, Any]:
-        """Detect system anomalies"""
+        """Detect system anomalies with the streaming detector"""
         try:
-            # Simulate enhanced anomaly detection
+            summary = self.engine.detector.summary("system.")
+            warmed_up = summary['warmed_up'] / summary['metrics'] if summary['metrics'] else 0.0
             return {
-                'anomalies_detected': 0,
-                'anomaly_score': 0.0,
-                'confidence': 1.0,
-                'detection_method': 'enhanced_ml'
+                'anomalies_detected': summary['anomalies_detected'],
+                'anomalous_metrics': summary['anomalous_metrics'],
+                'anomaly_score': summary['anomaly_score'],
+                'confidence': warmed_up,
+                'detection_method': 'ewma_mad_holt_winters'
             }
         except Exception as e:
             logger.error(f"Error detecting system anomalies: {str(e)}")
             return {}
     
     def _predict_system_health(self) -> Dict[str, Any]:
-        """Predict system health"""
-        try:
-            # Simulate enhanced health prediction
+        """Predict system health from Holt-Winters utilization forecasts"""
+        try:
+            time_horizon = 7200
+            factors = ['cpu', 'memory', 'disk']
+            steps = max(1, int(time_horizon / self.engine.sampler.interval))
+            forecasts = [
+                self.engine.detector.forecast(f"system.{factor}_percent", steps)
+                for factor in factors
+            ]
+            forecasts = [min(max(value, 0.0), 100.0) for value in forecasts if value is not None]
+            if not forecasts:
+                return {
+                    'predicted_health': None,
+                    'confidence': 0.0,
+                    'time_horizon': time_horizon,
+                    'factors': factors
+                }
+            summary = self.engine.detector.summary("system.")
             return {
-                'predicted_health': 98.5,
-                'confidence': 0.9999,
-                'time_horizon': 7200,
-                'factors': ['cpu', 'memory', 'disk', 'network', 'processes']
+                'predicted_health': round(100.0 - sum(forecasts) / len(forecasts), 2),
+                'confidence': summary['warmed_up'] / summary['metrics'] if summary['metrics'] else 0.0,
+                'time_horizon': time_horizon,
+                'factors': factors
             }
         except Exception as e:
             logger.error(f"Error predicting system health: {str(e)}")
@@ -993,25 +1015,25 @@ class EnhancedPerfectHealthSystem:
             # Execute health checks with enhanced parallel processing
             health_results = {}
             if self.parallel_processing:
-                with ThreadPoolExecutor(max_workers=12) as executor:
-                    future_to_check = {
-                        executor.submit(check): category
-                        for category, check in health_checks.items()
-                    }
-                    
-                    for future in as_completed(future_to_check):
-                        category = future_to_check[future]
-                        try:
-                            result = future.result()
-                            health_results[category] = result
-                        except Exception as e:
-                            logger.error(f"Enhanced health check {category} failed: {str(e)}")
-                            health_results[category] = {
-                                'status': HealthStatus.CRITICAL.value,
-                                'score': 0.0,
-                                'error': str(e),
-                                'timestamp': datetime.now().isoformat()
-                            }
+                executor = self.executor  # shared engine workers
+                future_to_check = {
+                    executor.submit(check): category
+                    for category, check in health_checks.items()
+                }
+                
+                for future in as_completed(future_to_check):
+                    category = future_to_check[future]
+                    try:
+                        result = future.result()
+                        health_results[category] = result
+                    except Exception as e:
+                        logger.error(f"Enhanced health check {category} failed: {str(e)}")
+                        health_results[category] = {
+                            'status': HealthStatus.CRITICAL.value,
+                            'score': 0.0,
+                            'error': str(e),
+                            'timestamp': datetime.now().isoformat()
+                        }
             else:
                 # Sequential execution
                 for category, check in health_checks.items():
@@ -1153,102 +1175,73 @@ class EnhancedPerfectHealthSystem:
             error_rates = []
             throughputs = []
             
+            # Probe every endpoint concurrently (a run takes max-probe time)
+            probes = self.engine.probe(endpoints, samples=10)
+            
             # Check each endpoint with enhanced analysis
             for endpoint in endpoints:
-                try:
-                    # Enhanced multiple requests for better accuracy
-                    request_times = []
-                    success_count = 0
-                    
-                    for _ in range(10):  # 10 requests per endpoint for enhanced accuracy
-                        start_time = time.time()
-                        response = requests.get(endpoint, timeout=10)
-                        response_time = (time.time() - start_time) * 1000
-                        request_times.append(response_time)
-                        
-                        if response.status_code == 200:
-                            success_count += 1
-                    
-                    avg_response_time = statistics.mean(request_times)
-                    response_times.append(avg_response_time)
-                    
-                    # Calculate enhanced endpoint metrics
-                    success_rate = success_count / 10
-                    error_rates.append(1 - success_rate)
-                    
-                    # Calculate throughput (enhanced)
-                    throughput = 1000 / avg_response_time if avg_response_time > 0 else 0
-                    throughputs.append(throughput)
-                    
-                    # Determine endpoint status with enhanced precision
-                    if success_rate == 1.0 and avg_response_time < 25:
-                        status = HealthStatus.PERFECT
-                        score = 100
-                    elif success_rate == 1.0 and avg_response_time < 50:
-                        status = HealthStatus.EXCELLENT
-                        score = 95
-                    elif success_rate == 1.0 and avg_response_time < 75:
-                        status = HealthStatus.VERY_GOOD
-                        score = 90
-                    elif success_rate >= 0.9 and avg_response_time < 100:
-                        status = HealthStatus.GOOD
-                        score = 85
-                    elif success_rate >= 0.8 and avg_response_time < 150:
-                        status = HealthStatus.FAIR
-                        score = 75
-                    elif success_rate > 0:
-                        status = HealthStatus.POOR
-                        score = 50
-                    else:
-                        status = HealthStatus.CRITICAL
-                        score = 0
-                    
-                    total_score += score
-                    
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'avg_response_time': avg_response_time,
-                        'success_rate': success_rate,
-                        'throughput': throughput,
-                        'status': status.value,
-                        'score': score,
-                        'request_times': request_times,
-                        'precision': 1.0,
-                        'enhanced_features': ['multi_request_analysis', 'enhanced_metrics', 'performance_tracking']
-                    })
-                    
-                except requests.exceptions.Timeout:
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'error': 'timeout',
-                        'status': HealthStatus.CRITICAL.value,
-                        'score': 0,
-                        'precision': 1.0
-                    })
-                    total_score += 0
-                    error_rates.append(1.0)
-                    
-                except requests.exceptions.ConnectionError:
+                probe = probes[endpoint]
+                if probe.error:
                     endpoint_results.append({
                         'endpoint': endpoint,
-                        'error': 'connection_error',
-                        'status': HealthStatus.CRITICAL.value,
-                        'score': 0,
-                        'precision': 1.0
-                    })
-                    total_score += 0
-                    error_rates.append(1.0)
-                    
-                except Exception as e:
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'error': str(e),
+                        'error': probe.error,
                         'status': HealthStatus.CRITICAL.value,
                         'score': 0,
                         'precision': 1.0
                     })
                     total_score += 0
                     error_rates.append(1.0)
+                    continue
+                
+                request_times = probe.request_times
+                avg_response_time = statistics.mean(request_times)
+                response_times.append(avg_response_time)
+                
+                # Calculate enhanced endpoint metrics
+                success_rate = probe.success_rate
+                error_rates.append(1 - success_rate)
+                
+                # Calculate throughput (enhanced)
+                throughput = 1000 / avg_response_time if avg_response_time > 0 else 0
+                throughputs.append(throughput)
+                
+                # Determine endpoint status with enhanced precision
+                if success_rate == 1.0 and avg_response_time < 25:
+                    status = HealthStatus.PERFECT
+                    score = 100
+                elif success_rate == 1.0 and avg_response_time < 50:
+                    status = HealthStatus.EXCELLENT
+                    score = 95
+                elif success_rate == 1.0 and avg_response_time < 75:
+                    status = HealthStatus.VERY_GOOD
+                    score = 90
+                elif success_rate >= 0.9 and avg_response_time < 100:
+                    status = HealthStatus.GOOD
+                    score = 85
+                elif success_rate >= 0.8 and avg_response_time < 150:
+                    status = HealthStatus.FAIR
+                    score = 75
+                elif success_rate > 0:
+                    status = HealthStatus.POOR
+                    score = 50
+                else:
+                    status = HealthStatus.CRITICAL
+                    score = 0
+                
+                total_score += score
+                
+                endpoint_results.append({
+                    'endpoint': endpoint,
+                    'avg_response_time': avg_response_time,
+                    'success_rate': success_rate,
+                    'throughput': throughput,
+                    'status': status.value,
+                    'score': score,
+                    'request_times': request_times,
+                    'latency_percentiles': probe.percentiles,
+                    'precision': 1.0,
+                    'enhanced_features': ['multi_request_analysis', 'enhanced_metrics', 'performance_tracking']
+                })
             
             # Calculate overall application health
             overall_score = total_score / len(endpoints) if endpoints else 0
@@ -1411,6 +1404,19 @@ class EnhancedPerfectHealthSystem:
             predicted_response_time = avg_response_time * 1.1 if avg_response_time > 50 else avg_response_time
             predicted_error_rate = avg_error_rate * 1.2 if avg_error_rate > 0.02 else avg_error_rate
             
+            # Project from recorded history; the thresholds above only cover a cold start
+            self.history.append_many({
+                'enhanced.application.response_time': avg_response_time,
+                'enhanced.application.error_rate': avg_error_rate
+            })
+            response_time_trend, predicted_response_time, response_time_confidence = self.history.project(
+                'enhanced.application.response_time', avg_response_time, self.prediction_horizon,
+                (response_time_trend, predicted_response_time), lower=0)
+            error_rate_trend, predicted_error_rate, error_rate_confidence = self.history.project(
+                'enhanced.application.error_rate', avg_error_rate, self.prediction_horizon,
+                (error_rate_trend, predicted_error_rate), lower=0, upper=1)
+            history_confidence = (response_time_confidence + error_rate_confidence) / 2
+            
             # Calculate reliability metrics
             reliability_score = 1 - avg_error_rate
             performance_score = max(0, 1 - (avg_response_time / 500))  # Normalize to 500ms
@@ -1426,7 +1432,7 @@ class EnhancedPerfectHealthSystem:
                     'reliability_score': reliability_score,
                     'performance_score': performance_score
                 },
-                'confidence': 0.9999,  # Enhanced confidence
+                'confidence': history_confidence or 0.9999,  # Enhanced confidence
                 'time_horizon': self.prediction_horizon,
                 'prediction_accuracy': 0.9999,  # Enhanced prediction accuracy
                 'model_type': 'enhanced_predictive',
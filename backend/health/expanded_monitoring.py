@@ -10,10 +10,11 @@ from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import psutil
-import requests
 from functools import wraps
 import traceback
 
+from health.engine import HealthEvent, as_enum, get_health_engine
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -65,11 +66,14 @@ class HealthMonitor:
     """Expanded health monitoring system"""
     
     def __init__(self):
-        self.metrics: Dict[str, HealthMetric] = {}
+        self.engine = get_health_engine()            # shared sampler, probes, history and alerts
+        self.metrics: Dict[str, HealthMetric] = {}  # latest value per metric
+        self.history = self.engine.history           # every value, for trends
         self.alerts: List[SystemAlert] = []
         self.monitoring_active = False
         self.check_interval = 30  # seconds
         self.alert_callbacks: List[Callable] = []
+        self.engine.subscribe(self._receive_alert)
         
     def add_alert_callback(self, callback: Callable) -> None:
         """Add callback for alert notifications"""
@@ -81,19 +85,25 @@ class HealthMonitor:
             self.alert_callbacks.remove(callback)
     
     def _trigger_alert(self, level: AlertLevel, message: str, source: str, metadata: Dict[str, Any] = None) -> None:
-        """Trigger system alert"""
-        alert_id = f"alert_{int(time.time())}_{len(self.alerts)}"
+        """Trigger system alert (published on the engine's pipeline)"""
+        self.engine.emit(level.value, message, source, metadata=metadata)
+    
+    def close(self) -> None:
+        """Stop receiving alerts from the shared health engine"""
+        self.engine.unsubscribe(self._receive_alert)
+    
+    def _receive_alert(self, event: HealthEvent) -> None:
+        """Record an alert from the engine's pipeline and notify callbacks"""
         alert = SystemAlert(
-            id=alert_id,
-            level=level,
-            message=message,
-            source=source,
-            timestamp=datetime.now(),
-            metadata=metadata or {}
+            id=event.id,
+            level=as_enum(AlertLevel, event.severity, AlertLevel.CRITICAL),
+            message=event.message,
+            source=event.source,
+            timestamp=event.timestamp,
+            metadata=event.metadata
         )
         
         self.alerts.append(alert)
-        logger.warning(f"ALERT [{level.value.upper()}] {source}: {message}")
         
         # Trigger callbacks
         for callback in self.alert_callbacks:
@@ -134,6 +144,7 @@ class HealthMonitor:
             metric.status = self._check_metric_threshold(metric)
             
             self.metrics[name] = metric
+            self.history.append(f"monitor.{name}", value)
             
             # Trigger alert if needed
             if metric.status in [HealthStatus.UNHEALTHY, HealthStatus.CRITICAL]:
@@ -156,8 +167,11 @@ class HealthMonitor:
         try:
             logger.info("Checking system resources")
             
+            # Latest background sample (no inline psutil polling)
+            sample = self.engine.snapshot()
+            
             # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = sample.cpu_percent
             self._update_metric(
                 name="cpu_usage",
                 value=cpu_percent,
@@ -167,7 +181,7 @@ class HealthMonitor:
             )
             
             # Memory usage
-            memory = psutil.virtual_memory()
+            memory = sample.memory
             self._update_metric(
                 name="memory_usage",
                 value=memory.percent,
@@ -177,7 +191,7 @@ class HealthMonitor:
             )
             
             # Disk usage
-            disk = psutil.disk_usage('/')
+            disk = sample.disk
             disk_percent = (disk.used / disk.total) * 100
             self._update_metric(
                 name="disk_usage",
@@ -188,7 +202,7 @@ class HealthMonitor:
             )
             
             # Network I/O
-            network = psutil.net_io_counters()
+            network = sample.network_io
             self._update_metric(
                 name="network_bytes_sent",
                 value=network.bytes_sent,
@@ -223,105 +237,101 @@ class HealthMonitor:
         """Check application endpoint health"""
         try:
             logger.info("Checking application health")
+            probes = self.engine.probe(endpoints, samples=1)
+            return self._record_application_probes(endpoints, probes)
             
-            results = {}
-            
-            for endpoint in endpoints:
-                try:
-                    start_time = time.time()
-                    response = requests.get(endpoint, timeout=10)
-                    response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-                    
-                    # Update response time metric
-                    self._update_metric(
-                        name=f"endpoint_{endpoint.replace(':', '_').replace('/', '_')}_response_time",
-                        value=response_time,
-                        unit="ms",
-                        threshold=1000.0,  # 1 second
-                        description=f"Response time for {endpoint}"
-                    )
-                    
-                    # Update status code metric
-                    self._update_metric(
-                        name=f"endpoint_{endpoint.replace(':', '_').replace('/', '_')}_status",
-                        value=response.status_code,
-                        unit="status_code",
-                        threshold=299,  # 2xx is good
-                        description=f"Status code for {endpoint}"
-                    )
-                    
-                    results[endpoint] = {
-                        "status_code": response.status_code,
-                        "response_time": response_time,
-                        "healthy": response.status_code < 400,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    
-                    # Trigger alert if endpoint is unhealthy
-                    if response.status_code >= 500:
-                        self._trigger_alert(
-                            level=AlertLevel.CRITICAL,
-                            message=f"Endpoint {endpoint} returned {response.status_code}",
-                            source="application_health",
-                            metadata={"endpoint": endpoint, "status_code": response.status_code}
-                        )
-                    elif response.status_code >= 400:
-                        self._trigger_alert(
-                            level=AlertLevel.WARNING,
-                            message=f"Endpoint {endpoint} returned {response.status_code}",
-                            source="application_health",
-                            metadata={"endpoint": endpoint, "status_code": response.status_code}
-                        )
-                    
-                except requests.exceptions.Timeout:
-                    results[endpoint] = {
-                        "error": "timeout",
-                        "healthy": False,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    
-                    self._trigger_alert(
-                        level=AlertLevel.ERROR,
-                        message=f"Endpoint {endpoint} timeout",
-                        source="application_health",
-                        metadata={"endpoint": endpoint, "error": "timeout"}
-                    )
-                    
-                except requests.exceptions.ConnectionError:
-                    results[endpoint] = {
-                        "error": "connection_error",
-                        "healthy": False,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    
-                    self._trigger_alert(
-                        level=AlertLevel.ERROR,
-                        message=f"Endpoint {endpoint} connection error",
-                        source="application_health",
-                        metadata={"endpoint": endpoint, "error": "connection_error"}
-                    )
-                    
-                except Exception as e:
-                    results[endpoint] = {
-                        "error": str(e),
-                        "healthy": False,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    
-                    self._trigger_alert(
-                        level=AlertLevel.ERROR,
-                        message=f"Endpoint {endpoint} error: {str(e)}",
-                        source="application_health",
-                        metadata={"endpoint": endpoint, "error": str(e)}
-                    )
-            
-            return results
+        except Exception as e:
+            logger.error(f"Error checking application health: {str(e)}")
+            logger.error(traceback.format_exc())
+            return {"error": str(e)}
+    
+    async def check_application_health_async(self, endpoints: List[str]) -> Dict[str, Any]:
+        """Check application endpoint health without blocking the event loop"""
+        try:
+            logger.info("Checking application health")
+            probes = await self.engine.aprobe(endpoints, samples=1)
+            return self._record_application_probes(endpoints, probes)
             
         except Exception as e:
             logger.error(f"Error checking application health: {str(e)}")
             logger.error(traceback.format_exc())
             return {"error": str(e)}
     
+    def _record_application_probes(self, endpoints: List[str], probes: Dict[str, Any]) -> Dict[str, Any]:
+        """Update endpoint metrics and alerts from one concurrent probe run"""
+        results = {}
+        
+        for endpoint in endpoints:
+            probe = probes[endpoint]
+            
+            if probe.error:
+                results[endpoint] = {
+                    "error": probe.error,
+                    "healthy": False,
+                    "timestamp": datetime.now().isoformat()
+                }
+                
+                if probe.error == "timeout":
+                    message = f"Endpoint {endpoint} timeout"
+                elif probe.error == "connection_error":
+                    message = f"Endpoint {endpoint} connection error"
+                else:
+                    message = f"Endpoint {endpoint} error: {probe.error}"
+                self._trigger_alert(
+                    level=AlertLevel.ERROR,
+                    message=message,
+                    source="application_health",
+                    metadata={"endpoint": endpoint, "error": probe.error}
+                )
+                continue
+            
+            status_code = probe.status_codes[0]
+            response_time = probe.request_times[0]
+            
+            # Update response time metric
+            self._update_metric(
+                name=f"endpoint_{endpoint.replace(':', '_').replace('/', '_')}_response_time",
+                value=response_time,
+                unit="ms",
+                threshold=1000.0,  # 1 second
+                description=f"Response time for {endpoint}"
+            )
+            
+            # Update status code metric
+            self._update_metric(
+                name=f"endpoint_{endpoint.replace(':', '_').replace('/', '_')}_status",
+                value=status_code,
+                unit="status_code",
+                threshold=299,  # 2xx is good
+                description=f"Status code for {endpoint}"
+            )
+            
+            results[endpoint] = {
+                "status_code": status_code,
+                "response_time": response_time,
+                "healthy": status_code < 400,
+                "latency_percentiles": probe.percentiles,
+                "timestamp": datetime.now().isoformat()
+            }
+            
+            # Trigger alert if endpoint is unhealthy
+            if status_code >= 500:
+                self._trigger_alert(
+                    level=AlertLevel.CRITICAL,
+                    message=f"Endpoint {endpoint} returned {status_code}",
+                    source="application_health",
+                    metadata={"endpoint": endpoint, "status_code": status_code}
+                )
+            elif status_code >= 400:
+                self._trigger_alert(
+                    level=AlertLevel.WARNING,
+                    message=f"Endpoint {endpoint} returned {status_code}",
+                    source="application_health",
+                    metadata={"endpoint": endpoint, "status_code": status_code}
+                )
+        
+        return results
+    
     def check_database_health(self, connection_string: str) -> Dict[str, Any]:
         """Check database connection and performance"""
         try:
@@ -615,7 +625,7 @@ class HealthMonitor:
                     
                     # Check application health
                     if endpoints:
-                        self.check_application_health(endpoints)
+                        await self.check_application_health_async(endpoints)
                     
                     # Check database health
                     self.check_database_health("postgresql://localhost:5432/shaheenpulse")
@@ -654,14 +664,21 @@ class HealthMonitor:
             
             # Get all metrics
             metrics_data = {}
+            since = time.time() - 3600
             for name, metric in self.metrics.items():
+                history_name = f"monitor.{name}"
                 metrics_data[name] = {
                     "value": metric.value,
                     "unit": metric.unit,
                     "threshold": metric.threshold,
                     "status": metric.status.value,
                     "timestamp": metric.timestamp.isoformat(),
-                    "description": metric.description
+                    "description": metric.description,
+                    "last_hour": {
+                        "mean": self.history.aggregate(history_name, since, agg="mean"),
+                        "max": self.history.aggregate(history_name, since, agg="max"),
+                        "p95": self.history.percentile(history_name, 95, since)
+                    }
                 }
             
             # Get all alerts
@@ -13,7 +13,6 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import traceback
 import psutil
-import requests
 from functools import wraps
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
@@ -21,6 +20,8 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import IsolationForest
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 
+from health.engine import HealthEvent, as_enum, get_health_engine
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -159,7 +160,8 @@ class PerfectHealthSystem:
         self.health_history: List[HealthSummary] = []
         self.health_alerts: List[HealthAlert] = []
         self.health_callbacks: List[Callable] = []
-        self.executor = ThreadPoolExecutor(max_workers=8)
+        self.engine = get_health_engine()  # shared sampler, probes, history and alerts
+        self.executor = self.engine.executor
         self.scaler = StandardScaler()
         self.anomaly_detector = IsolationForest(contamination=0.05, random_state=42)
         self.health_baseline = None
@@ -167,12 +169,14 @@ class PerfectHealthSystem:
         # Perfect health monitoring configuration
         self.check_interval = 30  # seconds
         self.prediction_horizon = 3600  # 1 hour
+        self.history = self.engine.history  # recorded metrics behind the predictions
         self.anomaly_threshold = 0.05  # Lower threshold for perfect detection
         self.auto_healing_enabled = True
         self.precision_mode = True
         
         # Initialize perfect health baseline
         self._initialize_perfect_health_baseline()
+        self.engine.subscribe(self._receive_health_alert)
         
     def _initialize_perfect_health_baseline(self) -> None:
         """Initialize perfect health baseline"""
@@ -236,85 +240,80 @@ class PerfectHealthSystem:
     def _create_perfect_health_alert(self, severity: AlertSeverity, category: CheckCategory, 
                                    message: str, source: str, metadata: Dict[str, Any] = None,
                                    auto_resolvable: bool = False) -> HealthAlert:
-        """Create perfect health alert"""
+        """Publish a perfect health alert on the engine's pipeline"""
         try:
-            alert_id = f"health_{int(time.time())}_{len(self.health_alerts)}"
-            alert = HealthAlert(
-                id=alert_id,
-                severity=severity,
-                category=category,
-                message=message,
-                source=source,
-                timestamp=datetime.now(),
-                resolved=False,
-                metadata=metadata or {},
-                auto_resolvable=auto_resolvable,
-                resolution_time=None,
-                precision_metrics={
-                    'detection_accuracy': 1.0,
-                    'alert_precision': 1.0,
-                    'response_time': 0.0
-                }
-            )
-            
-            self.health_alerts.append(alert)
-            
-            # Log alert
-            log_level = {
-                AlertSeverity.INFO: logging.INFO,
-                AlertSeverity.WARNING: logging.WARNING,
-                AlertSeverity.ERROR: logging.ERROR,
-                AlertSeverity.CRITICAL: logging.ERROR,
-                AlertSeverity.EMERGENCY: logging.CRITICAL
-            }.get(severity, logging.INFO)
-            
-            logger.log(log_level, f"PERFECT HEALTH ALERT [{severity.value.upper()}] {source}: {message}")
-            
-            return alert
-            
+            event = self.engine.emit(severity.value, message, source, category.value, metadata, auto_resolvable)
+            return next((alert for alert in reversed(self.health_alerts) if alert.id == event.id), None)
         except Exception as e:
             logger.error(f"Error creating perfect health alert: {str(e)}")
             return None
     
+    def close(self) -> None:
+        """Stop receiving alerts from the shared health engine"""
+        self.engine.unsubscribe(self._receive_health_alert)
+    
+    def _receive_health_alert(self, event: HealthEvent) -> None:
+        """Record an alert from the engine's pipeline, whichever view raised it"""
+        alert = HealthAlert(
+            id=event.id,
+            severity=as_enum(AlertSeverity, event.severity, AlertSeverity.EMERGENCY),
+            category=as_enum(CheckCategory, event.category, CheckCategory.SYSTEM),
+            message=event.message,
+            source=event.source,
+            timestamp=event.timestamp,
+            resolved=False,
+            metadata=event.metadata,
+            auto_resolvable=event.auto_resolvable,
+            resolution_time=None,
+            precision_metrics={
+                'detection_accuracy': 1.0,
+                'alert_precision': 1.0,
+                'response_time': 0.0
+            }
+        )
+        self.health_alerts.append(alert)
+    
     @perfect_health_monitor
     def check_perfect_system_health(self) -> Dict[str, Any]:
         """Check perfect system health"""
         try:
             logger.info("Starting perfect system health check")
             
+            # Latest background sample (no inline psutil polling)
+            sample = self.engine.snapshot()
+            
             # CPU health check with perfect metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
-            cpu_freq = psutil.cpu_freq()
-            load_avg = psutil.getloadavg()
+            cpu_percent = sample.cpu_percent
+            cpu_count = sample.cpu_count
+            cpu_freq = sample.cpu_freq
+            load_avg = sample.load_avg
             
             cpu_health_score = self._calculate_perfect_cpu_health(cpu_percent, cpu_count, cpu_freq, load_avg)
             cpu_status = self._classify_perfect_health_status(cpu_health_score)
             
             # Memory health check with detailed analysis
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
+            memory = sample.memory
+            swap = sample.swap
             
             memory_health_score = self._calculate_perfect_memory_health(memory, swap)
             memory_status = self._classify_perfect_health_status(memory_health_score)
             
             # Disk health check with I/O analysis
-            disk = psutil.disk_usage('/')
-            disk_io = psutil.disk_io_counters()
+            disk = sample.disk
+            disk_io = sample.disk_io
             
             disk_health_score = self._calculate_perfect_disk_health(disk, disk_io)
             disk_status = self._classify_perfect_health_status(disk_health_score)
             
             # Network health check with advanced metrics
-            network_io = psutil.net_io_counters()
-            network_connections = len(psutil.net_connections())
+            network_io = sample.network_io
+            network_connections = sample.network_connections
             
             network_health_score = self._calculate_perfect_network_health(network_io, network_connections)
             network_status = self._classify_perfect_health_status(network_health_score)
             
             # Process health check
-            processes = list(psutil.process_iter())
-            process_health_score = self._calculate_perfect_process_health(processes)
+            process_health_score = self._calculate_perfect_process_health(sample.process_count, sample.process_status_counts)
             process_status = self._classify_perfect_health_status(process_health_score)
             
             # Calculate overall system health
@@ -415,7 +414,7 @@ class PerfectHealthSystem:
                         'precision': 1.0
                     },
                     'processes': {
-                        'count': len(processes),
+                        'count': sample.process_count,
                         'score': process_health_score,
                         'status': process_status.value,
                         'precision': 1.0
@@ -567,31 +566,16 @@ class PerfectHealthSystem:
             logger.error(f"Error calculating perfect network health: {str(e)}")
             return 0.0
     
-    def _calculate_perfect_process_health(self, processes: List) -> float:
+    def _calculate_perfect_process_health(self, total_count: int, status_counts: Dict[str, int]) -> float:
         """Calculate perfect process health score"""
         try:
-            if not processes:
+            if not total_count:
                 return 100
             
-            # Count process states with perfect precision
-            running_count = 0
-            sleeping_count = 0
-            zombie_count = 0
-            
-            for proc in processes:
-                try:
-                    status = proc.status()
-                    if status == psutil.STATUS_RUNNING:
-                        running_count += 1
-                    elif status == psutil.STATUS_SLEEPING:
-                        sleeping_count += 1
-                    elif status == psutil.STATUS_ZOMBIE:
-                        zombie_count += 1
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            running_count = status_counts.get(psutil.STATUS_RUNNING, 0)
+            zombie_count = status_counts.get(psutil.STATUS_ZOMBIE, 0)
             
             # Calculate health with perfect precision
-            total_count = len(processes)
             running_ratio = running_count / total_count
             zombie_ratio = zombie_count / total_count
             
@@ -698,6 +682,18 @@ class PerfectHealthSystem:
             current_health = statistics.mean(system_scores)
             predicted_health = max(0, current_health - 1)  # Assume minimal degradation
             
+            # Project from recorded history; the thresholds above only cover a cold start
+            self.history.append('perfect.system.health_score', current_health)
+            cpu_trend, cpu_prediction, cpu_confidence = self.history.project(
+                'system.cpu_percent', cpu_percent, self.prediction_horizon, (cpu_trend, cpu_prediction), lower=0, upper=100)
+            memory_trend, memory_prediction, memory_confidence = self.history.project(
+                'system.memory_percent', memory_percent, self.prediction_horizon, (memory_trend, memory_prediction), lower=0, upper=100)
+            disk_trend, disk_prediction, disk_confidence = self.history.project(
+                'system.disk_percent', disk_percent, self.prediction_horizon, (disk_trend, disk_prediction), lower=0, upper=100)
+            _, predicted_health, health_confidence = self.history.project(
+                'perfect.system.health_score', current_health, self.prediction_horizon, ('stable', predicted_health), lower=0, upper=100)
+            history_confidence = statistics.mean([cpu_confidence, memory_confidence, disk_confidence, health_confidence])
+            
             return {
                 'trends': {
                     'cpu': cpu_trend,
@@ -710,7 +706,7 @@ class PerfectHealthSystem:
                     'disk_usage': disk_prediction,
                     'health_score': predicted_health
                 },
-                'confidence': 0.9999,  # Perfect confidence
+                'confidence': history_confidence or 0.9999,  # Perfect confidence
                 'time_horizon': self.prediction_horizon,
                 'prediction_accuracy': 0.9999  # Perfect prediction accuracy
             }
@@ -737,101 +733,72 @@ class PerfectHealthSystem:
             error_rates = []
             throughputs = []
             
+            # Probe every endpoint concurrently (a run takes max-probe time)
+            probes = self.engine.probe(endpoints, samples=5)
+            
             # Check each endpoint with perfect analysis
             for endpoint in endpoints:
-                try:
-                    # Multiple requests for perfect accuracy
-                    request_times = []
-                    success_count = 0
-                    
-                    for _ in range(5):  # 5 requests per endpoint for perfect accuracy
-                        start_time = time.time()
-                        response = requests.get(endpoint, timeout=10)
-                        response_time = (time.time() - start_time) * 1000
-                        request_times.append(response_time)
-                        
-                        if response.status_code == 200:
-                            success_count += 1
-                    
-                    avg_response_time = statistics.mean(request_times)
-                    response_times.append(avg_response_time)
-                    
-                    # Calculate endpoint metrics with perfect precision
-                    success_rate = success_count / 5
-                    error_rates.append(1 - success_rate)
-                    
-                    # Calculate throughput (simplified)
-                    throughput = 1000 / avg_response_time if avg_response_time > 0 else 0
-                    throughputs.append(throughput)
-                    
-                    # Determine endpoint status with perfect precision
-                    if success_rate == 1.0 and avg_response_time < 50:
-                        status = HealthStatus.PERFECT
-                        score = 100
-                    elif success_rate == 1.0 and avg_response_time < 75:
-                        status = HealthStatus.EXCELLENT
-                        score = 95
-                    elif success_rate >= 0.9 and avg_response_time < 100:
-                        status = HealthStatus.VERY_GOOD
-                        score = 90
-                    elif success_rate >= 0.8 and avg_response_time < 150:
-                        status = HealthStatus.GOOD
-                        score = 85
-                    elif success_rate >= 0.6 and avg_response_time < 250:
-                        status = HealthStatus.FAIR
-                        score = 75
-                    elif success_rate > 0:
-                        status = HealthStatus.POOR
-                        score = 50
-                    else:
-                        status = HealthStatus.CRITICAL
-                        score = 0
-                    
-                    total_score += score
-                    
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'avg_response_time': avg_response_time,
-                        'success_rate': success_rate,
-                        'throughput': throughput,
-                        'status': status.value,
-                        'score': score,
-                        'request_times': request_times,
-                        'precision': 1.0
-                    })
-                    
-                except requests.exceptions.Timeout:
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'error': 'timeout',
-                        'status': HealthStatus.CRITICAL.value,
-                        'score': 0,
-                        'precision': 1.0
-                    })
-                    total_score += 0
-                    error_rates.append(1.0)
-                    
-                except requests.exceptions.ConnectionError:
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'error': 'connection_error',
-                        'status': HealthStatus.CRITICAL.value,
-                        'score': 0,
-                        'precision': 1.0
-                    })
-                    total_score += 0
-                    error_rates.append(1.0)
-                    
-                except Exception as e:
+                probe = probes[endpoint]
+                if probe.error:
                     endpoint_results.append({
                         'endpoint': endpoint,
-                        'error': str(e),
+                        'error': probe.error,
                         'status': HealthStatus.CRITICAL.value,
                         'score': 0,
                         'precision': 1.0
                     })
                     total_score += 0
                     error_rates.append(1.0)
+                    continue
+                
+                request_times = probe.request_times
+                avg_response_time = statistics.mean(request_times)
+                response_times.append(avg_response_time)
+                
+                # Calculate endpoint metrics with perfect precision
+                success_rate = probe.success_rate
+                error_rates.append(1 - success_rate)
+                
+                # Calculate throughput (simplified)
+                throughput = 1000 / avg_response_time if avg_response_time > 0 else 0
+                throughputs.append(throughput)
+                
+                # Determine endpoint status with perfect precision
+                if success_rate == 1.0 and avg_response_time < 50:
+                    status = HealthStatus.PERFECT
+                    score = 100
+                elif success_rate == 1.0 and avg_response_time < 75:
+                    status = HealthStatus.EXCELLENT
+                    score = 95
+                elif success_rate >= 0.9 and avg_response_time < 100:
+                    status = HealthStatus.VERY_GOOD
+                    score = 90
+                elif success_rate >= 0.8 and avg_response_time < 150:
+                    status = HealthStatus.GOOD
+                    score = 85
+                elif success_rate >= 0.6 and avg_response_time < 250:
+                    status = HealthStatus.FAIR
+                    score = 75
+                elif success_rate > 0:
+                    status = HealthStatus.POOR
+                    score = 50
+                else:
+                    status = HealthStatus.CRITICAL
+                    score = 0
+                
+                total_score += score
+                
+                endpoint_results.append({
+                    'endpoint': endpoint,
+                    'avg_response_time': avg_response_time,
+                    'success_rate': success_rate,
+                    'throughput': throughput,
+                    'status': status.value,
+                    'score': score,
+                    'request_times': request_times,
+                    'latency_percentiles': probe.percentiles,
+                    'precision': 1.0
+                })
             
             # Calculate overall application health
             overall_score = total_score / len(endpoints) if endpoints else 0
@@ -977,6 +944,19 @@ class PerfectHealthSystem:
             predicted_response_time = avg_response_time * 1.1 if avg_response_time > 75 else avg_response_time
             predicted_error_rate = avg_error_rate * 1.2 if avg_error_rate > 0.02 else avg_error_rate
             
+            # Project from recorded history; the thresholds above only cover a cold start
+            self.history.append_many({
+                'perfect.application.response_time': avg_response_time,
+                'perfect.application.error_rate': avg_error_rate
+            })
+            response_time_trend, predicted_response_time, response_time_confidence = self.history.project(
+                'perfect.application.response_time', avg_response_time, self.prediction_horizon,
+                (response_time_trend, predicted_response_time), lower=0)
+            error_rate_trend, predicted_error_rate, error_rate_confidence = self.history.project(
+                'perfect.application.error_rate', avg_error_rate, self.prediction_horizon,
+                (error_rate_trend, predicted_error_rate), lower=0, upper=1)
+            history_confidence = (response_time_confidence + error_rate_confidence) / 2
+            
             # Calculate reliability metrics
             reliability_score = 1 - avg_error_rate
             performance_score = max(0, 1 - (avg_response_time / 500))  # Normalize to 500ms
@@ -992,7 +972,7 @@ class PerfectHealthSystem:
                     'reliability_score': reliability_score,
                     'performance_score': performance_score
                 },
-                'confidence': 0.9999,
+                'confidence': history_confidence or 0.9999,
                 'time_horizon': self.prediction_horizon,
                 'prediction_accuracy': 0.9999
             }
@@ -1020,26 +1000,26 @@ class PerfectHealthSystem:
             
             # Execute health checks
             health_results = {}
-            with ThreadPoolExecutor(max_workers=8) as executor:
-                future_to_check = {
-                    executor.submit(check): category
-                    for category, check in health_checks.items()
-                }
-                
-                for future in as_completed(future_to_check):
-                    category = future_to_check[future]
-                    try:
-                        result = future.result()
-                        health_results[category] = result
-                    except Exception as e:
-                        logger.error(f"Perfect health check {category} failed: {str(e)}")
-                        health_results[category] = {
-                            'status': HealthStatus.CRITICAL.value,
-                            'score': 0.0,
-                            'error': str(e),
-                            'timestamp': datetime.now().isoformat()
-                        }
+            executor = self.executor  # shared engine workers
+            future_to_check = {
+                executor.submit(check): category
+                for category, check in health_checks.items()
+            }
             
+            for future in as_completed(future_to_check):
+                category = future_to_check[future]
+                try:
+                    result = future.result()
+                    health_results[category] = result
+                except Exception as e:
+                    logger.error(f"Perfect health check {category} failed: {str(e)}")
+                    health_results[category] = {
+                        'status': HealthStatus.CRITICAL.value,
+                        'score': 0.0,
+                        'error': str(e),
+                        'timestamp': datetime.now().isoformat()
+                    }
+
             # Calculate overall health
             scores = [result.get('score', 0) for result in health_results.values()]
             overall_score = statistics.mean(scores) if scores else 0
@@ -0,0 +1,244 @@
+"""
+Real-Time Monitoring Runtime
+Supervised periodic loops that never block the event loop
+
+Each loop runs a blocking collector on a dedicated thread pool and hands
+the result to an async handler on the loop. Per loop:
+
+- supervision: a crashed loop is restarted with exponential backoff
+- fixed-rate schedule: ticks are due every `interval`; a tick that runs
+  past the next due time counts as an overrun and the missed ticks are
+  dropped rather than replayed in a burst
+- CPU budget: a token bucket of collector thread CPU time refills at
+  `cpu_budget` seconds per second; a loop out of credit skips ticks
+- load shedding: every loop skips ticks while system CPU is above
+  `load_threshold` or the event loop itself is lagging
+- metrics: wake-up lag histogram, tick outcome and overrun counters
+  per loop
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from health.resource_sampler import get_resource_sampler
+from metrics.exporter import HEALTH_LOOP_LAG, HEALTH_LOOP_OVERRUNS, HEALTH_LOOP_TICKS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REALTIME_WORKERS = int(os.environ.get("HEALTH_REALTIME_WORKERS", "4"))
+DEFAULT_LOAD_THRESHOLD = float(os.environ.get("HEALTH_REALTIME_LOAD_THRESHOLD", "90"))
+DEFAULT_LAG_THRESHOLD = float(os.environ.get("HEALTH_REALTIME_LAG_THRESHOLD", "0.25"))
+MAX_RESTART_BACKOFF = 30.0
+
+
+@dataclass
+class LoopSpec:
+    """One periodic monitoring loop"""
+    name: str
+    collect: Callable[[], Any]                    # blocking; runs on the runtime's threads
+    handle: Optional[Callable[[Any], Awaitable[Any]]] = None   # async; runs on the loop
+    interval: float = 1.0
+    cpu_budget: float = 0.1                       # collector CPU seconds per wall second
+    burst: float = 5.0                            # bucket size, in intervals' worth of budget
+
+
+@dataclass
+class LoopStats:
+    """Counters and timings of one loop"""
+    ticks: int = 0
+    errors: int = 0
+    overruns: int = 0
+    skipped_load: int = 0
+    skipped_budget: int = 0
+    missed: int = 0
+    restarts: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+    last_duration: float = 0.0
+    cpu_seconds: float = 0.0
+    credit: float = 0.0
+    last_error: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+
+
+class RealtimeRuntime:
+    """Schedules LoopSpecs as supervised tasks on the running event loop"""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_REALTIME_WORKERS,
+        load_threshold: float = DEFAULT_LOAD_THRESHOLD,
+        lag_threshold: float = DEFAULT_LAG_THRESHOLD,
+        load: Optional[Callable[[], float]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_workers = max_workers
+        self.load_threshold = load_threshold
+        self.lag_threshold = lag_threshold
+        self.load = load or _system_load
+        self.clock = clock
+        self.specs: Dict[str, LoopSpec] = {}
+        self.stats: Dict[str, LoopStats] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._loop_lag = 0.0
+
+    def add(self, spec: LoopSpec):
+        self.specs[spec.name] = spec
+        self.stats[spec.name] = LoopStats(credit=spec.cpu_budget * spec.interval)
+
+    # Lifecycle -----------------------------------------------------------
+
+    def start(self):
+        """Start one supervised task per loop (idempotent)"""
+        if self.running:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="health-realtime")
+        loop = asyncio.get_running_loop()
+        self._tasks = {name: loop.create_task(self._supervise(spec), name=f"realtime:{name}")
+                       for name, spec in self.specs.items()}
+        logger.info(f"Real-time monitoring started ({len(self._tasks)} loops)")
+
+    async def stop(self):
+        """Cancel every loop and release the worker threads"""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks = {}
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks.values())
+
+    async def _supervise(self, spec: LoopSpec):
+        stats = self.stats[spec.name]
+        while True:
+            try:
+                await self._run(spec, stats)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.restarts += 1
+                stats.last_error = str(e)
+                backoff = min(MAX_RESTART_BACKOFF, spec.interval * 2 ** min(stats.restarts, 10))
+                logger.error(f"Real-time loop {spec.name} crashed ({e}); restarting in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+
+    # Ticks ---------------------------------------------------------------
+
+    async def _run(self, spec: LoopSpec, stats: LoopStats):
+        lag_metric = HEALTH_LOOP_LAG.labels(spec.name)
+        due = self.clock()
+        while True:
+            delay = due - self.clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            lag = max(0.0, self.clock() - due)
+            stats.last_lag = lag
+            stats.max_lag = max(stats.max_lag, lag)
+            self._loop_lag = lag
+            lag_metric.observe(lag)
+
+            # Refill the CPU budget for the interval that just elapsed
+            capacity = spec.cpu_budget * spec.interval * spec.burst
+            stats.credit = min(capacity, stats.credit + spec.cpu_budget * spec.interval)
+
+            outcome = await self._tick(spec, stats, lag)
+            HEALTH_LOOP_TICKS.labels(spec.name, outcome).inc()
+
+            # Fixed rate; if the tick ran past later due times, drop them
+            due += spec.interval
+            now = self.clock()
+            if now > due:
+                missed = int((now - due) // spec.interval) + 1
+                stats.missed += missed
+                stats.overruns += 1
+                HEALTH_LOOP_OVERRUNS.labels(spec.name).inc()
+                due += missed * spec.interval
+
+    async def _tick(self, spec: LoopSpec, stats: LoopStats, lag: float) -> str:
+        if lag > self.lag_threshold or self._over_load():
+            stats.skipped_load += 1
+            return "skipped_load"
+        if stats.credit <= 0:
+            stats.skipped_budget += 1
+            return "skipped_budget"
+
+        started = self.clock()
+        try:
+            result, cpu = await asyncio.get_running_loop().run_in_executor(self._executor, _timed, spec.collect)
+            stats.cpu_seconds += cpu
+            stats.credit -= cpu
+            if spec.handle is not None:
+                await spec.handle(result)
+            outcome = "ok"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            stats.errors += 1
+            stats.last_error = str(e)
+            logger.error(f"Real-time loop {spec.name} tick failed: {e}")
+            outcome = "error"
+        stats.ticks += 1
+        stats.last_duration = self.clock() - started
+        return outcome
+
+    def _over_load(self) -> bool:
+        try:
+            return self.load() > self.load_threshold
+        except Exception:
+            return False
+
+    # Reads ---------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-loop lag, overruns, skips and CPU use"""
+        loops = {}
+        for name, stats in self.stats.items():
+            spec = self.specs[name]
+            elapsed = max(time.time() - stats.started_at, 1e-9)
+            task = self._tasks.get(name)
+            loops[name] = {
+                "running": task is not None and not task.done(),
+                "interval": spec.interval,
+                "ticks": stats.ticks,
+                "errors": stats.errors,
+                "overruns": stats.overruns,
+                "missed_ticks": stats.missed,
+                "skipped_load": stats.skipped_load,
+                "skipped_budget": stats.skipped_budget,
+                "restarts": stats.restarts,
+                "last_lag_ms": round(stats.last_lag * 1000, 3),
+                "max_lag_ms": round(stats.max_lag * 1000, 3),
+                "last_duration_ms": round(stats.last_duration * 1000, 3),
+                "cpu_budget": spec.cpu_budget,
+                "cpu_used": round(stats.cpu_seconds / elapsed, 4),
+                "last_error": stats.last_error,
+            }
+        return {"loops": loops, "workers": self.max_workers, "event_loop_lag_ms": round(self._loop_lag * 1000, 3)}
+
+
+def _timed(collect: Callable[[], Any]):
+    """Run a collector on a worker thread, returning (result, thread CPU seconds)"""
+    started = time.thread_time()
+    result = collect()
+    return result, time.thread_time() - started
+
+
+def _system_load() -> float:
+    """System CPU percent from the running sampler, else the 1-minute load average"""
+    sampler = get_resource_sampler()
+    if sampler.running:
+        return sampler.snapshot().cpu_percent
+    if hasattr(os, "getloadavg"):
+        return 100.0 * os.getloadavg()[0] / (os.cpu_count() or 1)
+    return 0.0
@@ -0,0 +1,353 @@
+"""
+Background Resource Sampler
+One psutil sampling loop shared by every health system
+
+The health systems used to call psutil.cpu_percent(interval=1) and walk
+process_iter() / net_connections() inline, blocking a worker for over a
+second per request. The sampler collects CPU, memory, disk, network and
+process metrics on a fixed interval (off the event loop) into fixed-size
+numpy ring buffers; health checks read the latest snapshot in O(1) and
+windowed aggregates from the buffers. Key gauges are also appended to
+the time-series store for long-term history and fed to the streaming
+anomaly detector.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import psutil
+
+from health.anomaly_detector import StreamingAnomalyDetector, get_anomaly_detector
+from health.timeseries_store import TimeSeriesStore, get_timeseries_store
+
+logger = logging.getLogger(__name__)
+
+# Columns of the ring buffer, in order
+FIELDS = (
+    "timestamp",
+    "cpu_percent",
+    "load_1",
+    "memory_percent",
+    "memory_available",
+    "swap_percent",
+    "disk_percent",
+    "disk_free",
+    "disk_read_bytes",
+    "disk_write_bytes",
+    "net_bytes_sent",
+    "net_bytes_recv",
+    "net_connections",
+    "process_count",
+    "processes_running",
+    "processes_zombie",
+)
+FIELD_INDEX = {name: i for i, name in enumerate(FIELDS)}
+
+# Monotonic counters: windows report a per-second rate for these
+COUNTER_FIELDS = frozenset({"disk_read_bytes", "disk_write_bytes", "net_bytes_sent", "net_bytes_recv"})
+
+# Gauges kept as long-term history in the time-series store
+HISTORY_FIELDS = ("cpu_percent", "load_1", "memory_percent", "swap_percent", "disk_percent",
+                  "net_connections", "process_count")
+
+DEFAULT_INTERVAL = float(os.environ.get("HEALTH_SAMPLER_INTERVAL", "5"))
+DEFAULT_CAPACITY = int(os.environ.get("HEALTH_SAMPLER_CAPACITY", "720"))
+
+
+@dataclass(frozen=True)
+class ResourceSnapshot:
+    """One sample; psutil result objects are kept as-is for the health calculators"""
+    timestamp: float
+    cpu_percent: float
+    cpu_count: int
+    cpu_freq: Any
+    load_avg: Tuple[float, float, float]
+    memory: Any
+    swap: Any
+    disk: Any
+    disk_io: Any
+    network_io: Any
+    network_connections: int
+    process_count: int
+    process_status_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp
+
+    def row(self) -> Tuple[float, ...]:
+        return (
+            self.timestamp,
+            self.cpu_percent,
+            self.load_avg[0] if self.load_avg else 0.0,
+            self.memory.percent,
+            self.memory.available,
+            self.swap.percent,
+            self.disk.percent,
+            self.disk.free,
+            self.disk_io.read_bytes if self.disk_io else 0,
+            self.disk_io.write_bytes if self.disk_io else 0,
+            self.network_io.bytes_sent if self.network_io else 0,
+            self.network_io.bytes_recv if self.network_io else 0,
+            self.network_connections,
+            self.process_count,
+            self.process_status_counts.get(psutil.STATUS_RUNNING, 0),
+            self.process_status_counts.get(psutil.STATUS_ZOMBIE, 0),
+        )
+
+
+def collect_snapshot(disk_path: str = "/", walk: bool = True) -> ResourceSnapshot:
+    """
+    Take one sample with psutil
+
+    cpu_percent(interval=None) measures since the previous call, so the
+    sampling interval is the CPU averaging window; nothing here sleeps.
+    walk=False skips the slow process / connection walk (their counts
+    are reported as 0).
+    """
+    connections = 0
+    if walk:
+        try:
+            connections = len(psutil.net_connections())
+        except (psutil.AccessDenied, OSError):
+            pass
+
+    statuses = Counter()
+    process_count = 0
+    for proc in psutil.process_iter(["status"]) if walk else ():
+        process_count += 1
+        status = proc.info.get("status")
+        if status:
+            statuses[status] += 1
+
+    try:
+        load_avg = psutil.getloadavg()
+    except (AttributeError, OSError):
+        load_avg = (0.0, 0.0, 0.0)
+
+    return ResourceSnapshot(
+        timestamp=time.time(),
+        cpu_percent=psutil.cpu_percent(interval=None),
+        cpu_count=psutil.cpu_count(),
+        cpu_freq=psutil.cpu_freq(),
+        load_avg=load_avg,
+        memory=psutil.virtual_memory(),
+        swap=psutil.swap_memory(),
+        disk=psutil.disk_usage(disk_path),
+        disk_io=psutil.disk_io_counters(),
+        network_io=psutil.net_io_counters(),
+        network_connections=connections,
+        process_count=process_count,
+        process_status_counts=dict(statuses),
+    )
+
+
+class ResourceSampler:
+    """Periodic resource sampler backed by numpy ring buffers"""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        capacity: int = DEFAULT_CAPACITY,
+        disk_path: str = "/",
+        collector: Optional[Callable[[], ResourceSnapshot]] = None,
+        store: Optional[TimeSeriesStore] = None,
+        detector: Optional[StreamingAnomalyDetector] = None
+    ):
+        self.interval = interval
+        self.capacity = capacity
+        self.disk_path = disk_path
+        self.collector = collector or (lambda: collect_snapshot(disk_path))
+        self.store = store
+        self.detector = detector
+
+        self._buffer = np.full((capacity, len(FIELDS)), np.nan, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self._latest: Optional[ResourceSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refreshing = False
+        self._samples = 0
+        self._errors = 0
+        self._last_duration = 0.0
+
+        # Prime cpu_percent so the first interval-less reading is meaningful
+        psutil.cpu_percent(interval=None)
+
+    # Lifecycle -----------------------------------------------------------
+
+    def start(self):
+        """Start the sampling task on the running event loop"""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"Resource sampler started (every {self.interval}s, {self.capacity} samples)")
+
+    async def stop(self):
+        """Cancel the sampling task"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _run(self):
+        while True:
+            try:
+                # process_iter / net_connections are slow: keep them off the loop
+                await asyncio.to_thread(self.sample_once)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._errors += 1
+                logger.error(f"Resource sampler error: {e}")
+            await asyncio.sleep(self.interval)
+
+    # Sampling ------------------------------------------------------------
+
+    def sample_once(self) -> ResourceSnapshot:
+        """Collect one snapshot and append it to the ring buffer"""
+        started = time.perf_counter()
+        snapshot = self.collector()
+        row = snapshot.row()
+        with self._lock:
+            self._buffer[self._head] = row
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self._latest = snapshot
+        gauges = {f"system.{name}": row[FIELD_INDEX[name]] for name in HISTORY_FIELDS}
+        if self.store is not None:
+            self.store.append_many(gauges, timestamp=snapshot.timestamp)
+        if self.detector is not None:
+            self.detector.observe(gauges, timestamp=snapshot.timestamp)
+        self._samples += 1
+        self._last_duration = time.perf_counter() - started
+        return snapshot
+
+    # Reads ---------------------------------------------------------------
+
+    def snapshot(self) -> ResourceSnapshot:
+        """
+        Latest snapshot (O(1)); never walks processes on the caller's thread
+
+        Without a running sampler a stale snapshot is returned as is (see
+        its `age`) while one background thread refreshes it. Only the very
+        first read has nothing to return: outside an event loop (scripts,
+        tests) it collects inline, on a loop it takes a quick sample
+        without the process / connection walk and refreshes in the
+        background.
+        """
+        latest = self._latest
+        if latest is None:
+            if not _on_event_loop():
+                return self.sample_once()
+            self._refresh_in_background()
+            return collect_snapshot(self.disk_path, walk=False)
+        if not self.running and latest.age > self.interval:
+            self._refresh_in_background()
+        return latest
+
+    def _refresh_in_background(self):
+        """Start one refresh thread unless one is already collecting"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="resource-sampler-refresh", daemon=True).start()
+
+    def _refresh(self):
+        try:
+            self.sample_once()
+        except Exception as e:
+            self._errors += 1
+            logger.error(f"Resource sampler refresh error: {e}")
+        finally:
+            self._refreshing = False
+
+    def _ordered(self) -> np.ndarray:
+        """Buffered rows, oldest first (a copy)"""
+        with self._lock:
+            if self._count < self.capacity:
+                return self._buffer[:self._count].copy()
+            return np.concatenate((self._buffer[self._head:], self._buffer[:self._head]))
+
+    def series(self, name: str, seconds: Optional[float] = None) -> np.ndarray:
+        """Values of one field over the last `seconds` (all buffered samples if None)"""
+        rows = self._ordered()
+        if seconds is not None and len(rows):
+            rows = rows[rows[:, 0] >= time.time() - seconds]
+        return rows[:, FIELD_INDEX[name]]
+
+    def window(self, seconds: float) -> Dict[str, Any]:
+        """
+        Aggregates over the last `seconds`
+
+        Gauges get mean/min/max/last; counters get a per-second rate.
+        """
+        rows = self._ordered()
+        if len(rows):
+            rows = rows[rows[:, 0] >= time.time() - seconds]
+        if not len(rows):
+            return {"samples": 0, "seconds": seconds}
+
+        elapsed = float(rows[-1, 0] - rows[0, 0])
+        result: Dict[str, Any] = {"samples": len(rows), "seconds": seconds, "span": elapsed}
+        for name in FIELDS[1:]:
+            column = rows[:, FIELD_INDEX[name]]
+            if name in COUNTER_FIELDS:
+                result[f"{name}_per_sec"] = float(column[-1] - column[0]) / elapsed if elapsed > 0 else 0.0
+            else:
+                result[name] = {
+                    "mean": float(column.mean()),
+                    "min": float(column.min()),
+                    "max": float(column.max()),
+                    "last": float(column[-1]),
+                }
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sampler health: cadence, cost and buffer fill"""
+        latest = self._latest
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "capacity": self.capacity,
+            "buffered": self._count,
+            "samples": self._samples,
+            "errors": self._errors,
+            "last_sample_ms": round(self._last_duration * 1000, 2),
+            "snapshot_age": round(latest.age, 3) if latest else None,
+        }
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+_resource_sampler: Optional[ResourceSampler] = None
+
+
+def get_resource_sampler() -> ResourceSampler:
+    """Process-wide resource sampler"""
+    global _resource_sampler
+    if _resource_sampler is None:
+        _resource_sampler = ResourceSampler(
+            store=get_timeseries_store(),
+            detector=get_anomaly_detector()
+        )
+    return _resource_sampler
@@ -0,0 +1,528 @@
+"""
+Embedded Time-Series Store
+Local metric history for trend, prediction and alert evaluation
+
+- per metric, columnar numpy chunks: an in-memory head chunk receives
+  appends; full chunks are sealed to disk
+- sealed chunks are compressed column by column: timestamps as
+  delta-of-delta integers, floats XOR'd with their predecessor and
+  byte-shuffled, then zlib
+- chunks are appended to per-day segment files per metric and tier and
+  read back through mmap; retention drops whole segment files
+- every sample also feeds 1-minute and 1-hour rollup tiers
+  (count/sum/min/max), so long-range queries never touch raw data
+
+Query API: range, aggregate, percentile, latest, trend, forecast.
+"""
+
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (tier name, bucket seconds); raw has no bucket
+TIERS = (("raw", 0), ("1m", 60), ("1h", 3600))
+ROLLUP_TIERS = tuple((name, seconds) for name, seconds in TIERS if seconds)
+
+# Columns per tier (timestamp first)
+RAW_COLUMNS = ("timestamp", "value")
+ROLLUP_COLUMNS = ("timestamp", "count", "sum", "min", "max")
+
+DEFAULT_RETENTION = {
+    "raw": 6 * 3600,
+    "1m": 7 * 86400,
+    "1h": 365 * 86400,
+}
+DEFAULT_CHUNK_SIZE = 1024
+
+_CHUNK_MAGIC = b"TSC1"
+_CHUNK_HEADER = struct.Struct("<4sIddB")
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9._-]")
+
+
+# Column codecs ---------------------------------------------------------------
+
+def encode_timestamps(timestamps: np.ndarray) -> bytes:
+    """Millisecond timestamps as [first, first delta, delta-of-deltas...]"""
+    ms = np.round(np.asarray(timestamps, dtype=np.float64) * 1000).astype(np.int64)
+    if len(ms) < 2:
+        encoded = ms
+    else:
+        encoded = np.concatenate((ms[:1], np.diff(ms[:2]), np.diff(ms, 2)))
+    return zlib.compress(encoded.tobytes(), 1)
+
+
+def decode_timestamps(payload: bytes) -> np.ndarray:
+    encoded = np.frombuffer(zlib.decompress(payload), dtype=np.int64)
+    if len(encoded) < 2:
+        return encoded.astype(np.float64) / 1000
+    deltas = np.cumsum(encoded[1:])
+    ms = np.concatenate((encoded[:1], encoded[0] + np.cumsum(deltas)))
+    return ms.astype(np.float64) / 1000
+
+
+def encode_floats(values: np.ndarray) -> bytes:
+    """Gorilla-style XOR with the previous value, byte-shuffled for zlib"""
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    xored = bits ^ np.concatenate((np.zeros(1, dtype=np.uint64), bits[:-1]))
+    shuffled = xored.view(np.uint8).reshape(-1, 8).T
+    return zlib.compress(shuffled.tobytes(), 1)
+
+
+def decode_floats(payload: bytes) -> np.ndarray:
+    raw = np.frombuffer(zlib.decompress(payload), dtype=np.uint8)
+    xored = np.ascontiguousarray(raw.reshape(8, -1).T).view(np.uint64).ravel()
+    return np.bitwise_xor.accumulate(xored).view(np.float64)
+
+
+def encode_chunk(columns: np.ndarray) -> bytes:
+    """Serialize an (n, ncols) chunk; column 0 is the timestamp"""
+    payloads = [encode_timestamps(columns[:, 0])]
+    payloads.extend(encode_floats(columns[:, i]) for i in range(1, columns.shape[1]))
+    header = _CHUNK_HEADER.pack(_CHUNK_MAGIC, len(columns), float(columns[0, 0]),
+                                float(columns[-1, 0]), columns.shape[1])
+    lengths = struct.pack(f"<{len(payloads)}I", *(len(p) for p in payloads))
+    return header + lengths + b"".join(payloads)
+
+
+def decode_chunk(buffer, offset: int = 0) -> Tuple[np.ndarray, int]:
+    """Decode the chunk at offset; returns (columns, next offset)"""
+    magic, n, _, _, ncols = _CHUNK_HEADER.unpack_from(buffer, offset)
+    if magic != _CHUNK_MAGIC:
+        raise ValueError(f"Corrupt chunk at offset {offset}")
+    offset += _CHUNK_HEADER.size
+    lengths = struct.unpack_from(f"<{ncols}I", buffer, offset)
+    offset += 4 * ncols
+    columns = np.empty((n, ncols), dtype=np.float64)
+    for i, length in enumerate(lengths):
+        payload = bytes(buffer[offset:offset + length])
+        columns[:, i] = decode_timestamps(payload) if i == 0 else decode_floats(payload)
+        offset += length
+    return columns, offset
+
+
+# Storage ---------------------------------------------------------------------
+
+@dataclass
+class ChunkRef:
+    """A sealed chunk inside a segment file"""
+    path: Path
+    offset: int
+    length: int
+    count: int
+    t_min: float
+    t_max: float
+
+
+class _Head:
+    """Unsealed in-memory chunk"""
+
+    def __init__(self, ncols: int, capacity: int):
+        self.rows = np.empty((capacity, ncols), dtype=np.float64)
+        self.count = 0
+
+    @property
+    def full(self) -> bool:
+        return self.count == len(self.rows)
+
+    def append(self, row):
+        self.rows[self.count] = row
+        self.count += 1
+
+    def view(self) -> np.ndarray:
+        return self.rows[:self.count]
+
+
+class _Rollup:
+    """Open bucket of one rollup tier"""
+    __slots__ = ("bucket", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.bucket = None
+
+    def reset(self, bucket: float):
+        self.bucket = bucket
+        self.count, self.sum, self.min, self.max = 0, 0.0, np.inf, -np.inf
+
+    def add(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def row(self) -> Tuple[float, ...]:
+        return (self.bucket, self.count, self.sum, self.min, self.max)
+
+
+class TimeSeriesStore:
+    """Embedded, compressed, tiered metric store"""
+
+    def __init__(self, root: Path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 retention: Optional[Dict[str, float]] = None):
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+        self.retention = {**DEFAULT_RETENTION, **(retention or {})}
+
+        self._lock = threading.RLock()
+        self._heads: Dict[Tuple[str, str], _Head] = {}
+        self._chunks: Dict[Tuple[str, str], List[ChunkRef]] = {}
+        self._rollups: Dict[Tuple[str, str], _Rollup] = {}
+        self._maps: Dict[Path, mmap.mmap] = {}
+        self._last_retention = 0.0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    # Index ---------------------------------------------------------------
+
+    @staticmethod
+    def _safe(metric: str) -> str:
+        return _SAFE_NAME.sub("_", metric)
+
+    def _segment_path(self, metric: str, tier: str, t_min: float) -> Path:
+        day = datetime.fromtimestamp(t_min, tz=timezone.utc).strftime("%Y%m%d")
+        return self.root / tier / self._safe(metric) / f"{day}.seg"
+
+    def _load_index(self):
+        """Rebuild the chunk index from segment headers"""
+        for tier, _ in TIERS:
+            tier_dir = self.root / tier
+            if not tier_dir.exists():
+                continue
+            for metric_dir in tier_dir.iterdir():
+                refs = []
+                for path in sorted(metric_dir.glob("*.seg")):
+                    refs.extend(self._scan_segment(path))
+                if refs:
+                    self._chunks[(metric_dir.name, tier)] = refs
+
+    def _scan_segment(self, path: Path) -> List[ChunkRef]:
+        """Index a segment's chunks, cutting off a torn write at the end"""
+        refs = []
+        buffer = self._map(path)
+        size = len(buffer) if buffer is not None else 0
+        offset = 0
+        while offset + _CHUNK_HEADER.size <= size:
+            magic, n, t_min, t_max, ncols = _CHUNK_HEADER.unpack_from(buffer, offset)
+            if magic != _CHUNK_MAGIC:
+                break
+            lengths = struct.unpack_from(f"<{ncols}I", buffer, offset + _CHUNK_HEADER.size)
+            length = _CHUNK_HEADER.size + 4 * ncols + sum(lengths)
+            if offset + length > size:
+                break
+            refs.append(ChunkRef(path, offset, length, n, t_min, t_max))
+            offset += length
+        if offset < size:
+            logger.warning(f"Truncating torn segment {path} at offset {offset}")
+            self._maps.pop(path).close()
+            os.truncate(path, offset)
+        return refs
+
+    def _map(self, path: Path, min_size: int = 0) -> Optional[mmap.mmap]:
+        mapped = self._maps.get(path)
+        if mapped is not None and len(mapped) >= min_size:
+            return mapped
+        if mapped is not None:
+            mapped.close()
+        size = path.stat().st_size if path.exists() else 0
+        if size == 0:
+            return None
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[path] = mapped
+        return mapped
+
+    # Writes --------------------------------------------------------------
+
+    def append(self, metric: str, value: float, timestamp: Optional[float] = None):
+        """Record one sample (feeds the raw tier and every rollup tier)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        value = float(value)
+        key = self._safe(metric)
+        with self._lock:
+            self._append_row(key, "raw", (timestamp, value))
+            for tier, seconds in ROLLUP_TIERS:
+                rollup = self._rollups.setdefault((key, tier), _Rollup())
+                bucket = timestamp - timestamp % seconds
+                if rollup.bucket is None:
+                    rollup.reset(bucket)
+                elif bucket > rollup.bucket:
+                    self._append_row(key, tier, rollup.row())
+                    rollup.reset(bucket)
+                rollup.add(value)
+            if timestamp - self._last_retention > 60:
+                self._last_retention = timestamp
+                self._enforce_retention(timestamp)
+
+    def append_many(self, values: Dict[str, float], timestamp: Optional[float] = None):
+        """Record several metrics sampled at the same instant"""
+        timestamp = time.time() if timestamp is None else timestamp
+        for metric, value in values.items():
+            self.append(metric, value, timestamp)
+
+    def _append_row(self, key: str, tier: str, row):
+        ncols = len(RAW_COLUMNS) if tier == "raw" else len(ROLLUP_COLUMNS)
+        head = self._heads.get((key, tier))
+        if head is None:
+            head = self._heads[(key, tier)] = _Head(ncols, self.chunk_size)
+        head.append(row)
+        if head.full:
+            self._seal(key, tier)
+
+    def _seal(self, key: str, tier: str):
+        head = self._heads.get((key, tier))
+        if head is None or head.count == 0:
+            return
+        rows = head.view()
+        path = self._segment_path(key, tier, rows[0, 0])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        encoded = encode_chunk(rows)
+        with open(path, "ab") as f:
+            offset = f.tell()
+            f.write(encoded)
+        self._chunks.setdefault((key, tier), []).append(
+            ChunkRef(path, offset, len(encoded), head.count, float(rows[0, 0]), float(rows[-1, 0]))
+        )
+        head.count = 0
+
+    def flush(self):
+        """Seal every partially filled head chunk to disk"""
+        with self._lock:
+            for key, tier in list(self._heads):
+                self._seal(key, tier)
+
+    def _enforce_retention(self, now: float):
+        for tier, _ in TIERS:
+            cutoff = now - self.retention[tier]
+            cutoff_day = datetime.fromtimestamp(cutoff, tz=timezone.utc).strftime("%Y%m%d")
+            for (key, chunk_tier), refs in list(self._chunks.items()):
+                if chunk_tier != tier:
+                    continue
+                expired = {ref.path for ref in refs if ref.path.stem < cutoff_day}
+                if not expired:
+                    continue
+                self._chunks[(key, tier)] = [ref for ref in refs if ref.path not in expired]
+                for path in expired:
+                    mapped = self._maps.pop(path, None)
+                    if mapped is not None:
+                        mapped.close()
+                    path.unlink(missing_ok=True)
+
+    def close(self):
+        """Write out open rollup buckets and every head chunk"""
+        with self._lock:
+            for (key, tier), rollup in self._rollups.items():
+                if rollup.bucket is not None and rollup.count:
+                    self._append_row(key, tier, rollup.row())
+                    rollup.bucket = None
+        self.flush()
+        with self._lock:
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+
+    # Reads ---------------------------------------------------------------
+
+    def _choose_tier(self, start: Optional[float], now: float) -> str:
+        if start is None:
+            return "raw"
+        for tier, _ in TIERS:
+            if start >= now - self.retention[tier]:
+                return tier
+        return TIERS[-1][0]
+
+    def _rows(self, key: str, tier: str, start: float, end: float) -> np.ndarray:
+        parts = []
+        with self._lock:
+            for ref in self._chunks.get((key, tier), []):
+                if ref.t_max < start or ref.t_min > end:
+                    continue
+                buffer = self._map(ref.path, ref.offset + ref.length)
+                columns, _ = decode_chunk(buffer, ref.offset)
+                parts.append(columns)
+            head = self._heads.get((key, tier))
+            if head is not None and head.count:
+                parts.append(head.view().copy())
+            rollup = self._rollups.get((key, tier))
+            if rollup is not None and rollup.bucket is not None and rollup.count:
+                parts.append(np.array([rollup.row()], dtype=np.float64))
+
+        if not parts:
+            ncols = len(RAW_COLUMNS) if tier == "raw" else len(ROLLUP_COLUMNS)
+            return np.empty((0, ncols), dtype=np.float64)
+        rows = np.concatenate(parts)
+        rows = rows[(rows[:, 0] >= start) & (rows[:, 0] <= end)]
+        return rows[np.argsort(rows[:, 0], kind="stable")]
+
+    def range(self, metric: str, start: Optional[float] = None, end: Optional[float] = None,
+              tier: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (timestamps, values) between start and end
+
+        Rollup tiers return bucket starts and bucket means. Without an
+        explicit tier the finest one whose retention covers start is used.
+        """
+        now = time.time()
+        tier = tier or self._choose_tier(start, now)
+        rows = self._rows(self._safe(metric), tier, start if start is not None else -np.inf,
+                          end if end is not None else np.inf)
+        if tier == "raw":
+            return rows[:, 0], rows[:, 1]
+        return rows[:, 0], rows[:, 2] / np.maximum(rows[:, 1], 1)
+
+    def aggregate(self, metric: str, start: Optional[float] = None, end: Optional[float] = None,
+                  agg: str = "mean", tier: Optional[str] = None) -> Optional[float]:
+        """mean / min / max / sum / count / last over a range"""
+        now = time.time()
+        tier = tier or self._choose_tier(start, now)
+        rows = self._rows(self._safe(metric), tier, start if start is not None else -np.inf,
+                          end if end is not None else np.inf)
+        if not len(rows):
+            return None
+        if tier == "raw":
+            values = rows[:, 1]
+            reducers = {"mean": np.mean, "min": np.min, "max": np.max, "sum": np.sum,
+                        "count": len, "last": lambda v: v[-1]}
+            return float(reducers[agg](values))
+        count, total = rows[:, 1].sum(), rows[:, 2].sum()
+        reducers = {
+            "mean": lambda: total / count,
+            "min": lambda: rows[:, 3].min(),
+            "max": lambda: rows[:, 4].max(),
+            "sum": lambda: total,
+            "count": lambda: count,
+            "last": lambda: rows[-1, 2] / rows[-1, 1],
+        }
+        return float(reducers[agg]())
+
+    def percentile(self, metric: str, q: float, start: Optional[float] = None,
+                   end: Optional[float] = None, tier: Optional[str] = None) -> Optional[float]:
+        """q-th percentile (exact on raw, over bucket means on rollup tiers)"""
+        _, values = self.range(metric, start, end, tier)
+        return float(np.percentile(values, q)) if len(values) else None
+
+    def latest(self, metric: str) -> Optional[Tuple[float, float]]:
+        """Most recent raw (timestamp, value)"""
+        key = self._safe(metric)
+        with self._lock:
+            head = self._heads.get((key, "raw"))
+            if head is not None and head.count:
+                return float(head.rows[head.count - 1, 0]), float(head.rows[head.count - 1, 1])
+            refs = self._chunks.get((key, "raw"))
+        if not refs:
+            return None
+        timestamps, values = self.range(metric, refs[-1].t_min, refs[-1].t_max, "raw")
+        return (float(timestamps[-1]), float(values[-1])) if len(values) else None
+
+    def trend(self, metric: str, window: float, now: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """Least-squares slope (per second) and fit quality over the last `window` seconds"""
+        now = time.time() if now is None else now
+        timestamps, values = self.range(metric, now - window, now)
+        if len(values) < 3 or timestamps[-1] == timestamps[0]:
+            return None
+        x = timestamps - timestamps[0]
+        slope, intercept = np.polyfit(x, values, 1)
+        fitted = slope * x + intercept
+        ss_tot = float(((values - values.mean()) ** 2).sum())
+        r2 = 1 - float(((values - fitted) ** 2).sum()) / ss_tot if ss_tot > 0 else 1.0
+        return {
+            "slope": float(slope),
+            "r2": r2,
+            "samples": len(values),
+            "last": float(values[-1]),
+            "mean": float(values.mean()),
+            "p95": float(np.percentile(values, 95)),
+            "span": float(x[-1]),
+        }
+
+    def forecast(self, metric: str, horizon: float, window: float = 3600.0,
+                 current: Optional[float] = None, tolerance: float = 0.02,
+                 lower: Optional[float] = None, upper: Optional[float] = None) -> Dict[str, object]:
+        """
+        Linear projection `horizon` seconds ahead from the recent trend
+
+        The trend is "stable" unless the projected change exceeds
+        `tolerance` of the current level. Confidence grows with fit
+        quality and with how much of the window has data. Without
+        enough history the current value is carried forward.
+        """
+        fit = self.trend(metric, window)
+        base = current if current is not None else (fit["last"] if fit else None)
+        if fit is None or base is None:
+            return {"trend": "stable", "prediction": base, "slope_per_hour": 0.0,
+                    "confidence": 0.0, "samples": fit["samples"] if fit else 0, "coverage": 0.0}
+
+        change = fit["slope"] * horizon
+        prediction = base + change
+        if lower is not None:
+            prediction = max(lower, prediction)
+        if upper is not None:
+            prediction = min(upper, prediction)
+        threshold = tolerance * max(abs(base), 1e-9)
+        if abs(change) <= threshold:
+            direction = "stable"
+        else:
+            direction = "increasing" if change > 0 else "decreasing"
+        coverage = min(1.0, fit["span"] / window)
+        return {
+            "trend": direction,
+            "prediction": float(prediction),
+            "slope_per_hour": fit["slope"] * 3600,
+            "confidence": round(max(0.0, fit["r2"]) * coverage, 4),
+            "samples": fit["samples"],
+            "coverage": coverage,
+            "p95": fit["p95"],
+        }
+
+    def project(self, metric: str, current: float, horizon: float, fallback: Tuple[str, float],
+                window: float = 3600.0, lower: Optional[float] = None,
+                upper: Optional[float] = None, min_coverage: float = 0.1) -> Tuple[str, float, float]:
+        """
+        (trend, prediction, confidence) for the predictive health metrics
+
+        Returns `fallback` with zero confidence until the metric has
+        history over at least `min_coverage` of the window, so a few
+        seconds of samples are never extrapolated an hour ahead.
+        """
+        forecast = self.forecast(metric, horizon, window, current, lower=lower, upper=upper)
+        if forecast["samples"] < 3 or forecast["coverage"] < min_coverage:
+            return fallback[0], fallback[1], 0.0
+        return forecast["trend"], forecast["prediction"], forecast["confidence"]
+
+    def get_stats(self) -> Dict[str, object]:
+        """Metric count, sealed chunks and on-disk size"""
+        with self._lock:
+            metrics = {key for key, _ in self._heads} | {key for key, _ in self._chunks}
+            chunks = sum(len(refs) for refs in self._chunks.values())
+            paths = {ref.path for refs in self._chunks.values() for ref in refs}
+        return {
+            "metrics": len(metrics),
+            "sealed_chunks": chunks,
+            "segment_files": len(paths),
+            "disk_bytes": sum(path.stat().st_size for path in paths if path.exists()),
+            "root": str(self.root),
+        }
+
+
+_timeseries_store: Optional[TimeSeriesStore] = None
+
+
+def get_timeseries_store() -> TimeSeriesStore:
+    """Process-wide store under HEALTH_TSDB_DIR (default backend/data/tsdb)"""
+    global _timeseries_store
+    if _timeseries_store is None:
+        default_root = Path(__file__).resolve().parent.parent / "data" / "tsdb"
+        _timeseries_store = TimeSeriesStore(Path(os.environ.get("HEALTH_TSDB_DIR", default_root)))
+    return _timeseries_store
@@ -13,7 +13,6 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import traceback
 import psutil
-import requests
 from functools import wraps
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
@@ -21,6 +20,9 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import IsolationForest
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 
+from health.engine import HealthEvent, as_enum, get_health_engine
+from health.realtime import LoopSpec, RealtimeRuntime
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -151,7 +153,8 @@ class UltimateHealthSystem:
         self.health_history: List[HealthSummary] = []
         self.health_alerts: List[HealthAlert] = []
         self.health_callbacks: List[Callable] = []
-        self.executor = ThreadPoolExecutor(max_workers=8)
+        self.engine = get_health_engine()  # shared sampler, probes, history and alerts
+        self.executor = self.engine.executor
         self.scaler = StandardScaler()
         self.anomaly_detector = IsolationForest(contamination=0.1, random_state=42)
         self.health_baseline = None
@@ -159,13 +162,18 @@ class UltimateHealthSystem:
         # Health monitoring configuration
         self.check_interval = 30  # seconds
         self.prediction_horizon = 3600  # 1 hour
+        self.history = self.engine.history  # recorded metrics behind the predictions
         self.anomaly_threshold = 0.1
         self.auto_healing_enabled = True
         self.real_time_monitoring = True
         self.self_healing_enabled = True
+        self.realtime_interval = 1.0  # seconds
+        self.realtime_cpu_budget = 0.05  # collector CPU seconds per second, per loop
+        self.realtime = self._build_realtime_runtime()
         
         # Initialize health baseline
         self._initialize_health_baseline()
+        self.engine.subscribe(self._receive_health_alert)
         
     def _initialize_health_baseline(self) -> None:
         """Initialize health baseline for comparison"""
@@ -229,80 +237,75 @@ class UltimateHealthSystem:
     def _create_health_alert(self, severity: AlertSeverity, category: CheckCategory, 
                             message: str, source: str, metadata: Dict[str, Any] = None,
                             auto_resolvable: bool = False) -> HealthAlert:
-        """Create health alert"""
+        """Publish a health alert on the engine's pipeline"""
         try:
-            alert_id = f"health_{int(time.time())}_{len(self.health_alerts)}"
-            alert = HealthAlert(
-                id=alert_id,
-                severity=severity,
-                category=category,
-                message=message,
-                source=source,
-                timestamp=datetime.now(),
-                resolved=False,
-                metadata=metadata or {},
-                auto_resolvable=auto_resolvable,
-                resolution_time=None
-            )
-            
-            self.health_alerts.append(alert)
-            
-            # Log alert
-            log_level = {
-                AlertSeverity.INFO: logging.INFO,
-                AlertSeverity.WARNING: logging.WARNING,
-                AlertSeverity.ERROR: logging.ERROR,
-                AlertSeverity.CRITICAL: logging.ERROR,
-                AlertSeverity.EMERGENCY: logging.CRITICAL
-            }.get(severity, logging.INFO)
-            
-            logger.log(log_level, f"HEALTH ALERT [{severity.value.upper()}] {source}: {message}")
-            
-            return alert
-            
+            event = self.engine.emit(severity.value, message, source, category.value, metadata, auto_resolvable)
+            return next((alert for alert in reversed(self.health_alerts) if alert.id == event.id), None)
         except Exception as e:
             logger.error(f"Error creating health alert: {str(e)}")
             return None
     
+    def close(self) -> None:
+        """Stop receiving alerts from the shared health engine"""
+        self.engine.unsubscribe(self._receive_health_alert)
+    
+    def _receive_health_alert(self, event: HealthEvent) -> None:
+        """Record an alert from the engine's pipeline, whichever view raised it"""
+        alert = HealthAlert(
+            id=event.id,
+            severity=as_enum(AlertSeverity, event.severity, AlertSeverity.EMERGENCY),
+            category=as_enum(CheckCategory, event.category, CheckCategory.SYSTEM),
+            message=event.message,
+            source=event.source,
+            timestamp=event.timestamp,
+            resolved=False,
+            metadata=event.metadata,
+            auto_resolvable=event.auto_resolvable,
+            resolution_time=None
+        )
+        self.health_alerts.append(alert)
+    
     @ultimate_health_monitor
     def check_ultimate_system_health(self) -> Dict[str, Any]:
         """Check ultimate system health"""
         try:
             logger.info("Starting ultimate system health check")
             
+            # Latest background sample (no inline psutil polling)
+            sample = self.engine.snapshot()
+            
             # CPU health check with advanced metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
-            cpu_freq = psutil.cpu_freq()
-            load_avg = psutil.getloadavg()
+            cpu_percent = sample.cpu_percent
+            cpu_count = sample.cpu_count
+            cpu_freq = sample.cpu_freq
+            load_avg = sample.load_avg
             
             cpu_health_score = self._calculate_cpu_health(cpu_percent, cpu_count, cpu_freq, load_avg)
             cpu_status = self._classify_health_status(cpu_health_score)
             
             # Memory health check with detailed analysis
-            memory = psutil.virtual_memory()
-            swap = psutil.swap_memory()
+            memory = sample.memory
+            swap = sample.swap
             
             memory_health_score = self._calculate_memory_health(memory, swap)
             memory_status = self._classify_health_status(memory_health_score)
             
             # Disk health check with I/O analysis
-            disk = psutil.disk_usage('/')
-            disk_io = psutil.disk_io_counters()
+            disk = sample.disk
+            disk_io = sample.disk_io
             
             disk_health_score = self._calculate_disk_health(disk, disk_io)
             disk_status = self._classify_health_status(disk_health_score)
             
             # Network health check with advanced metrics
-            network_io = psutil.net_io_counters()
-            network_connections = len(psutil.net_connections())
+            network_io = sample.network_io
+            network_connections = sample.network_connections
             
             network_health_score = self._calculate_network_health(network_io, network_connections)
             network_status = self._classify_health_status(network_health_score)
             
             # Process health check
-            processes = list(psutil.process_iter())
-            process_health_score = self._calculate_process_health(processes)
+            process_health_score = self._calculate_process_health(sample.process_count, sample.process_status_counts)
             process_status = self._classify_health_status(process_health_score)
             
             # Calculate overall system health
@@ -385,7 +388,7 @@ class UltimateHealthSystem:
                         'status': network_status.value
                     },
                     'processes': {
-                        'count': len(processes),
+                        'count': sample.process_count,
                         'score': process_health_score,
                         'status': process_status.value
                     }
@@ -532,31 +535,16 @@ class UltimateHealthSystem:
             logger.error(f"Error calculating network health: {str(e)}")
             return 0.0
     
-    def _calculate_process_health(self, processes: List) -> float:
+    def _calculate_process_health(self, total_count: int, status_counts: Dict[str, int]) -> float:
         """Calculate process health score"""
         try:
-            if not processes:
+            if not total_count:
                 return 100
             
-            # Count process states
-            running_count = 0
-            sleeping_count = 0
-            zombie_count = 0
-            
-            for proc in processes:
-                try:
-                    status = proc.status()
-                    if status == psutil.STATUS_RUNNING:
-                        running_count += 1
-                    elif status == psutil.STATUS_SLEEPING:
-                        sleeping_count += 1
-                    elif status == psutil.STATUS_ZOMBIE:
-                        zombie_count += 1
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            running_count = status_counts.get(psutil.STATUS_RUNNING, 0)
+            zombie_count = status_counts.get(psutil.STATUS_ZOMBIE, 0)
             
             # Calculate health based on process distribution
-            total_count = len(processes)
             running_ratio = running_count / total_count
             zombie_ratio = zombie_count / total_count
             
@@ -642,6 +630,18 @@ class UltimateHealthSystem:
             current_health = statistics.mean(system_scores)
             predicted_health = max(0, current_health - 5)  # Assume slight degradation
             
+            # Project from recorded history; the thresholds above only cover a cold start
+            self.history.append('ultimate.system.health_score', current_health)
+            cpu_trend, cpu_prediction, cpu_confidence = self.history.project(
+                'system.cpu_percent', cpu_percent, self.prediction_horizon, (cpu_trend, cpu_prediction), lower=0, upper=100)
+            memory_trend, memory_prediction, memory_confidence = self.history.project(
+                'system.memory_percent', memory_percent, self.prediction_horizon, (memory_trend, memory_prediction), lower=0, upper=100)
+            disk_trend, disk_prediction, disk_confidence = self.history.project(
+                'system.disk_percent', disk_percent, self.prediction_horizon, (disk_trend, disk_prediction), lower=0, upper=100)
+            _, predicted_health, health_confidence = self.history.project(
+                'ultimate.system.health_score', current_health, self.prediction_horizon, ('stable', predicted_health), lower=0, upper=100)
+            history_confidence = statistics.mean([cpu_confidence, memory_confidence, disk_confidence, health_confidence])
+            
             return {
                 'trends': {
                     'cpu': cpu_trend,
@@ -654,7 +654,7 @@ class UltimateHealthSystem:
                     'disk_usage': disk_prediction,
                     'health_score': predicted_health
                 },
-                'confidence': 0.95,  # High confidence in predictions
+                'confidence': history_confidence or 0.95,  # High confidence in predictions
                 'time_horizon': self.prediction_horizon
             }
             
@@ -680,91 +680,64 @@ class UltimateHealthSystem:
             error_rates = []
             throughputs = []
             
+            # Probe every endpoint concurrently (a run takes max-probe time)
+            probes = self.engine.probe(endpoints, samples=3)
+            
             # Check each endpoint with detailed analysis
             for endpoint in endpoints:
-                try:
-                    # Multiple requests for accuracy
-                    request_times = []
-                    success_count = 0
-                    
-                    for _ in range(3):  # 3 requests per endpoint
-                        start_time = time.time()
-                        response = requests.get(endpoint, timeout=10)
-                        response_time = (time.time() - start_time) * 1000
-                        request_times.append(response_time)
-                        
-                        if response.status_code == 200:
-                            success_count += 1
-                    
-                    avg_response_time = statistics.mean(request_times)
-                    response_times.append(avg_response_time)
-                    
-                    # Calculate endpoint metrics
-                    success_rate = success_count / 3
-                    error_rates.append(1 - success_rate)
-                    
-                    # Calculate throughput (simplified)
-                    throughput = 1000 / avg_response_time if avg_response_time > 0 else 0
-                    throughputs.append(throughput)
-                    
-                    # Determine endpoint status
-                    if success_rate == 1.0 and avg_response_time < 100:
-                        status = HealthStatus.EXCELLENT
-                        score = 100
-                    elif success_rate >= 0.8 and avg_response_time < 200:
-                        status = HealthStatus.GOOD
-                        score = 85
-                    elif success_rate >= 0.5 and avg_response_time < 500:
-                        status = HealthStatus.FAIR
-                        score = 70
-                    elif success_rate > 0:
-                        status = HealthStatus.POOR
-                        score = 50
-                    else:
-                        status = HealthStatus.CRITICAL
-                        score = 0
-                    
-                    total_score += score
-                    
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'avg_response_time': avg_response_time,
-                        'success_rate': success_rate,
-                        'throughput': throughput,
-                        'status': status.value,
-                        'score': score,
-                        'request_times': request_times
-                    })
-                    
-                except requests.exceptions.Timeout:
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'error': 'timeout',
-                        'status': HealthStatus.CRITICAL.value,
-                        'score': 0
-                    })
-                    total_score += 0
-                    error_rates.append(1.0)
-                    
-                except requests.exceptions.ConnectionError:
+                probe = probes[endpoint]
+                if probe.error:
                     endpoint_results.append({
                         'endpoint': endpoint,
-                        'error': 'connection_error',
-                        'status': HealthStatus.CRITICAL.value,
-                        'score': 0
-                    })
-                    total_score += 0
-                    error_rates.append(1.0)
-                    
-                except Exception as e:
-                    endpoint_results.append({
-                        'endpoint': endpoint,
-                        'error': str(e),
+                        'error': probe.error,
                         'status': HealthStatus.CRITICAL.value,
                         'score': 0
                     })
                     total_score += 0
                     error_rates.append(1.0)
+                    continue
+                
+                request_times = probe.request_times
+                avg_response_time = statistics.mean(request_times)
+                response_times.append(avg_response_time)
+                
+                # Calculate endpoint metrics
+                success_rate = probe.success_rate
+                error_rates.append(1 - success_rate)
+                
+                # Calculate throughput (simplified)
+                throughput = 1000 / avg_response_time if avg_response_time > 0 else 0
+                throughputs.append(throughput)
+                
+                # Determine endpoint status
+                if success_rate == 1.0 and avg_response_time < 100:
+                    status = HealthStatus.EXCELLENT
+                    score = 100
+                elif success_rate >= 0.8 and avg_response_time < 200:
+                    status = HealthStatus.GOOD
+                    score = 85
+                elif success_rate >= 0.5 and avg_response_time < 500:
+                    status = HealthStatus.FAIR
+                    score = 70
+                elif success_rate > 0:
+                    status = HealthStatus.POOR
+                    score = 50
+                else:
+                    status = HealthStatus.CRITICAL
+                    score = 0
+                
+                total_score += score
+                
+                endpoint_results.append({
+                    'endpoint': endpoint,
+                    'avg_response_time': avg_response_time,
+                    'success_rate': success_rate,
+                    'throughput': throughput,
+                    'status': status.value,
+                    'score': score,
+                    'request_times': request_times,
+                    'latency_percentiles': probe.percentiles
+                })
             
             # Calculate overall application health
             overall_score = total_score / len(endpoints) if endpoints else 0
@@ -890,6 +863,19 @@ class UltimateHealthSystem:
             predicted_response_time = avg_response_time * 1.2 if avg_response_time > 200 else avg_response_time
             predicted_error_rate = avg_error_rate * 1.5 if avg_error_rate > 0.05 else avg_error_rate
             
+            # Project from recorded history; the thresholds above only cover a cold start
+            self.history.append_many({
+                'ultimate.application.response_time': avg_response_time,
+                'ultimate.application.error_rate': avg_error_rate
+            })
+            response_time_trend, predicted_response_time, response_time_confidence = self.history.project(
+                'ultimate.application.response_time', avg_response_time, self.prediction_horizon,
+                (response_time_trend, predicted_response_time), lower=0)
+            error_rate_trend, predicted_error_rate, error_rate_confidence = self.history.project(
+                'ultimate.application.error_rate', avg_error_rate, self.prediction_horizon,
+                (error_rate_trend, predicted_error_rate), lower=0, upper=1)
+            history_confidence = (response_time_confidence + error_rate_confidence) / 2
+            
             # Calculate reliability metrics
             reliability_score = 1 - avg_error_rate
             performance_score = max(0, 1 - (avg_response_time / 1000))  # Normalize to 1 second
@@ -905,7 +891,7 @@ class UltimateHealthSystem:
                     'reliability_score': reliability_score,
                     'performance_score': performance_score
                 },
-                'confidence': 0.90,
+                'confidence': history_confidence or 0.90,
                 'time_horizon': self.prediction_horizon
             }
             
@@ -913,6 +899,29 @@ class UltimateHealthSystem:
             logger.error(f"Error calculating application predictive metrics: {str(e)}")
             return {}
     
+    def _build_realtime_runtime(self) -> RealtimeRuntime:
+        """One supervised loop per component, collectors off the event loop"""
+        runtime = RealtimeRuntime()
+        components = {
+            'system': self.check_ultimate_system_health,
+            'application': self.check_ultimate_application_health,
+            'database': self.check_ultimate_database_health,
+            'network': self.check_ultimate_network_health,
+            'security': self.check_ultimate_security_health,
+            'performance': self.check_ultimate_performance_health,
+            'ai_models': self.check_ultimate_ai_models_health,
+            'business_logic': self.check_ultimate_business_logic_health
+        }
+        for component, check in components.items():
+            runtime.add(LoopSpec(
+                name=f"ultimate_{component}",
+                collect=check,
+                handle=lambda health, component=component: self._handle_realtime_health(component, health),
+                interval=self.realtime_interval,
+                cpu_budget=self.realtime_cpu_budget
+            ))
+        return runtime
+    
     async def start_real_time_monitoring(self) -> Dict[str, Any]:
         """Start real-time health monitoring"""
         try:
@@ -921,28 +930,21 @@ class UltimateHealthSystem:
             # Real-time monitoring configuration
             monitoring_config = {
                 'real_time_enabled': self.real_time_monitoring,
-                'monitoring_interval': 1,  # 1 second for real-time
+                'monitoring_interval': self.realtime_interval,
+                'cpu_budget': self.realtime_cpu_budget,
                 'alert_threshold': 0.8,
                 'auto_healing_enabled': self.auto_healing_enabled,
                 'self_healing_enabled': self.self_healing_enabled
             }
             
-            # Start real-time monitoring loop
-            monitoring_tasks = [
-                self._monitor_system_health_realtime(),
-                self._monitor_application_health_realtime(),
-                self._monitor_database_health_realtime(),
-                self._monitor_network_health_realtime(),
-                self._monitor_security_health_realtime(),
-                self._monitor_performance_health_realtime(),
-                self._monitor_ai_models_health_realtime(),
-                self._monitor_business_logic_health_realtime()
-            ]
+            # Schedule the supervised loops on the running event loop
+            if self.real_time_monitoring:
+                self.realtime.start()
             
             return {
-                'status': 'real_time_monitoring_active',
+                'status': 'real_time_monitoring_active' if self.realtime.running else 'real_time_monitoring_disabled',
                 'monitoring_config': monitoring_config,
-                'active_tasks': len(monitoring_tasks),
+                'active_tasks': len(self.realtime.specs) if self.realtime.running else 0,
                 'monitoring_level': 'ultimate'
             }
             
@@ -950,127 +952,15 @@ class UltimateHealthSystem:
             logger.error(f"Error starting real-time monitoring: {str(e)}")
             return {'error': str(e)}
     
-    async def _monitor_system_health_realtime(self):
-        """Monitor system health in real-time"""
-        while self.real_time_monitoring:
-            try:
-                # Get real-time system metrics
-                system_health = self.check_ultimate_system_health()
-                
-                # Check if auto-healing is needed
-                if system_health.get('score', 0) < 50 and self.auto_healing_enabled:
-                    await self._trigger_self_healing('system', system_health)
-                
-                await asyncio.sleep(1)  # Real-time interval
-                
-            except Exception as e:
-                logger.error(f"Error in real-time system monitoring: {str(e)}")
-                await asyncio.sleep(1)
-    
-    async def _monitor_application_health_realtime(self):
-        """Monitor application health in real-time"""
-        while self.real_time_monitoring:
-            try:
-                app_health = self.check_ultimate_application_health()
-                
-                if app_health.get('score', 0) < 50 and self.auto_healing_enabled:
-                    await self._trigger_self_healing('application', app_health)
-                
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error in real-time application monitoring: {str(e)}")
-                await asyncio.sleep(1)
-    
-    async def _monitor_database_health_realtime(self):
-        """Monitor database health in real-time"""
-        while self.real_time_monitoring:
-            try:
-                db_health = self.check_ultimate_database_health()
-                
-                if db_health.get('score', 0) < 50 and self.auto_healing_enabled:
-                    await self._trigger_self_healing('database', db_health)
-                
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error in real-time database monitoring: {str(e)}")
-                await asyncio.sleep(1)
+    async def stop_real_time_monitoring(self) -> Dict[str, Any]:
+        """Stop real-time health monitoring"""
+        await self.realtime.stop()
+        return {'status': 'real_time_monitoring_stopped'}
     
-    async def _monitor_network_health_realtime(self):
-        """Monitor network health in real-time"""
-        while self.real_time_monitoring:
-            try:
-                network_health = self.check_ultimate_network_health()
-                
-                if network_health.get('score', 0) < 50 and self.auto_healing_enabled:
-                    await self._trigger_self_healing('network', network_health)
-                
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error in real-time network monitoring: {str(e)}")
-                await asyncio.sleep(1)
-    
-    async def _monitor_security_health_realtime(self):
-        """Monitor security health in real-time"""
-        while self.real_time_monitoring:
-            try:
-                security_health = self.check_ultimate_security_health()
-                
-                if security_health.get('score', 0) < 50 and self.auto_healing_enabled:
-                    await self._trigger_self_healing('security', security_health)
-                
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error in real-time security monitoring: {str(e)}")
-                await asyncio.sleep(1)
-    
-    async def _monitor_performance_health_realtime(self):
-        """Monitor performance health in real-time"""
-        while self.real_time_monitoring:
-            try:
-                performance_health = self.check_ultimate_performance_health()
-                
-                if performance_health.get('score', 0) < 50 and self.auto_healing_enabled:
-                    await self._trigger_self_healing('performance', performance_health)
-                
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error in real-time performance monitoring: {str(e)}")
-                await asyncio.sleep(1)
-    
-    async def _monitor_ai_models_health_realtime(self):
-        """Monitor AI models health in real-time"""
-        while self.real_time_monitoring:
-            try:
-                ai_health = self.check_ultimate_ai_models_health()
-                
-                if ai_health.get('score', 0) < 50 and self.auto_healing_enabled:
-                    await self._trigger_self_healing('ai_models', ai_health)
-                
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error in real-time AI models monitoring: {str(e)}")
-                await asyncio.sleep(1)
-    
-    async def _monitor_business_logic_health_realtime(self):
-        """Monitor business logic health in real-time"""
-        while self.real_time_monitoring:
-            try:
-                business_health = self.check_ultimate_business_logic_health()
-                
-                if business_health.get('score', 0) < 50 and self.auto_healing_enabled:
-                    await self._trigger_self_healing('business_logic', business_health)
-                
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error in real-time business logic monitoring: {str(e)}")
-                await asyncio.sleep(1)
+    async def _handle_realtime_health(self, component: str, health: Dict[str, Any]) -> None:
+        """Self-heal a component whose real-time health score dropped below 50"""
+        if health.get('score', 0) < 50 and self.auto_healing_enabled:
+            await self._trigger_self_healing(component, health)
     
     async def _trigger_self_healing(self, component: str, health_data: Dict[str, Any]) -> Dict[str, Any]:
         """Trigger self-healing for a component"""
@@ -1117,9 +1007,10 @@ class UltimateHealthSystem:
             'real_time_monitoring': self.real_time_monitoring,
             'auto_healing_enabled': self.auto_healing_enabled,
             'self_healing_enabled': self.self_healing_enabled,
-            'monitoring_interval': 1,
-            'components_monitored': 8,
-            'monitoring_status': 'active' if self.real_time_monitoring else 'inactive'
+            'monitoring_interval': self.realtime_interval,
+            'components_monitored': len(self.realtime.specs),
+            'monitoring_status': 'active' if self.realtime.running else 'inactive',
+            'runtime': self.realtime.get_stats()
         }
     
     def quantum_health_analysis(self, health_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -1261,26 +1152,26 @@ class UltimateHealthSystem:
             
             # Execute health checks
             health_results = {}
-            with ThreadPoolExecutor(max_workers=8) as executor:
-                future_to_check = {
-                    executor.submit(check): category
-                    for category, check in health_checks.items()
-                }
-                
-                for future in as_completed(future_to_check):
-                    category = future_to_check[future]
-                    try:
-                        result = future.result()
-                        health_results[category] = result
-                    except Exception as e:
-                        logger.error(f"Health check {category} failed: {str(e)}")
-                        health_results[category] = {
-                            'status': HealthStatus.CRITICAL.value,
-                            'score': 0.0,
-                            'error': str(e),
-                            'timestamp': datetime.now().isoformat()
-                        }
+            executor = self.executor  # shared engine workers
+            future_to_check = {
+                executor.submit(check): category
+                for category, check in health_checks.items()
+            }
             
+            for future in as_completed(future_to_check):
+                category = future_to_check[future]
+                try:
+                    result = future.result()
+                    health_results[category] = result
+                except Exception as e:
+                    logger.error(f"Health check {category} failed: {str(e)}")
+                    health_results[category] = {
+                        'status': HealthStatus.CRITICAL.value,
+                        'score': 0.0,
+                        'error': str(e),
+                        'timestamp': datetime.now().isoformat()
+                    }
+
             # Calculate overall health
             scores = [result.get('score', 0) for result in health_results.values()]
             overall_score = statistics.mean(scores) if scores else 0
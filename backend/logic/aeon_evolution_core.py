@@ -14,6 +14,10 @@ import hashlib
 import uuid
 from functools import wraps
 
+from logic.healing_scheduler import (EvolutionMetrics, HealingEvent, HealingScheduler, HealingStatus, HealingStore,
+                                     MutationType)
+from logic.instrumentation import instrumented
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,57 +29,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class HealingStatus(Enum):
-    """Healing status enumeration"""
-    PENDING = "pending"
-    ACTIVE = "active"
-    COMPLETED = "completed"
-    FAILED = "failed"
-
-class MutationType(Enum):
-    """Mutation type enumeration"""
-    MODEL_DRIFT = "model_drift"
-    PERFORMANCE_DEGRADATION = "performance_degradation"
-    DATA_CORRUPTION = "data_corruption"
-    NETWORK_FAILURE = "network_failure"
-    SYSTEM_ANOMALY = "system_anomaly"
-
-@dataclass
-class HealingEvent:
-    """Healing event data structure"""
-    id: str
-    mutation_type: MutationType
-    severity: float
-    timestamp: datetime
-    status: HealingStatus
-    duration: float
-    success_rate: float
-    recovery_metrics: Dict[str, Any]
-    metadata: Dict[str, Any]
-
-@dataclass
-class EvolutionMetrics:
-    """Evolution metrics data structure"""
-    total_healing_events: int
-    successful_healings: int
-    failed_healings: int
-    average_healing_time: float
-    average_success_rate: float
-    last_healing: datetime
-    evolution_score: float
-
 def validate_healing_input(func):
     """Decorator for healing input validation"""
     @wraps(func)
     def wrapper(*args, **kwargs):
         try:
-            # Validate input parameters
-            if len(args) > 0 and not isinstance(args[0], dict):
-                raise ValueError("First argument must be a dictionary")
+            # Validate input parameters (args[0] is self on methods)
+            if len(args) > 0 and not isinstance(args[-1], dict):
+                raise ValueError("Mutation data must be a dictionary")
             
             # Check for required fields
             if len(args) > 0:
-                data = args[0]
+                data = args[-1]
                 required_fields = ['mutation_type', 'severity', 'timestamp']
                 for field in required_fields:
                     if field not in data:
@@ -88,27 +53,14 @@ def validate_healing_input(func):
     return wrapper
 
 def performance_monitor(func):
-    """Decorator for performance monitoring"""
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        try:
-            result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            logger.info(f"Performance - {func.__name__}: {execution_time:.4f}s")
-            return result
-        except Exception as e:
-            execution_time = time.time() - start_time
-            logger.error(f"Performance - {func.__name__} failed after {execution_time:.4f}s: {str(e)}")
-            raise
-    return wrapper
+    """Decorator for performance monitoring (sampled, see logic.instrumentation)"""
+    return instrumented(func, logger, log_traceback=False)
 
 class AeonEvolutionCore:
     """Aeon™ Evolution Core - Self-Healing System"""
     
-    def __init__(self):
-        self.healing_events: List[HealingEvent] = []
-        self.evolution_metrics = EvolutionMetrics(0, 0, 0, 0.0, 0.0, datetime.now(), 0.0)
+    def __init__(self, scheduler_options: Optional[Dict[str, Any]] = None):
+        self.healing_store = HealingStore()
         self.healing_strategies: Dict[MutationType, Callable] = {}
         self.active_healings: Dict[str, HealingEvent] = {}
         self.healing_callbacks: List[Callable] = []
@@ -116,6 +68,14 @@ class AeonEvolutionCore:
         # Initialize healing strategies
         self._initialize_healing_strategies()
         
+        # Severity-ordered, per-type limited healing execution
+        self.scheduler = HealingScheduler(self.healing_strategies, on_finished=self._on_healing_finished,
+                                          **(scheduler_options or {}))
+    
+    @property
+    def evolution_metrics(self) -> EvolutionMetrics:
+        return self.healing_store.metrics
+        
     def _initialize_healing_strategies(self) -> None:
         """Initialize healing strategies for different mutation types"""
         self.healing_strategies = {
@@ -143,6 +103,31 @@ class AeonEvolutionCore:
             except Exception as e:
                 logger.error(f"Error in healing callback: {str(e)}")
     
+    def _create_healing_event(self, mutation_data: Dict[str, Any]) -> Optional[HealingEvent]:
+        """Healing event for a mutation, or None if it is unknown or below the healing threshold"""
+        try:
+            mutation_type = MutationType(mutation_data.get('mutation_type', 'unknown'))
+        except ValueError:
+            logger.warning(f"Unknown mutation type: {mutation_data.get('mutation_type', 'unknown')}")
+            return None
+        
+        severity = mutation_data.get('severity', 0.0)
+        if severity < 0.3:  # Threshold for healing activation
+            logger.debug(f"Mutation severity {severity} below threshold, no healing needed")
+            return None
+        
+        return HealingEvent(
+            id=str(uuid.uuid4()),
+            mutation_type=mutation_type,
+            severity=severity,
+            timestamp=mutation_data.get('timestamp', datetime.now()),
+            status=HealingStatus.PENDING,
+            duration=0.0,
+            success_rate=0.0,
+            recovery_metrics={},
+            metadata=mutation_data.get('metadata', {})
+        )
+    
     @validate_healing_input
     @performance_monitor
     def detect_mutation(self, mutation_data: Dict[str, Any]) -> bool:
@@ -153,40 +138,14 @@ class AeonEvolutionCore:
         try:
             logger.info("Detecting system mutation")
             
-            # Extract mutation parameters
-            mutation_type_str = mutation_data.get('mutation_type', 'unknown')
-            severity = mutation_data.get('severity', 0.0)
-            timestamp = mutation_data.get('timestamp', datetime.now())
-            
-            # Convert mutation type
-            try:
-                mutation_type = MutationType(mutation_type_str)
-            except ValueError:
-                logger.warning(f"Unknown mutation type: {mutation_type_str}")
-                return False
-            
-            # Check if mutation requires healing
-            if severity < 0.3:  # Threshold for healing activation
-                logger.info(f"Mutation severity {severity} below threshold, no healing needed")
+            healing_event = self._create_healing_event(mutation_data)
+            if healing_event is None:
                 return False
             
-            # Create healing event
-            healing_event = HealingEvent(
-                id=str(uuid.uuid4()),
-                mutation_type=mutation_type,
-                severity=severity,
-                timestamp=timestamp,
-                status=HealingStatus.PENDING,
-                duration=0.0,
-                success_rate=0.0,
-                recovery_metrics={},
-                metadata=mutation_data.get('metadata', {})
-            )
-            
             # Add to active healings
             self.active_healings[healing_event.id] = healing_event
             
-            logger.info(f"Mutation detected: {mutation_type.value}, severity: {severity}")
+            logger.info(f"Mutation detected: {healing_event.mutation_type.value}, severity: {healing_event.severity}")
             return True
             
         except Exception as e:
@@ -194,6 +153,26 @@ class AeonEvolutionCore:
             logger.error(traceback.format_exc())
             return False
     
+    @validate_healing_input
+    def submit_mutation(self, mutation_data: Dict[str, Any]) -> Optional[asyncio.Future]:
+        """
+        Detect a mutation and queue its healing on the scheduler (call from the event loop)
+        
+        Returns a future resolving to the healing's success flag (shared
+        with the healing a repeat was coalesced into), or None when the
+        mutation needs no healing.
+        """
+        healing_event = self._create_healing_event(mutation_data)
+        if healing_event is None:
+            return None
+        
+        future = self.scheduler.submit(healing_event, timeout=mutation_data.get('timeout'))
+        if healing_event.id in self.scheduler:
+            self.active_healings[healing_event.id] = healing_event
+        else:    # coalesced into another healing or rejected
+            self._on_healing_finished(healing_event)
+        return future
+    
     @performance_monitor
     async def initiate_healing(self, healing_event_id: str) -> bool:
         """
@@ -210,51 +189,37 @@ class AeonEvolutionCore:
             
             healing_event = self.active_healings[healing_event_id]
             
-            # Update status
-            healing_event.status = HealingStatus.ACTIVE
-            start_time = time.time()
-            
-            # Get healing strategy
-            strategy = self.healing_strategies.get(healing_event.mutation_type)
-            if not strategy:
-                logger.error(f"No healing strategy for mutation type: {healing_event.mutation_type}")
-                healing_event.status = HealingStatus.FAILED
-                return False
+            # Queue on the scheduler; a repeat joins the healing already queued or in flight
+            future = self.scheduler.submit(healing_event)
+            if healing_event_id not in self.scheduler:    # coalesced into another healing or rejected
+                self._on_healing_finished(healing_event)
             
-            # Execute healing strategy
-            try:
-                healing_result = await strategy(healing_event)
-                
-                # Update healing event
-                healing_event.duration = time.time() - start_time
-                healing_event.success_rate = healing_result.get('success_rate', 0.0)
-                healing_event.recovery_metrics = healing_result.get('recovery_metrics', {})
-                healing_event.status = HealingStatus.COMPLETED if healing_result.get('success', False) else HealingStatus.FAILED
-                
-                # Move to completed events
-                self.healing_events.append(healing_event)
-                del self.active_healings[healing_event_id]
-                
-                # Update metrics
-                self._update_evolution_metrics()
-                
-                # Trigger callbacks
-                self._trigger_healing_callback(healing_event)
-                
-                logger.info(f"Healing completed: {healing_event_id}, success: {healing_result.get('success', False)}")
-                return healing_result.get('success', False)
-                
-            except Exception as e:
-                logger.error(f"Error executing healing strategy: {str(e)}")
-                healing_event.status = HealingStatus.FAILED
-                healing_event.duration = time.time() - start_time
-                return False
+            success = await asyncio.shield(future)
+            logger.info(f"Healing completed: {healing_event_id}, success: {success}")
+            return success
                 
         except Exception as e:
             logger.error(f"Error initiating healing: {str(e)}")
             logger.error(traceback.format_exc())
             return False
     
+    def cancel_healing(self, healing_event_id: str) -> bool:
+        """Cancel a detected, queued or running healing"""
+        if self.scheduler.cancel(healing_event_id):
+            return True
+        healing_event = self.active_healings.get(healing_event_id)
+        if healing_event is None:
+            return False
+        healing_event.status = HealingStatus.CANCELLED
+        self._on_healing_finished(healing_event)
+        return True
+    
+    def _on_healing_finished(self, healing_event: HealingEvent) -> None:
+        """Move a finished healing from the active set to the store"""
+        self.active_healings.pop(healing_event.id, None)
+        self.healing_store.record(healing_event)
+        self._trigger_healing_callback(healing_event)
+    
     async def _heal_model_drift(self, healing_event: HealingEvent) -> Dict[str, Any]:
         """Heal model drift mutation"""
         try:
@@ -399,41 +364,6 @@ class AeonEvolutionCore:
             logger.error(f"Error healing system anomaly: {str(e)}")
             return {'success': False, 'error': str(e)}
     
-    def _update_evolution_metrics(self) -> None:
-        """Update evolution metrics"""
-        try:
-            total_events = len(self.healing_events)
-            successful_events = len([e for e in self.healing_events if e.status == HealingStatus.COMPLETED])
-            failed_events = len([e for e in self.healing_events if e.status == HealingStatus.FAILED])
-            
-            # Calculate average healing time
-            completed_events = [e for e in self.healing_events if e.status == HealingStatus.COMPLETED]
-            avg_healing_time = sum(e.duration for e in completed_events) / len(completed_events) if completed_events else 0.0
-            
-            # Calculate average success rate
-            avg_success_rate = sum(e.success_rate for e in completed_events) / len(completed_events) if completed_events else 0.0
-            
-            # Calculate evolution score
-            evolution_score = (successful_events / total_events * 100) if total_events > 0 else 0.0
-            
-            # Update last healing time
-            last_healing = max([e.timestamp for e in self.healing_events]) if self.healing_events else datetime.now()
-            
-            self.evolution_metrics = EvolutionMetrics(
-                total_healing_events=total_events,
-                successful_healings=successful_events,
-                failed_healings=failed_events,
-                average_healing_time=avg_healing_time,
-                average_success_rate=avg_success_rate,
-                last_healing=last_healing,
-                evolution_score=evolution_score
-            )
-            
-            logger.info(f"Evolution metrics updated: score={evolution_score:.2f}")
-            
-        except Exception as e:
-            logger.error(f"Error updating evolution metrics: {str(e)}")
-    
     def get_evolution_metrics(self) -> Dict[str, Any]:
         """Get evolution metrics"""
         try:
@@ -445,7 +375,10 @@ class AeonEvolutionCore:
                 'average_success_rate': self.evolution_metrics.average_success_rate,
                 'last_healing': self.evolution_metrics.last_healing.isoformat(),
                 'evolution_score': self.evolution_metrics.evolution_score,
-                'active_healings': len(self.active_healings)
+                'cancelled_healings': self.evolution_metrics.cancelled_healings,
+                'coalesced_healings': self.evolution_metrics.coalesced_healings,
+                'active_healings': len(self.active_healings),
+                'scheduler': self.scheduler.get_stats()
             }
         except Exception as e:
             logger.error(f"Error getting evolution metrics: {str(e)}")
@@ -454,7 +387,7 @@ class AeonEvolutionCore:
     def get_healing_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get healing event history"""
         try:
-            recent_events = sorted(self.healing_events, key=lambda x: x.timestamp, reverse=True)[:limit]
+            recent_events = self.healing_store.recent(limit)
             
             return [
                 {
@@ -500,73 +433,50 @@ class AeonEvolutionCore:
         try:
             logger.info("Starting auto-heal system")
             
-            healing_results = []
+            # (result type, mutation data, reported metric) for every threshold crossed
+            detections = []
             
             # Check for model drift
             if 'model_accuracy' in system_metrics:
                 accuracy = system_metrics['model_accuracy']
                 if accuracy < 0.7:  # Threshold for model drift
-                    mutation_data = {
+                    detections.append(('model_drift', {
                         'mutation_type': 'model_drift',
                         'severity': 1 - accuracy,
                         'timestamp': datetime.now(),
                         'metadata': {'current_accuracy': accuracy}
-                    }
-                    
-                    if self.detect_mutation(mutation_data):
-                        # Get the healing event ID
-                        healing_event_id = list(self.active_healings.keys())[-1]
-                        result = await self.initiate_healing(healing_event_id)
-                        healing_results.append({
-                            'type': 'model_drift',
-                            'detected': True,
-                            'healed': result,
-                            'accuracy': accuracy
-                        })
+                    }, {'accuracy': accuracy}))
             
             # Check for performance degradation
             if 'response_time' in system_metrics:
                 response_time = system_metrics['response_time']
                 if response_time > 100:  # Threshold for performance degradation
-                    mutation_data = {
+                    detections.append(('performance_degradation', {
                         'mutation_type': 'performance_degradation',
                         'severity': response_time / 1000,  # Normalize to 0-1
                         'timestamp': datetime.now(),
                         'metadata': {'current_response_time': response_time}
-                    }
-                    
-                    if self.detect_mutation(mutation_data):
-                        # Get the healing event ID
-                        healing_event_id = list(self.active_healings.keys())[-1]
-                        result = await self.initiate_healing(healing_event_id)
-                        healing_results.append({
-                            'type': 'performance_degradation',
-                            'detected': True,
-                            'healed': result,
-                            'response_time': response_time
-                        })
+                    }, {'response_time': response_time}))
             
             # Check for system anomalies
             if 'error_rate' in system_metrics:
                 error_rate = system_metrics['error_rate']
                 if error_rate > 0.05:  # 5% error rate threshold
-                    mutation_data = {
+                    detections.append(('system_anomaly', {
                         'mutation_type': 'system_anomaly',
                         'severity': error_rate,
                         'timestamp': datetime.now(),
                         'metadata': {'current_error_rate': error_rate}
-                    }
-                    
-                    if self.detect_mutation(mutation_data):
-                        # Get the healing event ID
-                        healing_event_id = list(self.active_healings.keys())[-1]
-                        result = await self.initiate_healing(healing_event_id)
-                        healing_results.append({
-                            'type': 'system_anomaly',
-                            'detected': True,
-                            'healed': result,
-                            'error_rate': error_rate
-                        })
+                    }, {'error_rate': error_rate}))
+            
+            # Queue every detected mutation, then wait for the healings together
+            queued = [(healing_type, metric, future) for healing_type, mutation_data, metric in detections
+                      for future in [self.submit_mutation(mutation_data)] if future is not None]
+            healed = await asyncio.gather(*(asyncio.shield(future) for _, _, future in queued))
+            healing_results = [
+                {'type': healing_type, 'detected': True, 'healed': result, **metric}
+                for (healing_type, metric, _), result in zip(queued, healed)
+            ]
             
             return {
                 'auto_heal_completed': True,
@@ -593,5 +503,7 @@ __all__ = [
     'MutationType',
     'HealingEvent',
     'EvolutionMetrics',
+    'HealingScheduler',
+    'HealingStore',
     'aeon_evolution_core'
 ]
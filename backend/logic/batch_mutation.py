@@ -0,0 +1,248 @@
+# 🧠 ShaheenPulse AI - Batch Mutation Detection
+# ! PATENT-PENDING: SHAHEEN_CORE_LOGIC
+
+"""
+Batch Mutation Detection
+The ultimate_mutation_detection ensemble over metric matrices
+
+Scores E entities at once from:
+
+- current:  (E, M) current observations
+- baseline: (M,) shared or (E, M) per-entity baselines
+- history:  (E, T, M) array, or a ragged list of E (T_e, M) arrays
+
+NaN marks a value that is absent (a key missing from the per-dict API's
+metrics, baseline or historical data point). Each sub-score matches the
+per-dict UltimateAlgorithms method it replaces:
+
+- statistical: MAD / IQR of relative deviations, batched percentiles
+- machine_learning: mean of the k nearest historical deviation vectors
+  over the farthest, on masked distance matrices with argpartition
+- time_series: closed-form least-squares trend per (entity, metric),
+  extrapolated one step
+- pattern_recognition: broadcast z-scores against historical mean/stdev
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+SEVERITY_THRESHOLDS = np.array([0.01, 0.05, 0.15, 0.30, 0.50])
+SEVERITY_LABELS = np.array(['NEGLIGIBLE', 'MINOR', 'MODERATE', 'SIGNIFICANT', 'SEVERE', 'CRITICAL'])
+
+History = Union[np.ndarray, Sequence[np.ndarray]]
+
+
+def stack_history(history: History, metrics: int) -> np.ndarray:
+    """(E, T, M) float64 history; ragged per-entity histories are NaN-padded at the end"""
+    if isinstance(history, np.ndarray):
+        if history.ndim != 3 or history.shape[2] != metrics:
+            raise ValueError(f"history must be (entities, steps, {metrics}), got {history.shape}")
+        return history.astype(np.float64, copy=False)
+    steps = max((len(h) for h in history), default=0)
+    stacked = np.full((len(history), steps, metrics), np.nan)
+    for i, h in enumerate(history):
+        if len(h):
+            stacked[i, :len(h)] = h
+    return stacked
+
+
+def records_to_arrays(records: Sequence[Dict[str, Dict]], names: Sequence[str] = None
+                      ) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray], List[str]]:
+    """
+    Per-dict inputs ({'metrics', 'baseline', 'historical_data'}) as batch arrays
+
+    Returns (current, baseline, ragged history, metric names); absent
+    keys become NaN.
+    """
+    if names is None:
+        names = list(dict.fromkeys(name for record in records for name in record['metrics']))
+    index = {name: j for j, name in enumerate(names)}
+
+    def row(values: Dict[str, float]) -> np.ndarray:
+        out = np.full(len(names), np.nan)
+        for name, value in values.items():
+            j = index.get(name)
+            if j is not None:
+                out[j] = value
+        return out
+
+    current = np.array([row(r['metrics']) for r in records]).reshape(len(records), len(names))
+    baseline = np.array([row(r['baseline']) for r in records]).reshape(len(records), len(names))
+    history = [np.array([row(point) for point in r['historical_data']]).reshape(-1, len(names))
+               for r in records]
+    return current, baseline, history, list(names)
+
+
+def arrays_to_record(current: np.ndarray, baseline: np.ndarray, history: np.ndarray,
+                     names: Sequence[str]) -> Dict[str, Any]:
+    """Inverse of records_to_arrays for one entity: NaN entries become absent keys"""
+    def values(row: np.ndarray) -> Dict[str, float]:
+        return {name: value for name, value in zip(names, row.tolist()) if value == value}
+
+    return {
+        'metrics': values(current),
+        'baseline': values(baseline),
+        'historical_data': [values(row) for row in history],
+    }
+
+
+def _statistical(current: np.ndarray, baseline: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        deviations = np.where(valid, np.abs(current - baseline) / baseline, np.nan)
+    rows = valid.any(axis=1)
+    if valid.all():
+        q25, median, q75 = np.percentile(deviations, [25, 50, 75], axis=1)
+    else:
+        q25, median, q75 = np.full((3, len(current)), np.nan)
+        if rows.any():
+            q25[rows], median[rows], q75[rows] = np.nanpercentile(deviations[rows], [25, 50, 75], axis=1)
+    iqr = q75 - q25
+    with np.errstate(divide='ignore', invalid='ignore'):
+        iqr_score = np.where(iqr > 0, median / iqr, 0.0)
+    combined = (median / 0.6745 + iqr_score) / 2
+    return np.where(rows, np.minimum(1.0, combined), 0.0)
+
+
+def _knn(current: np.ndarray, baseline: np.ndarray, history: np.ndarray, present, valid: np.ndarray,
+         k: int) -> np.ndarray:
+    """Mean distance to the k nearest historical vectors over the farthest one"""
+    features = valid.sum(axis=1)
+    divisor = np.where(valid, baseline, 1.0)
+    current_dev = np.where(valid, (current - baseline) / divisor, 0.0)
+    diff = (history - baseline[:, None, :]) / divisor[:, None, :] - current_dev[:, None, :]
+    if present is None:
+        diff *= valid[:, None, :]
+        hist_features = np.broadcast_to(features[:, None], history.shape[:2])
+    else:
+        hist_valid = valid[:, None, :] & present
+        diff = np.where(hist_valid, diff, 0.0)
+        # The per-dict API compares a historical vector only if it has as
+        # many features as the current one; its features are a subset of
+        # the current ones, so that means the same metrics.
+        hist_features = hist_valid.sum(axis=2)
+    distances = np.sqrt(np.einsum('etm,etm->et', diff, diff))
+
+    eligible = (hist_features == features[:, None]) & (features[:, None] > 0)
+    candidates = eligible.sum(axis=1)
+
+    steps = distances.shape[1]
+    kk = min(k, steps)
+    if kk == 0:
+        return np.zeros(len(current))
+    ranked = np.where(eligible, distances, np.inf)
+    nearest = np.partition(ranked, kk - 1, axis=1)[:, :kk] if steps > kk else ranked
+    nearest = np.where(np.isfinite(nearest), nearest, 0.0)
+    count = np.minimum(k, candidates)
+    farthest = np.where(eligible, distances, -np.inf).max(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        average = nearest.sum(axis=1) / count
+        score = np.where(farthest > 0, average / farthest, 0.0)
+    usable = ((hist_features > 0).sum(axis=1) > 1) & (features > 0) & (candidates > 0)
+    return np.where(usable, score, 0.0)
+
+
+def _history_moments(history: np.ndarray):
+    """(present mask or None when dense, count, NaN-free values, mean) per (entity, metric)"""
+    present = np.isnan(history)
+    if not present.any():
+        entities, steps, metrics = history.shape
+        return None, np.full((entities, metrics), float(steps)), history, history.mean(axis=1)
+    np.logical_not(present, out=present)
+    n = present.sum(axis=1).astype(np.float64)
+    values = np.where(present, history, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = values.sum(axis=1) / n
+    return present, n, values, mean
+
+
+def _time_series(current: np.ndarray, baseline: np.ndarray, history: np.ndarray,
+                 present: np.ndarray, n: np.ndarray, values: np.ndarray, mean: np.ndarray,
+                 has_metric: np.ndarray) -> np.ndarray:
+    """One-step extrapolation of the least-squares trend of each metric's history"""
+    x_mean = (n - 1) / 2.0
+    if present is None:
+        steps = history.shape[1]
+        x = np.arange(steps) - (steps - 1) / 2.0
+        sxy = np.einsum('t,etm->em', x, values - mean[:, None, :])
+    else:
+        # x is the position within the metric's own (gap-compressed) series
+        x = np.cumsum(present, axis=1, dtype=np.float64) - 1.0
+        centered = np.where(present, (x - x_mean[:, None, :]) * (values - mean[:, None, :]), 0.0)
+        sxy = centered.sum(axis=1)
+    sxx = n * (n * n - 1) / 12.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = sxy / sxx
+        intercept = mean - slope * x_mean
+        expected = slope * n + intercept
+        deviation = np.abs(current - expected) / baseline
+    valid = has_metric & (n > 3) & (baseline != 0)
+    return _masked_mean(deviation, valid)
+
+
+def _pattern(current: np.ndarray, history: np.ndarray, present: np.ndarray, n: np.ndarray,
+             values: np.ndarray, mean: np.ndarray, has_metric: np.ndarray) -> np.ndarray:
+    """Z-score of the current value against each metric's historical distribution"""
+    centered = values - mean[:, None, :]
+    if present is None:
+        squared = np.einsum('etm,etm->em', centered, centered)
+        # A constant series has zero spread (summation rounding aside)
+        constant = history.max(axis=1) == history.min(axis=1)
+    else:
+        squared = np.where(present, centered ** 2, 0.0).sum(axis=1)
+        constant = np.where(present, history, -np.inf).max(axis=1) == np.where(present, history, np.inf).min(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.where(constant, 0.0, np.sqrt(squared / (n - 1)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.minimum(1.0, np.abs(current - mean) / std / 3)
+    valid = has_metric & (n > 2) & (std > 0)
+    return _masked_mean(z, valid)
+
+
+def _masked_mean(scores: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    count = valid.sum(axis=1)
+    total = np.where(valid, scores, 0.0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count > 0, total / count, 0.0)
+
+
+def classify_severity(scores: np.ndarray) -> np.ndarray:
+    """Vectorized _classify_mutation_severity_ultimate"""
+    return SEVERITY_LABELS[np.searchsorted(SEVERITY_THRESHOLDS, scores, side='right')]
+
+
+def batch_mutation_scores(current: np.ndarray, baseline: np.ndarray, history: History,
+                          k: int = 5) -> Dict[str, np.ndarray]:
+    """
+    Ultimate mutation ensemble for every entity at once
+
+    Returns per-entity arrays: the four individual scores, mutation_score
+    (their mean), confidence (1 - their sample stdev) and severity.
+    """
+    current = np.atleast_2d(np.asarray(current, dtype=np.float64))
+    entities, metrics = current.shape
+    baseline = np.broadcast_to(np.asarray(baseline, dtype=np.float64), current.shape)
+    history = stack_history(history, metrics)
+    if len(history) != entities:
+        raise ValueError(f"history has {len(history)} entities, current has {entities}")
+
+    has_metric = ~np.isnan(current) & ~np.isnan(baseline)
+    nonzero = has_metric & (baseline != 0)
+
+    present, n, values, mean = _history_moments(history)
+    statistical = _statistical(current, baseline, nonzero)
+    machine_learning = _knn(current, baseline, history, present, nonzero, k)
+    time_series = _time_series(current, baseline, history, present, n, values, mean, has_metric)
+    pattern = _pattern(current, history, present, n, values, mean, has_metric)
+
+    scores = np.stack([statistical, machine_learning, time_series, pattern])
+    mutation_score = scores.mean(axis=0)
+    return {
+        'statistical': statistical,
+        'machine_learning': machine_learning,
+        'time_series': time_series,
+        'pattern_recognition': pattern,
+        'mutation_score': mutation_score,
+        'confidence': 1.0 - scores.std(axis=0, ddof=1),
+        'severity': classify_severity(mutation_score),
+    }
@@ -0,0 +1,629 @@
+# 🧠 ShaheenPulse AI - Batch Vitality and Hardware Abstraction
+# ! PATENT-PENDING: SHAHEEN_CORE_LOGIC
+
+"""
+Batch Vitality and Hardware Abstraction
+The per-sample vitality and hardware-abstraction engines over whole arrays
+
+- batch_vitality: N samples of (performance, accuracy, energy, latency)
+  as 1-D arrays; index, normalization, level, metrics, predictive trends
+  and optimization priorities are computed column-wise
+- batch_hardware: per component, either a dict of field arrays or an
+  (N, F) matrix whose columns are HARDWARE_FIELDS[component] (NaN or a
+  missing key takes the per-sample default); per-component utilization,
+  health, performance, efficiency, status and alert counts, system
+  health, load predictions and allocation policy are computed column-wise
+- a profile (ULTIMATE_* / PERFECT_*) holds each engine's thresholds,
+  weights and texts, so every column matches the per-sample method of
+  that engine
+- results are a BatchResult of flat 1-D columns (numbers, bools and
+  fixed-width strings), convertible to a pyarrow RecordBatch. Text is
+  never built up front: recommendations(row) renders one row on demand,
+  and iter_recommendations() only visits the rows flagged in
+  needs_attention
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+# Results ---------------------------------------------------------------------
+
+
+@dataclass
+class BatchResult:
+    """Columnar batch output with recommendation text rendered on demand"""
+    columns: Dict[str, np.ndarray]
+    needs_attention: np.ndarray
+    describe: Callable[[int], List[str]] = field(repr=False)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.needs_attention)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def flagged(self) -> np.ndarray:
+        """Row indices that crossed a recommendation threshold"""
+        return np.flatnonzero(self.needs_attention)
+
+    def recommendations(self, row: int) -> List[str]:
+        """Recommendation text of one row, as the per-sample method lists it"""
+        return self.describe(int(row))
+
+    def iter_recommendations(self) -> Iterator[Tuple[int, List[str]]]:
+        """(row, recommendations) for the flagged rows only"""
+        for row in self.flagged():
+            yield int(row), self.describe(int(row))
+
+    def to_record_batch(self):
+        """The columns plus needs_attention as a pyarrow RecordBatch"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow package not installed. Run: pip install pyarrow") from None
+        return pa.RecordBatch.from_pydict({**self.columns, 'needs_attention': self.needs_attention})
+
+
+def _columns(values: Mapping[str, ArrayLike], names: Sequence[str]) -> Tuple[np.ndarray, ...]:
+    arrays = np.broadcast_arrays(*(np.asarray(values[name], dtype=np.float64) for name in names))
+    if arrays[0].ndim != 1:
+        raise ValueError(f"Batch inputs must be 1-D arrays, got shape {arrays[0].shape}")
+    return tuple(arrays)
+
+
+def _labels(labels: Sequence[str], index: np.ndarray) -> np.ndarray:
+    return np.asarray(labels)[index]
+
+
+# Vitality --------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class VitalityProfile:
+    """Thresholds, weights and texts of one engine's vitality calculation"""
+    name: str
+    normalization: Tuple[Tuple[str, float], ...]               # (method, weight), summed in order
+    level_bounds: Tuple[float, ...]                            # ascending; level = labels[#bounds <= v]
+    level_labels: Tuple[str, ...]
+    tiers: Tuple[Tuple[float, Tuple[str, ...]], ...]           # (v < bound, texts), first match
+    rules: Tuple[Tuple[str, str, float, Tuple[str, ...]], ...]  # (input, '<' / '>', threshold, texts)
+    trends: Tuple[Tuple[float, float], ...]                    # (target, rate): short, medium, long term
+    volatility_factor: float
+    potential_target: float
+    energy_target: float
+    latency_target: float
+    quality_weights: Tuple[float, float, float, float]
+    strategy_suffix: str = ""
+    extended_metrics: bool = False
+    constants: Dict[str, Any] = field(default_factory=dict)   # per-sample constants, kept once in metadata
+
+
+ULTIMATE_VITALITY = VitalityProfile(
+    name="ultimate",
+    normalization=(("log", 0.25), ("sigmoid", 0.25), ("minmax", 0.25), ("rank", 0.25)),
+    level_bounds=(0.30, 0.50, 0.60, 0.70, 0.80, 0.90, 0.95),
+    level_labels=('CRITICAL', 'VERY_POOR', 'POOR', 'FAIR', 'GOOD', 'VERY_GOOD', 'EXCELLENT', 'PERFECT'),
+    tiers=(
+        (0.3, ("CRITICAL: Immediate system optimization required", "Activate all optimization protocols",
+               "Consider system redesign")),
+        (0.5, ("Significant optimization needed", "Activate Aeon™ Self-Healing", "Review all system parameters")),
+        (0.7, ("Moderate optimization recommended", "Monitor system closely", "Optimize underperforming components")),
+        (0.9, ("Minor optimizations available", "Fine-tune system parameters", "Maintain current performance")),
+    ),
+    rules=(
+        ("performance", "<", 0.7, ("Optimize performance algorithms", "Increase computational resources",
+                                   "Review performance bottlenecks")),
+        ("accuracy", "<", 0.8, ("Improve model accuracy", "Enhance data quality", "Retrain with better data")),
+        ("energy", ">", 0.8, ("Optimize energy consumption", "Implement power-saving measures",
+                              "Use energy-efficient algorithms")),
+        ("latency", ">", 0.5, ("Reduce system latency", "Optimize network configuration",
+                               "Implement caching strategies")),
+    ),
+    trends=((0.85, 0.1), (0.90, 0.2), (0.95, 0.3)),
+    volatility_factor=10,
+    potential_target=0.95,
+    energy_target=0.3,
+    latency_target=0.1,
+    quality_weights=(0.3, 0.3, 0.2, 0.2),
+)
+
+PERFECT_VITALITY = VitalityProfile(
+    name="perfect",
+    normalization=(("log", 0.25), ("tanh", 0.20), ("atan", 0.20), ("sigmoid", 0.20), ("rational", 0.15)),
+    level_bounds=(0.50, 0.70, 0.80, 0.85, 0.90, 0.95, 0.98),
+    level_labels=('CRITICAL', 'VERY_POOR', 'POOR', 'FAIR', 'GOOD', 'VERY_GOOD', 'EXCELLENT', 'PERFECT'),
+    tiers=(
+        (0.3, ("CRITICAL: Immediate system optimization required", "Activate all optimization protocols",
+               "Consider system redesign", "Emergency response needed")),
+        (0.5, ("Significant optimization needed", "Activate Aeon™ Self-Healing", "Review all system parameters",
+               "Intensive monitoring required")),
+        (0.7, ("Moderate optimization recommended", "Monitor system closely", "Optimize underperforming components",
+               "Preventive measures needed")),
+        (0.85, ("Minor optimizations available", "Fine-tune system parameters", "Maintain current performance",
+                "Continuous improvement")),
+        (0.95, ("System performing excellently", "Maintain current configuration",
+                "Monitor for optimization opportunities", "Prepare for scaling")),
+    ),
+    rules=(
+        ("performance", "<", 0.8, ("Optimize performance algorithms", "Increase computational resources",
+                                   "Review performance bottlenecks", "Implement performance tuning")),
+        ("accuracy", "<", 0.85, ("Improve model accuracy", "Enhance data quality", "Retrain with better data",
+                                 "Optimize accuracy parameters")),
+        ("energy", ">", 0.75, ("Optimize energy consumption", "Implement power-saving measures",
+                               "Use energy-efficient algorithms", "Monitor energy usage")),
+        ("latency", ">", 0.4, ("Reduce system latency", "Optimize network configuration",
+                               "Implement caching strategies", "Optimize processing pipeline")),
+    ),
+    trends=((0.98, 0.05), (0.99, 0.1), (1.0, 0.15)),
+    volatility_factor=5,
+    potential_target=1.0,
+    energy_target=0.25,
+    latency_target=0.05,
+    quality_weights=(0.25, 0.25, 0.25, 0.25),
+    strategy_suffix="_perfect",
+    extended_metrics=True,
+    constants={'prediction_accuracy': 0.9999, 'model_type': 'perfect_predictive', 'optimization_efficiency': 0.9999},
+)
+
+VITALITY_INPUTS = ('performance', 'accuracy', 'energy', 'latency')
+OPTIMIZATION_STRATEGIES = ('fine_tuning', 'targeted_improvement', 'focused_optimization', 'comprehensive_overhaul')
+
+
+def _normalize(vitality_index: np.ndarray, method: str) -> np.ndarray:
+    v = vitality_index
+    if method == "log":
+        return np.where(v > 0, 1 - (1 / (1 + np.log10(np.where(v > 0, v, 0) + 1))), 0.0)
+    if method == "sigmoid":
+        return 1 / (1 + np.exp(-10 * (v - 0.5)))
+    if method in ("minmax", "rank"):     # rank-based normalization is min-max until it has history
+        return np.clip((v - 0.001) / (1000.0 - 0.001), 0.0, 1.0)
+    if method == "tanh":
+        return np.tanh(v)
+    if method == "atan":
+        return (2 / math.pi) * np.arctan(v)
+    if method == "rational":
+        return v / (1 + v)
+    raise ValueError(f"Unknown normalization method {method!r}")
+
+
+def _rule_mask(values: np.ndarray, op: str, threshold: float) -> np.ndarray:
+    return values < threshold if op == "<" else values > threshold
+
+
+def batch_vitality(performance: ArrayLike, accuracy: ArrayLike, energy: ArrayLike, latency: ArrayLike,
+                   profile: VitalityProfile = ULTIMATE_VITALITY) -> BatchResult:
+    """
+    Vitality Index™ V_i = (Performance × Accuracy) / (Energy × Latency) for every row
+
+    Inputs broadcast to one 1-D shape and must all be positive, like the
+    per-sample method's; the first offending row raises ValueError.
+    """
+    inputs = dict(zip(VITALITY_INPUTS, _columns(
+        {'performance': performance, 'accuracy': accuracy, 'energy': energy, 'latency': latency}, VITALITY_INPUTS
+    )))
+    for name, values in inputs.items():
+        bad = ~(np.isfinite(values) & (values > 0))
+        if bad.any():
+            raise ValueError(f"Invalid {name}: must be positive number (row {int(np.argmax(bad))})")
+    p, a, e, l = (inputs[name] for name in VITALITY_INPUTS)
+
+    vitality_index = (p * a) / (e * l)
+    normalized = np.zeros_like(vitality_index)
+    for method, weight in profile.normalization:
+        normalized = normalized + _normalize(vitality_index, method) * weight
+    normalized = np.clip(normalized, 0.0, 1.0)
+
+    columns: Dict[str, np.ndarray] = {
+        'vitality_index': vitality_index,
+        'normalized_vitality': normalized,
+        'vitality_level': _labels(profile.level_labels, np.searchsorted(profile.level_bounds, normalized, 'right')),
+    }
+
+    # Vitality metrics
+    stability = 1.0 - np.abs(p - a) / 100.0
+    metrics = {
+        'performance_efficiency': p / 100.0,
+        'accuracy_efficiency': a / 100.0,
+        'energy_efficiency': 1.0 / e,
+        'latency_efficiency': 1.0 / l,
+        'performance_accuracy_balance': np.minimum(p, a) / np.maximum(p, a),
+        'energy_latency_balance': np.minimum(e, l) / np.maximum(e, l),
+        'signal_to_noise_ratio': vitality_index * 100,
+        'stability_factor': stability,
+        'sustainability_index': (p * a) / (e * e),
+        'growth_potential': vitality_index * stability,
+        'optimization_headroom': 1.0 - vitality_index,
+    }
+    w = profile.quality_weights
+    metrics['overall_quality'] = (metrics['performance_efficiency'] * w[0] + metrics['accuracy_efficiency'] * w[1]
+                                  + metrics['energy_efficiency'] * w[2] + metrics['latency_efficiency'] * w[3])
+    if profile.extended_metrics:
+        metrics['reliability_factor'] = (1 - l / 1000) * (1 - e / 100)
+        metrics['future_performance'] = vitality_index * 1.1
+        metrics['perfect_score'] = (metrics['overall_quality'] * 0.4 + stability * 0.3
+                                    + metrics['reliability_factor'] * 0.3)
+    columns.update(metrics)
+
+    # Predictive trends
+    (short_target, short_rate), (medium_target, medium_rate), (long_target, long_rate) = profile.trends
+    short_term = normalized + (short_target - normalized) * short_rate
+    volatility = np.abs(short_term - normalized) * profile.volatility_factor
+    columns.update({
+        'trend_direction': _labels(('declining', 'stable', 'improving'),
+                                   np.sign(short_term - normalized).astype(np.intp) + 1),
+        'short_term_prediction': short_term,
+        'medium_term_prediction': normalized + (medium_target - normalized) * medium_rate,
+        'long_term_prediction': normalized + (long_target - normalized) * long_rate,
+        'volatility': volatility,
+        'confidence_interval': volatility * 0.5,
+        'optimization_potential': np.maximum(0, profile.potential_target - normalized),
+    })
+
+    # Optimization opportunities, in the per-sample method's order
+    gains = {
+        'performance_optimization': (1.0 - p) * 100,
+        'accuracy_optimization': (1.0 - a) * 100,
+        'energy_optimization': np.where(e > profile.energy_target, (e - profile.energy_target) / e * 100, 0.0),
+        'latency_optimization': np.where(l > profile.latency_target, (l - profile.latency_target) / l * 100, 0.0),
+    }
+    crossed = {name: _rule_mask(inputs[name], op, threshold) for name, op, threshold, _ in profile.rules}
+    total_gain = np.zeros_like(vitality_index)
+    for (name, gain), input_name in zip(gains.items(), VITALITY_INPUTS):
+        columns[f'{name}_potential_gain'] = gain
+        columns[f'{name}_priority'] = np.where(crossed[input_name], 'high', 'medium')
+        total_gain = total_gain + gain
+    high_count = sum(mask.astype(np.intp) for mask in crossed.values())
+    columns.update({
+        'total_potential_gain': total_gain,
+        'recommended_focus': _labels(list(gains), np.argmax(np.stack(list(gains.values())), axis=0)),
+        'optimization_strategy': _labels([s + profile.strategy_suffix for s in OPTIMIZATION_STRATEGIES],
+                                         np.minimum(high_count, 3)),
+    })
+
+    tier = np.searchsorted([bound for bound, _ in profile.tiers], normalized, 'right')
+    needs_attention = (tier < len(profile.tiers)) | np.any(np.stack(list(crossed.values())), axis=0)
+
+    def describe(row: int) -> List[str]:
+        recommendations: List[str] = []
+        if tier[row] < len(profile.tiers):
+            recommendations.extend(profile.tiers[tier[row]][1])
+        for name, _, _, texts in profile.rules:
+            if crossed[name][row]:
+                recommendations.extend(texts)
+        return recommendations
+
+    return BatchResult(columns, needs_attention, describe, {'profile': profile.name, **profile.constants})
+
+
+# Hardware abstraction --------------------------------------------------------
+
+
+HARDWARE_COMPONENTS = ('cpu', 'memory', 'storage', 'network', 'gpu')
+
+HARDWARE_FIELDS = {
+    'cpu': ('usage_percent', 'cores', 'frequency', 'temperature'),
+    'memory': ('usage_percent', 'total_gb', 'available_gb', 'swap_usage_percent'),
+    'storage': ('usage_percent', 'total_gb', 'read_speed_mb_s', 'write_speed_mb_s', 'iops'),
+    'network': ('bandwidth_usage_percent', 'latency_ms', 'packet_loss_percent', 'throughput_mb_s'),
+    'gpu': ('usage_percent', 'memory_usage_percent', 'temperature', 'cores'),
+}
+
+HARDWARE_DEFAULTS = {
+    'cpu': {'usage_percent': 0.0, 'cores': 1, 'frequency': 1.0, 'temperature': 50.0},
+    'memory': {'usage_percent': 0.0, 'total_gb': 8.0, 'swap_usage_percent': 0.0},   # available_gb: from usage
+    'storage': {'usage_percent': 0.0, 'total_gb': 100.0, 'read_speed_mb_s': 100.0, 'write_speed_mb_s': 100.0,
+                'iops': 1000},
+    'network': {'bandwidth_usage_percent': 0.0, 'latency_ms': 10.0, 'packet_loss_percent': 0.0,
+                'throughput_mb_s': 100.0},
+    'gpu': {'usage_percent': 0.0, 'memory_usage_percent': 0.0, 'temperature': 60.0, 'cores': 1},
+}
+
+SYSTEM_HEALTH_WEIGHTS = {'cpu': 0.25, 'memory': 0.20, 'storage': 0.20, 'network': 0.20, 'gpu': 0.15}
+
+# (signal, op, threshold, alert, recommendation); a tuple of rules is an if / elif chain
+AlertChain = Tuple[Tuple[str, str, float, str, str], ...]
+
+
+@dataclass(frozen=True)
+class HardwareProfile:
+    """Coefficients, thresholds and texts of one engine's hardware abstraction"""
+    name: str
+    cpu_temperature_factor: float
+    swap_factor: float
+    packet_loss_factor: float
+    latency_divisor: float
+    gpu_temperature_factor: float
+    status_bounds: Tuple[float, ...]                     # ascending; status = labels[#bounds <= score]
+    status_labels: Tuple[str, ...]
+    alerts: Dict[str, Tuple[AlertChain, ...]]
+    status_texts: Dict[str, str]                         # status -> text with {component}
+    score_tiers: Tuple[Tuple[float, Tuple[str, ...]], ...]   # (mean score < bound, texts), first match
+    system_texts: Tuple[str, ...]
+    load_factors: Tuple[Tuple[int, float], ...]          # (load %, performance factor)
+    optimal_utilization: float
+    scaling_bounds: Tuple[float, ...]                    # ascending; policy = labels[#bounds < score]
+    scaling_labels: Tuple[str, ...]
+    scaling_texts: Dict[str, Tuple[str, ...]]
+    constants: Dict[str, Any] = field(default_factory=dict)   # per-sample constants, kept once in metadata
+
+
+ULTIMATE_HARDWARE = HardwareProfile(
+    name="ultimate",
+    cpu_temperature_factor=2, swap_factor=1, packet_loss_factor=10, latency_divisor=10, gpu_temperature_factor=2,
+    status_bounds=(0.5, 0.7, 0.9),
+    status_labels=('critical', 'degraded', 'good', 'optimal'),
+    alerts={
+        'cpu': (
+            (("usage", ">", 90, "Critical CPU utilization", "Scale up CPU resources"),
+             ("usage", ">", 70, "High CPU utilization", "Monitor CPU usage closely")),
+            (("temperature", ">", 80, "High CPU temperature", "Check cooling system"),),
+        ),
+        'memory': (
+            (("usage", ">", 90, "Critical memory usage", "Add more memory"),
+             ("usage", ">", 80, "High memory usage", "Optimize memory usage")),
+            (("swap", ">", 50, "High swap usage", "Add more memory or optimize usage"),),
+        ),
+        'storage': (
+            (("usage", ">", 95, "Critical storage usage", "Add more storage"),
+             ("usage", ">", 85, "High storage usage", "Clean up storage")),
+            (("min_speed", "<", 50, "Low storage performance", "Optimize storage configuration"),),
+        ),
+        'network': (
+            (("bandwidth", ">", 90, "Critical bandwidth usage", "Increase bandwidth"),),
+            (("latency", ">", 100, "High network latency", "Optimize network configuration"),),
+            (("packet_loss", ">", 1, "Packet loss detected", "Check network hardware"),),
+        ),
+        'gpu': (
+            (("usage", ">", 95, "Critical GPU usage", "Optimize GPU workload"),),
+            (("temperature", ">", 85, "High GPU temperature", "Check GPU cooling"),),
+        ),
+    },
+    status_texts={'critical': "Critical: Optimize {component} immediately",
+                  'degraded': "Optimize {component} performance"},
+    score_tiers=(
+        (0.5, ("Immediate system optimization required", "Consider hardware upgrade")),
+        (0.7, ("System optimization recommended",)),
+    ),
+    system_texts=("Implement dynamic resource allocation", "Enable predictive scaling",
+                  "Optimize resource scheduling"),
+    load_factors=((50, 0.8), (75, 0.6), (90, 0.4)),
+    optimal_utilization=70.0,
+    scaling_bounds=(0.6, 0.8),
+    scaling_labels=('scale_up', 'monitor', 'maintain'),
+    scaling_texts={'scale_up': ("Scale up resources immediately", "Consider load balancing"),
+                   'monitor': ("Monitor system closely", "Prepare for scaling")},
+)
+
+PERFECT_HARDWARE = HardwareProfile(
+    name="perfect",
+    cpu_temperature_factor=1.5, swap_factor=0.5, packet_loss_factor=5, latency_divisor=5, gpu_temperature_factor=1.5,
+    status_bounds=(0.65, 0.75, 0.85, 0.95),
+    status_labels=('poor', 'fair', 'good', 'excellent', 'perfect'),
+    alerts={
+        'cpu': (
+            (("usage", ">", 85, "High CPU utilization", "Optimize CPU-intensive processes"),
+             ("usage", ">", 70, "Moderate CPU utilization", "Monitor CPU usage")),
+            (("temperature", ">", 75, "High CPU temperature", "Check cooling system"),),
+        ),
+        'memory': (
+            (("usage", ">", 85, "High memory usage", "Optimize memory usage"),
+             ("usage", ">", 75, "Moderate memory usage", "Monitor memory usage")),
+            (("swap", ">", 40, "High swap usage", "Add more memory"),),
+        ),
+        'storage': (
+            (("usage", ">", 90, "High storage usage", "Clean up storage"),
+             ("usage", ">", 80, "Moderate storage usage", "Monitor storage usage")),
+            (("min_speed", "<", 80, "Low storage performance", "Optimize storage configuration"),),
+        ),
+        'network': (
+            (("bandwidth", ">", 85, "High bandwidth usage", "Optimize bandwidth usage"),),
+            (("latency", ">", 80, "High network latency", "Optimize network configuration"),),
+            (("packet_loss", ">", 0.5, "Packet loss detected", "Check network hardware"),),
+        ),
+        'gpu': (
+            (("usage", ">", 90, "High GPU usage", "Optimize GPU workload"),),
+            (("temperature", ">", 80, "High GPU temperature", "Check GPU cooling"),),
+        ),
+    },
+    status_texts={'poor': "Optimize {component} immediately", 'fair': "Optimize {component} immediately",
+                  'good': "Optimize {component} performance"},
+    score_tiers=(
+        (0.6, ("Immediate system optimization required", "Consider hardware upgrade", "Activate performance tuning")),
+        (0.8, ("System optimization recommended", "Monitor performance closely")),
+    ),
+    system_texts=("Implement dynamic resource allocation", "Enable predictive scaling", "Optimize resource scheduling",
+                  "Activate performance monitoring", "Enable auto-optimization"),
+    load_factors=((25, 0.95), (50, 0.85), (75, 0.70), (90, 0.50)),
+    optimal_utilization=75.0,
+    scaling_bounds=(0.7, 0.8, 0.9),
+    scaling_labels=('immediate_scaling', 'predictive_scaling', 'monitor_optimal', 'maintain_perfect'),
+    scaling_texts={
+        'immediate_scaling': ("Scale up resources immediately", "Implement load balancing",
+                              "Activate emergency protocols"),
+        'predictive_scaling': ("Enable predictive scaling", "Monitor trends closely", "Prepare for scaling"),
+        'monitor_optimal': ("Maintain optimal performance", "Continue monitoring", "Fine-tune as needed"),
+    },
+    constants={'prediction_accuracy': 0.9999},
+)
+
+
+def _component_fields(component: str, data: Union[Mapping[str, ArrayLike], np.ndarray],
+                      rows: Optional[int]) -> Dict[str, np.ndarray]:
+    """Field arrays of one component, with NaN / missing fields set to their defaults"""
+    names = HARDWARE_FIELDS[component]
+    if isinstance(data, np.ndarray):
+        if data.ndim != 2 or data.shape[1] != len(names):
+            raise ValueError(f"{component} matrix must be (rows, {len(names)}) with columns {names}, got {data.shape}")
+        raw = {name: data[:, j].astype(np.float64) for j, name in enumerate(names)}
+    else:
+        raw = {name: np.asarray(data[name], dtype=np.float64) for name in names if name in data}
+    if rows is None:
+        rows = max((np.size(v) for v in raw.values()), default=1)
+
+    defaults = HARDWARE_DEFAULTS[component]
+    fields = {}
+    for name in names:
+        if name in defaults:
+            values = np.broadcast_to(raw.get(name, np.nan), (rows,)).astype(np.float64)
+            fields[name] = np.where(np.isnan(values), defaults[name], values)
+    if component == 'memory':
+        derived = fields['total_gb'] * (1 - fields['usage_percent'] / 100)
+        available = np.broadcast_to(raw.get('available_gb', np.nan), (rows,))
+        fields['available_gb'] = np.where(np.isnan(available), derived, available)
+    return fields
+
+
+def _analyze_component(component: str, f: Dict[str, np.ndarray], profile: HardwareProfile):
+    """(utilization, performance, health, efficiency, alert signals) of one component"""
+    if component == 'cpu':
+        usage, capacity = f['usage_percent'], f['cores'] * f['frequency']
+        performance = capacity * (1 - usage / 100)
+        health = np.maximum(0, 100 - usage - (f['temperature'] - 50) * profile.cpu_temperature_factor)
+        return usage, performance, health, performance / capacity, {'usage': usage, 'temperature': f['temperature']}
+    if component == 'memory':
+        usage, swap = f['usage_percent'], f['swap_usage_percent']
+        performance = (f['available_gb'] / f['total_gb']) * 100
+        health = np.maximum(0, 100 - usage - swap * profile.swap_factor)
+        return usage, performance, health, performance, {'usage': usage, 'swap': swap}
+    if component == 'storage':
+        usage = f['usage_percent']
+        performance = (f['read_speed_mb_s'] + f['write_speed_mb_s']) / 2
+        health = np.maximum(0, 100 - usage)
+        return usage, performance, health, performance / 200, {
+            'usage': usage, 'min_speed': np.minimum(f['read_speed_mb_s'], f['write_speed_mb_s'])}
+    if component == 'network':
+        bandwidth, latency, loss = f['bandwidth_usage_percent'], f['latency_ms'], f['packet_loss_percent']
+        performance = f['throughput_mb_s'] * (1 - loss / 100) / (1 + latency / 100)
+        health = np.maximum(0, 100 - bandwidth - loss * profile.packet_loss_factor - latency / profile.latency_divisor)
+        return bandwidth, performance, health, performance / 100, {
+            'bandwidth': bandwidth, 'latency': latency, 'packet_loss': loss}
+    # gpu
+    usage = f['usage_percent']
+    utilization = np.maximum(usage, f['memory_usage_percent'])
+    performance = f['cores'] * (1 - utilization / 100)
+    health = np.maximum(0, 100 - utilization - (f['temperature'] - 60) * profile.gpu_temperature_factor)
+    return utilization, performance, health, performance / f['cores'], {
+        'usage': usage, 'temperature': f['temperature']}
+
+
+def batch_hardware(hardware: Mapping[str, Union[Mapping[str, ArrayLike], np.ndarray]],
+                   profile: HardwareProfile = ULTIMATE_HARDWARE) -> BatchResult:
+    """
+    Hardware abstraction of every row
+
+    A row whose component divides by zero (no cores, no memory) gets that
+    component's status 'error' and optimization score 0, and is left out
+    of system health and allocation, as the per-sample method does.
+    recommendations(row) is the per-sample 'optimizations' list followed
+    by the allocation strategy's recommendations, without duplicates;
+    metadata['alerts'](row) gives the alert texts per component.
+    """
+    for component in HARDWARE_COMPONENTS:
+        if component not in hardware:
+            raise ValueError(f"Missing hardware component: {component}")
+
+    rows = None
+    for component in HARDWARE_COMPONENTS:
+        data = hardware[component]
+        if isinstance(data, np.ndarray):
+            rows = data.shape[0]
+            break
+        sizes = [np.size(v) for v in data.values() if np.ndim(v)]
+        if sizes:
+            rows = max(sizes)
+            break
+
+    columns: Dict[str, np.ndarray] = {}
+    valid, scores, attention_scores, chains_hit = {}, {}, {}, {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for component in HARDWARE_COMPONENTS:
+            fields = _component_fields(component, hardware[component], rows)
+            rows = len(next(iter(fields.values())))
+            utilization, performance, health, efficiency, signals = _analyze_component(component, fields, profile)
+            ok = np.isfinite(performance) & np.isfinite(health) & np.isfinite(efficiency)
+            score = np.where(ok, health / 100, 0.0)
+            status = _labels(profile.status_labels, np.searchsorted(profile.status_bounds, score, 'right'))
+
+            # First matching rule of each chain, -1 when none
+            hits = []
+            for chain in profile.alerts[component]:
+                hit = np.full(rows, -1, dtype=np.intp)
+                for position in range(len(chain) - 1, -1, -1):
+                    signal, op, threshold, _, _ = chain[position]
+                    hit = np.where(_rule_mask(signals[signal], op, threshold), position, hit)
+                hits.append(np.where(ok, hit, -1))
+
+            valid[component], scores[component], chains_hit[component] = ok, score, hits
+            attention_scores[component] = np.where(ok, (health + performance) / 2, np.inf)
+            columns.update({
+                f'{component}_utilization': np.where(ok, utilization, np.nan),
+                f'{component}_performance': np.where(ok, performance, np.nan),
+                f'{component}_health': np.where(ok, health, np.nan),
+                f'{component}_efficiency': np.where(ok, efficiency, np.nan),
+                f'{component}_optimization_score': score,
+                f'{component}_status': np.where(ok, status, 'error'),
+                f'{component}_alerts': sum((hit >= 0).astype(np.intp) for hit in hits),
+            })
+            for load, factor in profile.load_factors:
+                columns[f'{component}_predicted_{load}_load'] = np.where(ok, performance * factor, np.nan)
+            columns[f'{component}_current_efficiency'] = np.where(ok & (performance > 0), performance / 100,
+                                                                   np.where(ok, 0.0, np.nan))
+
+    system_health = np.zeros(rows)
+    for component in HARDWARE_COMPONENTS:
+        system_health = system_health + np.where(valid[component],
+                                                 columns[f'{component}_health'] * SYSTEM_HEALTH_WEIGHTS[component], 0)
+    optimization_score = sum(scores[c] for c in HARDWARE_COMPONENTS) / len(HARDWARE_COMPONENTS)
+
+    # Allocation: components by ascending (health + performance) / 2, invalid ones last and dropped
+    component_scores = np.stack([attention_scores[c] for c in HARDWARE_COMPONENTS], axis=1)
+    order = np.argsort(component_scores, axis=1, kind='stable')[:, :3]
+    ranked = np.take_along_axis(component_scores, order, axis=1)
+    priorities = np.where(np.isfinite(ranked), np.asarray(HARDWARE_COMPONENTS)[order], '')
+    valid_count = sum(valid[c].astype(np.intp) for c in HARDWARE_COMPONENTS)
+    finite_scores = np.where(np.isfinite(component_scores), component_scores, 0.0)
+    mean_score = np.where(valid_count > 0, finite_scores.sum(axis=1) / np.maximum(valid_count, 1), 0.0)
+    policy = _labels(profile.scaling_labels, np.searchsorted(profile.scaling_bounds, mean_score, 'left'))
+
+    columns.update({
+        'system_health': system_health,
+        'optimization_score': optimization_score,
+        'priority_1': priorities[:, 0], 'priority_2': priorities[:, 1], 'priority_3': priorities[:, 2],
+        'scaling_policy': policy,
+    })
+
+    tier = np.searchsorted([bound for bound, _ in profile.score_tiers], optimization_score, 'right')
+    needs_attention = (tier < len(profile.score_tiers)) | np.isin(policy, list(profile.scaling_texts))
+    for component in HARDWARE_COMPONENTS:
+        needs_attention |= columns[f'{component}_alerts'] > 0
+        needs_attention |= np.isin(columns[f'{component}_status'], list(profile.status_texts))
+
+    def describe(row: int) -> List[str]:
+        texts: List[str] = []
+        if tier[row] < len(profile.score_tiers):
+            texts.extend(profile.score_tiers[tier[row]][1])
+        for component in HARDWARE_COMPONENTS:
+            status_text = profile.status_texts.get(str(columns[f'{component}_status'][row]))
+            if status_text:
+                texts.append(status_text.format(component=component))
+            for chain, hit in zip(profile.alerts[component], chains_hit[component]):
+                if hit[row] >= 0:
+                    texts.append(chain[hit[row]][4])
+        texts.extend(profile.system_texts)
+        texts.extend(profile.scaling_texts.get(str(policy[row]), ()))
+        return list(dict.fromkeys(texts))
+
+    def alerts(row: int) -> Dict[str, List[str]]:
+        return {component: [chain[hit[row]][3] for chain, hit in zip(profile.alerts[component], chains_hit[component])
+                            if hit[row] >= 0]
+                for component in HARDWARE_COMPONENTS}
+
+    return BatchResult(columns, needs_attention, describe, {
+        'profile': profile.name, 'optimal_utilization': profile.optimal_utilization, **profile.constants,
+        'alerts': alerts})
@@ -13,6 +13,8 @@ from functools import wraps
 import time
 import traceback
 
+from logic.instrumentation import instrumented, size_summary
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -69,27 +71,8 @@ def validate_input(func):
     return wrapper
 
 def performance_monitor(func):
-    """Decorator for performance monitoring"""
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        input_size = len(str(args)) + len(str(kwargs))
-        
-        try:
-            result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            output_size = len(str(result))
-            
-            # Log performance metrics
-            logger.info(f"Performance - {func.__name__}: {execution_time:.4f}s, Input: {input_size}, Output: {output_size}")
-            
-            return result
-        except Exception as e:
-            execution_time = time.time() - start_time
-            logger.error(f"Performance - {func.__name__} failed after {execution_time:.4f}s: {str(e)}")
-            logger.error(traceback.format_exc())
-            raise
-    return wrapper
+    """Decorator for performance monitoring (sampled, see logic.instrumentation)"""
+    return instrumented(func, logger, summary=size_summary)
 
 class EnhancedAeonCore:
     """Enhanced Aeon™ Evolution Core with improved algorithms"""
@@ -16,6 +16,7 @@ import traceback
 import hashlib
 import uuid
 import statistics
+import threading
 from concurrent.futures import ThreadPoolExecutor
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 from sklearn.preprocessing import StandardScaler
@@ -24,6 +25,12 @@ from sklearn.neural_network import MLPClassifier
 from sklearn.svm import SVC
 import pickle
 
+from logic.ensemble_executor import Detector, EnsembleExecutor, EnsembleRun
+from logic.instrumentation import instrumented
+from logic.knn_index import deviation_features, knn_score
+from logic.metrics_history import ALGORITHM_FIELDS, MetricsHistory
+from logic.model_registry import ModelRegistry, get_model_registry
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -111,51 +118,83 @@ def enhanced_validation(func):
             raise
     return wrapper
 
+def _efficiency_summary(seconds: float, args: tuple, kwargs: dict, result: Any) -> str:
+    input_size = len(str(args)) + len(str(kwargs))
+    output_size = len(str(result))
+    throughput = output_size / seconds if seconds > 0 else 0
+
+    # Enhanced performance calculations
+    efficiency = throughput / (input_size + 1) if input_size > 0 else 0
+    optimization_score = min(100, efficiency * 100)
+    return (f", Input: {input_size}, Output: {output_size}, Throughput: {throughput:.2f}, "
+            f"Efficiency: {efficiency:.4f}, Optimization: {optimization_score:.2f}%")
+
 def enhanced_performance_monitor(func):
-    """Enhanced performance monitoring decorator"""
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        start_memory = 0  # Would use psutil in real implementation
-        start_cpu = 0  # Would use psutil in real implementation
-        
-        try:
-            result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # Calculate enhanced metrics
-            input_size = len(str(args)) + len(str(kwargs))
-            output_size = len(str(result))
-            throughput = output_size / execution_time if execution_time > 0 else 0
-            
-            # Enhanced performance calculations
-            efficiency = throughput / (input_size + 1) if input_size > 0 else 0
-            optimization_score = min(100, efficiency * 100)
-            
-            logger.info(f"Enhanced Performance - {func.__name__}: {execution_time:.4f}s, Input: {input_size}, Output: {output_size}, Throughput: {throughput:.2f}, Efficiency: {efficiency:.4f}, Optimization: {optimization_score:.2f}%")
-            
-            return result
-        except Exception as e:
-            execution_time = time.time() - start_time
-            logger.error(f"Enhanced Performance - {func.__name__} failed after {execution_time:.4f}s: {str(e)}")
-            logger.error(traceback.format_exc())
-            raise
-    return wrapper
+    """Enhanced performance monitoring decorator (sampled, see logic.instrumentation)"""
+    return instrumented(func, logger, "Enhanced Performance", _efficiency_summary)
+
+ENHANCED_METRIC_FIELDS = ALGORITHM_FIELDS + ('model_confidence', 'prediction_accuracy', 'optimization_level')
+
+MODEL_INPUT_WIDTH = 10  # Feature count the models are initialized with
+
+def _pad_features(features: np.ndarray, width: int = MODEL_INPUT_WIDTH) -> np.ndarray:
+    """Truncate or zero-pad (n, F) feature rows to the model input width"""
+    padded = np.zeros((len(features), width))
+    columns = min(width, features.shape[1])
+    padded[:, :columns] = features[:, :columns]
+    return padded
+
+# Weighted voting over the sub-detectors (sums to 1)
+ENHANCED_DETECTOR_WEIGHTS = {
+    'statistical': 0.15,
+    'random_forest': 0.15,
+    'gradient_boosting': 0.15,
+    'neural_network': 0.15,
+    'ensemble': 0.15,
+    'deep_learning': 0.1,
+    'time_series': 0.075,
+    'pattern_recognition': 0.075
+}
+
+ENHANCED_MODELS = ('mutation_detector', 'vitality_predictor', 'neural_router', 'ensemble_classifier')
+
+def train_enhanced_models(seed: int = 42) -> Dict[str, Any]:
+    """Train the enhanced ML models on synthetic data (run offline: python -m logic.model_registry train)"""
+    rng = np.random.default_rng(seed)
+    n_samples = 1000
+    n_features = MODEL_INPUT_WIDTH
+    
+    models = {
+        'mutation_detector': RandomForestClassifier(n_estimators=100, random_state=42),
+        'vitality_predictor': GradientBoostingClassifier(n_estimators=100, random_state=42),
+        'neural_router': MLPClassifier(hidden_layer_sizes=(100, 50), random_state=42),
+        'ensemble_classifier': SVC(probability=True, random_state=42)
+    }
+    # (classes, class probabilities) of the synthetic labels per model
+    labels = {
+        'mutation_detector': ([0, 1], [0.7, 0.3]),
+        'vitality_predictor': ([0, 1, 2], [0.6, 0.3, 0.1]),
+        'neural_router': ([0, 1, 2, 3], None),
+        'ensemble_classifier': ([0, 1], [0.6, 0.4])
+    }
+    for name, model in models.items():
+        classes, p = labels[name]
+        model.fit(rng.random((n_samples, n_features)), rng.choice(classes, n_samples, p=p))
+    return models
 
 class EnhancedPerfectAlgorithms:
     """Enhanced perfect algorithms system with advanced ML capabilities"""
     
-    def __init__(self):
-        self.metrics_history: List[EnhancedAlgorithmMetrics] = []
+    def __init__(self, model_registry: Optional[ModelRegistry] = None):
+        self.metrics_history = MetricsHistory(ENHANCED_METRIC_FIELDS)
         self.model_cache: Dict[str, Any] = {}
         self.scaler = StandardScaler()
         self.executor = ThreadPoolExecutor(max_workers=8)
         
-        # Enhanced ML models
-        self.mutation_detector = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.vitality_predictor = GradientBoostingClassifier(n_estimators=100, random_state=42)
-        self.neural_router = MLPClassifier(hidden_layer_sizes=(100, 50), random_state=42)
-        self.ensemble_classifier = SVC(probability=True, random_state=42)
+        # Enhanced ML models: versioned artifacts, loaded on first use
+        self.model_registry = model_registry or get_model_registry()
+        self._fallback_models: Optional[Dict[str, Any]] = None
+        self._fallback_lock = threading.Lock()
         
         # Enhanced configuration
         self.optimization_enabled = True
@@ -163,44 +202,36 @@ class EnhancedPerfectAlgorithms:
         self.parallel_processing = True
         self.caching_enabled = True
         self.auto_tuning = True
-        
-        # Initialize enhanced models
-        self._initialize_enhanced_models()
-        
-    def _initialize_enhanced_models(self) -> None:
-        """Initialize enhanced ML models"""
+        self.parallel_min_history = 256
+        self.ensemble = EnsembleExecutor(self.executor)
+    
+    def _model(self, name: str) -> Any:
+        """Registry model, or models trained in-process when nothing has been published"""
         try:
-            # Pre-train models with synthetic data for better performance
-            logger.info("Initializing enhanced ML models...")
-            
-            # Generate synthetic training data
-            n_samples = 1000
-            n_features = 10
-            
-            # Mutation detection training data
-            X_mutation = np.random.rand(n_samples, n_features)
-            y_mutation = np.random.choice([0, 1], n_samples, p=[0.7, 0.3])
-            self.mutation_detector.fit(X_mutation, y_mutation)
-            
-            # Vitality prediction training data
-            X_vitality = np.random.rand(n_samples, n_features)
-            y_vitality = np.random.choice([0, 1, 2], n_samples, p=[0.6, 0.3, 0.1])
-            self.vitality_predictor.fit(X_vitality, y_vitality)
-            
-            # Neural router training data
-            X_router = np.random.rand(n_samples, n_features)
-            y_router = np.random.choice([0, 1, 2, 3], n_samples)
-            self.neural_router.fit(X_router, y_router)
-            
-            # Ensemble classifier training data
-            X_ensemble = np.random.rand(n_samples, n_features)
-            y_ensemble = np.random.choice([0, 1], n_samples, p=[0.6, 0.4])
-            self.ensemble_classifier.fit(X_ensemble, y_ensemble)
-            
-            logger.info("Enhanced ML models initialized successfully")
-            
-        except Exception as e:
-            logger.error(f"Error initializing enhanced models: {str(e)}")
+            return self.model_registry.get(name)
+        except LookupError:
+            with self._fallback_lock:
+                if self._fallback_models is None:
+                    logger.warning(f"No published enhanced models under {self.model_registry.root}; "
+                                   "training in-process (publish with: python -m logic.model_registry train)")
+                    self._fallback_models = train_enhanced_models()
+            return self._fallback_models[name]
+    
+    @property
+    def mutation_detector(self) -> RandomForestClassifier:
+        return self._model('mutation_detector')
+    
+    @property
+    def vitality_predictor(self) -> GradientBoostingClassifier:
+        return self._model('vitality_predictor')
+    
+    @property
+    def neural_router(self) -> MLPClassifier:
+        return self._model('neural_router')
+    
+    @property
+    def ensemble_classifier(self) -> SVC:
+        return self._model('ensemble_classifier')
     
     @enhanced_validation
     @enhanced_performance_monitor
@@ -223,44 +254,21 @@ class EnhancedPerfectAlgorithms:
             baseline = data['baseline']
             historical_data = data['historical_data']
             
-            # Enhanced mutation detection with multiple ML approaches
-            mutation_scores = []
-            
-            # 1. Statistical anomaly detection
-            stat_score = self._enhanced_statistical_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(stat_score)
-            
-            # 2. Random Forest ML detection
-            rf_score = self._random_forest_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(rf_score)
-            
-            # 3. Gradient Boosting detection
-            gb_score = self._gradient_boosting_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(gb_score)
-            
-            # 4. Neural Network detection
-            nn_score = self._neural_network_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(nn_score)
-            
-            # 5. Ensemble method detection
-            ensemble_score = self._ensemble_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(ensemble_score)
-            
-            # 6. Deep learning detection
-            dl_score = self._enhanced_deep_learning_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(dl_score)
-            
-            # 7. Time series analysis
-            ts_score = self._enhanced_time_series_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(ts_score)
-            
-            # 8. Pattern recognition
-            pattern_score = self._enhanced_pattern_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(pattern_score)
+            # Enhanced mutation detection with multiple ML approaches, run
+            # concurrently for long histories; detectors that fail or time
+            # out are left out and the remaining weights renormalized
+            run = self._run_mutation_detectors(metrics, baseline, historical_data)
+            finished = [name for name in run.timings if name in run.scores]
+            if not finished:
+                raise RuntimeError(f"No mutation detector finished: {run.timings}")
+            individual_scores = {name: run.scores[name] for name in finished}
+            mutation_scores = list(individual_scores.values())
             
             # Enhanced ensemble approach with weighted voting
-            weights = [0.15, 0.15, 0.15, 0.15, 0.15, 0.1, 0.075, 0.075]
+            weights = [ENHANCED_DETECTOR_WEIGHTS[name] for name in finished]
             final_mutation_score = sum(score * weight for score, weight in zip(mutation_scores, weights))
+            if run.degraded:
+                final_mutation_score /= sum(weights)
             
             # Calculate confidence with enhanced methods
             confidence = 1.0 - (statistics.stdev(mutation_scores) if len(mutation_scores) > 1 else 0)
@@ -270,7 +278,7 @@ class EnhancedPerfectAlgorithms:
             
             # Generate comprehensive recommendations
             recommendations = self._enhanced_generate_mutation_recommendations(
-                final_mutation_score, severity, mutation_scores
+                final_mutation_score, severity, individual_scores
             )
             
             # Calculate enhanced predictive metrics
@@ -285,19 +293,12 @@ class EnhancedPerfectAlgorithms:
                 'mutation_score': final_mutation_score,
                 'confidence': confidence,
                 'severity': severity,
-                'individual_scores': {
-                    'statistical': stat_score,
-                    'random_forest': rf_score,
-                    'gradient_boosting': gb_score,
-                    'neural_network': nn_score,
-                    'ensemble': ensemble_score,
-                    'deep_learning': dl_score,
-                    'time_series': ts_score,
-                    'pattern_recognition': pattern_score
-                },
+                'individual_scores': individual_scores,
                 'recommendations': recommendations,
                 'predictive_metrics': predictive_metrics,
                 'detection_method': 'enhanced_ensemble',
+                'detector_timings': run.timings,
+                'degraded_detectors': run.missing,
                 'timestamp': datetime.now().isoformat(),
                 'accuracy': 0.9999,  # Enhanced accuracy
                 'model_confidence': model_confidence,
@@ -316,6 +317,24 @@ class EnhancedPerfectAlgorithms:
             logger.error(traceback.format_exc())
             raise
     
+    def _run_mutation_detectors(self, metrics: Dict[str, Any], baseline: Dict[str, Any], 
+                                historical_data: List[Dict[str, Any]]) -> EnsembleRun:
+        """Run the eight sub-detectors (in parallel once the history is long enough to pay for it)"""
+        detectors = [
+            Detector('statistical', self._enhanced_statistical_mutation_detection, mode='inline'),
+            # sklearn inference and numpy kNN release the GIL
+            Detector('random_forest', self._random_forest_mutation_detection),
+            Detector('gradient_boosting', self._gradient_boosting_mutation_detection),
+            Detector('neural_network', self._neural_network_mutation_detection),
+            Detector('ensemble', self._ensemble_mutation_detection),
+            Detector('deep_learning', self._enhanced_deep_learning_mutation_detection),
+            # Only look at the last few points
+            Detector('time_series', self._enhanced_time_series_mutation_detection, mode='inline'),
+            Detector('pattern_recognition', self._enhanced_pattern_mutation_detection, mode='inline')
+        ]
+        parallel = self.parallel_processing and len(historical_data) >= self.parallel_min_history
+        return self.ensemble.run(detectors, (metrics, baseline, historical_data), parallel=parallel)
+    
     def _enhanced_statistical_mutation_detection(self, metrics: Dict[str, Any], baseline: Dict[str, Any], 
                                                   historical_data: List[Dict[str, Any]]) -> float:
         """Enhanced statistical mutation detection"""
@@ -350,56 +369,52 @@ class EnhancedPerfectAlgorithms:
             logger.error(f"Error in enhanced statistical mutation detection: {str(e)}")
             return 0.0
     
+    # Model inputs ----------------------------------------------------------
+    
+    def _model_input(self, metrics: Dict[str, Any], baseline: Dict[str, Any], 
+                     historical_data: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """(1, F) current deviation vector, or None without enough history to score against"""
+        _, current_features, features, partial = deviation_features(metrics, baseline, historical_data)
+        if len(features) + partial > 1 and len(current_features) > 0:
+            return current_features[None, :]
+        return None
+    
+    def model_mutation_scores(self, current_features: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Random Forest, Gradient Boosting, Neural Network and Ensemble scores
+        for (n, F) deviation vectors, one predict_proba call per model
+        """
+        current_features = np.atleast_2d(np.asarray(current_features, dtype=np.float64))
+        return {
+            'random_forest': self._random_forest_scores(current_features),
+            'gradient_boosting': self._gradient_boosting_scores(current_features),
+            'neural_network': self._neural_network_scores(current_features),
+            'ensemble': self._ensemble_scores(current_features)
+        }
+    
+    def _random_forest_scores(self, current_features: np.ndarray) -> np.ndarray:
+        return self.mutation_detector.predict_proba(_pad_features(current_features))[:, 1]
+    
+    def _gradient_boosting_scores(self, current_features: np.ndarray) -> np.ndarray:
+        # Weight the probabilities (higher weight for mutation classes)
+        probabilities = self.vitality_predictor.predict_proba(_pad_features(current_features))
+        return probabilities[:, 1] * 0.6 + probabilities[:, 2] * 0.4
+    
+    def _neural_network_scores(self, current_features: np.ndarray) -> np.ndarray:
+        probabilities = self.neural_router.predict_proba(_pad_features(current_features))
+        return probabilities[:, 1] * 0.2 + probabilities[:, 2] * 0.3 + probabilities[:, 3] * 0.5
+    
+    def _ensemble_scores(self, current_features: np.ndarray) -> np.ndarray:
+        return self.ensemble_classifier.predict_proba(_pad_features(current_features))[:, 1]
+    
     def _random_forest_mutation_detection(self, metrics: Dict[str, Any], baseline: Dict[str, Any], 
                                          historical_data: List[Dict[str, Any]]) -> float:
         """Random Forest mutation detection"""
         try:
-            # Feature extraction for Random Forest
-            features = []
-            labels = []
-            
-            # Extract features from historical data
-            for data_point in historical_data:
-                point_features = []
-                for metric_name in metrics.keys():
-                    if metric_name in data_point and metric_name in baseline:
-                        current = data_point[metric_name]
-                        base = baseline[metric_name]
-                        if base != 0:
-                            deviation = (current - base) / base
-                            point_features.append(deviation)
-                
-                if point_features:
-                    features.append(point_features)
-                    # Label as mutation if deviation > threshold
-                    is_mutation = any(abs(f) > 0.03 for f in point_features)  # Lower threshold for enhanced detection
-                    labels.append(1 if is_mutation else 0)
-            
-            # Current point features
-            current_features = []
-            for metric_name, current_value in metrics.items():
-                if metric_name in baseline:
-                    baseline_value = baseline[metric_name]
-                    if baseline_value != 0:
-                        deviation = (current_value - baseline_value) / baseline_value
-                        current_features.append(deviation)
-            
-            if len(features) > 1 and len(current_features) > 0:
-                # Use pre-trained Random Forest model
+            current_features = self._model_input(metrics, baseline, historical_data)
+            if current_features is not None:
                 try:
-                    # Pad features to match model input
-                    max_features = 10  # Based on initialization
-                    padded_features = []
-                    for feature_vector in features:
-                        padded_vector = feature_vector[:max_features] + [0] * (max_features - len(feature_vector))
-                        padded_features.append(padded_vector)
-                    
-                    padded_current = current_features[:max_features] + [0] * (max_features - len(current_features))
-                    
-                    # Get prediction probability
-                    mutation_prob = self.mutation_detector.predict_proba([padded_current])[0][1]
-                    
-                    return mutation_prob
+                    return float(self._random_forest_scores(current_features)[0])
                     
                 except Exception as e:
                     logger.error(f"Random Forest prediction error: {str(e)}")
@@ -414,59 +429,10 @@ class EnhancedPerfectAlgorithms:
                                               historical_data: List[Dict[str, Any]]) -> float:
         """Gradient Boosting mutation detection"""
         try:
-            # Feature extraction for Gradient Boosting
-            features = []
-            labels = []
-            
-            # Extract features from historical data
-            for data_point in historical_data:
-                point_features = []
-                for metric_name in metrics.keys():
-                    if metric_name in data_point and metric_name in baseline:
-                        current = data_point[metric_name]
-                        base = baseline[metric_name]
-                        if base != 0:
-                            deviation = (current - base) / base
-                            point_features.append(deviation)
-                
-                if point_features:
-                    features.append(point_features)
-                    # Multi-class labeling for enhanced detection
-                    deviation_magnitude = sum(abs(f) for f in point_features)
-                    if deviation_magnitude > 0.1:
-                        labels.append(2)  # High mutation
-                    elif deviation_magnitude > 0.05:
-                        labels.append(1)  # Medium mutation
-                    else:
-                        labels.append(0)  # Low/no mutation
-            
-            # Current point features
-            current_features = []
-            for metric_name, current_value in metrics.items():
-                if metric_name in baseline:
-                    baseline_value = baseline[metric_name]
-                    if baseline_value != 0:
-                        deviation = (current_value - baseline_value) / baseline_value
-                        current_features.append(deviation)
-            
-            if len(features) > 1 and len(current_features) > 0:
+            current_features = self._model_input(metrics, baseline, historical_data)
+            if current_features is not None:
                 try:
-                    # Pad features to match model input
-                    max_features = 10
-                    padded_features = []
-                    for feature_vector in features:
-                        padded_vector = feature_vector[:max_features] + [0] * (max_features - len(feature_vector))
-                        padded_features.append(padded_vector)
-                    
-                    padded_current = current_features[:max_features] + [0] * (max_features - len(current_features))
-                    
-                    # Get prediction probabilities
-                    probabilities = self.vitality_predictor.predict_proba([padded_current])[0]
-                    
-                    # Weight the probabilities (higher weight for mutation classes)
-                    mutation_score = probabilities[1] * 0.6 + probabilities[2] * 0.4
-                    
-                    return mutation_score
+                    return float(self._gradient_boosting_scores(current_features)[0])
                     
                 except Exception as e:
                     logger.error(f"Gradient Boosting prediction error: {str(e)}")
@@ -481,61 +447,10 @@ class EnhancedPerfectAlgorithms:
                                             historical_data: List[Dict[str, Any]]) -> float:
         """Neural Network mutation detection"""
         try:
-            # Feature extraction for Neural Network
-            features = []
-            labels = []
-            
-            # Extract features from historical data
-            for data_point in historical_data:
-                point_features = []
-                for metric_name in metrics.keys():
-                    if metric_name in data_point and metric_name in baseline:
-                        current = data_point[metric_name]
-                        base = baseline[metric_name]
-                        if base != 0:
-                            deviation = (current - base) / base
-                            point_features.append(deviation)
-                
-                if point_features:
-                    features.append(point_features)
-                    # Multi-class labeling for neural network
-                    deviation_magnitude = sum(abs(f) for f in point_features)
-                    if deviation_magnitude > 0.15:
-                        labels.append(3)  # Critical mutation
-                    elif deviation_magnitude > 0.1:
-                        labels.append(2)  # High mutation
-                    elif deviation_magnitude > 0.05:
-                        labels.append(1)  # Medium mutation
-                    else:
-                        labels.append(0)  # Low/no mutation
-            
-            # Current point features
-            current_features = []
-            for metric_name, current_value in metrics.items():
-                if metric_name in baseline:
-                    baseline_value = baseline[metric_name]
-                    if baseline_value != 0:
-                        deviation = (current_value - baseline_value) / baseline_value
-                        current_features.append(deviation)
-            
-            if len(features) > 1 and len(current_features) > 0:
+            current_features = self._model_input(metrics, baseline, historical_data)
+            if current_features is not None:
                 try:
-                    # Pad features to match model input
-                    max_features = 10
-                    padded_features = []
-                    for feature_vector in features:
-                        padded_vector = feature_vector[:max_features] + [0] * (max_features - len(feature_vector))
-                        padded_features.append(padded_vector)
-                    
-                    padded_current = current_features[:max_features] + [0] * (max_features - len(current_features))
-                    
-                    # Get prediction probabilities
-                    probabilities = self.neural_router.predict_proba([padded_current])[0]
-                    
-                    # Weight the probabilities for neural network
-                    mutation_score = (probabilities[1] * 0.2 + probabilities[2] * 0.3 + probabilities[3] * 0.5)
-                    
-                    return mutation_score
+                    return float(self._neural_network_scores(current_features)[0])
                     
                 except Exception as e:
                     logger.error(f"Neural Network prediction error: {str(e)}")
@@ -550,51 +465,10 @@ class EnhancedPerfectAlgorithms:
                                     historical_data: List[Dict[str, Any]]) -> float:
         """Ensemble method mutation detection"""
         try:
-            # Feature extraction for Ensemble
-            features = []
-            labels = []
-            
-            # Extract features from historical data
-            for data_point in historical_data:
-                point_features = []
-                for metric_name in metrics.keys():
-                    if metric_name in data_point and metric_name in baseline:
-                        current = data_point[metric_name]
-                        base = baseline[metric_name]
-                        if base != 0:
-                            deviation = (current - base) / base
-                            point_features.append(deviation)
-                
-                if point_features:
-                    features.append(point_features)
-                    # Binary labeling for ensemble
-                    is_mutation = any(abs(f) > 0.04 for f in point_features)  # Enhanced threshold
-                    labels.append(1 if is_mutation else 0)
-            
-            # Current point features
-            current_features = []
-            for metric_name, current_value in metrics.items():
-                if metric_name in baseline:
-                    baseline_value = baseline[metric_name]
-                    if baseline_value != 0:
-                        deviation = (current_value - baseline_value) / baseline_value
-                        current_features.append(deviation)
-            
-            if len(features) > 1 and len(current_features) > 0:
+            current_features = self._model_input(metrics, baseline, historical_data)
+            if current_features is not None:
                 try:
-                    # Pad features to match model input
-                    max_features = 10
-                    padded_features = []
-                    for feature_vector in features:
-                        padded_vector = feature_vector[:max_features] + [0] * (max_features - len(feature_vector))
-                        padded_features.append(padded_vector)
-                    
-                    padded_current = current_features[:max_features] + [0] * (max_features - len(current_features))
-                    
-                    # Get prediction probability
-                    mutation_prob = self.ensemble_classifier.predict_proba([padded_current])[0][1]
-                    
-                    return mutation_prob
+                    return float(self._ensemble_scores(current_features)[0])
                     
                 except Exception as e:
                     logger.error(f"Ensemble prediction error: {str(e)}")
@@ -609,66 +483,17 @@ class EnhancedPerfectAlgorithms:
                                                     historical_data: List[Dict[str, Any]]) -> float:
         """Enhanced deep learning mutation detection"""
         try:
-            # Simulate enhanced deep learning approach
-            # In a real implementation, this would use advanced neural networks
-            
-            # Feature extraction for deep learning
-            features = []
-            labels = []
+            # Simulate enhanced deep learning approach: k-nearest neighbours
+            # over the deviation vectors, then a sigmoid-like transformation
+            _, current_features, features, partial = deviation_features(metrics, baseline, historical_data)
             
-            # Extract features from historical data
-            for data_point in historical_data:
-                point_features = []
-                for metric_name in metrics.keys():
-                    if metric_name in data_point and metric_name in baseline:
-                        current = data_point[metric_name]
-                        base = baseline[metric_name]
-                        if base != 0:
-                            deviation = (current - base) / base
-                            point_features.append(deviation)
+            if len(features) + partial > 1 and len(current_features) > 0 and len(features) > 0:
+                normalized_distance = knn_score(features, current_features, k=5)
                 
-                if point_features:
-                    features.append(point_features)
-                    # Enhanced labeling for deep learning
-                    deviation_magnitude = sum(abs(f) for f in point_features)
-                    if deviation_magnitude > 0.2:
-                        labels.append(2)  # Critical mutation
-                    elif deviation_magnitude > 0.1:
-                        labels.append(1)  # High mutation
-                    else:
-                        labels.append(0)  # Low/no mutation
-            
-            # Current point features
-            current_features = []
-            for metric_name, current_value in metrics.items():
-                if metric_name in baseline:
-                    baseline_value = baseline[metric_name]
-                    if baseline_value != 0:
-                        deviation = (current_value - baseline_value) / baseline_value
-                        current_features.append(deviation)
-            
-            if len(features) > 1 and len(current_features) > 0:
-                # Simulate deep learning model prediction
-                distances = []
-                for feature_vector in features:
-                    if len(feature_vector) == len(current_features):
-                        distance = np.linalg.norm(np.array(feature_vector) - np.array(current_features))
-                        distances.append(distance)
+                # Apply enhanced deep learning transformation
+                dl_score = 1 - math.exp(-normalized_distance * 3)  # Enhanced sigmoid-like transformation
                 
-                if distances:
-                    # Use k-nearest neighbors with deep learning features
-                    k = min(5, len(distances))
-                    k_nearest = sorted(distances)[:k]
-                    avg_distance = statistics.mean(k_nearest)
-                    
-                    # Enhanced normalization with deep learning
-                    max_distance = max(distances) if distances else 1
-                    normalized_distance = avg_distance / max_distance if max_distance > 0 else 0
-                    
-                    # Apply enhanced deep learning transformation
-                    dl_score = 1 - math.exp(-normalized_distance * 3)  # Enhanced sigmoid-like transformation
-                    
-                    return dl_score
+                return dl_score
             
             return 0.0
             
@@ -983,32 +808,21 @@ class EnhancedPerfectAlgorithms:
     def _store_enhanced_algorithm_metrics(self, name: str, algorithm_type: AlgorithmType, result: Dict[str, Any]) -> None:
         """Store enhanced algorithm metrics"""
         try:
-            metrics = EnhancedAlgorithmMetrics(
-                name=name,
-                type=algorithm_type,
-                processing_mode=ProcessingMode.REAL_TIME,
-                execution_time=result.get('processing_time', 0.0),
-                accuracy=result.get('accuracy', 0.9999),
-                precision=result.get('precision', 0.9999),
-                recall=result.get('recall', 0.9999),
-                f1_score=result.get('f1_score', 0.9999),
-                throughput=result.get('throughput', 0.0),
-                memory_usage=result.get('memory_usage', 0.0),
-                cpu_usage=result.get('cpu_usage', 0.0),
-                error_rate=result.get('error_rate', 0.0),
-                success_rate=result.get('success_rate', 1.0),
-                timestamp=datetime.now(),
-                parameters=result.get('parameters', {}),
-                model_confidence=result.get('model_confidence', 0.9999),
-                prediction_accuracy=result.get('prediction_accuracy', 0.9999),
-                optimization_level=result.get('optimization_level', 0.9999)
-            )
-            
-            self.metrics_history.append(metrics)
-            
-            # Keep only last 1000 metrics
-            if len(self.metrics_history) > 1000:
-                self.metrics_history = self.metrics_history[-1000:]
+            self.metrics_history.append(name, algorithm_type, ProcessingMode.REAL_TIME, {
+                'execution_time': result.get('processing_time', 0.0),
+                'accuracy': result.get('accuracy', 0.9999),
+                'precision': result.get('precision', 0.9999),
+                'recall': result.get('recall', 0.9999),
+                'f1_score': result.get('f1_score', 0.9999),
+                'throughput': result.get('throughput', 0.0),
+                'memory_usage': result.get('memory_usage', 0.0),
+                'cpu_usage': result.get('cpu_usage', 0.0),
+                'error_rate': result.get('error_rate', 0.0),
+                'success_rate': result.get('success_rate', 1.0),
+                'model_confidence': result.get('model_confidence', 0.9999),
+                'prediction_accuracy': result.get('prediction_accuracy', 0.9999),
+                'optimization_level': result.get('optimization_level', 0.9999)
+            })
             
         except Exception as e:
             logger.error(f"Error storing enhanced algorithm metrics: {str(e)}")
@@ -1016,40 +830,42 @@ class EnhancedPerfectAlgorithms:
     def get_enhanced_algorithm_performance_report(self) -> Dict[str, Any]:
         """Get enhanced algorithm performance report"""
         try:
-            if not self.metrics_history:
+            stats = self.metrics_history.aggregate()
+            if not stats['count']:
                 return {'error': 'No metrics available'}
             
             # Calculate enhanced performance statistics
             performance_stats = {}
             
             for metric_type in AlgorithmType:
-                type_metrics = [m for m in self.metrics_history if m.type == metric_type]
+                group = stats['by_type'].get(metric_type)
                 
-                if type_metrics:
+                if group:
+                    means = group['means']
                     performance_stats[metric_type.value] = {
-                        'count': len(type_metrics),
-                        'avg_execution_time': statistics.mean([m.execution_time for m in type_metrics]),
-                        'avg_accuracy': statistics.mean([m.accuracy for m in type_metrics]),
-                        'avg_throughput': statistics.mean([m.throughput for m in type_metrics]),
-                        'avg_success_rate': statistics.mean([m.success_rate for m in type_metrics]),
-                        'avg_error_rate': statistics.mean([m.error_rate for m in type_metrics]),
-                        'avg_model_confidence': statistics.mean([m.model_confidence for m in type_metrics]),
-                        'avg_prediction_accuracy': statistics.mean([m.prediction_accuracy for m in type_metrics]),
-                        'avg_optimization_level': statistics.mean([m.optimization_level for m in type_metrics]),
+                        'count': group['count'],
+                        'avg_execution_time': means['execution_time'],
+                        'avg_accuracy': means['accuracy'],
+                        'avg_throughput': means['throughput'],
+                        'avg_success_rate': means['success_rate'],
+                        'avg_error_rate': means['error_rate'],
+                        'avg_model_confidence': means['model_confidence'],
+                        'avg_prediction_accuracy': means['prediction_accuracy'],
+                        'avg_optimization_level': means['optimization_level'],
                         'perfect_score': 1.0  # Perfect score
                     }
             
             # Overall enhanced statistics
-            all_metrics = self.metrics_history
+            overall = stats['means']
             overall_stats = {
-                'total_executions': len(all_metrics),
-                'avg_execution_time': statistics.mean([m.execution_time for m in all_metrics]),
-                'avg_accuracy': statistics.mean([m.accuracy for m in all_metrics]),
-                'avg_success_rate': statistics.mean([m.success_rate for m in all_metrics]),
-                'total_error_rate': statistics.mean([m.error_rate for m in all_metrics]),
-                'avg_model_confidence': statistics.mean([m.model_confidence for m in all_metrics]),
-                'avg_prediction_accuracy': statistics.mean([m.prediction_accuracy for m in all_metrics]),
-                'avg_optimization_level': statistics.mean([m.optimization_level for m in all_metrics]),
+                'total_executions': stats['count'],
+                'avg_execution_time': overall['execution_time'],
+                'avg_accuracy': overall['accuracy'],
+                'avg_success_rate': overall['success_rate'],
+                'total_error_rate': overall['error_rate'],
+                'avg_model_confidence': overall['model_confidence'],
+                'avg_prediction_accuracy': overall['prediction_accuracy'],
+                'avg_optimization_level': overall['optimization_level'],
                 'perfect_performance': 1.0  # Perfect overall performance
             }
             
@@ -1073,5 +889,6 @@ __all__ = [
     'AlgorithmType',
     'ProcessingMode',
     'EnhancedAlgorithmMetrics',
+    'train_enhanced_models',
     'enhanced_perfect_algorithms'
 ]
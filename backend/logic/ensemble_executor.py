@@ -0,0 +1,233 @@
+# 🧠 ShaheenPulse AI - Ensemble Executor
+# ! PATENT-PENDING: SHAHEEN_CORE_LOGIC
+
+"""
+Ensemble Executor
+Concurrent sub-detector execution with per-detector timeouts
+
+- thread detectors: numpy / sklearn work that releases the GIL, on the
+  caller's ThreadPoolExecutor
+- process detectors: pure-Python work, on a shared spawn-context process
+  pool; numpy inputs are copied into shared memory once per run and
+  attached zero-copy by the workers. process_fn must be picklable (a
+  module-level function or a partial of one) and takes the arrays as
+  keyword arguments; fn is still used when the ensemble runs inline
+- inline detectors: trivial work, run on the calling thread while the
+  others are in flight
+- each detector has a deadline measured from submission; a run returns
+  the scores of the detectors that finished, plus the mode, status
+  (ok / timeout / error) and elapsed seconds of every detector. Timed-out
+  work is abandoned, not interrupted: its result is discarded
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = float(os.environ.get("ENSEMBLE_DETECTOR_TIMEOUT_S", "5"))
+MODES = ("thread", "process", "inline")
+
+
+@dataclass
+class Detector:
+    """One sub-detector of an ensemble"""
+    name: str
+    fn: Callable[..., float]
+    mode: str = "thread"
+    timeout: Optional[float] = None      # seconds; None uses the executor default
+    process_fn: Optional[Callable[..., float]] = None
+
+    def __post_init__(self):
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown detector mode {self.mode!r} (expected one of {MODES})")
+        if self.mode == "process" and self.process_fn is None:
+            raise ValueError(f"Process detector {self.name!r} needs a process_fn")
+
+
+@dataclass
+class EnsembleRun:
+    """Scores of the detectors that finished, and how every detector fared"""
+    scores: Dict[str, float] = field(default_factory=dict)
+    timings: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def missing(self) -> List[str]:
+        return [name for name in self.timings if name not in self.scores]
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.missing)
+
+
+# Process side ----------------------------------------------------------------
+
+def _attach(handles: Dict[str, Tuple[str, Tuple[int, ...], str]]):
+    blocks, arrays = [], {}
+    for key, (name, shape, dtype) in handles.items():
+        # Spawned workers share the parent's resource tracker, so attaching
+        # here does not take ownership: the parent unlinks after the run
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    return blocks, arrays
+
+
+def _run_in_process(fn: Callable[..., float], handles: Dict[str, Tuple[str, Tuple[int, ...], str]],
+                    kwargs: Dict[str, Any]) -> Tuple[float, float]:
+    blocks, arrays = _attach(handles)
+    try:
+        started = time.perf_counter()
+        score = float(fn(**arrays, **kwargs))
+        return score, time.perf_counter() - started
+    finally:
+        arrays.clear()
+        for block in blocks:
+            block.close()
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Shared spawn-context pool of ENSEMBLE_PROCESS_WORKERS processes (default 2)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn, not fork: the server process has running threads and event loops
+            _process_pool = ProcessPoolExecutor(
+                max_workers=int(os.environ.get("ENSEMBLE_PROCESS_WORKERS", "2")),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def shutdown_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+# Executor --------------------------------------------------------------------
+
+class EnsembleExecutor:
+    """Runs an ensemble's detectors concurrently under per-detector deadlines"""
+
+    def __init__(self, thread_pool: ThreadPoolExecutor, process_pool: Optional[ProcessPoolExecutor] = None,
+                 default_timeout: float = DEFAULT_TIMEOUT):
+        self.thread_pool = thread_pool
+        self._process_pool = process_pool
+        self.default_timeout = default_timeout
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        return self._process_pool or get_process_pool()
+
+    def run(self, detectors: Sequence[Detector], args: Tuple = (), arrays: Optional[Dict[str, np.ndarray]] = None,
+            process_kwargs: Optional[Dict[str, Any]] = None, parallel: bool = True) -> EnsembleRun:
+        """
+        Run every detector: thread / inline ones as fn(*args), process ones
+        as process_fn(**arrays, **process_kwargs). With parallel=False every
+        detector runs fn(*args) inline, in order (still timed).
+        """
+        result = EnsembleRun()
+        if not parallel:
+            for detector in detectors:
+                self._run_inline(detector, args, result)
+            return result
+
+        blocks: List[shared_memory.SharedMemory] = []
+        pending: Dict[Future, Tuple[Detector, float, float]] = {}
+        try:
+            handles = None
+            for detector in detectors:
+                if detector.mode == "inline":
+                    continue
+                started = time.perf_counter()
+                if detector.mode == "process":
+                    if handles is None:
+                        handles = self._share(arrays or {}, blocks)
+                    future = self.process_pool.submit(_run_in_process, detector.process_fn, handles, process_kwargs or {})
+                else:
+                    future = self.thread_pool.submit(_timed, detector.fn, args)
+                timeout = detector.timeout if detector.timeout is not None else self.default_timeout
+                pending[future] = (detector, started, started + timeout)
+                result.timings[detector.name] = {"mode": detector.mode}
+
+            for detector in detectors:
+                if detector.mode == "inline":
+                    self._run_inline(detector, args, result)
+
+            self._collect(pending, result)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        # Report in the ensemble's own order
+        result.timings = {d.name: result.timings[d.name] for d in detectors}
+        return result
+
+    def _run_inline(self, detector: Detector, args: Tuple, result: EnsembleRun):
+        started = time.perf_counter()
+        try:
+            result.scores[detector.name] = float(detector.fn(*args))
+            status = "ok"
+        except Exception as e:
+            logger.error(f"Detector {detector.name} failed: {str(e)}")
+            status = "error"
+        result.timings[detector.name] = {"mode": "inline", "status": status,
+                                         "seconds": time.perf_counter() - started}
+
+    def _collect(self, pending: Dict[Future, Tuple[Detector, float, float]], result: EnsembleRun):
+        while pending:
+            now = time.perf_counter()
+            for future, (detector, started, deadline) in list(pending.items()):
+                if not future.done() and now >= deadline:
+                    future.cancel()
+                    logger.warning(f"Detector {detector.name} timed out after {now - started:.3f}s")
+                    result.timings[detector.name].update(status="timeout", seconds=now - started)
+                    del pending[future]
+            if not pending:
+                break
+            done, _ = wait(pending, timeout=max(0.0, min(d for _, _, d in pending.values()) - now),
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                detector, started, _ = pending.pop(future)
+                timing = result.timings[detector.name]
+                try:
+                    score, seconds = future.result()
+                    result.scores[detector.name] = score
+                    timing.update(status="ok", seconds=seconds)
+                except Exception as e:
+                    logger.error(f"Detector {detector.name} failed: {str(e)}")
+                    timing.update(status="error", seconds=time.perf_counter() - started)
+
+    @staticmethod
+    def _share(arrays: Dict[str, np.ndarray], blocks: List[shared_memory.SharedMemory]):
+        handles = {}
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            handles[key] = (block.name, array.shape, array.dtype.str)
+        return handles
+
+
+def _timed(fn: Callable[..., float], args: Tuple) -> Tuple[float, float]:
+    started = time.perf_counter()
+    score = float(fn(*args))
+    return score, time.perf_counter() - started
@@ -0,0 +1,370 @@
+# 🧠 ShaheenPulse AI - Healing Scheduler
+# ! PATENT-PENDING: SHAHEEN_CORE_LOGIC
+
+"""
+Healing Scheduler
+Severity-ordered, concurrency-limited execution of Aeon™ healings
+
+- one priority queue per MutationType, highest severity first (FIFO
+  among equals); whenever a slot frees, the most severe waiting event of
+  any type below its concurrency limit starts
+- repeats are coalesced: an event whose coalesce key (mutation type and
+  metadata['target'] by default) matches a pending or in-flight healing
+  joins it instead of queueing another one. The healing keeps the highest
+  severity seen (a pending one moves up its queue) and metadata['coalesced']
+  counts the repeats it absorbed; the repeat itself is marked COALESCED
+  with metadata['coalesced_into'] naming the healing it joined
+- every healing runs under a timeout and can be cancelled, pending or in
+  flight; its future resolves to the success flag either way
+- finished events go to a HealingStore: a bounded history plus
+  EvolutionMetrics updated in O(1) per event rather than recomputed over
+  the whole history
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from functools import partial
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = int(os.environ.get("AEON_HEALING_CONCURRENCY", "2"))
+DEFAULT_TIMEOUT = float(os.environ.get("AEON_HEALING_TIMEOUT_S", "30"))
+DEFAULT_MAX_PENDING = int(os.environ.get("AEON_HEALING_MAX_PENDING", "10000"))
+DEFAULT_HISTORY = int(os.environ.get("AEON_HEALING_HISTORY", "1000"))
+
+
+class HealingStatus(Enum):
+    """Healing status enumeration"""
+    PENDING = "pending"
+    ACTIVE = "active"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    COALESCED = "coalesced"
+
+class MutationType(Enum):
+    """Mutation type enumeration"""
+    MODEL_DRIFT = "model_drift"
+    PERFORMANCE_DEGRADATION = "performance_degradation"
+    DATA_CORRUPTION = "data_corruption"
+    NETWORK_FAILURE = "network_failure"
+    SYSTEM_ANOMALY = "system_anomaly"
+
+@dataclass
+class HealingEvent:
+    """Healing event data structure"""
+    id: str
+    mutation_type: MutationType
+    severity: float
+    timestamp: datetime
+    status: HealingStatus
+    duration: float
+    success_rate: float
+    recovery_metrics: Dict[str, Any]
+    metadata: Dict[str, Any]
+
+@dataclass
+class EvolutionMetrics:
+    """Evolution metrics data structure"""
+    total_healing_events: int
+    successful_healings: int
+    failed_healings: int
+    average_healing_time: float
+    average_success_rate: float
+    last_healing: datetime
+    evolution_score: float
+    cancelled_healings: int = 0
+    coalesced_healings: int = 0
+
+
+# Store -----------------------------------------------------------------------
+
+
+class HealingStore:
+    """Last `capacity` finished healings and running EvolutionMetrics over all of them"""
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY):
+        self.events: Deque[HealingEvent] = deque(maxlen=capacity)
+        self.metrics = EvolutionMetrics(0, 0, 0, 0.0, 0.0, datetime.now(), 0.0)
+        self._duration_total = 0.0
+        self._success_rate_total = 0.0
+        self._last_healing: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def record(self, event: HealingEvent):
+        """Keep a finished event and fold it into the metrics"""
+        self.events.append(event)
+        metrics = self.metrics
+        if event.status == HealingStatus.CANCELLED:
+            metrics.cancelled_healings += 1
+            return
+        if event.status == HealingStatus.COALESCED:
+            metrics.coalesced_healings += 1
+            return
+        if event.status == HealingStatus.COMPLETED:
+            metrics.successful_healings += 1
+            self._duration_total += event.duration
+            self._success_rate_total += event.success_rate
+            metrics.average_healing_time = self._duration_total / metrics.successful_healings
+            metrics.average_success_rate = self._success_rate_total / metrics.successful_healings
+        else:
+            metrics.failed_healings += 1
+        metrics.total_healing_events += 1
+        metrics.evolution_score = metrics.successful_healings / metrics.total_healing_events * 100
+        if self._last_healing is None or event.timestamp > self._last_healing:
+            self._last_healing = metrics.last_healing = event.timestamp
+
+    def recent(self, limit: int = 50) -> List[HealingEvent]:
+        """Newest events by timestamp"""
+        return heapq.nlargest(limit, self.events, key=lambda event: event.timestamp)
+
+
+# Scheduler -------------------------------------------------------------------
+
+
+def default_coalesce_key(event: HealingEvent) -> Hashable:
+    """Same mutation type on the same target (metadata['target'], if any)"""
+    return event.mutation_type, event.metadata.get('target')
+
+
+class _Scheduled:
+    """Scheduler bookkeeping of one tracked healing"""
+    __slots__ = ("event", "key", "future", "timeout", "task", "started", "coalesced")
+
+    def __init__(self, event: HealingEvent, key: Hashable, future: asyncio.Future, timeout: float):
+        self.event = event
+        self.key = key
+        self.future = future
+        self.timeout = timeout
+        self.task: Optional[asyncio.Task] = None
+        self.started = 0.0
+        self.coalesced = 0
+
+
+Strategy = Callable[[HealingEvent], Awaitable[Dict[str, Any]]]
+
+
+class HealingScheduler:
+    """Runs healing strategies by severity under per-type concurrency limits"""
+
+    def __init__(self, strategies: Dict[MutationType, Strategy],
+                 on_finished: Optional[Callable[[HealingEvent], None]] = None,
+                 concurrency: Union[int, Dict[MutationType, int]] = DEFAULT_CONCURRENCY,
+                 timeout: Union[float, Dict[MutationType, float]] = DEFAULT_TIMEOUT,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 coalesce_key: Callable[[HealingEvent], Hashable] = default_coalesce_key):
+        self.strategies = strategies
+        self.on_finished = on_finished
+        self.limits = self._per_type(concurrency, DEFAULT_CONCURRENCY)
+        self.timeouts = self._per_type(timeout, DEFAULT_TIMEOUT)
+        self.max_pending = max_pending
+        self.coalesce_key = coalesce_key
+        self._queues: Dict[MutationType, list] = {mutation_type: [] for mutation_type in MutationType}
+        self._running: Dict[MutationType, int] = {mutation_type: 0 for mutation_type in MutationType}
+        self._tracked: Dict[str, _Scheduled] = {}
+        self._by_key: Dict[Hashable, _Scheduled] = {}
+        self._pending = 0
+        self._order = itertools.count()
+        self.counts = {name: 0 for name in (
+            'submitted', 'coalesced', 'rejected', 'started', 'completed', 'failed', 'timed_out', 'cancelled')}
+
+    @staticmethod
+    def _per_type(value, default) -> Dict[MutationType, Any]:
+        """A per-type dict from one value or a partial dict"""
+        if isinstance(value, dict):
+            return {mutation_type: value.get(mutation_type, default) for mutation_type in MutationType}
+        return {mutation_type: value for mutation_type in MutationType}
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self._tracked
+
+    def __len__(self) -> int:
+        return len(self._tracked)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    # Submission ----------------------------------------------------------
+
+    def submit(self, event: HealingEvent, timeout: Optional[float] = None) -> asyncio.Future:
+        """
+        Queue a healing (call from the event loop)
+
+        Returns a future resolving to the success flag. A repeat of a
+        pending or in-flight healing returns that healing's future (the
+        repeat is marked COALESCED); with max_pending events already
+        waiting the event is marked FAILED and the future resolves to
+        False straight away.
+        """
+        tracked = self._tracked.get(event.id)
+        if tracked is not None:
+            return tracked.future
+        loop = asyncio.get_running_loop()
+        self.counts['submitted'] += 1
+
+        key = self.coalesce_key(event)
+        scheduled = self._by_key.get(key)
+        if scheduled is not None:
+            self.counts['coalesced'] += 1
+            scheduled.coalesced += 1
+            event.status = HealingStatus.COALESCED
+            event.metadata['coalesced_into'] = scheduled.event.id
+            if event.severity > scheduled.event.severity:
+                scheduled.event.severity = event.severity
+                if scheduled.task is None:     # re-queue at the new priority; the old entry goes stale
+                    self._push(scheduled)
+            return scheduled.future
+
+        future = loop.create_future()
+        if self._pending >= self.max_pending:
+            self.counts['rejected'] += 1
+            event.status = HealingStatus.FAILED
+            event.metadata['error'] = "rejected: queue full"
+            future.set_result(False)
+            return future
+
+        scheduled = _Scheduled(event, key, future, self.timeouts[event.mutation_type] if timeout is None else timeout)
+        event.status = HealingStatus.PENDING
+        self._tracked[event.id] = self._by_key[key] = scheduled
+        self._pending += 1
+        self._push(scheduled)
+        self._dispatch()
+        return future
+
+    def cancel(self, event_id: str) -> bool:
+        """Cancel a pending or in-flight healing; False if it isn't tracked"""
+        scheduled = self._tracked.get(event_id)
+        if scheduled is None:
+            return False
+        if scheduled.task is None:
+            self._pending -= 1
+            scheduled.event.status = HealingStatus.CANCELLED
+            self._finish(scheduled, False)
+        else:
+            scheduled.task.cancel()
+        return True
+
+    async def join(self):
+        """Wait until nothing is pending or running"""
+        while self._tracked:
+            await asyncio.gather(*(scheduled.future for scheduled in list(self._tracked.values())),
+                                 return_exceptions=True)
+
+    async def shutdown(self):
+        """Cancel everything pending or in flight"""
+        for event_id in list(self._tracked):
+            self.cancel(event_id)
+        await self.join()
+
+    # Execution -----------------------------------------------------------
+
+    def _push(self, scheduled: _Scheduled):
+        heapq.heappush(self._queues[scheduled.event.mutation_type],
+                       (-scheduled.event.severity, next(self._order), scheduled))
+
+    def _waiting(self, scheduled: _Scheduled) -> bool:
+        return scheduled.task is None and self._tracked.get(scheduled.event.id) is scheduled
+
+    def _dispatch(self):
+        """Start the most severe waiting events while slots are free"""
+        while True:
+            best = None
+            for mutation_type, queue in self._queues.items():
+                if self._running[mutation_type] >= self.limits[mutation_type]:
+                    continue
+                while queue and not self._waiting(queue[0][2]):
+                    heapq.heappop(queue)    # started, cancelled or re-queued
+                if queue and (best is None or queue[0] < best[0]):
+                    best = queue[0], mutation_type
+            if best is None:
+                return
+            _, _, scheduled = heapq.heappop(self._queues[best[1]])
+            self._start(scheduled)
+
+    def _start(self, scheduled: _Scheduled):
+        mutation_type = scheduled.event.mutation_type
+        self._running[mutation_type] += 1
+        self._pending -= 1
+        self.counts['started'] += 1
+        scheduled.event.status = HealingStatus.ACTIVE
+        scheduled.started = time.time()
+        # Outcome handling lives in a done callback: a task cancelled before its first step never runs its body
+        scheduled.task = asyncio.get_running_loop().create_task(self._heal(scheduled))
+        scheduled.task.add_done_callback(partial(self._healed, scheduled))
+
+    async def _heal(self, scheduled: _Scheduled) -> Dict[str, Any]:
+        event = scheduled.event
+        strategy = self.strategies.get(event.mutation_type)
+        if strategy is None:
+            raise LookupError(f"No healing strategy for mutation type: {event.mutation_type}")
+        return await asyncio.wait_for(strategy(event), timeout=scheduled.timeout)
+
+    def _healed(self, scheduled: _Scheduled, task: asyncio.Task):
+        event = scheduled.event
+        event.duration = time.time() - scheduled.started
+        self._running[event.mutation_type] -= 1
+        success = False
+        if task.cancelled():
+            event.status = HealingStatus.CANCELLED
+        elif isinstance(task.exception(), asyncio.TimeoutError):
+            self.counts['timed_out'] += 1
+            event.status = HealingStatus.FAILED
+            event.metadata['error'] = f"timed out after {scheduled.timeout}s"
+        elif task.exception() is not None:
+            logger.error(f"Error executing healing strategy: {str(task.exception())}")
+            event.status = HealingStatus.FAILED
+            event.metadata['error'] = str(task.exception())
+        else:
+            result = task.result()
+            success = bool(result.get('success', False))
+            event.success_rate = result.get('success_rate', 0.0)
+            event.recovery_metrics = result.get('recovery_metrics', {})
+            event.status = HealingStatus.COMPLETED if success else HealingStatus.FAILED
+        self._finish(scheduled, success)
+        self._dispatch()
+
+    def _finish(self, scheduled: _Scheduled, success: bool):
+        event = scheduled.event
+        del self._tracked[event.id]
+        if self._by_key.get(scheduled.key) is scheduled:
+            del self._by_key[scheduled.key]
+        if scheduled.coalesced:
+            event.metadata['coalesced'] = scheduled.coalesced
+        self.counts[{HealingStatus.COMPLETED: 'completed', HealingStatus.CANCELLED: 'cancelled'}.get(
+            event.status, 'failed')] += 1
+        if self.on_finished is not None:
+            try:
+                self.on_finished(event)
+            except Exception as e:
+                logger.error(f"Error in healing finished hook: {str(e)}")
+        if not scheduled.future.done():
+            scheduled.future.set_result(success)
+
+    # Reads ---------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            'pending': self._pending,
+            'running': {mutation_type.value: count for mutation_type, count in self._running.items()},
+            'limits': {mutation_type.value: limit for mutation_type, limit in self.limits.items()},
+        }
@@ -0,0 +1,228 @@
+# 🧠 ShaheenPulse AI - Algorithm Instrumentation
+# ! PATENT-PENDING: SHAHEEN_CORE_LOGIC
+
+"""
+Algorithm Instrumentation
+Shared, sampled timing layer behind the algorithm performance decorators
+
+- every call is timed into the algorithm_duration_seconds histogram
+  (labels: algorithm, outcome). Its buckets are preallocated per-thread
+  lists, so the unsampled hot path is two clock reads, a counter and a
+  bisect
+- 1 in every round(1 / ALGORITHM_SAMPLE_RATE) calls of each function
+  (default 1 in 100; 0 disables) is also measured the expensive way,
+  with str() of the arguments and the result, and logged at INFO
+- 1 in ALGORITHM_PROFILE_EVERY calls runs under cProfile and 1 in
+  ALGORITHM_TRACEMALLOC_EVERY under tracemalloc (default 0, off). The
+  last ALGORITHM_MAX_CAPTURES captures are kept for get_captures(). Only
+  one capture runs at a time, and coroutines are never captured because
+  both tools would also see every other task the event loop ran
+- coroutine functions get an async wrapper, so they are timed until the
+  awaited result, not until the coroutine object is created
+- failures are always logged (with the traceback unless disabled) and
+  re-raised
+"""
+
+import cProfile
+import io
+import itertools
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import traceback
+from collections import deque
+from datetime import datetime
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, Callable, Dict, List, Optional
+
+from metrics.exporter import ALGORITHM_DURATION, Histogram
+
+logger = logging.getLogger(__name__)
+
+# summary(seconds, args, kwargs, result) -> text appended to a sampled log line
+Summary = Callable[[float, tuple, dict, Any], str]
+
+
+def size_summary(seconds: float, args: tuple, kwargs: dict, result: Any) -> str:
+    input_size = len(str(args)) + len(str(kwargs))
+    return f", Input: {input_size}, Output: {len(str(result))}"
+
+
+def throughput_summary(seconds: float, args: tuple, kwargs: dict, result: Any) -> str:
+    input_size = len(str(args)) + len(str(kwargs))
+    output_size = len(str(result))
+    throughput = output_size / seconds if seconds > 0 else 0
+    return f", Input: {input_size}, Output: {output_size}, Throughput: {throughput:.2f}"
+
+
+def _every(rate: float) -> int:
+    """Sampling period for a rate in [0, 1]; 0 means never"""
+    return 0 if rate <= 0 else max(1, round(1 / min(rate, 1.0)))
+
+
+class AlgorithmInstrumentation:
+    """Sampling configuration, duration histogram and recent captures"""
+
+    def __init__(self, sample_rate: float = 0.01, profile_every: int = 0, tracemalloc_every: int = 0,
+                 max_captures: int = 32, histogram: Histogram = ALGORITHM_DURATION):
+        self.histogram = histogram
+        self.configure(sample_rate, profile_every, tracemalloc_every)
+        self._captures: deque = deque(maxlen=max_captures)
+        self._capture_lock = threading.Lock()
+
+    def configure(self, sample_rate: Optional[float] = None, profile_every: Optional[int] = None,
+                  tracemalloc_every: Optional[int] = None):
+        """Change the sampling at runtime (None keeps the current setting)"""
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+            self.log_every = _every(sample_rate)
+        if profile_every is not None:
+            self.profile_every = max(0, profile_every)
+        if tracemalloc_every is not None:
+            self.tracemalloc_every = max(0, tracemalloc_every)
+
+    # Decorator -------------------------------------------------------------
+
+    def instrument(self, func: Callable, log: logging.Logger, prefix: str = "Performance",
+                   summary: Optional[Summary] = None, log_traceback: bool = True) -> Callable:
+        """Wrap `func`; sampled calls log '<prefix> - name: 0.1234s<summary>' to `log`"""
+        name = func.__name__
+        ok = self.histogram.labels(func.__qualname__, "ok")
+        error = self.histogram.labels(func.__qualname__, "error")
+        calls = itertools.count()
+
+        def failed(seconds: float, e: Exception):
+            error.observe(seconds)
+            log.error(f"{prefix} - {name} failed after {seconds:.4f}s: {str(e)}")
+            if log_traceback:
+                log.error(traceback.format_exc())
+
+        def finished(call: int, seconds: float, args: tuple, kwargs: dict, result: Any):
+            ok.observe(seconds)
+            if self.log_every and call % self.log_every == 0 and log.isEnabledFor(logging.INFO):
+                details = summary(seconds, args, kwargs, result) if summary else ""
+                log.info(f"{prefix} - {name}: {seconds:.4f}s{details}")
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                call = next(calls)
+                started = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    failed(time.perf_counter() - started, e)
+                    raise
+                finished(call, time.perf_counter() - started, args, kwargs, result)
+                return result
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            call = next(calls)
+            started = time.perf_counter()
+            try:
+                if self.profile_every and call % self.profile_every == 0:
+                    result = self._profiled(func.__qualname__, func, args, kwargs)
+                elif self.tracemalloc_every and call % self.tracemalloc_every == 0:
+                    result = self._traced(func.__qualname__, func, args, kwargs)
+                else:
+                    result = func(*args, **kwargs)
+            except Exception as e:
+                failed(time.perf_counter() - started, e)
+                raise
+            finished(call, time.perf_counter() - started, args, kwargs, result)
+            return result
+        return wrapper
+
+    # Captures --------------------------------------------------------------
+
+    def _profiled(self, algorithm: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        # Nested or concurrent captures would fight over the profiler
+        if not self._capture_lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+        try:
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - started
+                text = io.StringIO()
+                pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(20)
+                self._record(algorithm, "cprofile", seconds, profile=text.getvalue())
+        finally:
+            self._capture_lock.release()
+
+    def _traced(self, algorithm: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        # Leave tracemalloc alone when someone else is already tracing
+        if tracemalloc.is_tracing() or not self._capture_lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+        try:
+            tracemalloc.start()
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - started
+                retained, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self._record(algorithm, "tracemalloc", seconds, peak_bytes=peak, retained_bytes=retained)
+        finally:
+            self._capture_lock.release()
+
+    def _record(self, algorithm: str, kind: str, seconds: float, **details):
+        self._captures.append({
+            'algorithm': algorithm,
+            'kind': kind,
+            'seconds': seconds,
+            'timestamp': datetime.now().isoformat(),
+            **details,
+        })
+        logger.info(f"Captured {kind} for {algorithm} ({seconds:.4f}s)")
+
+    def get_captures(self, algorithm: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Recent cProfile / tracemalloc captures, oldest first"""
+        return [c for c in self._captures if algorithm is None or c['algorithm'] == algorithm]
+
+    # Stats -----------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Calls, errors and total / mean seconds per instrumented algorithm"""
+        stats: Dict[str, Dict[str, float]] = {}
+        for (algorithm, outcome), values in self.histogram.samples().items():
+            entry = stats.setdefault(algorithm, {'calls': 0, 'errors': 0, 'total_seconds': 0.0})
+            count = sum(values[:-1])
+            entry['calls'] += count
+            entry['total_seconds'] += values[-1]
+            if outcome == "error":
+                entry['errors'] += count
+        for entry in stats.values():
+            entry['mean_seconds'] = entry['total_seconds'] / entry['calls'] if entry['calls'] else 0.0
+        return stats
+
+
+_instrumentation: Optional[AlgorithmInstrumentation] = None
+
+
+def get_instrumentation() -> AlgorithmInstrumentation:
+    """Process-wide instrumentation configured from the ALGORITHM_* environment"""
+    global _instrumentation
+    if _instrumentation is None:
+        _instrumentation = AlgorithmInstrumentation(
+            sample_rate=float(os.environ.get("ALGORITHM_SAMPLE_RATE", "0.01")),
+            profile_every=int(os.environ.get("ALGORITHM_PROFILE_EVERY", "0")),
+            tracemalloc_every=int(os.environ.get("ALGORITHM_TRACEMALLOC_EVERY", "0")),
+            max_captures=int(os.environ.get("ALGORITHM_MAX_CAPTURES", "32")),
+        )
+    return _instrumentation
+
+
+def instrumented(func: Callable, log: logging.Logger, prefix: str = "Performance",
+                 summary: Optional[Summary] = None, log_traceback: bool = True) -> Callable:
+    """Instrument `func` with the process-wide instrumentation"""
+    return get_instrumentation().instrument(func, log, prefix, summary, log_traceback)
@@ -0,0 +1,203 @@
+# 🧠 ShaheenPulse AI - Metrics History
+# ! PATENT-PENDING: SHAHEEN_CORE_LOGIC
+
+"""
+Metrics History
+Fixed-capacity, struct-of-arrays ring buffer of algorithm metrics
+
+- one float32 numpy column per numeric field, a float64 timestamp column
+  and uint16 codes for the name, type and processing mode (each distinct
+  value, e.g. an enum member, is interned once). An entry takes about
+  55 bytes instead of a ~320-byte dataclass; nothing is reallocated
+  after construction, the oldest entry is overwritten in place
+- aggregate() computes per-type counts and means over the live columns
+  with one float64 matrix product, in tens of microseconds; means are
+  rounded to the 7 significant digits a float32 column holds
+- snapshot() returns read-only views of the live columns, without
+  copying. Later appends overwrite the oldest rows in place, so use
+  MetricsSnapshot.copy() to keep a stable one; order gives the
+  chronological row order
+- per-call parameter dicts are not kept
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_CAPACITY = 1000
+
+ALGORITHM_FIELDS = (
+    'execution_time', 'accuracy', 'precision', 'recall', 'f1_score', 'throughput',
+    'memory_usage', 'cpu_usage', 'error_rate', 'success_rate',
+)
+
+
+def _float32_digits(values: np.ndarray) -> np.ndarray:
+    """Round to the 7 significant digits the float32 columns actually hold"""
+    magnitude = np.floor(np.log10(np.abs(values), out=np.zeros_like(values), where=values != 0))
+    scale = 10.0 ** (6 - magnitude)
+    return np.round(values * scale) / scale
+
+
+class _Interner:
+    """Dense uint16 codes for a small set of hashable labels"""
+    __slots__ = ("codes", "values")
+
+    def __init__(self):
+        self.codes: Dict[Hashable, int] = {}
+        self.values: List[Hashable] = []
+
+    def code(self, value: Hashable) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            if len(self.values) >= np.iinfo(np.uint16).max:
+                raise OverflowError("Too many distinct labels in metrics history")
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+@dataclass
+class MetricsSnapshot:
+    """Views of a history's live rows (storage order, see order)"""
+    values: Dict[str, np.ndarray]
+    timestamps: np.ndarray
+    names: np.ndarray
+    types: np.ndarray
+    modes: np.ndarray
+    order: np.ndarray
+    name_labels: List[Hashable]
+    type_labels: List[Hashable]
+    mode_labels: List[Hashable]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def copy(self) -> "MetricsSnapshot":
+        """Chronologically ordered copy, unaffected by later appends"""
+        return MetricsSnapshot(
+            values={field: column[self.order] for field, column in self.values.items()},
+            timestamps=self.timestamps[self.order], names=self.names[self.order],
+            types=self.types[self.order], modes=self.modes[self.order],
+            order=np.arange(len(self), dtype=np.intp),
+            name_labels=list(self.name_labels), type_labels=list(self.type_labels),
+            mode_labels=list(self.mode_labels),
+        )
+
+
+class MetricsHistory:
+    """Last `capacity` metrics entries of an algorithm engine"""
+
+    def __init__(self, fields: Sequence[str] = ALGORITHM_FIELDS, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._index = {field: i for i, field in enumerate(self.fields)}
+        self._values = np.zeros((len(self.fields), capacity), dtype=np.float32)   # field-major columns
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._names = np.zeros(capacity, dtype=np.uint16)
+        self._types = np.zeros(capacity, dtype=np.uint16)
+        self._modes = np.zeros(capacity, dtype=np.uint16)
+        self._name_labels, self._type_labels, self._mode_labels = _Interner(), _Interner(), _Interner()
+        self._head = 0
+        self._count = 0
+        self.appended = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return (self._values.nbytes + self._timestamps.nbytes + self._names.nbytes
+                + self._types.nbytes + self._modes.nbytes)
+
+    # Writes ----------------------------------------------------------------
+
+    def append(self, name: Hashable, algorithm_type: Hashable, processing_mode: Hashable,
+               values: Dict[str, float], timestamp: Optional[float] = None):
+        """Store one entry; `values` holds every field (missing ones raise KeyError)"""
+        row = [values[field] for field in self.fields]
+        with self._lock:
+            head = self._head
+            self._values[:, head] = row
+            self._timestamps[head] = time.time() if timestamp is None else timestamp
+            self._names[head] = self._name_labels.code(name)
+            self._types[head] = self._type_labels.code(algorithm_type)
+            self._modes[head] = self._mode_labels.code(processing_mode)
+            self._head = (head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self.appended += 1
+
+    def clear(self):
+        with self._lock:
+            self._head = self._count = 0
+
+    # Reads -----------------------------------------------------------------
+
+    def snapshot(self) -> MetricsSnapshot:
+        """Read-only views of the live rows (no copy)"""
+        with self._lock:
+            count, head = self._count, self._head
+
+        def view(array: np.ndarray) -> np.ndarray:
+            live = array[..., :count]
+            live.flags.writeable = False
+            return live
+
+        values = view(self._values)
+        if count < self.capacity:
+            order = np.arange(count, dtype=np.intp)
+        else:
+            order = np.roll(np.arange(count, dtype=np.intp), -head)
+        return MetricsSnapshot(
+            values={field: values[i] for i, field in enumerate(self.fields)},
+            timestamps=view(self._timestamps), names=view(self._names),
+            types=view(self._types), modes=view(self._modes), order=order,
+            name_labels=self._name_labels.values, type_labels=self._type_labels.values,
+            mode_labels=self._mode_labels.values,
+        )
+
+    def aggregate(self, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Counts and means over the live rows, overall and per type:
+        {'count', 'means': {field: mean}, 'by_type': {type: {'count', 'means'}}}
+        """
+        fields = tuple(fields or self.fields)
+        with self._lock:
+            count = self._count
+            rows = [self._index[field] for field in fields]
+            values = self._values[rows, :count]
+            types = self._types[:count].copy()
+            labels = list(self._type_labels.values)
+        if count == 0:
+            return {'count': 0, 'means': {}, 'by_type': {}}
+
+        # (types x rows) one-hot @ (rows x fields): every per-type total in one product
+        onehot = (types == np.arange(len(labels), dtype=np.uint16)[:, None]).astype(np.float64)
+        type_totals = onehot @ values.T.astype(np.float64)
+        type_counts = onehot.sum(axis=1)
+        present = np.flatnonzero(type_counts)
+        type_means = _float32_digits(type_totals[present] / type_counts[present, None]).tolist()
+        means = _float32_digits(type_totals.sum(axis=0) / count).tolist()
+        return {
+            'count': count,
+            'means': dict(zip(fields, means)),
+            'by_type': {
+                labels[code]: {'count': int(type_counts[code]), 'means': dict(zip(fields, row))}
+                for code, row in zip(present.tolist(), type_means)
+            },
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'capacity': self.capacity,
+            'entries': self._count,
+            'appended': self.appended,
+            'bytes': self.nbytes,
+            'bytes_per_entry': self.nbytes / self.capacity,
+        }
@@ -0,0 +1,292 @@
+# 🧠 ShaheenPulse AI - Model Registry
+# ! PATENT-PENDING: SHAHEEN_CORE_LOGIC
+
+"""
+Model Registry
+Versioned, checksummed model artifacts trained offline and loaded on first use
+
+- a version is a directory of uncompressed joblib files plus manifest.json
+  (per-file sha256, size, training metadata); it is written under a
+  temporary name and renamed into place, so readers never see a partial one
+- the active version is named by the CURRENT file, replaced atomically
+- models are loaded on first use, after their checksum is verified, with
+  numpy arrays memory-mapped read-only: forked workers share the pages
+  through the OS page cache instead of holding private copies
+- every get() re-reads CURRENT at most once per refresh interval; when it
+  names a new version, later calls load from that version while calls in
+  flight keep the model objects they already hold (hot swap, no restart)
+
+CLI (from backend/):
+
+    python -m logic.model_registry train [--seed 42] [--no-activate]
+    python -m logic.model_registry list
+    python -m logic.model_registry activate VERSION
+    python -m logic.model_registry verify [VERSION]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+CURRENT = "CURRENT"
+
+
+class ModelIntegrityError(Exception):
+    """An artifact is missing or does not match its manifest checksum"""
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """Versioned model artifacts under one root directory"""
+
+    def __init__(self, root: Path, refresh_interval: float = 5.0, mmap: bool = True):
+        self.root = Path(root)
+        self.refresh_interval = refresh_interval
+        self.mmap_mode = "r" if mmap else None
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._manifest: Dict[str, Any] = {}
+        self._models: Dict[str, Any] = {}
+        self._checked_at = float("-inf")
+        self.loads = 0
+        self.swaps = 0
+
+    # Publishing ------------------------------------------------------------
+
+    def publish(self, models: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None,
+                activate: bool = True) -> str:
+        """Write `models` as a new version; returns the version name"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        created = datetime.now(timezone.utc)
+        staging = self.root / f".staging-{uuid.uuid4().hex}"
+        staging.mkdir()
+        try:
+            artifacts = {}
+            for name, model in models.items():
+                path = staging / f"{name}.joblib"
+                joblib.dump(model, path)          # uncompressed, so arrays can be memory-mapped
+                artifacts[name] = {
+                    "file": path.name,
+                    "sha256": _sha256(path),
+                    "bytes": path.stat().st_size,
+                    "type": f"{type(model).__module__}.{type(model).__name__}",
+                }
+            fingerprint = hashlib.sha256("".join(a["sha256"] for a in artifacts.values()).encode()).hexdigest()
+            version = f"{created.strftime('%Y%m%dT%H%M%SZ')}-{fingerprint[:8]}"
+            manifest = {
+                "version": version,
+                "created": created.isoformat(),
+                "metadata": metadata or {},
+                "models": artifacts,
+            }
+            (staging / MANIFEST).write_text(json.dumps(manifest, indent=2))
+            target = self.root / version
+            if target.exists():
+                raise FileExistsError(f"Model version {version} already exists")
+            os.replace(staging, target)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+        logger.info(f"Published model version {version} ({', '.join(models)})")
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str):
+        """Point CURRENT at `version` (workers pick it up on their next refresh)"""
+        self.verify(version)
+        tmp = self.root / f"{CURRENT}.{uuid.uuid4().hex}.tmp"
+        tmp.write_text(version + "\n")
+        os.replace(tmp, self.root / CURRENT)
+        logger.info(f"Activated model version {version}")
+
+    # Reads -----------------------------------------------------------------
+
+    def active_version(self) -> Optional[str]:
+        """Version named by CURRENT, or None when nothing has been published"""
+        try:
+            return (self.root / CURRENT).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def manifest(self, version: str) -> Dict[str, Any]:
+        try:
+            return json.loads((self.root / version / MANIFEST).read_text())
+        except FileNotFoundError:
+            raise ModelIntegrityError(f"Model version {version} has no manifest") from None
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """Manifests of every published version, oldest first"""
+        if not self.root.exists():
+            return []
+        manifests = [self.manifest(path.name) for path in sorted(self.root.iterdir())
+                     if path.is_dir() and (path / MANIFEST).exists()]
+        return sorted(manifests, key=lambda m: m["created"])
+
+    def verify(self, version: str) -> Dict[str, str]:
+        """Check every artifact of `version` against its manifest; returns name -> sha256"""
+        manifest = self.manifest(version)
+        checked = {}
+        for name, artifact in manifest["models"].items():
+            path = self.root / version / artifact["file"]
+            if not path.exists():
+                raise ModelIntegrityError(f"{version}/{artifact['file']} is missing")
+            digest = _sha256(path)
+            if digest != artifact["sha256"]:
+                raise ModelIntegrityError(f"{version}/{artifact['file']} checksum mismatch")
+            checked[name] = digest
+        return checked
+
+    # Loading ---------------------------------------------------------------
+
+    def get(self, name: str) -> Any:
+        """
+        The active version's `name` model, loaded on first use
+
+        Raises LookupError when no version is active or it has no such model.
+        """
+        self._refresh()
+        with self._lock:
+            model = self._models.get(name)
+            if model is not None:
+                return model
+            if self._version is None:
+                raise LookupError(f"No model version is active under {self.root}")
+            artifact = self._manifest["models"].get(name)
+            if artifact is None:
+                raise LookupError(f"Model version {self._version} has no {name!r} model")
+            path = self.root / self._version / artifact["file"]
+            if _sha256(path) != artifact["sha256"]:
+                raise ModelIntegrityError(f"{self._version}/{artifact['file']} checksum mismatch")
+            model = joblib.load(path, mmap_mode=self.mmap_mode)
+            self._models[name] = model
+            self.loads += 1
+            return model
+
+    def _refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = now
+        version = self.active_version()
+        if version == self._version:
+            return
+        manifest = self.manifest(version) if version else {}
+        with self._lock:
+            if version != self._version:
+                if self._version is not None:
+                    self.swaps += 1
+                    logger.info(f"Model version {self._version} -> {version}")
+                self._version, self._manifest, self._models = version, manifest, {}
+
+    def reload(self):
+        """Re-read CURRENT now instead of waiting for the refresh interval"""
+        self._refresh(force=True)
+
+    @property
+    def version(self) -> Optional[str]:
+        """Version currently served by get()"""
+        self._refresh()
+        return self._version
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "root": str(self.root),
+            "version": self._version,
+            "loaded": sorted(self._models),
+            "loads": self.loads,
+            "swaps": self.swaps,
+            "mmap": self.mmap_mode is not None,
+        }
+
+
+_model_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide registry under MODEL_REGISTRY_DIR (default backend/data/models)"""
+    global _model_registry
+    if _model_registry is None:
+        default_root = Path(__file__).resolve().parent.parent / "data" / "models"
+        _model_registry = ModelRegistry(
+            Path(os.environ.get("MODEL_REGISTRY_DIR", default_root)),
+            refresh_interval=float(os.environ.get("MODEL_REGISTRY_REFRESH_S", "5")),
+            mmap=os.environ.get("MODEL_REGISTRY_MMAP", "1") != "0",
+        )
+    return _model_registry
+
+
+# CLI -------------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--root", type=Path, help="registry directory (default MODEL_REGISTRY_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="train the enhanced models and publish a version")
+    train.add_argument("--seed", type=int, default=42)
+    train.add_argument("--no-activate", action="store_true")
+    commands.add_parser("list", help="list published versions")
+    activate = commands.add_parser("activate", help="make VERSION the active version")
+    activate.add_argument("version")
+    verify = commands.add_parser("verify", help="check artifact checksums")
+    verify.add_argument("version", nargs="?")
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(args.root) if args.root else get_model_registry()
+    try:
+        if args.command == "train":
+            from logic.enhanced_perfect_algorithms import train_enhanced_models
+
+            started = time.perf_counter()
+            models = train_enhanced_models(seed=args.seed)
+            version = registry.publish(models, metadata={
+                "seed": args.seed, "training_seconds": round(time.perf_counter() - started, 3)
+            }, activate=not args.no_activate)
+            print(version)
+        elif args.command == "list":
+            active = registry.active_version()
+            for manifest in registry.versions():
+                marker = "*" if manifest["version"] == active else " "
+                size = sum(a["bytes"] for a in manifest["models"].values())
+                print(f"{marker} {manifest['version']}  {manifest['created']}  {size / 1e6:.1f} MB  "
+                      f"{', '.join(manifest['models'])}")
+        elif args.command == "activate":
+            registry.activate(args.version)
+        elif args.command == "verify":
+            version = args.version or registry.active_version()
+            if version is None:
+                print("no active version", file=sys.stderr)
+                return 1
+            for name, digest in registry.verify(version).items():
+                print(f"{version}/{name}  {digest}")
+    except ModelIntegrityError as e:
+        print(f"integrity error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
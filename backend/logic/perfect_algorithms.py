@@ -21,6 +21,10 @@ from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_sc
 from sklearn.preprocessing import StandardScaler
 import pickle
 
+from logic.batch_vitality import PERFECT_HARDWARE, PERFECT_VITALITY, ArrayLike, BatchResult, batch_hardware, batch_vitality
+from logic.instrumentation import instrumented, throughput_summary
+from logic.metrics_history import MetricsHistory
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -98,37 +102,14 @@ def perfect_validation(func):
     return wrapper
 
 def perfect_performance_monitor(func):
-    """Perfect performance monitoring decorator"""
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        start_memory = 0  # Would use psutil in real implementation
-        start_cpu = 0  # Would use psutil in real implementation
-        
-        try:
-            result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # Calculate metrics
-            input_size = len(str(args)) + len(str(kwargs))
-            output_size = len(str(result))
-            throughput = output_size / execution_time if execution_time > 0 else 0
-            
-            logger.info(f"Perfect Performance - {func.__name__}: {execution_time:.4f}s, Input: {input_size}, Output: {output_size}, Throughput: {throughput:.2f}")
-            
-            return result
-        except Exception as e:
-            execution_time = time.time() - start_time
-            logger.error(f"Perfect Performance - {func.__name__} failed after {execution_time:.4f}s: {str(e)}")
-            logger.error(traceback.format_exc())
-            raise
-    return wrapper
+    """Perfect performance monitoring decorator (sampled, see logic.instrumentation)"""
+    return instrumented(func, logger, "Perfect Performance", throughput_summary)
 
 class PerfectAlgorithms:
     """Perfect algorithms system with 100% optimization"""
     
     def __init__(self):
-        self.metrics_history: List[AlgorithmMetrics] = []
+        self.metrics_history = MetricsHistory()
         self.model_cache: Dict[str, Any] = {}
         self.scaler = StandardScaler()
         self.executor = ThreadPoolExecutor(max_workers=4)
@@ -469,6 +450,18 @@ class PerfectAlgorithms:
             logger.error(traceback.format_exc())
             raise
     
+    def perfect_hardware_abstraction_batch(self, hardware_data: Dict[str, Any]) -> BatchResult:
+        """
+        Perfect hardware abstraction for many samples at once
+        
+        Each component is a dict of field arrays or an (N, F) matrix with
+        columns HARDWARE_FIELDS[component]. Columns match
+        perfect_hardware_abstraction per row; recommendation text is
+        rendered only on request.
+        """
+        return self._run_batch("perfect_hardware_abstraction_batch", AlgorithmType.HARDWARE_ABSTRACTION,
+                               lambda: batch_hardware(hardware_data, PERFECT_HARDWARE))
+    
     def _process_hardware_component_perfect(self, component: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Process hardware component with perfect optimization"""
         try:
@@ -892,6 +885,33 @@ class PerfectAlgorithms:
             logger.error(traceback.format_exc())
             raise
     
+    def perfect_vitality_calculation_batch(self, performance: ArrayLike, accuracy: ArrayLike,
+                                           energy: ArrayLike, latency: ArrayLike) -> BatchResult:
+        """
+        Perfect Vitality Index™ for many samples at once
+        
+        Inputs are 1-D arrays (scalars broadcast). Columns match
+        perfect_vitality_calculation per row; recommendation text is
+        rendered only on request.
+        """
+        return self._run_batch("perfect_vitality_calculation_batch", AlgorithmType.VITALITY_CALCULATION,
+                               lambda: batch_vitality(performance, accuracy, energy, latency, PERFECT_VITALITY))
+    
+    def _run_batch(self, name: str, algorithm_type: AlgorithmType, compute: Callable[[], BatchResult]) -> BatchResult:
+        started = time.time()
+        result = compute()
+        elapsed = time.time() - started
+        rows = len(result)
+        
+        self._store_algorithm_metrics(name, algorithm_type, {
+            'processing_time': elapsed,
+            'throughput': rows / elapsed if elapsed > 0 else 0.0,
+            'parameters': {'rows': rows}
+        })
+        logger.info(f"{name}: {rows} rows in {elapsed:.4f}s, {int(result.needs_attention.sum())} flagged")
+        result.metadata.update({'timestamp': datetime.now().isoformat()})
+        return result
+    
     def _normalize_vitality_perfect(self, vitality_index: float) -> float:
         """Perfect vitality normalization"""
         try:
@@ -1186,29 +1206,18 @@ class PerfectAlgorithms:
     def _store_algorithm_metrics(self, name: str, algorithm_type: AlgorithmType, result: Dict[str, Any]) -> None:
         """Store algorithm metrics"""
         try:
-            metrics = AlgorithmMetrics(
-                name=name,
-                type=algorithm_type,
-                processing_mode=ProcessingMode.REAL_TIME,
-                execution_time=result.get('processing_time', 0.0),
-                accuracy=result.get('accuracy', 1.0),
-                precision=result.get('precision', 1.0),
-                recall=result.get('recall', 1.0),
-                f1_score=result.get('f1_score', 1.0),
-                throughput=result.get('throughput', 0.0),
-                memory_usage=result.get('memory_usage', 0.0),
-                cpu_usage=result.get('cpu_usage', 0.0),
-                error_rate=result.get('error_rate', 0.0),
-                success_rate=result.get('success_rate', 1.0),
-                timestamp=datetime.now(),
-                parameters=result.get('parameters', {})
-            )
-            
-            self.metrics_history.append(metrics)
-            
-            # Keep only last 1000 metrics
-            if len(self.metrics_history) > 1000:
-                self.metrics_history = self.metrics_history[-1000:]
+            self.metrics_history.append(name, algorithm_type, ProcessingMode.REAL_TIME, {
+                'execution_time': result.get('processing_time', 0.0),
+                'accuracy': result.get('accuracy', 1.0),
+                'precision': result.get('precision', 1.0),
+                'recall': result.get('recall', 1.0),
+                'f1_score': result.get('f1_score', 1.0),
+                'throughput': result.get('throughput', 0.0),
+                'memory_usage': result.get('memory_usage', 0.0),
+                'cpu_usage': result.get('cpu_usage', 0.0),
+                'error_rate': result.get('error_rate', 0.0),
+                'success_rate': result.get('success_rate', 1.0)
+            })
             
         except Exception as e:
             logger.error(f"Error storing algorithm metrics: {str(e)}")
@@ -1216,34 +1225,36 @@ class PerfectAlgorithms:
     def get_perfect_algorithm_performance_report(self) -> Dict[str, Any]:
         """Get perfect algorithm performance report"""
         try:
-            if not self.metrics_history:
+            stats = self.metrics_history.aggregate()
+            if not stats['count']:
                 return {'error': 'No metrics available'}
             
             # Calculate performance statistics
             performance_stats = {}
             
             for metric_type in AlgorithmType:
-                type_metrics = [m for m in self.metrics_history if m.type == metric_type]
+                group = stats['by_type'].get(metric_type)
                 
-                if type_metrics:
+                if group:
+                    means = group['means']
                     performance_stats[metric_type.value] = {
-                        'count': len(type_metrics),
-                        'avg_execution_time': statistics.mean([m.execution_time for m in type_metrics]),
-                        'avg_accuracy': statistics.mean([m.accuracy for m in type_metrics]),
-                        'avg_throughput': statistics.mean([m.throughput for m in type_metrics]),
-                        'avg_success_rate': statistics.mean([m.success_rate for m in type_metrics]),
-                        'avg_error_rate': statistics.mean([m.error_rate for m in type_metrics]),
+                        'count': group['count'],
+                        'avg_execution_time': means['execution_time'],
+                        'avg_accuracy': means['accuracy'],
+                        'avg_throughput': means['throughput'],
+                        'avg_success_rate': means['success_rate'],
+                        'avg_error_rate': means['error_rate'],
                         'perfect_score': 1.0  # Perfect score
                     }
             
             # Overall statistics
-            all_metrics = self.metrics_history
+            overall = stats['means']
             overall_stats = {
-                'total_executions': len(all_metrics),
-                'avg_execution_time': statistics.mean([m.execution_time for m in all_metrics]),
-                'avg_accuracy': statistics.mean([m.accuracy for m in all_metrics]),
-                'avg_success_rate': statistics.mean([m.success_rate for m in all_metrics]),
-                'total_error_rate': statistics.mean([m.error_rate for m in all_metrics]),
+                'total_executions': stats['count'],
+                'avg_execution_time': overall['execution_time'],
+                'avg_accuracy': overall['accuracy'],
+                'avg_success_rate': overall['success_rate'],
+                'total_error_rate': overall['error_rate'],
                 'perfect_performance': 1.0  # Perfect overall performance
             }
             
@@ -0,0 +1,224 @@
+# 🧠 ShaheenPulse AI - Streaming Mutation Detection
+# ! PATENT-PENDING: SHAHEEN_CORE_LOGIC
+
+"""
+Streaming Mutation Detection
+The ultimate_mutation_detection ensemble over one metric stream, O(1) per observation
+
+Instead of re-deriving everything from a caller-supplied historical_data
+list, a detector keeps per-metric sufficient statistics and absorbs one
+observation at a time:
+
+- pattern_recognition: Welford running mean / variance plus min / max
+  (a constant series has zero spread)
+- time_series: online least-squares accumulators (mean position, mean
+  value, co-moment) for each metric's own series, extrapolated one step
+- machine_learning: a fixed-size reservoir sample of past observations;
+  kNN runs over the reservoir, so it is exact until the stream outgrows
+  it and a uniform sample of the history after that. The reservoir also
+  gives per-metric robust quantiles (median, IQR, MAD)
+- statistical: depends only on the current observation and the baseline
+
+An observation is scored against the state *before* it is absorbed, so
+after absorbing h_1..h_T, score(c) equals ultimate_mutation_detection with
+historical_data=[h_1..h_T] (while T <= reservoir size). State is
+checkpointed to a single .npz file and restored with `load`.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from logic.batch_mutation import _knn, _masked_mean, _statistical, classify_severity
+
+_STATE = ("count", "mean", "m2", "comoment", "minimum", "maximum")
+
+
+class StreamingMutationDetector:
+    """Incremental mutation scoring for one stream of named metrics"""
+
+    def __init__(self, names: Sequence[str], baseline: Dict[str, float], reservoir_size: int = 256,
+                 k: int = 5, seed: Optional[int] = None):
+        self.names = list(names)
+        self._index = {name: j for j, name in enumerate(self.names)}
+        self.baseline = self._row(baseline)
+        self.reservoir_size = reservoir_size
+        self.k = k
+        self.seen = 0                    # observations absorbed (reservoir denominator)
+        self.rng = np.random.default_rng(seed)
+
+        metrics = len(self.names)
+        self.state = {key: np.zeros(metrics) for key in _STATE}
+        self.state["minimum"][:] = np.inf
+        self.state["maximum"][:] = -np.inf
+        self.reservoir = np.full((reservoir_size, metrics), np.nan)
+        self._lock = threading.Lock()
+
+    def _row(self, values: Union[Dict[str, float], np.ndarray]) -> np.ndarray:
+        if not isinstance(values, dict):
+            row = np.asarray(values, dtype=np.float64)
+            if row.shape != (len(self.names),):
+                raise ValueError(f"Expected {len(self.names)} values, got {row.shape}")
+            return row
+        row = np.full(len(self.names), np.nan)
+        for name, value in values.items():
+            j = self._index.get(name)
+            if j is not None:
+                row[j] = value
+        return row
+
+    def set_baseline(self, baseline: Dict[str, float]):
+        """Replace the baseline (history is stored raw, so nothing is recomputed)"""
+        with self._lock:
+            self.baseline = self._row(baseline)
+
+    # Updates ---------------------------------------------------------------
+
+    def absorb(self, observation: Union[Dict[str, float], np.ndarray]):
+        """Add one observation to the history; absent metrics (NaN / missing keys) are skipped"""
+        with self._lock:
+            self._absorb(self._row(observation))
+
+    def _absorb(self, y: np.ndarray):
+        s = self.state
+        present = ~np.isnan(y)
+        if not present.any():
+            return
+        value = np.where(present, y, 0.0)
+        count = s["count"] + present
+        safe = np.maximum(count, 1)
+
+        # Positions are each metric's own index (0, 1, ...), so the position
+        # mean is (count - 1) / 2 and the update needs no stored x
+        x_delta = np.where(present, s["count"] - (s["count"] - 1) / 2.0, 0.0)
+        y_delta = np.where(present, value - s["mean"], 0.0)
+        mean = s["mean"] + y_delta / safe
+        s["m2"] += np.where(present, y_delta * (value - mean), 0.0)
+        s["comoment"] += np.where(present, x_delta * (value - mean), 0.0)
+        s["mean"][:] = mean
+        s["count"][:] = count
+        s["minimum"][:] = np.where(present, np.minimum(s["minimum"], value), s["minimum"])
+        s["maximum"][:] = np.where(present, np.maximum(s["maximum"], value), s["maximum"])
+
+        # Reservoir sampling (Algorithm R)
+        if self.seen < self.reservoir_size:
+            self.reservoir[self.seen] = y
+        else:
+            slot = self.rng.integers(0, self.seen + 1)
+            if slot < self.reservoir_size:
+                self.reservoir[slot] = y
+        self.seen += 1
+
+    def update(self, observation: Union[Dict[str, float], np.ndarray]) -> Dict[str, Any]:
+        """Score an observation against the stream so far, then absorb it"""
+        with self._lock:
+            y = self._row(observation)
+            result = self._score(y)
+            self._absorb(y)
+        return result
+
+    # Scoring ---------------------------------------------------------------
+
+    def score(self, observation: Union[Dict[str, float], np.ndarray]) -> Dict[str, Any]:
+        """Score without absorbing (same shape as ultimate_mutation_detection)"""
+        with self._lock:
+            return self._score(self._row(observation))
+
+    def _score(self, current: np.ndarray) -> Dict[str, Any]:
+        s = self.state
+        baseline = self.baseline
+        has_metric = ~np.isnan(current) & ~np.isnan(baseline)
+        nonzero = has_metric & (baseline != 0)
+        n = s["count"]
+        current_row, baseline_row = current[None, :], baseline[None, :]
+
+        statistical = _statistical(current_row, baseline_row, nonzero[None, :])[0]
+        filled = min(self.seen, self.reservoir_size)
+        machine_learning = _knn(current_row, baseline_row, self.reservoir[None, :filled],
+                                ~np.isnan(self.reservoir[None, :filled]), nonzero[None, :], self.k)[0]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_mean = (n - 1) / 2.0
+            slope = s["comoment"] / (n * (n * n - 1) / 12.0)
+            expected = slope * n + (s["mean"] - slope * x_mean)
+            trend_deviation = np.abs(current - expected) / baseline
+            std = np.where(s["maximum"] == s["minimum"], 0.0, np.sqrt(s["m2"] / (n - 1)))
+            z = np.minimum(1.0, np.abs(current - s["mean"]) / std / 3)
+        time_series = _masked_mean(trend_deviation[None, :], (has_metric & (n > 3) & (baseline != 0))[None, :])[0]
+        pattern = _masked_mean(z[None, :], (has_metric & (n > 2) & (std > 0))[None, :])[0]
+
+        scores = np.array([statistical, machine_learning, time_series, pattern])
+        mutation_score = float(scores.mean())
+        return {
+            'mutation_score': mutation_score,
+            'confidence': float(1.0 - scores.std(ddof=1)),
+            'severity': str(classify_severity(np.array([mutation_score]))[0]),
+            'individual_scores': {
+                'statistical': float(statistical),
+                'machine_learning': float(machine_learning),
+                'time_series': float(time_series),
+                'pattern_recognition': float(pattern)
+            },
+            'detection_method': 'ultimate_streaming',
+            'observations': self.seen,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    # Reads -----------------------------------------------------------------
+
+    def robust_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-metric median, IQR and MAD estimated from the reservoir"""
+        with self._lock:
+            sample = self.reservoir[:min(self.seen, self.reservoir_size)]
+            stats = {}
+            for j, name in enumerate(self.names):
+                column = sample[:, j][~np.isnan(sample[:, j])]
+                if len(column) == 0:
+                    continue
+                q25, median, q75 = np.percentile(column, [25, 50, 75])
+                stats[name] = {
+                    'median': float(median),
+                    'iqr': float(q75 - q25),
+                    'mad': float(np.median(np.abs(column - median))),
+                    'count': int(self.state['count'][j])
+                }
+            return stats
+
+    # Checkpoints -----------------------------------------------------------
+
+    def checkpoint(self, path: Union[str, Path]):
+        """Atomically write the full state to `path` (.npz)"""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with self._lock:
+            meta = {
+                'reservoir_size': self.reservoir_size,
+                'k': self.k,
+                'seen': self.seen,
+                'rng': self.rng.bit_generator.state,
+            }
+            with open(tmp, 'wb') as f:
+                np.savez(f, names=np.array(self.names, dtype=str), baseline=self.baseline,
+                         reservoir=self.reservoir, meta=np.array(json.dumps(meta)),
+                         **{f"state_{key}": column for key, column in self.state.items()})
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "StreamingMutationDetector":
+        """Restore a detector written by checkpoint()"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            names = [str(name) for name in data['names']]
+            detector = cls(names, {}, reservoir_size=meta['reservoir_size'], k=meta['k'])
+            detector.baseline = data['baseline'].copy()
+            detector.reservoir = data['reservoir'].copy()
+            for key in _STATE:
+                detector.state[key] = data[f"state_{key}"].copy()
+        detector.seen = meta['seen']
+        detector.rng.bit_generator.state = meta['rng']
+        return detector
@@ -3,6 +3,7 @@
 
 import logging
 import asyncio
+import os
 import json
 import time
 import math
@@ -11,7 +12,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Union, Tuple, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
-from functools import wraps
+from functools import partial, wraps
 import traceback
 import hashlib
 import uuid
@@ -21,6 +22,13 @@ from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_sc
 from sklearn.preprocessing import StandardScaler
 import pickle
 
+from logic.batch_mutation import History, arrays_to_record, batch_mutation_scores, records_to_arrays
+from logic.batch_vitality import ULTIMATE_HARDWARE, ULTIMATE_VITALITY, ArrayLike, BatchResult, batch_hardware, batch_vitality
+from logic.ensemble_executor import Detector, EnsembleExecutor, EnsembleRun
+from logic.instrumentation import instrumented, throughput_summary
+from logic.knn_index import HistoryIndexCache, deviation_features, knn_score
+from logic.metrics_history import MetricsHistory
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -98,41 +106,43 @@ def comprehensive_validation(func):
     return wrapper
 
 def advanced_performance_monitor(func):
-    """Advanced performance monitoring decorator"""
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        start_memory = 0  # Would use psutil in real implementation
-        start_cpu = 0  # Would use psutil in real implementation
-        
-        try:
-            result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # Calculate metrics
-            input_size = len(str(args)) + len(str(kwargs))
-            output_size = len(str(result))
-            throughput = output_size / execution_time if execution_time > 0 else 0
-            
-            logger.info(f"Performance - {func.__name__}: {execution_time:.4f}s, Input: {input_size}, Output: {output_size}, Throughput: {throughput:.2f}")
-            
-            return result
-        except Exception as e:
-            execution_time = time.time() - start_time
-            logger.error(f"Performance - {func.__name__} failed after {execution_time:.4f}s: {str(e)}")
-            logger.error(traceback.format_exc())
-            raise
-    return wrapper
+    """Advanced performance monitoring decorator (sampled, see logic.instrumentation)"""
+    return instrumented(func, logger, "Performance", throughput_summary)
+
+# History length from which time_series / pattern_recognition go to the
+# process pool. Off by default: shipping the history as arrays and
+# rebuilding the dicts in the worker costs more than the detectors save
+# (measure with benchmarks/ensemble_executor.py before turning it on).
+# Never used on a single CPU.
+PROCESS_MIN_HISTORY = os.environ.get("ULTIMATE_PROCESS_MIN_HISTORY")
+
+_process_algorithms = None
+
+def _array_mutation_detection(method: str, current: np.ndarray, baseline: np.ndarray, history: np.ndarray,
+                              names: List[str]) -> float:
+    """Run a per-dict sub-detector on shared-memory arrays (process pool side)"""
+    global _process_algorithms
+    if _process_algorithms is None:
+        _process_algorithms = UltimateAlgorithms()
+    record = arrays_to_record(current, baseline, history, names)
+    return getattr(_process_algorithms, method)(record['metrics'], record['baseline'], record['historical_data'])
 
 class UltimateAlgorithms:
     """Ultimate algorithms system with 100% optimization"""
     
     def __init__(self):
-        self.metrics_history: List[AlgorithmMetrics] = []
+        self.metrics_history = MetricsHistory()
         self.model_cache: Dict[str, Any] = {}
         self.scaler = StandardScaler()
         self.executor = ThreadPoolExecutor(max_workers=4)
         self.optimization_enabled = True
+        self.history_index = HistoryIndexCache()
+        self.knn_index_min_history = 4096
+        self.parallel_processing = True
+        self.parallel_min_history = 2048
+        self.process_min_history: Optional[int] = (
+            int(PROCESS_MIN_HISTORY) if PROCESS_MIN_HISTORY and (os.cpu_count() or 1) > 1 else None)
+        self.ensemble = EnsembleExecutor(self.executor)
         
     @comprehensive_validation
     @advanced_performance_monitor
@@ -155,24 +165,14 @@ class UltimateAlgorithms:
             baseline = data['baseline']
             historical_data = data['historical_data']
             
-            # Advanced mutation detection using multiple algorithms
-            mutation_scores = []
-            
-            # 1. Statistical anomaly detection
-            stat_score = self._statistical_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(stat_score)
-            
-            # 2. Machine learning-based detection
-            ml_score = self._ml_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(ml_score)
-            
-            # 3. Time series analysis
-            ts_score = self._time_series_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(ts_score)
-            
-            # 4. Pattern recognition
-            pattern_score = self._pattern_mutation_detection(metrics, baseline, historical_data)
-            mutation_scores.append(pattern_score)
+            # Advanced mutation detection using multiple algorithms, run
+            # concurrently for long histories; detectors that fail or time
+            # out are left out of the ensemble
+            run = self._run_mutation_detectors(metrics, baseline, historical_data)
+            individual_scores = {name: run.scores[name] for name in run.timings if name in run.scores}
+            mutation_scores = list(individual_scores.values())
+            if not mutation_scores:
+                raise RuntimeError(f"No mutation detector finished: {run.timings}")
             
             # Ensemble approach for maximum accuracy
             final_mutation_score = statistics.mean(mutation_scores)
@@ -182,7 +182,7 @@ class UltimateAlgorithms:
             severity = self._classify_mutation_severity_ultimate(final_mutation_score)
             
             # Generate comprehensive recommendations
-            recommendations = self._generate_ultimate_mutation_recommendations(final_mutation_score, severity, mutation_scores)
+            recommendations = self._generate_ultimate_mutation_recommendations(final_mutation_score, severity, individual_scores)
             
             # Calculate predictive metrics
             predictive_metrics = self._calculate_predictive_metrics(final_mutation_score, historical_data)
@@ -191,15 +191,12 @@ class UltimateAlgorithms:
                 'mutation_score': final_mutation_score,
                 'confidence': confidence,
                 'severity': severity,
-                'individual_scores': {
-                    'statistical': stat_score,
-                    'machine_learning': ml_score,
-                    'time_series': ts_score,
-                    'pattern_recognition': pattern_score
-                },
+                'individual_scores': individual_scores,
                 'recommendations': recommendations,
                 'predictive_metrics': predictive_metrics,
                 'detection_method': 'ultimate_ensemble',
+                'detector_timings': run.timings,
+                'degraded_detectors': run.missing,
                 'timestamp': datetime.now().isoformat(),
                 'accuracy': 1.0,  # Ultimate accuracy
                 'processing_time': time.time()
@@ -216,35 +213,81 @@ class UltimateAlgorithms:
             logger.error(traceback.format_exc())
             raise
     
+    def _run_mutation_detectors(self, metrics: Dict[str, Any], baseline: Dict[str, Any],
+                                historical_data: List[Dict[str, Any]]) -> EnsembleRun:
+        """
+        Run the four sub-detectors (in parallel once the history is long enough to pay for it)
+        
+        The pure-Python history scans run on threads unless process_min_history
+        is set and reached, in which case they go to worker processes.
+        """
+        scan_mode = 'thread'
+        if self.process_min_history is not None and len(historical_data) >= self.process_min_history:
+            scan_mode = 'process'
+        detectors = [
+            Detector('statistical', self._statistical_mutation_detection, mode='inline'),
+            Detector('machine_learning', self._ml_mutation_detection, mode='thread'),
+            Detector('time_series', self._time_series_mutation_detection, mode=scan_mode,
+                     process_fn=partial(_array_mutation_detection, '_time_series_mutation_detection')),
+            Detector('pattern_recognition', self._pattern_mutation_detection, mode=scan_mode,
+                     process_fn=partial(_array_mutation_detection, '_pattern_mutation_detection')),
+        ]
+        if not (self.parallel_processing and len(historical_data) >= self.parallel_min_history):
+            return self.ensemble.run(detectors, (metrics, baseline, historical_data), parallel=False)
+        if scan_mode == 'thread':
+            return self.ensemble.run(detectors, (metrics, baseline, historical_data))
+        
+        current, base, history, names = records_to_arrays(
+            [{'metrics': metrics, 'baseline': baseline, 'historical_data': historical_data}])
+        return self.ensemble.run(
+            detectors, (metrics, baseline, historical_data),
+            arrays={'current': current[0], 'baseline': base[0], 'history': history[0]},
+            process_kwargs={'names': names}
+        )
+    
+    def ultimate_mutation_detection_batch(self, current: np.ndarray, baseline: np.ndarray,
+                                          history: History) -> Dict[str, Any]:
+        """
+        Ultimate mutation detection for many entities at once
+        
+        current is (entities, metrics), baseline (metrics,) or (entities,
+        metrics), history (entities, steps, metrics) or a ragged list; NaN
+        marks an absent value. Scores, confidence and severity per entity
+        match ultimate_mutation_detection on the equivalent dicts.
+        """
+        started = time.time()
+        result = batch_mutation_scores(current, baseline, history)
+        elapsed = time.time() - started
+        entities = len(result['mutation_score'])
+        
+        self._store_algorithm_metrics("ultimate_mutation_detection_batch", AlgorithmType.MUTATION_DETECTION, {
+            'processing_time': elapsed,
+            'throughput': entities / elapsed if elapsed > 0 else 0.0,
+            'parameters': {'entities': entities}
+        })
+        logger.info(f"Ultimate batch mutation detection: {entities} entities in {elapsed:.4f}s")
+        return {**result, 'detection_method': 'ultimate_ensemble_batch', 'timestamp': datetime.now().isoformat()}
+    
     def _statistical_mutation_detection(self, metrics: Dict[str, Any], baseline: Dict[str, Any], 
                                        historical_data: List[Dict[str, Any]]) -> float:
         """Statistical mutation detection with advanced methods"""
         try:
-            deviations = []
-            
-            for metric_name, current_value in metrics.items():
-                if metric_name in baseline:
-                    baseline_value = baseline[metric_name]
-                    
-                    # Calculate Z-score
-                    if baseline_value != 0:
-                        z_score = abs(current_value - baseline_value) / baseline_value
-                        deviations.append(z_score)
-            
-            # Use robust statistical methods
-            if deviations:
-                # Median Absolute Deviation (MAD)
-                median_dev = statistics.median(deviations)
-                mad_score = median_dev / 0.6745  # Convert to standard deviation scale
+            names = [name for name in metrics if baseline.get(name, 0) != 0]
+            if names:
+                current = np.fromiter((metrics[name] for name in names), dtype=np.float64, count=len(names))
+                reference = np.fromiter((baseline[name] for name in names), dtype=np.float64, count=len(names))
+                # Relative deviation from baseline, all metrics at once
+                deviations = np.abs(current - reference) / reference
                 
-                # Interquartile Range (IQR)
-                q75, q25 = np.percentile(deviations, [75, 25])
+                # Median Absolute Deviation (MAD) and Interquartile Range (IQR) in one pass
+                q25, median_dev, q75 = np.percentile(deviations, [25, 50, 75])
+                mad_score = median_dev / 0.6745  # Convert to standard deviation scale
                 iqr = q75 - q25
                 iqr_score = median_dev / iqr if iqr > 0 else 0
                 
                 # Combine scores
                 combined_score = (mad_score + iqr_score) / 2
-                return min(1.0, combined_score)
+                return min(1.0, float(combined_score))
             
             return 0.0
             
@@ -256,56 +299,24 @@ class UltimateAlgorithms:
                                historical_data: List[Dict[str, Any]]) -> float:
         """Machine learning-based mutation detection"""
         try:
-            # Feature extraction
-            features = []
-            labels = []
-            
-            # Extract features from historical data
-            for data_point in historical_data:
-                point_features = []
-                for metric_name in metrics.keys():
-                    if metric_name in data_point and metric_name in baseline:
-                        current = data_point[metric_name]
-                        base = baseline[metric_name]
-                        if base != 0:
-                            deviation = (current - base) / base
-                            point_features.append(deviation)
-                
-                if point_features:
-                    features.append(point_features)
-                    # Label as mutation if deviation > threshold
-                    is_mutation = any(abs(f) > 0.1 for f in point_features)
-                    labels.append(1 if is_mutation else 0)
-            
-            # Current point features
-            current_features = []
-            for metric_name, current_value in metrics.items():
-                if metric_name in baseline:
-                    baseline_value = baseline[metric_name]
-                    if baseline_value != 0:
-                        deviation = (current_value - baseline_value) / baseline_value
-                        current_features.append(deviation)
-            
-            if len(features) > 1 and len(current_features) > 0:
-                # Simple ML approach (in real implementation, use advanced models)
-                # For now, use distance-based approach
-                distances = []
-                for feature_vector in features:
-                    if len(feature_vector) == len(current_features):
-                        distance = np.linalg.norm(np.array(feature_vector) - np.array(current_features))
-                        distances.append(distance)
-                
-                if distances:
-                    # Use k-nearest neighbors approach
-                    k = min(5, len(distances))
-                    k_nearest = sorted(distances)[:k]
-                    avg_distance = statistics.mean(k_nearest)
-                    
-                    # Normalize to 0-1 scale
-                    max_distance = max(distances) if distances else 1
-                    normalized_distance = avg_distance / max_distance if max_distance > 0 else 0
-                    
-                    return normalized_distance
+            # Distance-based approach: k nearest historical deviation vectors
+            # over the farthest. Long histories go through a cached KD-tree
+            # index that only absorbs newly appended points between calls.
+            names = [name for name in metrics if name in baseline and baseline[name] != 0]
+            if not names:
+                return 0.0
+            
+            if len(historical_data) >= self.knn_index_min_history:
+                base = np.array([baseline[name] for name in names], dtype=np.float64)
+                current = (np.array([metrics[name] for name in names], dtype=np.float64) - base) / base
+                index, partial_count = self.history_index.get(historical_data, names, base)
+                if len(index) + partial_count > 1:
+                    return float(index.score(current, k=5)[0])
+                return 0.0
+            
+            _, current, features, partial_count = deviation_features(metrics, baseline, historical_data)
+            if len(features) + partial_count > 1:
+                return knn_score(features, current, k=5)
             
             return 0.0
             
@@ -542,6 +553,18 @@ class UltimateAlgorithms:
             logger.error(traceback.format_exc())
             raise
     
+    def ultimate_hardware_abstraction_batch(self, hardware_data: Dict[str, Any]) -> BatchResult:
+        """
+        Ultimate hardware abstraction for many samples at once
+        
+        Each component is a dict of field arrays or an (N, F) matrix with
+        columns HARDWARE_FIELDS[component]. Columns match
+        ultimate_hardware_abstraction per row; recommendation text is
+        rendered only on request.
+        """
+        return self._run_batch("ultimate_hardware_abstraction_batch", AlgorithmType.HARDWARE_ABSTRACTION,
+                               lambda: batch_hardware(hardware_data, ULTIMATE_HARDWARE))
+    
     def _process_hardware_component_ultimate(self, component: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Process hardware component with ultimate optimization"""
         try:
@@ -899,6 +922,33 @@ class UltimateAlgorithms:
             logger.error(traceback.format_exc())
             raise
     
+    def ultimate_vitality_calculation_batch(self, performance: ArrayLike, accuracy: ArrayLike,
+                                            energy: ArrayLike, latency: ArrayLike) -> BatchResult:
+        """
+        Ultimate Vitality Index™ for many samples at once
+        
+        Inputs are 1-D arrays (scalars broadcast). Columns match
+        ultimate_vitality_calculation per row; recommendation text is
+        rendered only on request.
+        """
+        return self._run_batch("ultimate_vitality_calculation_batch", AlgorithmType.VITALITY_CALCULATION,
+                               lambda: batch_vitality(performance, accuracy, energy, latency, ULTIMATE_VITALITY))
+    
+    def _run_batch(self, name: str, algorithm_type: AlgorithmType, compute: Callable[[], BatchResult]) -> BatchResult:
+        started = time.time()
+        result = compute()
+        elapsed = time.time() - started
+        rows = len(result)
+        
+        self._store_algorithm_metrics(name, algorithm_type, {
+            'processing_time': elapsed,
+            'throughput': rows / elapsed if elapsed > 0 else 0.0,
+            'parameters': {'rows': rows}
+        })
+        logger.info(f"{name}: {rows} rows in {elapsed:.4f}s, {int(result.needs_attention.sum())} flagged")
+        result.metadata.update({'timestamp': datetime.now().isoformat()})
+        return result
+    
     def _normalize_vitality_ultimate(self, vitality_index: float) -> float:
         """Ultimate vitality normalization"""
         try:
@@ -1169,29 +1219,18 @@ class UltimateAlgorithms:
     def _store_algorithm_metrics(self, name: str, algorithm_type: AlgorithmType, result: Dict[str, Any]) -> None:
         """Store algorithm metrics"""
         try:
-            metrics = AlgorithmMetrics(
-                name=name,
-                type=algorithm_type,
-                processing_mode=ProcessingMode.REAL_TIME,
-                execution_time=result.get('processing_time', 0.0),
-                accuracy=result.get('accuracy', 1.0),
-                precision=result.get('precision', 1.0),
-                recall=result.get('recall', 1.0),
-                f1_score=result.get('f1_score', 1.0),
-                throughput=result.get('throughput', 0.0),
-                memory_usage=result.get('memory_usage', 0.0),
-                cpu_usage=result.get('cpu_usage', 0.0),
-                error_rate=result.get('error_rate', 0.0),
-                success_rate=result.get('success_rate', 1.0),
-                timestamp=datetime.now(),
-                parameters=result.get('parameters', {})
-            )
-            
-            self.metrics_history.append(metrics)
-            
-            # Keep only last 1000 metrics
-            if len(self.metrics_history) > 1000:
-                self.metrics_history = self.metrics_history[-1000:]
+            self.metrics_history.append(name, algorithm_type, ProcessingMode.REAL_TIME, {
+                'execution_time': result.get('processing_time', 0.0),
+                'accuracy': result.get('accuracy', 1.0),
+                'precision': result.get('precision', 1.0),
+                'recall': result.get('recall', 1.0),
+                'f1_score': result.get('f1_score', 1.0),
+                'throughput': result.get('throughput', 0.0),
+                'memory_usage': result.get('memory_usage', 0.0),
+                'cpu_usage': result.get('cpu_usage', 0.0),
+                'error_rate': result.get('error_rate', 0.0),
+                'success_rate': result.get('success_rate', 1.0)
+            })
             
         except Exception as e:
             logger.error(f"Error storing algorithm metrics: {str(e)}")
@@ -1199,33 +1238,35 @@ class UltimateAlgorithms:
     def get_algorithm_performance_report(self) -> Dict[str, Any]:
         """Get comprehensive algorithm performance report"""
         try:
-            if not self.metrics_history:
+            stats = self.metrics_history.aggregate()
+            if not stats['count']:
                 return {'error': 'No metrics available'}
             
             # Calculate performance statistics
             performance_stats = {}
             
             for metric_type in AlgorithmType:
-                type_metrics = [m for m in self.metrics_history if m.type == metric_type]
+                group = stats['by_type'].get(metric_type)
                 
-                if type_metrics:
+                if group:
+                    means = group['means']
                     performance_stats[metric_type.value] = {
-                        'count': len(type_metrics),
-                        'avg_execution_time': statistics.mean([m.execution_time for m in type_metrics]),
-                        'avg_accuracy': statistics.mean([m.accuracy for m in type_metrics]),
-                        'avg_throughput': statistics.mean([m.throughput for m in type_metrics]),
-                        'avg_success_rate': statistics.mean([m.success_rate for m in type_metrics]),
-                        'avg_error_rate': statistics.mean([m.error_rate for m in type_metrics])
+                        'count': group['count'],
+                        'avg_execution_time': means['execution_time'],
+                        'avg_accuracy': means['accuracy'],
+                        'avg_throughput': means['throughput'],
+                        'avg_success_rate': means['success_rate'],
+                        'avg_error_rate': means['error_rate']
                     }
             
             # Overall statistics
-            all_metrics = self.metrics_history
+            overall = stats['means']
             overall_stats = {
-                'total_executions': len(all_metrics),
-                'avg_execution_time': statistics.mean([m.execution_time for m in all_metrics]),
-                'avg_accuracy': statistics.mean([m.accuracy for m in all_metrics]),
-                'avg_success_rate': statistics.mean([m.success_rate for m in all_metrics]),
-                'total_error_rate': statistics.mean([m.error_rate for m in all_metrics])
+                'total_executions': stats['count'],
+                'avg_execution_time': overall['execution_time'],
+                'avg_accuracy': overall['accuracy'],
+                'avg_success_rate': overall['success_rate'],
+                'total_error_rate': overall['error_rate']
             }
             
             return {
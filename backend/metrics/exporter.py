@@ -0,0 +1,525 @@
+"""
+OpenMetrics Exporter
+Counters, gauges and histograms served at /metrics
+
+- hot path: every thread increments its own value list (a per-thread
+  shard), so observing takes no lock and costs a bisect plus two list
+  writes; scrapes sum the shards. When a thread exits its shard is
+  folded into a retired total, so short-lived threads don't pile up
+- multiprocess mode (METRICS_MULTIPROC_DIR): each worker writes its
+  totals to <dir>/<pid>.json every METRICS_FLUSH_INTERVAL seconds and
+  the scraped worker merges them. Counters and histograms of exited
+  workers keep counting; gauges only come from live workers. Empty the
+  directory when the deployment (not a worker) starts.
+- exposition: OpenMetrics 1.0 text, or Prometheus 0.0.4 text for
+  scrapers that don't ask for OpenMetrics
+"""
+
+import atexit
+import json
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from functools import wraps
+from inspect import iscoroutinefunction
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+GAUGE_MODES = ("sum", "max", "min", "all")
+
+
+class _ThreadToken:
+    """Lives in a thread's local storage; collected when the thread exits"""
+    __slots__ = ("__weakref__",)
+
+
+class _Shards:
+    """Per-thread value lists of one labelled child, plus the totals of exited threads"""
+    __slots__ = ("size", "local", "lists", "retired", "lock", "__weakref__")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.local = threading.local()
+        self.lists: Dict[int, List[float]] = {}
+        self.retired = [0.0] * size
+        self.lock = threading.Lock()
+
+    def mine(self) -> List[float]:
+        try:
+            return self.local.values
+        except AttributeError:
+            values = self.local.values = [0.0] * self.size
+            token = self.local.token = _ThreadToken()
+            with self.lock:
+                self.lists[id(values)] = values
+            weakref.finalize(token, _Shards._retire, weakref.ref(self), values)
+            return values
+
+    @staticmethod
+    def _retire(shards_ref: "weakref.ref", values: List[float]):
+        """Fold an exited thread's values into the retired totals"""
+        shards = shards_ref()
+        if shards is None:
+            return
+        with shards.lock:
+            if shards.lists.pop(id(values), None) is not None:
+                shards.retired = [a + b for a, b in zip(shards.retired, values)]
+
+    def totals(self) -> List[float]:
+        with self.lock:
+            lists = [self.retired, *self.lists.values()]
+        return [math.fsum(column) for column in zip(*lists)]
+
+
+class _Timer:
+    """Observe elapsed seconds into a histogram child (context manager or decorator)"""
+    __slots__ = ("child", "started")
+
+    def __init__(self, child: "HistogramChild"):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.started)
+
+    def __call__(self, func: Callable) -> Callable:
+        child = self.child
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    child.observe(time.perf_counter() - started)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started)
+        return wrapper
+
+
+class CounterChild:
+    __slots__ = ("_shards",)
+
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1.0):
+        try:
+            values = self._shards.local.values
+        except AttributeError:
+            values = self._shards.mine()
+        values[0] += amount
+
+    def values(self) -> List[float]:
+        return self._shards.totals()
+
+
+class GaugeChild:
+    """Last-write-wins value, or a callback read at scrape time"""
+    __slots__ = ("_value", "_function", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, function: Callable[[], float]):
+        self._function = function
+
+    def values(self) -> List[float]:
+        if self._function is not None:
+            try:
+                return [float(self._function())]
+            except Exception as e:
+                logger.debug(f"Gauge callback failed: {e}")
+                return [math.nan]
+        return [float(self._value)]
+
+
+class HistogramChild:
+    """Bucket counts (last bucket is +Inf) followed by the sum"""
+    __slots__ = ("_bounds", "_shards")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self._shards = _Shards(len(bounds) + 2)
+
+    def observe(self, value: float):
+        try:
+            values = self._shards.local.values
+        except AttributeError:
+            values = self._shards.mine()
+        values[bisect_left(self._bounds, value)] += 1
+        values[-1] += value
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    def values(self) -> List[float]:
+        return self._shards.totals()
+
+
+class _Metric:
+    kind = ""
+    child_type: Callable = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), unit: str = ""):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.unit = unit
+        self._children: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        return self.child_type()
+
+    def labels(self, *values, **kwargs):
+        """Child for one label combination (cache it on hot paths)"""
+        key = values or tuple(kwargs[name] for name in self.labelnames)
+        try:
+            return self._children[key]
+        except KeyError:
+            pass
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+        canonical = tuple(str(value) for value in key)
+        with self._lock:
+            child = self._children.get(canonical)
+            if child is None:
+                child = self._children[canonical] = self._new_child()
+            # Also index the raw key so ints etc. skip str() next time
+            self._children[key] = child
+        return child
+
+    def samples(self) -> Dict[Tuple[str, ...], List[float]]:
+        """Totals per canonical label tuple"""
+        with self._lock:
+            children = [(key, child) for key, child in self._children.items()
+                        if all(isinstance(value, str) for value in key)]
+        return {key: child.values() for key, child in children}
+
+    def describe(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "help": self.documentation, "labelnames": list(self.labelnames),
+                "unit": self.unit}
+
+
+class Counter(_Metric):
+    kind = "counter"
+    child_type = CounterChild
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+    child_type = GaugeChild
+
+    def __init__(self, *args, multiprocess_mode: str = "sum", **kwargs):
+        super().__init__(*args, **kwargs)
+        if multiprocess_mode not in GAUGE_MODES:
+            raise ValueError(f"multiprocess_mode must be one of {GAUGE_MODES}")
+        self.multiprocess_mode = multiprocess_mode
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]):
+        self.labels().set_function(function)
+
+    def describe(self) -> Dict[str, Any]:
+        return {**super().describe(), "mode": self.multiprocess_mode}
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bounds = tuple(sorted(float(b) for b in buckets if b != math.inf))
+
+    def _new_child(self):
+        return HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def describe(self) -> Dict[str, Any]:
+        return {**super().describe(), "bounds": list(self.bounds)}
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class MetricsRegistry:
+    """Named metrics of this process plus multiprocess aggregation"""
+
+    def __init__(self, multiproc_dir: Optional[str] = None, flush_interval: float = 1.0):
+        self.multiproc_dir = Path(multiproc_dir) if multiproc_dir else None
+        self.flush_interval = flush_interval
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+
+        if self.multiproc_dir is not None:
+            self.multiproc_dir.mkdir(parents=True, exist_ok=True)
+            self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+            self._flusher.start()
+            atexit.register(self.flush)
+
+    # Registration --------------------------------------------------------
+
+    def _register(self, metric_type, name: str, *args, **kwargs) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, metric_type):
+                    raise ValueError(f"Metric {name} already registered as a {existing.kind}")
+                return existing
+            metric = self._metrics[name] = metric_type(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = (), unit: str = "") -> Counter:
+        return self._register(Counter, name, documentation, labelnames, unit=unit)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), unit: str = "",
+              multiprocess_mode: str = "sum") -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames, unit=unit,
+                              multiprocess_mode=multiprocess_mode)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), unit: str = "",
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, unit=unit, buckets=buckets)
+
+    # Multiprocess --------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """This process's metadata and totals (JSON-serialisable)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {**metric.describe(),
+                          "samples": [[list(key), values] for key, values in metric.samples().items()]}
+            for metric in metrics
+        }
+
+    def flush(self):
+        """Write this worker's totals for the other workers' scrapes"""
+        if self.multiproc_dir is None:
+            return
+        path = self.multiproc_dir / f"{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, path)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Metrics flush error: {e}")
+
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _worker_snapshots(self) -> List[Tuple[int, bool, Dict[str, Any]]]:
+        snapshots = [(os.getpid(), True, self.snapshot())]
+        if self.multiproc_dir is None:
+            return snapshots
+        for path in self.multiproc_dir.glob("*.json"):
+            try:
+                pid = int(path.stem)
+            except ValueError:
+                continue
+            if pid == os.getpid():
+                continue
+            try:
+                snapshots.append((pid, self._alive(pid), json.loads(path.read_text())))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable metrics file {path}: {e}")
+        return snapshots
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics merged across workers: {name: description + {labels: values}}"""
+        merged: Dict[str, Dict[str, Any]] = {}
+        for pid, alive, snapshot in self._worker_snapshots():
+            for name, data in snapshot.items():
+                kind = data["kind"]
+                if kind == "gauge" and not alive:
+                    continue
+                entry = merged.setdefault(name, {**{k: v for k, v in data.items() if k != "samples"},
+                                                 "series": {}})
+                if kind == "gauge" and data.get("mode") == "all":
+                    entry["labelnames"] = list(data["labelnames"]) + ["pid"]
+                for key, values in data["samples"]:
+                    key = tuple(key)
+                    if kind == "gauge" and data.get("mode") == "all":
+                        key = key + (str(pid),)
+                    current = entry["series"].get(key)
+                    if current is None:
+                        entry["series"][key] = list(values)
+                    elif kind != "gauge" or data.get("mode") == "sum":
+                        entry["series"][key] = [a + b for a, b in zip(current, values)]
+                    elif data.get("mode") == "max":
+                        entry["series"][key] = [max(a, b) for a, b in zip(current, values)]
+                    elif data.get("mode") == "min":
+                        entry["series"][key] = [min(a, b) for a, b in zip(current, values)]
+        return merged
+
+    # Exposition ----------------------------------------------------------
+
+    def render(self, openmetrics: bool = True) -> str:
+        """Text exposition of every metric"""
+        lines: List[str] = []
+        for name, entry in sorted(self.collect().items()):
+            kind, labelnames = entry["kind"], entry["labelnames"]
+            family = name[:-6] if openmetrics and kind == "counter" and name.endswith("_total") else name
+            lines.append(f"# TYPE {family} {kind}")
+            if openmetrics and entry.get("unit"):
+                lines.append(f"# UNIT {family} {entry['unit']}")
+            lines.append(f"# HELP {family} {_escape(entry['help'])}")
+            for key, values in sorted(entry["series"].items()):
+                if kind == "counter":
+                    suffix = "_total" if openmetrics and not name.endswith("_total") else ""
+                    lines.append(f"{name}{suffix}{_labels(labelnames, key)} {_format_value(values[0])}")
+                elif kind == "gauge":
+                    lines.append(f"{name}{_labels(labelnames, key)} {_format_value(values[0])}")
+                else:
+                    cumulative = 0.0
+                    bounds = list(entry["bounds"]) + [math.inf]
+                    for bound, count in zip(bounds, values[:-1]):
+                        cumulative += count
+                        le = 'le="+Inf"' if bound == math.inf else f'le="{float(bound)!r}"'
+                        lines.append(f"{name}_bucket{_labels(labelnames, key, le)} {_format_value(cumulative)}")
+                    lines.append(f"{name}_count{_labels(labelnames, key)} {_format_value(cumulative)}")
+                    lines.append(f"{name}_sum{_labels(labelnames, key)} {_format_value(values[-1])}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry(
+    multiproc_dir=os.environ.get("METRICS_MULTIPROC_DIR") or None,
+    flush_interval=float(os.environ.get("METRICS_FLUSH_INTERVAL", "1.0"))
+)
+
+# Application metrics ---------------------------------------------------------
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status"), unit="seconds"
+)
+SECURITY_ANALYSIS_DURATION = REGISTRY.histogram(
+    "zero_day_analysis_duration_seconds", "Zero-day middleware request analysis time",
+    ("outcome",), unit="seconds", buckets=FAST_BUCKETS
+)
+LLM_REQUEST_DURATION = REGISTRY.histogram(
+    "llm_request_duration_seconds", "LLM call latency per provider",
+    ("provider", "model", "outcome"), unit="seconds", buckets=LLM_BUCKETS
+)
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total", "LLM tokens per provider", ("provider", "model", "kind")
+)
+TIME_GATE_REDIS_DURATION = REGISTRY.histogram(
+    "time_gate_redis_duration_seconds", "Time-gate Redis round trips",
+    ("transport", "command"), unit="seconds", buckets=FAST_BUCKETS
+)
+ENCRYPTION_DURATION = REGISTRY.histogram(
+    "encryption_duration_seconds", "Encryption service operations",
+    ("operation",), unit="seconds", buckets=FAST_BUCKETS
+)
+CERTIFICATE_RENDER_DURATION = REGISTRY.histogram(
+    "certificate_render_duration_seconds", "Sovereign certificate PDF render time", unit="seconds"
+)
+ALGORITHM_DURATION = REGISTRY.histogram(
+    "algorithm_duration_seconds", "Instrumented algorithm call time", ("algorithm", "outcome"),
+    unit="seconds", buckets=FAST_BUCKETS
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "queue_depth", "Items waiting per in-process queue", ("queue",)
+)
+HEALTH_LOOP_LAG = REGISTRY.histogram(
+    "health_loop_lag_seconds", "Real-time health loop wake-up lag", ("loop",), unit="seconds"
+)
+HEALTH_LOOP_TICKS = REGISTRY.counter(
+    "health_loop_ticks_total", "Real-time health loop ticks by outcome", ("loop", "outcome")
+)
+HEALTH_LOOP_OVERRUNS = REGISTRY.counter(
+    "health_loop_overruns_total", "Real-time health loop ticks that ran past the next tick", ("loop",)
+)
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "event_loop_lag_seconds", "Event loop heartbeat wake-up lag", unit="seconds", buckets=FAST_BUCKETS
+)
+EVENT_LOOP_BLOCKED_SECONDS = REGISTRY.counter(
+    "event_loop_blocked_seconds_total", "Time the event loop was blocked past the stall threshold",
+    ("route", "module")
+)
+EVENT_LOOP_STALLS = REGISTRY.counter(
+    "event_loop_stalls_total", "Callbacks that blocked the event loop past the stall threshold",
+    ("route", "module")
+)
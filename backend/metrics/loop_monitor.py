@@ -0,0 +1,306 @@
+"""
+Event Loop Monitor
+Continuous loop-lag measurement and blocking-call attribution
+
+- heartbeat: a task on the loop sleeps `interval` and records how late it
+  wakes (event_loop_lag_seconds)
+- watchdog: a thread checks the heartbeat; once it is overdue by more
+  than `threshold`, the loop thread's stack is captured while the
+  offending callback is still running. The stall is attributed to the
+  request being served (route template) and to the innermost
+  application module on the stack, and its duration is settled when the
+  loop wakes again (event_loop_blocked_seconds_total)
+- report: recent stalls with stacks, lag percentiles and blocked time
+  per route and module
+- test mode (LOOP_MONITOR_FAIL_MS, or `watch()`): a request or block
+  that stalls the loop longer than the limit raises BlockingCallError
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from metrics.exporter import EVENT_LOOP_BLOCKED_SECONDS, EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = str(Path(__file__).resolve().parent.parent)
+_THIS_FILE = str(Path(__file__).resolve())
+
+
+class BlockingCallError(AssertionError):
+    """The event loop was blocked longer than the test-mode limit"""
+
+
+@dataclass
+class Stall:
+    """One callback that held the loop past the threshold"""
+    started: float                 # perf_counter when the loop should have woken
+    route: str
+    module: str
+    task: str
+    stack: List[str]
+    duration: float = 0.0
+    timestamp: float = field(default_factory=time.time)
+    task_ref: Any = field(default=None, repr=False)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "duration_ms": round(self.duration * 1000, 2),
+            "route": self.route,
+            "module": self.module,
+            "task": self.task,
+            "timestamp": self.timestamp,
+            "stack": self.stack,
+        }
+
+
+def _frame_module(frame) -> str:
+    return frame.f_globals.get("__name__", "?")
+
+
+def _attribute(frame) -> Tuple[str, List[str]]:
+    """Innermost application module on a stack, and the formatted stack"""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    module = None
+    for candidate in frames:  # innermost first
+        filename = candidate.f_code.co_filename
+        if filename.startswith(APP_ROOT) and filename != _THIS_FILE and "site-packages" not in filename:
+            module = _frame_module(candidate)
+            break
+    if module is None and frames:
+        module = _frame_module(frames[0])
+    stack = [
+        f"{f.f_code.co_filename}:{f.f_lineno} in {f.f_code.co_name}"
+        for f in reversed(frames[:30])
+    ]
+    return module or "?", stack
+
+
+class LoopMonitor:
+    """Event-loop lag heartbeat plus a stack-capturing watchdog thread"""
+
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1, fail_after: Optional[float] = None,
+                 max_stalls: int = 100, lag_window: int = 2048):
+        self.interval = interval
+        self.threshold = threshold
+        self.fail_after = fail_after
+        self.stalls: Deque[Stall] = deque(maxlen=max_stalls)
+        self.blocked_by_route: Counter = Counter()
+        self.blocked_by_module: Counter = Counter()
+        self._lags: Deque[float] = deque(maxlen=lag_window)
+        self._task_scopes: "weakref.WeakKeyDictionary[asyncio.Task, dict]" = weakref.WeakKeyDictionary()
+        self._task_blocked: "weakref.WeakKeyDictionary[asyncio.Task, float]" = weakref.WeakKeyDictionary()
+        self._open: Optional[Stall] = None
+        self._expected: Optional[float] = None   # perf_counter of the next heartbeat
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    # Lifecycle -----------------------------------------------------------
+
+    def start(self):
+        """Start the heartbeat on the running loop and the watchdog thread"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stopping.clear()
+        self._expected = time.perf_counter() + self.interval
+        self._heartbeat = self._loop.create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (threshold {self.threshold * 1000:.0f} ms)")
+
+    async def stop(self):
+        self._stopping.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+        self._expected = None
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None and not self._heartbeat.done()
+
+    # Loop side -----------------------------------------------------------
+
+    async def _beat(self):
+        while True:
+            self._expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - self._expected)
+            self._lags.append(lag)
+            EVENT_LOOP_LAG.observe(lag)
+            self.settle()
+
+    def settle(self):
+        """Close the open stall (call from the loop thread: the loop is running again)"""
+        with self._lock:
+            stall, self._open = self._open, None
+        if stall is None:
+            return
+        stall.duration = max(0.0, time.perf_counter() - stall.started)
+        self.stalls.append(stall)
+        self.blocked_by_route[stall.route] += stall.duration
+        self.blocked_by_module[stall.module] += stall.duration
+        EVENT_LOOP_BLOCKED_SECONDS.labels(stall.route, stall.module).inc(stall.duration)
+        EVENT_LOOP_STALLS.labels(stall.route, stall.module).inc()
+        task = stall.task_ref() if stall.task_ref is not None else None
+        if task is not None:
+            self._task_blocked[task] = self._task_blocked.get(task, 0.0) + stall.duration
+        logger.warning(f"Event loop blocked {stall.duration * 1000:.0f} ms by {stall.module} ({stall.route})")
+
+    def track(self, scope: dict):
+        """Associate the current task with a request scope (for route attribution)"""
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_scopes[task] = scope
+
+    def blocked_time(self, task: Optional[asyncio.Task] = None) -> float:
+        """Settled blocking time attributed to a task (default: the current one)"""
+        self.settle()
+        task = task or asyncio.current_task()
+        return self._task_blocked.get(task, 0.0) if task is not None else 0.0
+
+    # Watchdog thread -----------------------------------------------------
+
+    def _watch(self):
+        while not self._stopping.wait(max(self.threshold / 4, 0.001)):
+            expected = self._expected
+            if expected is None or self._open is not None:
+                continue
+            if time.perf_counter() - expected > self.threshold:
+                self._capture(expected)
+
+    def _capture(self, started: float):
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return
+        module, stack = _attribute(frame)
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        scope = self._task_scopes.get(task) if task is not None else None
+        route = "background"
+        if scope is not None:
+            matched = scope.get("route")
+            route = getattr(matched, "path", None) or scope.get("path", "unmatched")
+        with self._lock:
+            if self._open is None and self._expected == started:
+                self._open = Stall(
+                    started=started,
+                    route=route,
+                    module=module,
+                    task=task.get_name() if task is not None else "-",
+                    stack=stack,
+                    task_ref=weakref.ref(task) if task is not None else None
+                )
+
+    # Test mode -----------------------------------------------------------
+
+    @asynccontextmanager
+    async def watch(self, max_block_ms: float):
+        """Raise BlockingCallError if the loop stalls longer than max_block_ms inside the block"""
+        started_here = not self.running
+        threshold = self.threshold
+        self.threshold = min(threshold, max_block_ms / 1000)
+        if started_here:
+            self.start()
+        first = len(self.stalls)
+        try:
+            yield self
+            await asyncio.sleep(0)
+            self.settle()
+        finally:
+            self.threshold = threshold
+            if started_here:
+                await self.stop()
+        offenders = [stall for stall in list(self.stalls)[first:] if stall.duration * 1000 > max_block_ms]
+        if offenders:
+            worst = max(offenders, key=lambda stall: stall.duration)
+            raise BlockingCallError(
+                f"Event loop blocked {worst.duration * 1000:.0f} ms (limit {max_block_ms:.0f} ms) "
+                f"in {worst.module}:\n" + "\n".join(worst.stack[-8:])
+            )
+
+    # Reads ---------------------------------------------------------------
+
+    def get_report(self, top: int = 10) -> Dict[str, Any]:
+        """Lag percentiles, blocked time per route and module, recent stalls"""
+        self.settle()
+        lags = sorted(self._lags)
+
+        def percentile(p: float) -> float:
+            return round(lags[min(len(lags) - 1, int(p / 100 * len(lags)))] * 1000, 3) if lags else 0.0
+
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "test_mode_limit_ms": self.fail_after * 1000 if self.fail_after else None,
+            "lag_ms": {"p50": percentile(50), "p99": percentile(99), "max": percentile(100),
+                       "samples": len(lags)},
+            "stalls": len(self.stalls),
+            "blocked_seconds_by_route": dict(self.blocked_by_route.most_common(top)),
+            "blocked_seconds_by_module": dict(self.blocked_by_module.most_common(top)),
+            "recent_stalls": [stall.as_dict() for stall in list(self.stalls)[-top:]],
+        }
+
+
+class LoopMonitorMiddleware:
+    """Tag each request's task with its scope; in test mode fail requests that block the loop"""
+
+    def __init__(self, app, monitor: Optional[LoopMonitor] = None):
+        self.app = app
+        self.monitor = monitor or get_loop_monitor()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.monitor.track(scope)
+        await self.app(scope, receive, send)
+        if self.monitor.fail_after is not None:
+            blocked = self.monitor.blocked_time()
+            if blocked > self.monitor.fail_after:
+                route = getattr(scope.get("route"), "path", scope.get("path"))
+                raise BlockingCallError(
+                    f"{scope['method']} {route} blocked the event loop for {blocked * 1000:.0f} ms "
+                    f"(limit {self.monitor.fail_after * 1000:.0f} ms)"
+                )
+
+
+_loop_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Process-wide event loop monitor"""
+    global _loop_monitor
+    if _loop_monitor is None:
+        fail_ms = os.environ.get("LOOP_MONITOR_FAIL_MS")
+        fail_after = float(fail_ms) / 1000 if fail_ms else None
+        threshold = float(os.environ.get("LOOP_MONITOR_THRESHOLD_MS", "100")) / 1000
+        _loop_monitor = LoopMonitor(
+            interval=float(os.environ.get("LOOP_MONITOR_INTERVAL_MS", "50")) / 1000,
+            threshold=min(threshold, fail_after) if fail_after else threshold,
+            fail_after=fail_after
+        )
+    return _loop_monitor
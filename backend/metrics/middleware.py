@@ -0,0 +1,42 @@
+"""
+HTTP Metrics Middleware
+Per-route request latency histograms
+
+Pure ASGI (no BaseHTTPMiddleware request wrapping), labelled by the
+matched route template rather than the raw path so path parameters
+don't explode label cardinality.
+"""
+
+import time
+
+from metrics.exporter import HTTP_REQUEST_DURATION
+
+
+class MetricsMiddleware:
+    """Observe every HTTP request into http_request_duration_seconds"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(scope["method"], template, status).observe(
+                time.perf_counter() - started
+            )
@@ -19,6 +19,7 @@ class PaymentStatus(Enum):
     SUCCESS = "success"
     FAILED = "failed"
     CANCELLED = "cancelled"
+    REFUNDED = "refunded"
 
 @dataclass
 class PaymentRequest:
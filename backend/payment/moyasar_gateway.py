@@ -147,7 +147,8 @@ class MoyasarGateway(PaymentGateway):
             "paid": PaymentStatus.SUCCESS,
             "pending": PaymentStatus.PENDING,
             "failed": PaymentStatus.FAILED,
-            "canceled": PaymentStatus.CANCELLED
+            "canceled": PaymentStatus.CANCELLED,
+            "refunded": PaymentStatus.REFUNDED
         }
         return status_mapping.get(moyasar_status, PaymentStatus.PENDING)
     
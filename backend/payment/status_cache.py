@@ -0,0 +1,141 @@
+"""
+Payment Status Cache
+Serve checkout polling without hammering Moyasar
+
+- final states (failed / cancelled / refunded) never change again and
+  are kept until evicted by the LRU bound
+- success is served for a long but finite TTL: a refund can still move
+  it to refunded, and invalidation only reaches the worker that handled
+  the refund webhook, so other workers converge within that TTL
+- pending states are served for a short TTL
+- concurrent lookups for the same payment share one upstream load
+  (single-flight)
+- the webhook processor invalidates an entry as soon as it settles a
+  payment, so a poll on that worker right after the webhook sees the new
+  state
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from . import PaymentStatus
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({
+    PaymentStatus.SUCCESS.value,
+    PaymentStatus.FAILED.value,
+    PaymentStatus.CANCELLED.value,
+    PaymentStatus.REFUNDED.value,
+})
+
+# Terminal states that can't change any more (success can still be refunded)
+FINAL_STATUSES = TERMINAL_STATUSES - {PaymentStatus.SUCCESS.value}
+
+StatusLoader = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+def is_terminal_status(status: Optional[str]) -> bool:
+    """Whether a payment has left the pending states"""
+    return status in TERMINAL_STATUSES
+
+
+def is_final_status(status: Optional[str]) -> bool:
+    """Whether a payment status can no longer change"""
+    return status in FINAL_STATUSES
+
+
+class PaymentStatusCache:
+    """Per-process, single-flight cache of payment status lookups"""
+
+    def __init__(
+        self,
+        loader: StatusLoader,
+        pending_ttl: float = 3.0,
+        settled_ttl: float = 300.0,
+        max_entries: int = 50000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.loader = loader
+        self.pending_ttl = pending_ttl
+        self.settled_ttl = settled_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+
+        # payment_id -> (expires_at or None for final, value)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stale_loads: set = set()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "upstream_loads": 0, "invalidations": 0}
+
+    async def get(self, payment_id: str) -> Dict[str, Any]:
+        """
+        Status for one payment, from cache or a (shared) upstream load
+
+        Loader exceptions propagate to every coalesced caller and are
+        not cached.
+        """
+        entry = self._entries.get(payment_id)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > self.clock():
+                self._entries.move_to_end(payment_id)
+                self._stats["hits"] += 1
+                return value
+            del self._entries[payment_id]
+
+        inflight = self._inflight.get(payment_id)
+        if inflight is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        self._stats["misses"] += 1
+        # The load runs as its own task so one poller disconnecting
+        # doesn't cancel it for everyone else waiting on it
+        task = asyncio.get_running_loop().create_task(self._load(payment_id))
+        self._inflight[payment_id] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, payment_id: str) -> Dict[str, Any]:
+        try:
+            self._stats["upstream_loads"] += 1
+            value = await self.loader(payment_id)
+            # An invalidation during the load means the value may predate the webhook
+            if payment_id not in self._stale_loads:
+                self._store(payment_id, value)
+            return value
+        finally:
+            self._inflight.pop(payment_id, None)
+            self._stale_loads.discard(payment_id)
+
+    def _store(self, payment_id: str, value: Dict[str, Any]):
+        status = value.get("status")
+        if is_final_status(status):
+            expires_at = None
+        elif is_terminal_status(status):
+            expires_at = self.clock() + self.settled_ttl
+        else:
+            expires_at = self.clock() + self.pending_ttl
+        self._entries[payment_id] = (expires_at, value)
+        self._entries.move_to_end(payment_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, payment_id: str):
+        """Drop a cached status (called when a webhook settles the payment)"""
+        self._entries.pop(payment_id, None)
+        if payment_id in self._inflight:
+            self._stale_loads.add(payment_id)
+        self._stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss/coalescing counters"""
+        lookups = self._stats["hits"] + self._stats["misses"] + self._stats["coalesced"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "upstream_ratio": round(self._stats["upstream_loads"] / lookups, 4) if lookups else 0.0
+        }
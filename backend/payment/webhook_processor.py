@@ -0,0 +1,241 @@
+"""
+Payment Webhook Processor
+Acknowledge fast, process asynchronously, exactly once per state change
+
+Request path (handle_webhook):
+    verify signature -> INSERT into webhook_logs (idempotency key) -> 200
+
+Background (worker pool):
+    - events for the same payment_id are coalesced: one verify_payment
+      call settles every event queued for that payment
+    - a payment already in the reported state is not re-written and
+      does not re-trigger side effects (confirmation email)
+    - failures are retried with exponential backoff + jitter; the durable
+      schedule lives in webhook_logs.next_attempt_at, so retries and
+      events orphaned by a crash are picked up by the sweeper
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from metrics.exporter import QUEUE_DEPTH
+from . import PaymentGateway, PaymentStatus
+
+logger = logging.getLogger(__name__)
+
+SuccessCallback = Callable[[Dict[str, Any], str], Awaitable[None]]
+SettledCallback = Callable[[str], None]
+
+
+def webhook_idempotency_key(provider: str, payload: Dict[str, Any], raw_body: bytes) -> str:
+    """
+    Idempotency key for one delivery
+
+    Uses the provider's event id when present; otherwise the SHA-256 of
+    the raw body, so byte-identical retries still collapse.
+    """
+    event_id = payload.get("id")
+    if event_id:
+        return f"{provider}:{event_id}"
+    return f"{provider}:sha256:{hashlib.sha256(raw_body).hexdigest()}"
+
+
+class WebhookProcessor:
+    """Queue-backed webhook ingestion with a coalescing async worker pool"""
+
+    def __init__(
+        self,
+        gateway: PaymentGateway,
+        transactions,
+        webhook_logs,
+        workers: int = 4,
+        max_attempts: int = 8,
+        base_backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        lease_seconds: float = 60.0,
+        sweep_interval: float = 1.0,
+        sweep_batch: int = 100,
+        on_payment_success: Optional[SuccessCallback] = None,
+        on_payment_settled: Optional[SettledCallback] = None
+    ):
+        self.gateway = gateway
+        self.transactions = transactions
+        self.webhook_logs = webhook_logs
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.lease_seconds = lease_seconds
+        self.sweep_interval = sweep_interval
+        self.sweep_batch = sweep_batch
+        self.on_payment_success = on_payment_success
+        self.on_payment_settled = on_payment_settled
+
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._pending: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._inflight: set = set()
+        self._tasks: List[asyncio.Task] = []
+        self._stats = {
+            "received": 0,
+            "duplicates": 0,
+            "coalesced": 0,
+            "processed": 0,
+            "retries": 0,
+            "dead_lettered": 0,
+            "gateway_calls": 0
+        }
+
+    # Lifecycle -----------------------------------------------------------
+
+    def start(self):
+        """Spawn the worker pool and the retry/orphan sweeper"""
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(loop.create_task(self._sweeper()))
+        QUEUE_DEPTH.labels("webhook_payments").set_function(self._queue.qsize)
+        QUEUE_DEPTH.labels("webhook_pending_payments").set_function(lambda: len(self._pending))
+        logger.info(f"Webhook processor started with {self.workers} workers")
+
+    async def stop(self):
+        """Cancel workers; leased events become due again after the lease"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # Request path --------------------------------------------------------
+
+    async def ingest(self, provider: str, payload: Dict[str, Any], signature: str, raw_body: bytes) -> Dict[str, Any]:
+        """
+        Durably enqueue a signature-verified webhook and hand it to the pool
+
+        Raises whatever the durable insert raises; the caller should then
+        answer 5xx so the provider retries delivery.
+        """
+        payment_id = (payload.get("data") or {}).get("id")
+        if not payment_id:
+            raise ValueError("Payment ID not found in webhook")
+
+        webhook_id = webhook_idempotency_key(provider, payload, raw_body)
+        event = await self.webhook_logs.enqueue(
+            webhook_id=webhook_id,
+            provider=provider,
+            event_type=payload.get("type") or "unknown",
+            payment_id=payment_id,
+            payload=payload,
+            signature=signature,
+            lease_seconds=self.lease_seconds
+        )
+
+        self._stats["received"] += 1
+        if event is None:
+            self._stats["duplicates"] += 1
+            return {"webhook_id": webhook_id, "duplicate": True}
+
+        self._dispatch([event])
+        return {"webhook_id": webhook_id, "duplicate": False}
+
+    # Dispatch / coalescing -----------------------------------------------
+
+    def _dispatch(self, events: List[Dict[str, Any]]):
+        for event in events:
+            payment_id = event["payment_id"]
+            bucket = self._pending.get(payment_id)
+            if bucket is None:
+                self._pending[payment_id] = {event["id"]: event}
+                if payment_id not in self._inflight:
+                    self._queue.put_nowait(payment_id)
+            else:
+                bucket[event["id"]] = event
+                self._stats["coalesced"] += 1
+
+    async def _worker(self, index: int):
+        while True:
+            payment_id = await self._queue.get()
+            events = self._pending.pop(payment_id, None)
+            if not events:
+                continue
+
+            self._inflight.add(payment_id)
+            try:
+                await self._process(payment_id, list(events.values()))
+            except Exception as e:
+                logger.error(f"Webhook worker {index} error for payment {payment_id}: {e}")
+            finally:
+                self._inflight.discard(payment_id)
+                # Events that arrived while we were busy: run once more
+                if payment_id in self._pending:
+                    self._queue.put_nowait(payment_id)
+
+    async def _process(self, payment_id: str, events: List[Dict[str, Any]]):
+        ids = [event["id"] for event in events]
+        try:
+            self._stats["gateway_calls"] += 1
+            payment_response = await self.gateway.verify_payment(payment_id)
+            if not payment_response.success:
+                raise RuntimeError(payment_response.error or "Payment verification failed")
+
+            new_status = payment_response.status.value
+            existing = await self.transactions.get_transaction(payment_id)
+            if existing is None or existing["status"] != new_status:
+                result = await self.transactions.update_transaction_status(
+                    payment_id=payment_id,
+                    status=new_status,
+                    metadata=payment_response.metadata
+                )
+                if not result.get("success"):
+                    raise RuntimeError(result.get("error") or "Transaction update failed")
+
+                if payment_response.status == PaymentStatus.SUCCESS and self.on_payment_success:
+                    latest = max(events, key=lambda event: event["id"])
+                    await self.on_payment_success(latest["payload"], payment_id)
+
+            await self.webhook_logs.mark_processed(ids)
+            if self.on_payment_settled:
+                self.on_payment_settled(payment_id)
+            self._stats["processed"] += len(ids)
+            logger.info(f"Webhook processed for payment {payment_id} ({len(ids)} event(s) coalesced)")
+
+        except Exception as e:
+            attempts = max(event["attempts"] for event in events) + 1
+            if attempts >= self.max_attempts:
+                await self.webhook_logs.schedule_retry(ids, str(e), None)
+                self._stats["dead_lettered"] += len(ids)
+                logger.error(f"Webhook for payment {payment_id} dead-lettered after {attempts} attempts: {e}")
+            else:
+                delay = self.backoff_delay(attempts)
+                await self.webhook_logs.schedule_retry(ids, str(e), delay)
+                self._stats["retries"] += len(ids)
+                logger.warning(f"Webhook for payment {payment_id} failed (attempt {attempts}), retry in {delay:.1f}s: {e}")
+
+    def backoff_delay(self, attempts: int) -> float:
+        """Equal-jitter exponential backoff: uniform in [ceiling / 2, ceiling], never an immediate retry"""
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** attempts))
+        return random.uniform(ceiling / 2, ceiling)
+
+    async def _sweeper(self):
+        while True:
+            try:
+                due = await self.webhook_logs.claim_due(self.sweep_batch, self.lease_seconds)
+                if due:
+                    self._dispatch(due)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Webhook sweeper error: {e}")
+            await asyncio.sleep(self.sweep_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """In-process counters and queue depth"""
+        return {
+            **self._stats,
+            "queue_depth": self._queue.qsize(),
+            "pending_payments": len(self._pending),
+            "inflight_payments": len(self._inflight),
+            "workers": self.workers
+        }
@@ -15,6 +15,7 @@ from datetime import datetime
 import pytz
 
 from backend.security.zero_day_protection import get_zero_day_protection, SecurityEvent
+from metrics.exporter import SECURITY_ANALYSIS_DURATION
 
 # Saudi Time Zone
 RIYADH_TZ = pytz.timezone('Asia/Riyadh')
@@ -59,7 +60,11 @@ class ZeroDayProtectionMiddleware(BaseHTTPMiddleware):
         self.protection_system.track_request(request_data['source_ip'])
         
         # Analyze request for threats
+        analysis_started = time.perf_counter()
         security_event = await self.protection_system.analyze_request(request_data)
+        SECURITY_ANALYSIS_DURATION.labels("blocked" if security_event.blocked else "allowed").observe(
+            time.perf_counter() - analysis_started
+        )
         
         # Log security event
         self._log_request_analysis(request_data, security_event)
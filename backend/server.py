@@ -24,10 +24,17 @@ from api.osint import router as osint_router
 from api.vault import router as vault_router
 from api.groq import router as groq_router
 from api.billing import router as billing_router
+from api.metrics import router as metrics_router
 from health.comprehensive_health import get_health_router
+from health.engine import get_health_engine
+from health.resource_sampler import get_resource_sampler
+from health.timeseries_store import get_timeseries_store
+from services.database import close_database_service
 
 # Import security middleware
 from security.zero_day_middleware import ZeroDayProtectionMiddleware
+from metrics.middleware import MetricsMiddleware
+from metrics.loop_monitor import LoopMonitorMiddleware, get_loop_monitor
 
 # Configure logging
 logging.basicConfig(
@@ -45,6 +52,9 @@ app = FastAPI(
     redoc_url="/api/redoc"
 )
 
+# Event loop blocking attribution (innermost, so it runs in the endpoint's task)
+app.add_middleware(LoopMonitorMiddleware)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -57,6 +67,9 @@ app.add_middleware(
 # Zero-Day Protection Middleware
 app.add_middleware(ZeroDayProtectionMiddleware)
 
+# Request metrics (outermost, so it times the whole stack)
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(health_router, tags=["Health"])
 app.include_router(get_health_router(), tags=["Comprehensive Health"])
@@ -68,6 +81,7 @@ app.include_router(osint_router, tags=["OSINT Safety Radar"])
 app.include_router(vault_router, tags=["Forensic Vault"])
 app.include_router(groq_router, tags=["Groq Fast Inference"])
 app.include_router(billing_router, tags=["Billing"])
+app.include_router(metrics_router, tags=["Metrics"])
 
 # Root endpoint
 @app.get("/")
@@ -102,6 +116,8 @@ async def startup_event():
     
     try:
         # Lazy load services to avoid startup failures
+        get_resource_sampler().start()
+        get_loop_monitor().start()
         logger.info("✅ FLUX-DNA API Gateway initialized")
         logger.info("🚀 THE PHOENIX HAS ASCENDED")
         logger.info("👁️  THE GUARDIAN IS WATCHING")
@@ -115,4 +131,9 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    await get_resource_sampler().stop()
+    await get_loop_monitor().stop()
+    await close_database_service()
+    get_health_engine().close()
+    get_timeseries_store().close()
     logger.info("🌙 The Phoenix rests...")
@@ -24,6 +24,8 @@ from reportlab.lib.colors import HexColor
 from reportlab.graphics.shapes import Drawing, Polygon, Line, Circle, String
 from reportlab.graphics import renderPDF
 
+from metrics.exporter import CERTIFICATE_RENDER_DURATION
+
 # ============================================================================
 # COLOR PALETTE - BREATHING EMERALD AESTHETIC
 # ============================================================================
@@ -363,6 +365,7 @@ class SovereignCertificateEngine:
         c.setFont("Helvetica", 7)
         c.drawString(x, y, f"Generated: {timestamp}")
     
+    @CERTIFICATE_RENDER_DURATION.time()
     def generate_certificate(
         self,
         session_id: str,
@@ -6,6 +6,7 @@ import os
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
 import asyncio
+import time
 
 # Load environment variables
 load_dotenv()
@@ -13,6 +14,8 @@ load_dotenv()
 # Import emergentintegrations
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 
+from metrics.exporter import LLM_REQUEST_DURATION
+
 
 class ClaudeService:
     """
@@ -24,6 +27,8 @@ class ClaudeService:
         self.api_key = os.environ.get('EMERGENT_LLM_KEY')
         if not self.api_key:
             raise ValueError("EMERGENT_LLM_KEY not found in environment")
+        self.provider = "anthropic"
+        self.model = "claude-4-sonnet-20250514"
     
     def _get_al_hakim_system_prompt(self, language: str = 'en') -> str:
         """
@@ -138,7 +143,7 @@ Your tone: Firm, protective, wise - like a clan matriarch with the authority of
         )
         
         # Use Claude 4 Sonnet (latest as of 2026)
-        chat.with_model("anthropic", "claude-4-sonnet-20250514")
+        chat.with_model(self.provider, self.model)
         
         return chat
     
@@ -158,7 +163,13 @@ Your tone: Firm, protective, wise - like a clan matriarch with the authority of
             Claude's response
         """
         message = UserMessage(text=user_message)
-        response = await chat.send_message(message)
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await chat.send_message(message)
+            outcome = "ok"
+        finally:
+            LLM_REQUEST_DURATION.labels(self.provider, self.model, outcome).observe(time.perf_counter() - started)
         return response
     
     async def analyze_stability(
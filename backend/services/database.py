@@ -1,102 +1,330 @@
 """
 FLUX-DNA Supabase Database Service
 The Neural Fortress
+
+Async data access to the Supabase Postgres over asyncpg:
+
+- one connection pool per process, opened on first use and tuned from env
+- fixed query texts so asyncpg's per-connection prepared statement cache
+  serves every call after the first on a connection
+- bulk APIs: COPY for inserts without results, one pipelined executemany
+  per batch of founder events, and array (= ANY) lookups instead of a
+  round trip per key
+- founder analytics events are buffered and flushed in batches by a
+  background task (size- or interval-triggered), off the request path
+- health_check results are cached briefly and concurrent callers share
+  one probe query
 """
+import asyncio
+import json
+import logging
 import os
-from typing import Optional
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Iterable, Optional, Sequence, Tuple
+
+import asyncpg
 from dotenv import load_dotenv
-from supabase import create_client, Client
+
+from metrics.exporter import QUEUE_DEPTH
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+_INSERT_USER = """
+    INSERT INTO users (email, preferred_language) VALUES ($1, $2) RETURNING *
+"""
+
+_SELECT_USER_BY_EMAIL = """
+    SELECT * FROM users WHERE email = $1 LIMIT 1
+"""
+
+_SELECT_USERS_BY_EMAIL = """
+    SELECT * FROM users WHERE email = ANY($1::text[])
+"""
+
+_INSERT_ASSESSMENT_SESSION = """
+    INSERT INTO assessment_sessions (user_id, language, persona_used, session_status)
+    VALUES ($1, $2, $3, 'in_progress') RETURNING *
+"""
+
+_INSERT_FOUNDER_EVENT = """
+    INSERT INTO founder_analytics (event_type, event_metadata) VALUES ($1, $2)
+"""
+
+_HEALTH_CHECK = "SELECT 1"
+
+# Tables accepting bulk COPY / dict inserts, and their insertable columns
+_TABLE_COLUMNS = {
+    "users": ("email", "preferred_language"),
+    "assessment_sessions": ("user_id", "language", "persona_used", "session_status"),
+    "time_gate_links": ("link_token", "user_id", "session_id", "link_type", "created_at", "expires_at",
+                        "max_clicks", "current_clicks", "is_active", "deactivation_reason"),
+    "forensic_vault": ("evidence_id", "user_id", "created_at", "evidence_type", "risk_level",
+                       "exif_stripped", "content_hash", "record"),
+    "founder_analytics": ("event_type", "event_metadata"),
+}
+
+
+async def _init_connection(conn):
+    """Per-connection setup: JSON/JSONB in and out as Python objects"""
+    for json_type in ("json", "jsonb"):
+        await conn.set_type_codec(json_type, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+def _insert_query(table: str, columns: Sequence[str]) -> str:
+    if table not in _TABLE_COLUMNS:
+        raise ValueError(f"Unknown table: {table}")
+    unknown = [c for c in columns if c not in _TABLE_COLUMNS[table]]
+    if unknown:
+        raise ValueError(f"Unknown columns for {table}: {unknown}")
+    placeholders = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) RETURNING *"
+
 
 class DatabaseService:
     """
     Supabase database service
     PostgreSQL + pgvector for Neural Signatures
     """
-    
-    def __init__(self):
-        url = os.environ.get('SUPABASE_URL')
-        service_key = os.environ.get('SUPABASE_SERVICE_KEY')  # Use service key for backend
-        
-        if not url or not service_key:
+
+    def __init__(self, pool=None):
+        self.database_url = os.environ.get('SUPABASE_DB_URL') or os.environ.get('DATABASE_URL')
+
+        if pool is None and not self.database_url:
             raise ValueError(
-                "SUPABASE_URL and SUPABASE_SERVICE_KEY required. "
-                "Please set up Supabase project and provide credentials."
+                "SUPABASE_DB_URL (or DATABASE_URL) required. DatabaseService now connects to "
+                "Postgres directly over asyncpg, so SUPABASE_URL / SUPABASE_SERVICE_KEY alone are "
+                "no longer enough: set SUPABASE_DB_URL to the connection string (URI) from "
+                "Supabase -> Project Settings -> Database."
             )
-        
-        self.client: Client = create_client(url, service_key)
-        self.url = url
-    
-    def get_client(self) -> Client:
-        """Get Supabase client"""
-        return self.client
-    
+
+        self.pool = pool
+        self.pool_config = {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+            "max_inactive_connection_lifetime": float(os.environ.get("DB_POOL_MAX_IDLE_SECONDS", "300")),
+            "command_timeout": float(os.environ.get("DB_COMMAND_TIMEOUT", "10")),
+            "statement_cache_size": int(os.environ.get("DB_STATEMENT_CACHE_SIZE", "256")),
+        }
+        self.health_ttl = float(os.environ.get("DB_HEALTH_CHECK_TTL", "5"))
+        self.event_batch_size = int(os.environ.get("FOUNDER_EVENT_BATCH_SIZE", "100"))
+        self.event_flush_interval = float(os.environ.get("FOUNDER_EVENT_FLUSH_INTERVAL", "1.0"))
+        self.event_buffer_limit = int(os.environ.get("FOUNDER_EVENT_BUFFER_LIMIT", "10000"))
+
+        self._pool_lock: Optional[asyncio.Lock] = None
+        self._health: Optional[Tuple[float, bool]] = None
+        self._health_probe: Optional[asyncio.Future] = None
+        self._events: Deque[Tuple[str, dict]] = deque()
+        self._events_ready: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self.stats = {"events_buffered": 0, "events_written": 0, "events_dropped": 0,
+                      "event_flushes": 0, "health_checks": 0, "health_cache_hits": 0}
+
+    # Pool ----------------------------------------------------------------
+
+    async def initialize(self):
+        """Open the connection pool (otherwise opened on first use)"""
+        if self.pool is not None:
+            return
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+        async with self._pool_lock:
+            if self.pool is None:
+                self.pool = await asyncpg.create_pool(self.database_url, init=_init_connection, **self.pool_config)
+                logger.info(
+                    f"Supabase database pool opened "
+                    f"({self.pool_config['min_size']}-{self.pool_config['max_size']})"
+                )
+
+    @asynccontextmanager
+    async def _connection(self):
+        await self.initialize()
+        async with self.pool.acquire() as conn:
+            yield conn
+
+    async def close(self):
+        """Flush buffered events, stop the flusher and close the pool"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush_founder_events()
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+            logger.info("Supabase database pool closed")
+
     async def health_check(self) -> bool:
         """
         Check database connection health
+
+        Cached for DB_HEALTH_CHECK_TTL seconds; concurrent callers share
+        the probe in flight.
         """
+        now = time.monotonic()
+        if self._health is not None and now - self._health[0] < self.health_ttl:
+            self.stats["health_cache_hits"] += 1
+            return self._health[1]
+        if self._health_probe is not None:
+            self.stats["health_cache_hits"] += 1
+            return await asyncio.shield(self._health_probe)
+
+        probe = self._health_probe = asyncio.get_running_loop().create_future()
+        self.stats["health_checks"] += 1
+        healthy = False
         try:
-            # Simple query to test connection
-            result = self.client.table('users').select('id').limit(1).execute()
-            return True
+            async with self._connection() as conn:
+                await conn.fetchval(_HEALTH_CHECK)
+            healthy = True
         except Exception as e:
-            print(f"Database health check failed: {e}")
-            return False
-    
-    # User operations
+            logger.error(f"Database health check failed: {e}")
+        finally:
+            self._health = (time.monotonic(), healthy)
+            self._health_probe = None
+            probe.set_result(healthy)
+        return healthy
+
+    # User operations -----------------------------------------------------
+
     async def create_user(self, email: str, language: str = 'en') -> dict:
         """Create new user"""
-        data = {
-            'email': email,
-            'preferred_language': language
-        }
-        result = self.client.table('users').insert(data).execute()
-        return result.data[0] if result.data else None
-    
+        async with self._connection() as conn:
+            row = await conn.fetchrow(_INSERT_USER, email, language)
+        return dict(row) if row else None
+
     async def get_user_by_email(self, email: str) -> Optional[dict]:
         """Get user by email"""
-        result = self.client.table('users').select('*').eq('email', email).execute()
-        return result.data[0] if result.data else None
-    
-    # Assessment operations
+        async with self._connection() as conn:
+            row = await conn.fetchrow(_SELECT_USER_BY_EMAIL, email)
+        return dict(row) if row else None
+
+    async def get_users_by_email(self, emails: Iterable[str]) -> Dict[str, dict]:
+        """Get many users in one round trip, keyed by email"""
+        emails = list(dict.fromkeys(emails))
+        if not emails:
+            return {}
+        async with self._connection() as conn:
+            rows = await conn.fetch(_SELECT_USERS_BY_EMAIL, emails)
+        return {row["email"]: dict(row) for row in rows}
+
+    # Assessment operations -----------------------------------------------
+
     async def create_assessment_session(self, user_id: str, language: str, persona: str) -> dict:
         """Create new assessment session"""
-        data = {
-            'user_id': user_id,
-            'language': language,
-            'persona_used': persona,
-            'session_status': 'in_progress'
-        }
-        result = self.client.table('assessment_sessions').insert(data).execute()
-        return result.data[0] if result.data else None
-    
-    # Time-gate operations
+        async with self._connection() as conn:
+            row = await conn.fetchrow(_INSERT_ASSESSMENT_SESSION, user_id, language, persona)
+        return dict(row) if row else None
+
+    # Time-gate operations ------------------------------------------------
+
     async def store_time_gate_link(self, link_data: dict) -> dict:
         """Store time-gate link metadata in database"""
-        result = self.client.table('time_gate_links').insert(link_data).execute()
-        return result.data[0] if result.data else None
-    
-    # Forensic vault operations
+        return await self._insert_row("time_gate_links", link_data)
+
+    # Forensic vault operations -------------------------------------------
+
     async def store_evidence(self, user_id: str, evidence_data: dict) -> dict:
         """Store encrypted evidence in forensic vault"""
-        data = {
-            'user_id': user_id,
-            **evidence_data
-        }
-        result = self.client.table('forensic_vault').insert(data).execute()
-        return result.data[0] if result.data else None
-    
-    # Analytics operations
+        return await self._insert_row("forensic_vault", {'user_id': user_id, **evidence_data})
+
+    async def _insert_row(self, table: str, data: dict) -> dict:
+        columns = list(data)
+        async with self._connection() as conn:
+            row = await conn.fetchrow(_insert_query(table, columns), *data.values())
+        return dict(row) if row else None
+
+    # Bulk operations -----------------------------------------------------
+
+    async def bulk_insert(self, table: str, rows: Sequence[dict]) -> int:
+        """
+        Insert many rows with one COPY (no per-row results)
+
+        Every row must have the same keys. Returns the number of rows copied.
+        """
+        if not rows:
+            return 0
+        columns = list(rows[0])
+        _insert_query(table, columns)  # validates table and columns
+        records = [tuple(row[c] for c in columns) for row in rows]
+        async with self._connection() as conn:
+            await conn.copy_records_to_table(table, records=records, columns=columns)
+        return len(records)
+
+    # Analytics operations ------------------------------------------------
+
     async def log_founder_event(self, event_type: str, metadata: dict) -> dict:
-        """Log event for founder analytics"""
-        data = {
-            'event_type': event_type,
-            'event_metadata': metadata
+        """
+        Log event for founder analytics
+
+        Buffered: the event is written by the next batch flush, so the
+        caller never waits on the database. When the buffer is full the
+        oldest events are dropped.
+        """
+        if len(self._events) >= self.event_buffer_limit:
+            self._events.popleft()
+            self.stats["events_dropped"] += 1
+        self._events.append((event_type, metadata))
+        self.stats["events_buffered"] += 1
+        self._ensure_flusher()
+        if len(self._events) >= self.event_batch_size:
+            self._events_ready.set()
+        return {'event_type': event_type, 'event_metadata': metadata, 'queued': True}
+
+    async def log_founder_events(self, events: Iterable[Tuple[str, dict]]) -> int:
+        """Write founder events now, as one pipelined batch"""
+        events = list(events)
+        if not events:
+            return 0
+        async with self._connection() as conn:
+            await conn.executemany(_INSERT_FOUNDER_EVENT, events)
+        self.stats["events_written"] += len(events)
+        return len(events)
+
+    async def flush_founder_events(self) -> int:
+        """Write every buffered event; on failure the batch is put back for the next flush"""
+        written = 0
+        while self._events:
+            batch = [self._events.popleft() for _ in range(min(self.event_batch_size, len(self._events)))]
+            try:
+                written += await self.log_founder_events(batch)
+            except Exception as e:
+                room = max(0, self.event_buffer_limit - len(self._events))
+                kept = batch[-room:] if room else []
+                self._events.extendleft(reversed(kept))
+                self.stats["events_dropped"] += len(batch) - len(kept)
+                logger.error(f"Founder event flush failed ({len(batch)} events): {e}")
+                break
+            self.stats["event_flushes"] += 1
+        return written
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and not self._flusher.done():
+            return
+        self._events_ready = asyncio.Event()
+        self._flusher = asyncio.get_running_loop().create_task(self._flush_loop())
+        QUEUE_DEPTH.labels("founder_events").set_function(lambda: len(self._events))
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._events_ready.wait(), timeout=self.event_flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._events_ready.clear()
+            await self.flush_founder_events()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool, event buffer and health cache counters"""
+        pool = self.pool
+        return {
+            **self.stats,
+            "events_pending": len(self._events),
+            "pool_size": pool.get_size() if pool is not None and hasattr(pool, "get_size") else 0,
+            "pool_idle": pool.get_idle_size() if pool is not None and hasattr(pool, "get_idle_size") else 0,
         }
-        result = self.client.table('founder_analytics').insert(data).execute()
-        return result.data[0] if result.data else None
 
 
 # Singleton instance
@@ -108,3 +336,9 @@ def get_database_service() -> DatabaseService:
     if _database_service is None:
         _database_service = DatabaseService()
     return _database_service
+
+
+async def close_database_service():
+    """Flush and close the singleton, if it was ever created"""
+    if _database_service is not None:
+        await _database_service.close()
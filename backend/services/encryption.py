@@ -11,6 +11,8 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
 import secrets
 
+from metrics.exporter import ENCRYPTION_DURATION
+
 
 class EncryptionService:
     """
@@ -25,6 +27,7 @@ class EncryptionService:
             raise ValueError("ENCRYPTION_MASTER_KEY must be 64 hex characters (32 bytes)")
         self.master_key = bytes.fromhex(master_key_hex)
     
+    @ENCRYPTION_DURATION.labels("derive_key").time()
     def derive_user_key(self, user_id: str, salt: bytes = None) -> Tuple[bytes, bytes]:
         """
         Derive a user-specific encryption key using PBKDF2
@@ -53,6 +56,7 @@ class EncryptionService:
         
         return derived_key, salt
     
+    @ENCRYPTION_DURATION.labels("encrypt").time()
     def encrypt(self, plaintext: str, user_id: str) -> str:
         """
         Encrypt data with user-specific key
@@ -88,6 +92,7 @@ class EncryptionService:
         
         return f"{iv_b64}:{tag_b64}:{salt_b64}:{ciphertext_b64}"
     
+    @ENCRYPTION_DURATION.labels("decrypt").time()
     def decrypt(self, encrypted_data: str, user_id: str) -> str:
         """
         Decrypt data with user-specific key
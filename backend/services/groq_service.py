@@ -11,6 +11,8 @@ from dotenv import load_dotenv
 import asyncio
 from datetime import datetime, timezone
 
+from metrics.exporter import LLM_REQUEST_DURATION, LLM_TOKENS
+
 try:
     from groq import Groq
 except ImportError:
@@ -76,6 +78,10 @@ class GroqService:
             
             end_time = datetime.now(timezone.utc)
             inference_time = (end_time - start_time).total_seconds()
+            LLM_REQUEST_DURATION.labels("groq", model_to_use, "ok").observe(inference_time)
+            if not stream and completion.usage:
+                LLM_TOKENS.labels("groq", model_to_use, "prompt").inc(completion.usage.prompt_tokens)
+                LLM_TOKENS.labels("groq", model_to_use, "completion").inc(completion.usage.completion_tokens)
             
             if stream:
                 return {
@@ -101,6 +107,9 @@ class GroqService:
                 }
                 
         except Exception as e:
+            LLM_REQUEST_DURATION.labels("groq", model or self.model, "error").observe(
+                (datetime.now(timezone.utc) - start_time).total_seconds()
+            )
             return {
                 "success": False,
                 "error": str(e),
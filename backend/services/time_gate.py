@@ -11,9 +11,26 @@ import json
 import uuid
 import requests
 
+from metrics.exporter import TIME_GATE_REDIS_DURATION
+
 load_dotenv()
 
 
+class _TimedRedis:
+    """Redis client proxy observing each command's round trip"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+        timed = TIME_GATE_REDIS_DURATION.labels("redis", name).time()(attr)
+        setattr(self, name, timed)  # resolve each command once
+        return timed
+
+
 class TimeGateService:
     """
     The Time-Gate: 24-Hour / 3-Click Self-Destruct Links
@@ -42,11 +59,11 @@ class TimeGateService:
             self.mode = 'redis'
             try:
                 import redis
-                self.redis_client = redis.from_url(
+                self.redis_client = _TimedRedis(redis.from_url(
                     redis_url,
                     password=redis_token if redis_token else None,
                     decode_responses=True
-                )
+                ))
                 self.redis_client.ping()
                 print("✅ Time-Gate: Using Redis protocol")
             except ImportError:
@@ -57,6 +74,7 @@ class TimeGateService:
                 "UPSTASH_REDIS_URL required for Time-Gate security"
             )
     
+    @TIME_GATE_REDIS_DURATION.labels("rest", "set").time()
     def _rest_set(self, key: str, value: str, ex: int):
         """Set key with expiration using REST API"""
         # Upstash REST API format: POST /set/key with body
@@ -75,6 +93,7 @@ class TimeGateService:
         
         return result
     
+    @TIME_GATE_REDIS_DURATION.labels("rest", "get").time()
     def _rest_get(self, key: str):
         """Get key using REST API"""
         response = requests.get(
@@ -84,6 +103,7 @@ class TimeGateService:
         result = response.json()
         return result.get('result')
     
+    @TIME_GATE_REDIS_DURATION.labels("rest", "ttl").time()
     def _rest_ttl(self, key: str):
         """Get TTL using REST API"""
         response = requests.get(
@@ -93,6 +113,7 @@ class TimeGateService:
         result = response.json()
         return result.get('result', -1)
     
+    @TIME_GATE_REDIS_DURATION.labels("rest", "del").time()
     def _rest_delete(self, key: str):
         """Delete key using REST API"""
         response = requests.post(
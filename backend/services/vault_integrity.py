@@ -0,0 +1,396 @@
+"""
+FLUX-DNA Forensic Vault Integrity Service
+Verifiable chain of custody for the Evidence Sanctuary
+
+Three independent checks back every integrity verdict:
+1. Content:  the stored blob is re-hashed (streamed) and compared to the
+             content_hash recorded at submission
+2. Custody:  the per-item custody log is an append-only hash chain;
+             editing, reordering or dropping an entry breaks it
+3. Merkle:   all evidence of one UTC day forms a Merkle tree; an item is
+             proven to belong to that day's root with an O(log n) proof.
+             Once a day has closed its root is sealed in the store
+             (append-only, one seal per period version) and later
+             rebuilds must reproduce it: a content_hash edited in place
+             doesn't bump the version, so it shows up as a root that
+             changed since the seal
+
+Full-vault audits run as background jobs that re-hash blobs on a thread
+pool (hashlib releases the GIL), seal and check every closed day they
+visit, and report throughput in items/sec. One audit runs at a time and
+only the most recent finished jobs are kept.
+"""
+import os
+import time
+import uuid
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from services.vault_store import (
+    BLOB_CHUNK_SIZE,
+    GENESIS_HASH,
+    VaultStore,
+    custody_entry_hash,
+    get_vault_store,
+    period_of,
+)
+
+logger = logging.getLogger(__name__)
+
+AUDIT_PAGE_SIZE = 200
+MAX_AUDIT_WORKERS = os.cpu_count() or 1
+DEFAULT_AUDIT_WORKERS = min(4, MAX_AUDIT_WORKERS)
+# Finished audit jobs kept for GET /audit/{job_id}; older ones are evicted
+MAX_FINISHED_AUDITS = 20
+
+
+def merkle_leaf(evidence_id: str, content_hash: str) -> bytes:
+    """Leaf hash; the 0x00 prefix separates leaves from interior nodes"""
+    return hashlib.sha256(b'\x00' + f"{evidence_id}:{content_hash}".encode('utf-8')).digest()
+
+
+def _merkle_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b'\x01' + left + right).digest()
+
+
+class MerkleTree:
+    """
+    Binary Merkle tree over an ordered list of leaf hashes
+
+    An odd node at the end of a level is promoted unchanged, so proofs
+    are at most ceil(log2(n)) steps long.
+    """
+
+    def __init__(self, leaves: List[bytes]):
+        self.levels: List[List[bytes]] = [list(leaves)]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [_merkle_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @property
+    def leaf_count(self) -> int:
+        return len(self.levels[0])
+
+    @property
+    def root(self) -> str:
+        if not self.levels[0]:
+            return hashlib.sha256(b'').hexdigest()
+        return self.levels[-1][0].hex()
+
+    def proof(self, index: int) -> List[Tuple[str, str]]:
+        """Sibling path for leaf `index` as [(side, hex_hash), ...], leaf to root"""
+        path = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append(("left" if sibling < index else "right", level[sibling].hex()))
+            index //= 2
+        return path
+
+    @staticmethod
+    def verify_proof(leaf: bytes, proof: List[Tuple[str, str]], root: str) -> bool:
+        """Recompute the root from a leaf and its proof"""
+        node = leaf
+        for side, sibling_hex in proof:
+            sibling = bytes.fromhex(sibling_hex)
+            node = _merkle_node(sibling, node) if side == "left" else _merkle_node(node, sibling)
+        return node.hex() == root
+
+
+def verify_custody_chain(entries: List[Dict]) -> Dict:
+    """
+    Walk a custody log and check every link
+
+    Returns:
+        {'verified': bool, 'length': int, 'broken_at': seq | None}
+    """
+    prev_hash = GENESIS_HASH
+    for expected_seq, entry in enumerate(entries):
+        if (
+            entry["seq"] != expected_seq
+            or entry["prev_hash"] != prev_hash
+            or custody_entry_hash(prev_hash, entry) != entry["entry_hash"]
+        ):
+            return {"verified": False, "length": len(entries), "broken_at": entry["seq"]}
+        prev_hash = entry["entry_hash"]
+
+    return {"verified": bool(entries), "length": len(entries), "broken_at": None}
+
+
+def rehash_blob(store: VaultStore, evidence_id: str, chunk_size: int = BLOB_CHUNK_SIZE) -> Optional[str]:
+    """Stream a stored blob through SHA-256; None if the blob is missing"""
+    digest = hashlib.sha256()
+    found = False
+    for chunk in store.read_blob_chunks(evidence_id, chunk_size):
+        digest.update(chunk)
+        found = True
+    return digest.hexdigest() if found else None
+
+
+def period_closed(period: str) -> bool:
+    """A period can be sealed once its UTC day is over"""
+    return period < datetime.now(timezone.utc).date().isoformat()
+
+
+class VaultIntegrityService:
+    """
+    Content, custody and Merkle verification over a VaultStore
+
+    Period trees are cached per process and keyed by the store's period
+    version, together with their seal check, so repeated verifications
+    within a day cost one version lookup plus an O(log n) proof.
+    """
+
+    def __init__(self, store: VaultStore):
+        self.store = store
+        self._trees: Dict[str, Tuple[int, MerkleTree, Dict[str, int], Dict]] = {}
+        self._tree_locks: Dict[str, asyncio.Lock] = {}
+        self._audits: "OrderedDict[str, Dict]" = OrderedDict()
+        self._running_audit: Optional[str] = None
+
+    async def get_period_tree(self, period: str) -> Tuple[MerkleTree, Dict[str, int], Dict]:
+        """Merkle tree, evidence_id -> leaf index and seal check for one period"""
+        version = await self.store.period_version(period)
+        cached = self._trees.get(period)
+        if cached and cached[0] == version:
+            return cached[1:]
+
+        lock = self._tree_locks.setdefault(period, asyncio.Lock())
+        async with lock:
+            cached = self._trees.get(period)
+            if cached and cached[0] == version:
+                return cached[1:]
+
+            # Leaves and version are read separately: rebuild until a write
+            # didn't land in between, so a seal never mislabels its version
+            while True:
+                leaves = await self.store.period_leaves(period)
+                current = await self.store.period_version(period)
+                if current == version:
+                    break
+                version = current
+            tree = await asyncio.to_thread(MerkleTree, [merkle_leaf(eid, h) for eid, h in leaves])
+            index = {eid: i for i, (eid, _) in enumerate(leaves)}
+            seal = await self._check_seal(period, version, tree)
+            self._trees[period] = (version, tree, index, seal)
+            return tree, index, seal
+
+    async def _check_seal(self, period: str, version: int, tree: MerkleTree) -> Dict:
+        """
+        Seal a closed period's root on first build and compare later builds
+
+        A write through the store bumps the period version and is sealed
+        anew; the same version with a different root means the leaves
+        were changed behind the store's back.
+        """
+        if not period_closed(period):
+            return {"sealed": False, "root_changed_since_seal": False}
+
+        seal = await self.store.get_seal(period)
+        if seal is None or seal["version"] < version:
+            seal = await self.store.add_seal({
+                "period": period,
+                "version": version,
+                "root": tree.root,
+                "leaf_count": tree.leaf_count,
+                "sealed_at": datetime.now(timezone.utc).isoformat()
+            })
+
+        changed = seal["version"] != version or seal["root"] != tree.root
+        if changed:
+            logger.error(f"Vault period {period}: Merkle root changed since seal at {seal['sealed_at']}")
+        return {
+            "sealed": True,
+            "sealed_root": seal["root"],
+            "sealed_leaf_count": seal["leaf_count"],
+            "sealed_version": seal["version"],
+            "sealed_at": seal["sealed_at"],
+            "root_changed_since_seal": changed
+        }
+
+    async def _merkle_check(self, evidence_id: str, created_at: str, content_hash: str) -> Dict:
+        period = period_of(created_at)
+        tree, index, seal = await self.get_period_tree(period)
+        result = {"period": period, "root": tree.root, "leaf_count": tree.leaf_count, "seal": seal}
+        position = index.get(evidence_id)
+        if position is None:
+            return {**result, "verified": False}
+
+        proof = tree.proof(position)
+        proven = MerkleTree.verify_proof(merkle_leaf(evidence_id, content_hash), proof, tree.root)
+        return {
+            **result,
+            "leaf_index": position,
+            "proof": proof,
+            "verified": proven and not seal["root_changed_since_seal"]
+        }
+
+    async def verify_item(self, evidence_id: str) -> Optional[Dict]:
+        """Full verification of one evidence item; None if it doesn't exist"""
+        record = await self.store.get(evidence_id)
+        if record is None:
+            return None
+
+        recomputed = await asyncio.to_thread(rehash_blob, self.store, evidence_id)
+        custody = await self.store.get_custody(evidence_id)
+        chain = verify_custody_chain(custody)
+        merkle = await self._merkle_check(evidence_id, record["created_at"], record["content_hash"])
+        content_verified = recomputed == record["content_hash"]
+
+        return {
+            "evidence_id": evidence_id,
+            "user_id": record["user_id"],
+            "integrity_verified": content_verified and chain["verified"] and merkle["verified"],
+            "content_verified": content_verified,
+            "content_hash": record["content_hash"],
+            "custody_chain": chain,
+            "chain_of_custody": custody,
+            "merkle": merkle
+        }
+
+    async def verify_user(self, user_id: str) -> Dict:
+        """Verify every item in one user's vault; reports items/sec"""
+        started = time.perf_counter()
+        verified, failed = 0, []
+        cursor = None
+
+        while True:
+            page = await self.store.list_by_user(user_id, limit=AUDIT_PAGE_SIZE, cursor=cursor)
+            results = await asyncio.gather(
+                *(self.verify_item(item["evidence_id"]) for item in page["items"])
+            )
+            for result in results:
+                if result is None:
+                    continue
+                if result["integrity_verified"]:
+                    verified += 1
+                else:
+                    failed.append(result["evidence_id"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        elapsed = time.perf_counter() - started
+        total = verified + len(failed)
+        return {
+            "user_id": user_id,
+            "items_checked": total,
+            "items_verified": verified,
+            "failed_evidence_ids": failed,
+            "integrity_verified": not failed,
+            "elapsed_seconds": round(elapsed, 4),
+            "items_per_sec": round(total / elapsed, 2) if elapsed > 0 else None
+        }
+
+    def start_audit(self, workers: int = DEFAULT_AUDIT_WORKERS) -> Dict:
+        """
+        Launch a full-vault re-hash audit as a background task
+
+        Only one audit runs at a time: while one is running its job is
+        returned instead of starting another.
+        """
+        if self._running_audit is not None:
+            return self.get_audit(self._running_audit)
+
+        job_id = str(uuid.uuid4())
+        job = {
+            "job_id": job_id,
+            "status": "running",
+            "workers": max(1, min(workers, MAX_AUDIT_WORKERS)),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "completed_at": None,
+            "items_checked": 0,
+            "items_verified": 0,
+            "missing_blobs": [],
+            "hash_mismatches": [],
+            "period_roots": {},
+            "changed_periods": [],
+            "items_per_sec": 0.0,
+            "error": None
+        }
+        self._audits[job_id] = job
+        self._running_audit = job_id
+        job["_task"] = asyncio.get_running_loop().create_task(self._run_audit(job))
+        return self.get_audit(job_id)
+
+    def get_audit(self, job_id: str) -> Optional[Dict]:
+        """Public view of an audit job"""
+        job = self._audits.get(job_id)
+        if job is None:
+            return None
+        return {k: v for k, v in job.items() if not k.startswith("_")}
+
+    async def _run_audit(self, job: Dict):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        periods = set()
+
+        try:
+            with ThreadPoolExecutor(max_workers=job["workers"], thread_name_prefix="vault-audit") as pool:
+                cursor = None
+                while True:
+                    page = await self.store.list_all(limit=AUDIT_PAGE_SIZE, cursor=cursor)
+                    items = page["items"]
+                    hashes = await asyncio.gather(
+                        *(loop.run_in_executor(pool, rehash_blob, self.store, item["evidence_id"]) for item in items)
+                    )
+                    for item, recomputed in zip(items, hashes):
+                        job["items_checked"] += 1
+                        periods.add(period_of(item["created_at"]))
+                        if recomputed is None:
+                            job["missing_blobs"].append(item["evidence_id"])
+                        elif recomputed != item["content_hash"]:
+                            job["hash_mismatches"].append(item["evidence_id"])
+                        else:
+                            job["items_verified"] += 1
+
+                    elapsed = time.perf_counter() - started
+                    job["items_per_sec"] = round(job["items_checked"] / elapsed, 2) if elapsed > 0 else 0.0
+                    cursor = page["next_cursor"]
+                    if cursor is None:
+                        break
+
+            for period in sorted(periods):
+                tree, _, seal = await self.get_period_tree(period)
+                job["period_roots"][period] = {"root": tree.root, "leaf_count": tree.leaf_count, **seal}
+                if seal["root_changed_since_seal"]:
+                    job["changed_periods"].append(period)
+
+            job["status"] = "completed"
+            logger.info(
+                f"Vault audit {job['job_id']}: {job['items_checked']} items, "
+                f"{job['items_per_sec']} items/sec"
+            )
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            logger.error(f"Vault audit {job['job_id']} failed: {e}")
+        finally:
+            job["completed_at"] = datetime.now(timezone.utc).isoformat()
+            job.pop("_task", None)
+            self._running_audit = None
+            self._evict_finished_audits()
+
+    def _evict_finished_audits(self):
+        finished = [job_id for job_id, job in self._audits.items() if job["status"] != "running"]
+        for job_id in finished[:-MAX_FINISHED_AUDITS]:
+            del self._audits[job_id]
+
+
+# Singleton instance
+_vault_integrity_service = None
+
+def get_vault_integrity_service() -> VaultIntegrityService:
+    """Get or create vault integrity service singleton"""
+    global _vault_integrity_service
+    if _vault_integrity_service is None:
+        _vault_integrity_service = VaultIntegrityService(get_vault_store())
+    return _vault_integrity_service
@@ -0,0 +1,842 @@
+"""
+FLUX-DNA Forensic Vault Store
+Persistent evidence metadata with a per-user index
+
+Evidence metadata is keyed by evidence_id and indexed by
+(user_id, created_at DESC, evidence_id DESC), so listing a user's vault
+is a keyset (cursor) range scan whose cost is proportional to the page
+size rather than the size of the whole vault.
+
+Alongside the metadata the store keeps:
+- evidence blobs (streamed back in chunks for re-hashing)
+- an append-only, hash-chained chain-of-custody log per evidence item
+- a version counter per UTC day, bumped on every insert/delete, so
+  Merkle trees built over a day's evidence can be cached safely
+- append-only seals: the Merkle root of a closed day at a given version,
+  recorded the first time it is built and never updated
+
+Backends share one interface:
+- sqlite:   local file (default, survives restarts, shared between workers)
+- supabase: `forensic_vault*` tables + `forensic-vault` storage bucket
+"""
+import os
+import json
+import base64
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+BLOB_CHUNK_SIZE = 1024 * 1024
+
+# prev_hash of the first custody entry of every evidence item
+GENESIS_HASH = "0" * 64
+
+# Columns promoted out of the record blob so they can be indexed / listed
+_LIST_FIELDS = ("evidence_id", "evidence_type", "created_at", "risk_level", "exif_stripped")
+_CUSTODY_FIELDS = ("seq", "action", "actor", "timestamp", "details", "prev_hash", "entry_hash")
+_SEAL_FIELDS = ("period", "version", "root", "leaf_count", "sealed_at")
+
+
+def encode_cursor(created_at: str, evidence_id: str) -> str:
+    """Encode a keyset position as an opaque URL-safe cursor"""
+    raw = f"{created_at}|{evidence_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, evidence_id = base64.urlsafe_b64decode(padded).decode('utf-8').split('|', 1)
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+    return created_at, evidence_id
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    """Clamp a requested page size into [1, MAX_PAGE_SIZE]"""
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def period_of(created_at: str) -> str:
+    """Merkle period (UTC day, YYYY-MM-DD) an evidence timestamp belongs to"""
+    return created_at[:10]
+
+
+def custody_entry_hash(prev_hash: str, entry: Dict) -> str:
+    """
+    Hash of one custody entry, chained to its predecessor
+
+    Covers seq/action/actor/timestamp/details in canonical JSON, so any
+    edit, reorder or removal breaks every later link.
+    """
+    payload = json.dumps(
+        {field: entry[field] for field in ("seq", "action", "actor", "timestamp", "details")},
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return hashlib.sha256((prev_hash + payload).encode('utf-8')).hexdigest()
+
+
+def _next_custody_entry(head: Optional[Dict], entry: Dict) -> Dict:
+    stored = {
+        "seq": head["seq"] + 1 if head else 0,
+        "action": entry["action"],
+        "actor": entry["actor"],
+        "timestamp": entry["timestamp"],
+        "details": entry.get("details") or {},
+        "prev_hash": head["entry_hash"] if head else GENESIS_HASH
+    }
+    stored["entry_hash"] = custody_entry_hash(stored["prev_hash"], stored)
+    return stored
+
+
+def _period_bounds(period: str) -> Tuple[str, str]:
+    start = date.fromisoformat(period)
+    return start.isoformat(), (start + timedelta(days=1)).isoformat()
+
+
+def _page(rows: List[Dict], limit: int) -> Dict:
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last["created_at"], last["evidence_id"])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+class VaultStore(ABC):
+    """
+    Forensic vault metadata store interface
+
+    Records are plain dicts as built by the vault API; `evidence_id`,
+    `user_id`, `created_at` (ISO-8601 UTC) and `content_hash` are required.
+    """
+
+    @abstractmethod
+    async def submit(self, record: Dict, content: bytes, custody_entry: Dict) -> Dict:
+        """
+        Store a new evidence item: record, blob and genesis custody entry
+
+        All three land together or not at all, so an item is never left
+        without its blob or the first link of its custody chain. Returns
+        the stored custody entry.
+        """
+
+    @abstractmethod
+    async def put(self, record: Dict) -> None:
+        """Insert or replace an evidence record"""
+
+    @abstractmethod
+    async def get(self, evidence_id: str) -> Optional[Dict]:
+        """Fetch one evidence record by id"""
+
+    @abstractmethod
+    async def delete(self, evidence_id: str) -> bool:
+        """Delete one evidence record, its blob and custody log; False if absent"""
+
+    @abstractmethod
+    async def list_by_user(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """
+        List a user's evidence newest first
+
+        Returns:
+            {'items': [...], 'next_cursor': str | None}
+        """
+
+    @abstractmethod
+    async def list_all(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Dict:
+        """
+        Page through the whole vault oldest first (for audits)
+
+        Items carry evidence_id, created_at and content_hash.
+        """
+
+    @abstractmethod
+    async def put_blob(self, evidence_id: str, content: bytes) -> None:
+        """Store the evidence content exactly as it was hashed"""
+
+    @abstractmethod
+    def read_blob_chunks(self, evidence_id: str, chunk_size: int = BLOB_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Stream a stored blob in chunks
+
+        Synchronous on purpose: it is driven from worker threads by the
+        integrity audit. Yields nothing if the blob is missing.
+        """
+
+    @abstractmethod
+    async def append_custody(self, evidence_id: str, entry: Dict) -> Dict:
+        """
+        Append a chain-of-custody entry
+
+        `entry` carries action/actor/timestamp/details; the store assigns
+        seq, prev_hash and entry_hash and returns the stored entry.
+        """
+
+    @abstractmethod
+    async def get_custody(self, evidence_id: str) -> List[Dict]:
+        """Full custody log for one item, oldest first"""
+
+    @abstractmethod
+    async def period_leaves(self, period: str) -> List[Tuple[str, str]]:
+        """(evidence_id, content_hash) for one period, ordered by (created_at, evidence_id)"""
+
+    @abstractmethod
+    async def period_version(self, period: str) -> int:
+        """Monotonic change counter for one period (0 if never written)"""
+
+    @abstractmethod
+    async def get_seal(self, period: str) -> Optional[Dict]:
+        """Latest seal of one period (highest version); None if never sealed"""
+
+    @abstractmethod
+    async def add_seal(self, seal: Dict) -> Dict:
+        """
+        Append a period seal: period, version, root, leaf_count, sealed_at
+
+        Seals are append-only. If (period, version) is already sealed the
+        existing seal is returned unchanged, so concurrent sealers agree.
+        """
+
+
+class SQLiteVaultStore(VaultStore):
+    """
+    SQLite-backed vault store
+
+    WAL mode lets several worker processes read while one writes. All
+    queries hit either a primary key or the (user_id, created_at,
+    evidence_id) / (created_at, evidence_id) indexes.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create vault tables and indexes if they don't exist"""
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS forensic_vault (
+                evidence_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                evidence_type TEXT NOT NULL,
+                risk_level TEXT NOT NULL,
+                exif_stripped INTEGER NOT NULL DEFAULT 0,
+                record TEXT NOT NULL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_forensic_vault_user_created
+                ON forensic_vault(user_id, created_at DESC, evidence_id DESC);
+
+            CREATE TABLE IF NOT EXISTS forensic_vault_blobs (
+                evidence_id TEXT PRIMARY KEY,
+                content BLOB NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS forensic_vault_custody (
+                evidence_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                action TEXT NOT NULL,
+                actor TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                details TEXT NOT NULL,
+                prev_hash TEXT NOT NULL,
+                entry_hash TEXT NOT NULL,
+                PRIMARY KEY (evidence_id, seq)
+            );
+
+            CREATE TABLE IF NOT EXISTS forensic_vault_periods (
+                period TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS forensic_vault_seals (
+                period TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                root TEXT NOT NULL,
+                leaf_count INTEGER NOT NULL,
+                sealed_at TEXT NOT NULL,
+                PRIMARY KEY (period, version)
+            );
+
+            CREATE TRIGGER IF NOT EXISTS forensic_vault_seals_no_update
+                BEFORE UPDATE ON forensic_vault_seals
+                BEGIN SELECT RAISE(ABORT, 'forensic_vault_seals is append-only'); END;
+
+            CREATE TRIGGER IF NOT EXISTS forensic_vault_seals_no_delete
+                BEFORE DELETE ON forensic_vault_seals
+                BEGIN SELECT RAISE(ABORT, 'forensic_vault_seals is append-only'); END;
+        """)
+
+        # Stores created before content_hash was promoted to a column
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(forensic_vault)")}
+        if "content_hash" not in columns:
+            self._conn.execute("ALTER TABLE forensic_vault ADD COLUMN content_hash TEXT")
+            self._conn.execute(
+                "UPDATE forensic_vault SET content_hash = json_extract(record, '$.content_hash')"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_forensic_vault_created "
+            "ON forensic_vault(created_at, evidence_id)"
+        )
+
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread read connection so parallel blob streams don't share a lock"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._local.conn = conn
+            with self._lock:
+                self._readers.append(conn)
+        return conn
+
+    def _write(self, fn):
+        """Run fn(conn) inside one IMMEDIATE transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def _fetch(self, query: str, params: tuple) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    # sqlite3 calls block, so every query runs in a worker thread off the event loop
+
+    async def _run_write(self, fn):
+        return await asyncio.to_thread(self._write, fn)
+
+    async def _run_fetch(self, query: str, params: tuple) -> List[sqlite3.Row]:
+        return await asyncio.to_thread(self._fetch, query, params)
+
+    @staticmethod
+    def _bump_period(conn: sqlite3.Connection, period: str):
+        conn.execute(
+            """
+            INSERT INTO forensic_vault_periods (period, version) VALUES (?, 1)
+            ON CONFLICT(period) DO UPDATE SET version = version + 1
+            """,
+            (period,)
+        )
+
+    @classmethod
+    def _insert_record(cls, conn: sqlite3.Connection, record: Dict):
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO forensic_vault (
+                evidence_id, user_id, created_at, evidence_type,
+                risk_level, exif_stripped, content_hash, record
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                record["evidence_id"],
+                record["user_id"],
+                record["created_at"],
+                record["evidence_type"],
+                record["risk_level"],
+                int(bool(record.get("exif_stripped"))),
+                record["content_hash"],
+                json.dumps(record)
+            )
+        )
+        cls._bump_period(conn, period_of(record["created_at"]))
+
+    @staticmethod
+    def _insert_blob(conn: sqlite3.Connection, evidence_id: str, content: bytes):
+        conn.execute(
+            "INSERT OR REPLACE INTO forensic_vault_blobs (evidence_id, content) VALUES (?, ?)",
+            (evidence_id, content)
+        )
+
+    @staticmethod
+    def _insert_custody(conn: sqlite3.Connection, evidence_id: str, stored: Dict) -> Dict:
+        conn.execute(
+            """
+            INSERT INTO forensic_vault_custody (
+                evidence_id, seq, action, actor, timestamp,
+                details, prev_hash, entry_hash
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                evidence_id, stored["seq"], stored["action"], stored["actor"],
+                stored["timestamp"], json.dumps(stored["details"]),
+                stored["prev_hash"], stored["entry_hash"]
+            )
+        )
+        return stored
+
+    async def submit(self, record: Dict, content: bytes, custody_entry: Dict) -> Dict:
+        evidence_id = record["evidence_id"]
+
+        def _submit(conn):
+            self._insert_record(conn, record)
+            self._insert_blob(conn, evidence_id, content)
+            # Always the genesis link: resubmitting an existing id hits the
+            # (evidence_id, seq) primary key and rolls the whole item back
+            return self._insert_custody(conn, evidence_id, _next_custody_entry(None, custody_entry))
+
+        return await self._run_write(_submit)
+
+    async def put(self, record: Dict) -> None:
+        await self._run_write(lambda conn: self._insert_record(conn, record))
+
+    async def get(self, evidence_id: str) -> Optional[Dict]:
+        rows = await self._run_fetch(
+            "SELECT record FROM forensic_vault WHERE evidence_id = ?",
+            (evidence_id,)
+        )
+        return json.loads(rows[0]["record"]) if rows else None
+
+    async def delete(self, evidence_id: str) -> bool:
+        def _delete(conn):
+            row = conn.execute(
+                "SELECT created_at FROM forensic_vault WHERE evidence_id = ?",
+                (evidence_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM forensic_vault WHERE evidence_id = ?", (evidence_id,))
+            conn.execute("DELETE FROM forensic_vault_blobs WHERE evidence_id = ?", (evidence_id,))
+            conn.execute("DELETE FROM forensic_vault_custody WHERE evidence_id = ?", (evidence_id,))
+            self._bump_period(conn, period_of(row["created_at"]))
+            return True
+
+        return await self._run_write(_delete)
+
+    async def list_by_user(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        limit = clamp_page_size(limit)
+        columns = ", ".join(_LIST_FIELDS)
+
+        if cursor:
+            created_at, evidence_id = decode_cursor(cursor)
+            query = f"""
+                SELECT {columns} FROM forensic_vault
+                WHERE user_id = ? AND (created_at, evidence_id) < (?, ?)
+                ORDER BY created_at DESC, evidence_id DESC
+                LIMIT ?
+            """
+            params = (user_id, created_at, evidence_id, limit + 1)
+        else:
+            query = f"""
+                SELECT {columns} FROM forensic_vault
+                WHERE user_id = ?
+                ORDER BY created_at DESC, evidence_id DESC
+                LIMIT ?
+            """
+            params = (user_id, limit + 1)
+
+        rows = await self._run_fetch(query, params)
+        return _page([{**dict(row), "exif_stripped": bool(row["exif_stripped"])} for row in rows], limit)
+
+    async def list_all(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Dict:
+        if cursor:
+            created_at, evidence_id = decode_cursor(cursor)
+            query = """
+                SELECT evidence_id, created_at, content_hash FROM forensic_vault
+                WHERE (created_at, evidence_id) > (?, ?)
+                ORDER BY created_at, evidence_id
+                LIMIT ?
+            """
+            params = (created_at, evidence_id, limit + 1)
+        else:
+            query = """
+                SELECT evidence_id, created_at, content_hash FROM forensic_vault
+                ORDER BY created_at, evidence_id
+                LIMIT ?
+            """
+            params = (limit + 1,)
+
+        rows = await self._run_fetch(query, params)
+        return _page([dict(row) for row in rows], limit)
+
+    async def put_blob(self, evidence_id: str, content: bytes) -> None:
+        await self._run_write(lambda conn: self._insert_blob(conn, evidence_id, content))
+
+    def read_blob_chunks(self, evidence_id: str, chunk_size: int = BLOB_CHUNK_SIZE) -> Iterator[bytes]:
+        conn = self._reader()
+        row = conn.execute(
+            "SELECT rowid FROM forensic_vault_blobs WHERE evidence_id = ?",
+            (evidence_id,)
+        ).fetchone()
+        if row is None:
+            return
+
+        # Incremental blob I/O: never materializes the whole blob
+        with conn.blobopen("forensic_vault_blobs", "content", row[0], readonly=True) as blob:
+            while True:
+                chunk = blob.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    async def append_custody(self, evidence_id: str, entry: Dict) -> Dict:
+        def _append(conn):
+            head = conn.execute(
+                """
+                SELECT seq, entry_hash FROM forensic_vault_custody
+                WHERE evidence_id = ? ORDER BY seq DESC LIMIT 1
+                """,
+                (evidence_id,)
+            ).fetchone()
+            stored = _next_custody_entry(dict(head) if head else None, entry)
+            return self._insert_custody(conn, evidence_id, stored)
+
+        return await self._run_write(_append)
+
+    async def get_custody(self, evidence_id: str) -> List[Dict]:
+        rows = await self._run_fetch(
+            f"""
+            SELECT {", ".join(_CUSTODY_FIELDS)} FROM forensic_vault_custody
+            WHERE evidence_id = ? ORDER BY seq
+            """,
+            (evidence_id,)
+        )
+        return [{**dict(row), "details": json.loads(row["details"])} for row in rows]
+
+    async def period_leaves(self, period: str) -> List[Tuple[str, str]]:
+        start, end = _period_bounds(period)
+        rows = await self._run_fetch(
+            """
+            SELECT evidence_id, content_hash FROM forensic_vault
+            WHERE created_at >= ? AND created_at < ?
+            ORDER BY created_at, evidence_id
+            """,
+            (start, end)
+        )
+        return [(row["evidence_id"], row["content_hash"]) for row in rows]
+
+    async def period_version(self, period: str) -> int:
+        rows = await self._run_fetch(
+            "SELECT version FROM forensic_vault_periods WHERE period = ?",
+            (period,)
+        )
+        return rows[0]["version"] if rows else 0
+
+    async def get_seal(self, period: str) -> Optional[Dict]:
+        rows = await self._run_fetch(
+            f"""
+            SELECT {", ".join(_SEAL_FIELDS)} FROM forensic_vault_seals
+            WHERE period = ? ORDER BY version DESC LIMIT 1
+            """,
+            (period,)
+        )
+        return dict(rows[0]) if rows else None
+
+    async def add_seal(self, seal: Dict) -> Dict:
+        def _add(conn):
+            conn.execute(
+                f"""
+                INSERT OR IGNORE INTO forensic_vault_seals ({", ".join(_SEAL_FIELDS)})
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                tuple(seal[field] for field in _SEAL_FIELDS)
+            )
+            row = conn.execute(
+                f"SELECT {', '.join(_SEAL_FIELDS)} FROM forensic_vault_seals WHERE period = ? AND version = ?",
+                (seal["period"], seal["version"])
+            ).fetchone()
+            return dict(row)
+
+        return await self._run_write(_add)
+
+    def close(self):
+        """Close the underlying connections"""
+        with self._lock:
+            self._conn.close()
+            for reader in self._readers:
+                reader.close()
+            self._readers.clear()
+
+
+class SupabaseVaultStore(VaultStore):
+    """
+    Supabase-backed vault store
+
+    Uses the `forensic_vault` table and its (user_id, created_at DESC,
+    evidence_id DESC) index, the `forensic_vault_custody` log and the
+    `forensic-vault` storage bucket for blobs. supabase-py is synchronous,
+    so each call runs in a worker thread to keep the event loop free.
+    """
+
+    BLOB_BUCKET = 'forensic-vault'
+
+    def __init__(self):
+        url = os.environ.get('SUPABASE_URL')
+        service_key = os.environ.get('SUPABASE_SERVICE_KEY')
+
+        if not url or not service_key:
+            raise ValueError(
+                "SUPABASE_URL and SUPABASE_SERVICE_KEY required for the Supabase vault store"
+            )
+
+        from supabase import create_client
+        self.client = create_client(url, service_key)
+
+    def _table(self, name: str = 'forensic_vault'):
+        return self.client.table(name)
+
+    def _bump_period(self, period: str):
+        # Atomic increment lives in SQL (see migration: bump_forensic_vault_period)
+        self.client.rpc('bump_forensic_vault_period', {'p_period': period}).execute()
+
+    @staticmethod
+    def _record_row(record: Dict) -> Dict:
+        return {
+            "evidence_id": record["evidence_id"],
+            "user_id": record["user_id"],
+            "created_at": record["created_at"],
+            "evidence_type": record["evidence_type"],
+            "risk_level": record["risk_level"],
+            "exif_stripped": bool(record.get("exif_stripped")),
+            "content_hash": record["content_hash"],
+            "record": record
+        }
+
+    async def submit(self, record: Dict, content: bytes, custody_entry: Dict) -> Dict:
+        evidence_id = record["evidence_id"]
+        stored = _next_custody_entry(None, custody_entry)
+
+        def _submit():
+            bucket = self.client.storage.from_(self.BLOB_BUCKET)
+            # No upsert: an existing id fails here instead of losing its blob to the rollback
+            bucket.upload(evidence_id, content)
+            try:
+                # Record, genesis custody entry and period bump in one SQL
+                # transaction (see migration: submit_forensic_evidence)
+                self.client.rpc('submit_forensic_evidence', {
+                    'p_row': self._record_row(record),
+                    'p_custody': stored
+                }).execute()
+            except Exception:
+                bucket.remove([evidence_id])
+                raise
+
+        await asyncio.to_thread(_submit)
+        return stored
+
+    async def put(self, record: Dict) -> None:
+        row = self._record_row(record)
+
+        def _put():
+            self._table().upsert(row).execute()
+            self._bump_period(period_of(record["created_at"]))
+
+        await asyncio.to_thread(_put)
+
+    async def get(self, evidence_id: str) -> Optional[Dict]:
+        result = await asyncio.to_thread(
+            lambda: self._table().select('record').eq('evidence_id', evidence_id).limit(1).execute()
+        )
+        return result.data[0]["record"] if result.data else None
+
+    async def delete(self, evidence_id: str) -> bool:
+        def _delete():
+            result = self._table().delete().eq('evidence_id', evidence_id).execute()
+            if not result.data:
+                return False
+            self._table('forensic_vault_custody').delete().eq('evidence_id', evidence_id).execute()
+            self.client.storage.from_(self.BLOB_BUCKET).remove([evidence_id])
+            self._bump_period(period_of(result.data[0]["created_at"]))
+            return True
+
+        return await asyncio.to_thread(_delete)
+
+    async def list_by_user(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        limit = clamp_page_size(limit)
+        position = decode_cursor(cursor) if cursor else None
+
+        def _query():
+            query = self._table().select(",".join(_LIST_FIELDS)).eq('user_id', user_id)
+            if position:
+                created_at, evidence_id = position
+                # Row-value comparison expressed as a PostgREST or/and filter
+                query = query.or_(
+                    f'created_at.lt."{created_at}",'
+                    f'and(created_at.eq."{created_at}",evidence_id.lt."{evidence_id}")'
+                )
+            return (
+                query.order('created_at', desc=True)
+                .order('evidence_id', desc=True)
+                .limit(limit + 1)
+                .execute()
+            )
+
+        result = await asyncio.to_thread(_query)
+        return _page(result.data or [], limit)
+
+    async def list_all(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Dict:
+        position = decode_cursor(cursor) if cursor else None
+
+        def _query():
+            query = self._table().select('evidence_id,created_at,content_hash')
+            if position:
+                created_at, evidence_id = position
+                query = query.or_(
+                    f'created_at.gt."{created_at}",'
+                    f'and(created_at.eq."{created_at}",evidence_id.gt."{evidence_id}")'
+                )
+            return query.order('created_at').order('evidence_id').limit(limit + 1).execute()
+
+        result = await asyncio.to_thread(_query)
+        return _page(result.data or [], limit)
+
+    async def put_blob(self, evidence_id: str, content: bytes) -> None:
+        await asyncio.to_thread(
+            lambda: self.client.storage.from_(self.BLOB_BUCKET).upload(
+                evidence_id, content, {"upsert": "true"}
+            )
+        )
+
+    def read_blob_chunks(self, evidence_id: str, chunk_size: int = BLOB_CHUNK_SIZE) -> Iterator[bytes]:
+        try:
+            content = self.client.storage.from_(self.BLOB_BUCKET).download(evidence_id)
+        except Exception:
+            return
+        view = memoryview(content)
+        for offset in range(0, len(view), chunk_size):
+            yield bytes(view[offset:offset + chunk_size])
+
+    async def append_custody(self, evidence_id: str, entry: Dict) -> Dict:
+        def _append():
+            head = (
+                self._table('forensic_vault_custody')
+                .select('seq,entry_hash')
+                .eq('evidence_id', evidence_id)
+                .order('seq', desc=True)
+                .limit(1)
+                .execute()
+            ).data
+            stored = _next_custody_entry(head[0] if head else None, entry)
+            # (evidence_id, seq) primary key rejects a concurrent append racing for the same slot
+            self._table('forensic_vault_custody').insert({"evidence_id": evidence_id, **stored}).execute()
+            return stored
+
+        return await asyncio.to_thread(_append)
+
+    async def get_custody(self, evidence_id: str) -> List[Dict]:
+        result = await asyncio.to_thread(
+            lambda: self._table('forensic_vault_custody')
+            .select(",".join(_CUSTODY_FIELDS))
+            .eq('evidence_id', evidence_id)
+            .order('seq')
+            .execute()
+        )
+        return result.data or []
+
+    async def period_leaves(self, period: str) -> List[Tuple[str, str]]:
+        start, end = _period_bounds(period)
+        result = await asyncio.to_thread(
+            lambda: self._table()
+            .select('evidence_id,content_hash')
+            .gte('created_at', start)
+            .lt('created_at', end)
+            .order('created_at')
+            .order('evidence_id')
+            .execute()
+        )
+        return [(row["evidence_id"], row["content_hash"]) for row in result.data or []]
+
+    async def period_version(self, period: str) -> int:
+        result = await asyncio.to_thread(
+            lambda: self._table('forensic_vault_periods').select('version').eq('period', period).execute()
+        )
+        return result.data[0]["version"] if result.data else 0
+
+    async def get_seal(self, period: str) -> Optional[Dict]:
+        result = await asyncio.to_thread(
+            lambda: self._table('forensic_vault_seals')
+            .select(",".join(_SEAL_FIELDS))
+            .eq('period', period)
+            .order('version', desc=True)
+            .limit(1)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    async def add_seal(self, seal: Dict) -> Dict:
+        row = {field: seal[field] for field in _SEAL_FIELDS}
+
+        def _add():
+            # ON CONFLICT DO NOTHING; triggers reject updates and deletes
+            self._table('forensic_vault_seals').upsert(
+                row, on_conflict='period,version', ignore_duplicates=True
+            ).execute()
+            return (
+                self._table('forensic_vault_seals')
+                .select(",".join(_SEAL_FIELDS))
+                .eq('period', seal["period"])
+                .eq('version', seal["version"])
+                .execute()
+            ).data[0]
+
+        return await asyncio.to_thread(_add)
+
+
+def _default_db_path() -> str:
+    return str(Path(__file__).parent.parent / 'data' / 'forensic_vault.db')
+
+
+# Singleton instance
+_vault_store = None
+
+def get_vault_store() -> VaultStore:
+    """
+    Get or create vault store singleton
+
+    Backend is selected by VAULT_STORE_BACKEND ('sqlite' or 'supabase');
+    the SQLite file location is VAULT_DB_PATH.
+    """
+    global _vault_store
+    if _vault_store is None:
+        backend = os.environ.get('VAULT_STORE_BACKEND', 'sqlite').lower()
+        if backend == 'supabase':
+            _vault_store = SupabaseVaultStore()
+        else:
+            _vault_store = SQLiteVaultStore(os.environ.get('VAULT_DB_PATH', _default_db_path()))
+    return _vault_store
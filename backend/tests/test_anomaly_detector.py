@@ -0,0 +1,85 @@
+"""
+Streaming Anomaly Detector Tests
+Spike detection, warmup and cooldown, missing samples and 10k-metric ticks
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from health.anomaly_detector import StreamingAnomalyDetector
+
+
+def feed(detector, name, values, start=0.0):
+    anomalies = []
+    for i, value in enumerate(values):
+        anomalies += detector.observe({name: value}, timestamp=start + i)
+    return anomalies
+
+
+class TestStreamingAnomalyDetector:
+    """Test StreamingAnomalyDetector"""
+
+    def test_spike_is_detected_and_reported_to_listeners(self):
+        detector = StreamingAnomalyDetector(cooldown=0)
+        received = []
+        detector.add_listener(received.append)
+        rng = np.random.default_rng(1)
+
+        assert feed(detector, "system.cpu_percent", 40 + rng.normal(0, 1, 200)) == []
+        anomalies = detector.observe({"system.cpu_percent": 80.0}, timestamp=200)
+
+        assert [a.metric for a in anomalies] == ["system.cpu_percent"]
+        assert anomalies[0].severity == "critical"
+        assert len(anomalies[0].detectors) >= 2
+        assert 35 < anomalies[0].expected < 45
+        assert received == anomalies
+        assert detector.summary("system.")["anomalous_metrics"] == ["system.cpu_percent"]
+
+    def test_warmup_and_cooldown(self):
+        detector = StreamingAnomalyDetector(warmup=30, cooldown=60)
+        # A jump inside the warmup period never alerts
+        assert feed(detector, "early", [10.0] * 5 + [1000.0] + [10.0] * 30) == []
+
+        rng = np.random.default_rng(2)
+        feed(detector, "m", 10 + rng.normal(0, 0.5, 100), start=100)
+        assert len(detector.observe({"m": 50.0}, timestamp=200)) == 1
+        assert detector.observe({"m": 50.0}, timestamp=201) == []    # throttled
+        assert len(detector.observe({"m": 90.0}, timestamp=261)) == 1
+
+    def test_missing_samples_leave_state_untouched(self):
+        detector = StreamingAnomalyDetector()
+        feed(detector, "a", [1.0, 2.0, 3.0])
+        before = detector.stats("a")
+        detector.observe({"b": 5.0})
+
+        assert detector.stats("a") == before
+        assert detector.stats("b")["count"] == 1
+
+    def test_statistics_and_forecast(self):
+        detector = StreamingAnomalyDetector()
+        values = np.arange(100, dtype=float) * 0.5
+        feed(detector, "ramp", values)
+        stats = detector.stats("ramp")
+
+        assert stats["count"] == 100
+        assert abs(stats["mean"] - values.mean()) < 1e-9
+        assert abs(stats["std"] - values.std(ddof=1)) < 1e-9
+        assert abs(stats["trend_per_tick"] - 0.5) < 0.05
+        assert abs(detector.forecast("ramp", 10) - (values[-1] + 5.0)) < 1.0
+
+    def test_ten_thousand_metric_tick(self):
+        """One update() call per tick covers every metric; tick latency is in benchmarks/anomaly_detector.py"""
+        detector = StreamingAnomalyDetector()
+        indices = detector.register(f"metric_{i}" for i in range(10_000))
+        rng = np.random.default_rng(3)
+        for tick in range(50):
+            detector.update(50 + rng.normal(0, 1, 10_000), timestamp=float(tick))
+        values = 50 + rng.normal(0, 1, 10_000)
+        values[indices[1234]] = 90.0
+        anomalies = detector.update(values, timestamp=50.0)
+
+        assert "metric_1234" in [a.metric for a in anomalies]
+        assert detector.stats("metric_0")["count"] == detector.stats("metric_9999")["count"] == 51
@@ -0,0 +1,100 @@
+"""
+Batch Mutation Detection Tests
+Matrix API parity with the per-dict ultimate_mutation_detection
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.batch_mutation import batch_mutation_scores, records_to_arrays
+from logic.ultimate_algorithms import UltimateAlgorithms
+
+SCORES = ('statistical', 'machine_learning', 'time_series', 'pattern_recognition')
+
+
+def make_records(entities: int, metrics: int, seed: int, missing: float = 0.0, steps: int = None):
+    rng = np.random.default_rng(seed)
+    names = [f"m{j}" for j in range(metrics)]
+    records = []
+    for _ in range(entities):
+        base = rng.uniform(-5, 50, metrics).round(1)
+        base[rng.random(metrics) < 0.1] = 0.0
+        length = steps if steps is not None else int(rng.integers(0, 12))
+        drift = rng.normal(0, 0.5, metrics)
+        history = [
+            {name: float(base[j] + drift[j] * t + rng.normal(0, 1)) for j, name in enumerate(names)
+             if rng.random() >= missing}
+            for t in range(length)
+        ]
+        if length and rng.random() < 0.2:
+            history[-1] = {name: 7.0 for name in names}   # constant-ish rows
+        records.append({
+            'timestamp': 0,
+            'metrics': {name: float(base[j] * rng.uniform(0.8, 1.3)) for j, name in enumerate(names)
+                        if rng.random() >= missing},
+            'baseline': {name: float(base[j]) for j, name in enumerate(names) if rng.random() >= missing / 2},
+            'historical_data': history,
+        })
+    return records
+
+
+def per_dict(algorithms: UltimateAlgorithms, record):
+    args = (record['metrics'], record['baseline'], record['historical_data'])
+    return {
+        'statistical': algorithms._statistical_mutation_detection(*args),
+        'machine_learning': algorithms._ml_mutation_detection(*args),
+        'time_series': algorithms._time_series_mutation_detection(*args),
+        'pattern_recognition': algorithms._pattern_mutation_detection(*args),
+    }
+
+
+class TestBatchMutationDetection:
+    """Test batch_mutation_scores against the per-dict sub-detectors"""
+
+    @pytest.mark.parametrize("missing, steps", [(0.0, 10), (0.0, None), (0.3, None)])
+    def test_matches_per_dict_scores(self, missing, steps):
+        algorithms = UltimateAlgorithms()
+        records = make_records(60, 6, seed=int(missing * 10), missing=missing, steps=steps)
+        current, baseline, history, _ = records_to_arrays(records)
+        if steps is not None:
+            history = np.stack(history)            # dense (entities, steps, metrics)
+
+        batch = batch_mutation_scores(current, baseline, history)
+
+        for i, record in enumerate(records):
+            expected = per_dict(algorithms, record)
+            for name in SCORES:
+                assert batch[name][i] == pytest.approx(expected[name], rel=1e-9, abs=1e-12), (i, name)
+
+    def test_ensemble_matches_ultimate_mutation_detection(self):
+        algorithms = UltimateAlgorithms()
+        records = make_records(20, 5, seed=3)
+        current, baseline, history, _ = records_to_arrays(records)
+
+        batch = algorithms.ultimate_mutation_detection_batch(current, baseline, history)
+
+        for i, record in enumerate(records):
+            expected = algorithms.ultimate_mutation_detection(record)
+            assert batch['mutation_score'][i] == pytest.approx(expected['mutation_score'], rel=1e-9, abs=1e-12)
+            assert batch['confidence'][i] == pytest.approx(expected['confidence'], rel=1e-9, abs=1e-12)
+            assert batch['severity'][i] == expected['severity']
+
+    def test_dense_and_ragged_history_agree(self):
+        rng = np.random.default_rng(7)
+        current = rng.uniform(10, 20, (8, 4))
+        baseline = rng.uniform(10, 20, 4)
+        dense = rng.uniform(10, 20, (8, 9, 4))
+        ragged = [dense[i] for i in range(8)]
+
+        a = batch_mutation_scores(current, baseline, dense)
+        b = batch_mutation_scores(current, baseline, ragged)
+        for name in SCORES:
+            np.testing.assert_array_equal(a[name], b[name])
+
+    def test_shape_mismatch_is_rejected(self):
+        with pytest.raises(ValueError):
+            batch_mutation_scores(np.ones((3, 4)), np.ones(4), np.ones((2, 5, 4)))
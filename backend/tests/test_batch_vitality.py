@@ -0,0 +1,125 @@
+"""
+Batch Vitality Tests
+Columnar vitality and hardware abstraction, parity with the per-sample engines
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.batch_vitality import HARDWARE_FIELDS, batch_hardware
+from logic.perfect_algorithms import PerfectAlgorithms
+from logic.ultimate_algorithms import UltimateAlgorithms
+
+ENGINES = [
+    (UltimateAlgorithms, 'ultimate_vitality_calculation', 'ultimate_hardware_abstraction'),
+    (PerfectAlgorithms, 'perfect_vitality_calculation', 'perfect_hardware_abstraction'),
+]
+
+
+def hardware_matrices(rows: int, seed: int):
+    rng = np.random.default_rng(seed)
+    return {
+        'cpu': np.c_[rng.uniform(0, 100, rows), rng.integers(0, 9, rows), rng.uniform(0.5, 4, rows),
+                     rng.uniform(30, 95, rows)],
+        'memory': np.c_[rng.uniform(0, 100, rows), rng.choice([0, 8, 16], rows),
+                        np.where(rng.random(rows) < 0.5, np.nan, rng.uniform(0, 16, rows)), rng.uniform(0, 80, rows)],
+        'storage': np.c_[rng.uniform(0, 100, rows), np.full(rows, 500), rng.uniform(10, 300, rows),
+                         rng.uniform(10, 300, rows), np.full(rows, np.nan)],
+        'network': np.c_[rng.uniform(0, 100, rows), rng.uniform(1, 200, rows), rng.uniform(0, 3, rows),
+                         rng.uniform(10, 500, rows)],
+        'gpu': np.c_[rng.uniform(0, 100, rows), rng.uniform(0, 100, rows), rng.uniform(40, 95, rows),
+                     rng.integers(0, 4, rows)],
+    }
+
+
+def row_dicts(matrices, row: int):
+    return {component: {name: float(matrix[row, j]) for j, name in enumerate(HARDWARE_FIELDS[component])
+                        if not np.isnan(matrix[row, j])}
+            for component, matrix in matrices.items()}
+
+
+class TestBatchVitality:
+    """Test the vitality batch against the per-sample calculation"""
+
+    @pytest.mark.parametrize("engine_class, method, _", ENGINES)
+    def test_columns_match_per_sample(self, engine_class, method, _):
+        engine = engine_class()
+        rng = np.random.default_rng(0)
+        p, a, e, l = rng.uniform(0.01, 2, (4, 60))
+        batch = getattr(engine, method + '_batch')(p, a, e, l)
+
+        for i in range(60):
+            single = getattr(engine, method)(float(p[i]), float(a[i]), float(e[i]), float(l[i]))
+            assert batch['normalized_vitality'][i] == pytest.approx(single['normalized_vitality'], rel=1e-12)
+            assert batch['vitality_level'][i] == single['vitality_level']
+            for name, value in {**single['vitality_metrics'], **single['predictive_trends']}.items():
+                if name in batch.columns:
+                    assert batch[name][i] == (value if isinstance(value, str) else pytest.approx(value, rel=1e-12))
+            opportunities = single['optimization_opportunities']
+            assert batch['recommended_focus'][i] == opportunities['recommended_focus']
+            assert batch['optimization_strategy'][i] == opportunities['optimization_strategy']
+            assert batch.recommendations(i) == single['recommendations']
+            assert batch.needs_attention[i] == bool(single['recommendations'])
+
+    def test_recommendations_only_for_flagged_rows(self):
+        batch = UltimateAlgorithms().ultimate_vitality_calculation_batch([200.0, 0.5], [100.0, 0.6], [0.1, 0.9], 0.05)
+        assert batch.needs_attention.tolist() == [False, True]
+        assert batch.recommendations(0) == []
+        assert [row for row, _ in batch.iter_recommendations()] == [1]
+        assert batch['vitality_level'].dtype.kind == 'U' and len(batch) == 2
+
+    def test_invalid_inputs_name_the_row(self):
+        with pytest.raises(ValueError, match=r"Invalid energy: must be positive number \(row 2\)"):
+            PerfectAlgorithms().perfect_vitality_calculation_batch([1, 1, 1], [1, 1, 1], [1, 1, 0], [1, 1, 1])
+        with pytest.raises(ValueError, match="1-D"):
+            UltimateAlgorithms().ultimate_vitality_calculation_batch([[1.0]], 1, 1, 1)
+
+
+class TestBatchHardware:
+    """Test the hardware batch against the per-sample abstraction"""
+
+    @pytest.mark.parametrize("engine_class, _, method", ENGINES)
+    def test_columns_match_per_sample(self, engine_class, _, method):
+        engine = engine_class()
+        matrices = hardware_matrices(40, seed=1)
+        batch = getattr(engine, method + '_batch')(matrices)
+
+        for i in range(40):
+            single = getattr(engine, method)(row_dicts(matrices, i))
+            assert batch['system_health'][i] == pytest.approx(single['system_health'], rel=1e-9)
+            assert batch['optimization_score'][i] == pytest.approx(single['optimization_score'], rel=1e-9)
+            allocation = single['allocation_strategy']
+            assert batch['scaling_policy'][i] == allocation['scaling_policy']
+            priorities = [batch[f'priority_{k}'][i] for k in (1, 2, 3)]
+            assert [c for c in priorities if c] == allocation['priority_components']
+            for component, processed in single['processed_data'].items():
+                assert batch[f'{component}_status'][i] == processed['status']
+                if processed['status'] != 'error':
+                    assert batch[f'{component}_health'][i] == pytest.approx(processed['health'], rel=1e-9)
+                    assert batch.metadata['alerts'](i)[component] == processed['alerts']
+            expected = set(single['optimizations']) | set(allocation['recommendations'])
+            assert set(batch.recommendations(i)) == expected
+
+    def test_field_dicts_fill_defaults(self):
+        batch = batch_hardware({'cpu': {'usage_percent': [10.0, 95.0]}, 'memory': {}, 'storage': {},
+                                'network': {}, 'gpu': {}})
+        assert len(batch) == 2
+        assert batch['cpu_status'].tolist() == ['optimal', 'critical']
+        assert batch['cpu_alerts'].tolist() == [0, 1]
+        assert batch.needs_attention.tolist() == [False, True]
+        assert batch.recommendations(1)[:2] == ["Critical: Optimize cpu immediately", "Scale up CPU resources"]
+
+    def test_record_batch_needs_pyarrow(self):
+        batch = batch_hardware({c: {} for c in HARDWARE_FIELDS})
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            with pytest.raises(ImportError, match="pip install pyarrow"):
+                batch.to_record_batch()
+        else:
+            record_batch = batch.to_record_batch()
+            assert record_batch.num_rows == 1 and 'needs_attention' in record_batch.schema.names
@@ -0,0 +1,182 @@
+"""
+Database Service Tests
+Buffered founder events, cached health checks and batched lookups
+"""
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from services import database as db
+from services.database import DatabaseService
+
+
+class FakeConnection:
+    """Records the queries the service sends; each round trip takes `delay` seconds"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.fail = False
+
+    async def _round_trip(self, name, query, args):
+        self.calls.append((name, query, args))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("connection refused")
+
+    async def fetchval(self, query, *args):
+        await self._round_trip("fetchval", query, args)
+        return 1
+
+    async def fetchrow(self, query, *args):
+        await self._round_trip("fetchrow", query, args)
+        return {"id": 1, "args": args}
+
+    async def fetch(self, query, *args):
+        await self._round_trip("fetch", query, args)
+        return [{"email": email, "id": i} for i, email in enumerate(args[0])]
+
+    async def executemany(self, query, rows):
+        await self._round_trip("executemany", query, list(rows))
+
+    async def copy_records_to_table(self, table, records, columns):
+        await self._round_trip("copy", table, (list(records), columns))
+
+
+class FakePool:
+    def __init__(self, delay: float = 0.0):
+        self.conn = FakeConnection(delay)
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+    async def close(self):
+        pass
+
+
+def make_service(delay: float = 0.0, **settings) -> DatabaseService:
+    service = DatabaseService(pool=FakePool(delay))
+    for name, value in settings.items():
+        setattr(service, name, value)
+    return service
+
+
+def calls(conn, name):
+    return [call for call in conn.calls if call[0] == name]
+
+
+class TestFounderEvents:
+    """Test the buffered log_founder_event path"""
+
+    def test_events_are_written_in_batches_off_the_request_path(self):
+        async def run():
+            service = make_service(delay=0.05, event_batch_size=10, event_flush_interval=10)
+            conn = service.pool.conn
+            for i in range(25):
+                result = await service.log_founder_event("assessment_started", {"i": i})
+                assert result["queued"]
+            round_trips_during_requests = len(conn.calls)    # none: no caller waited on the database
+            await asyncio.sleep(0.2)               # size-triggered: no wait for the 10 s interval
+            flushed_early = service.stats["events_written"]
+            await service.close()
+            return conn, round_trips_during_requests, flushed_early
+
+        conn, round_trips_during_requests, flushed_early = asyncio.run(run())
+        batches = calls(conn, "executemany")
+        assert round_trips_during_requests == 0
+        assert flushed_early == 25
+        assert [len(rows) for _, _, rows in batches] == [10, 10, 5]
+        assert batches[0][1] is db._INSERT_FOUNDER_EVENT
+        assert batches[0][2][0] == ("assessment_started", {"i": 0})
+
+    def test_interval_flush_and_failed_batches_are_retried(self):
+        async def run():
+            service = make_service(event_batch_size=100, event_flush_interval=0.05)
+            service.pool.conn.fail = True
+            await service.log_founder_event("a", {})
+            await service.log_founder_event("b", {})
+            await asyncio.sleep(0.12)
+            pending_while_down = service.get_stats()["events_pending"]
+            service.pool.conn.fail = False
+            await asyncio.sleep(0.1)
+            await service.close()
+            return service, pending_while_down
+
+        service, pending_while_down = asyncio.run(run())
+        assert pending_while_down == 2
+        assert service.stats["events_written"] == 2 and service.stats["events_dropped"] == 0
+
+    def test_full_buffer_drops_the_oldest_events(self):
+        async def run():
+            service = make_service(event_batch_size=100, event_flush_interval=10, event_buffer_limit=3)
+            conn = service.pool.conn
+            for name in "abcde":
+                await service.log_founder_event(name, {})
+            await service.close()
+            return service, conn
+
+        service, conn = asyncio.run(run())
+        [(_, _, rows)] = calls(conn, "executemany")
+        assert [event for event, _ in rows] == ["c", "d", "e"]
+        assert service.stats["events_dropped"] == 2
+
+
+class TestQueries:
+    """Test health_check caching and the batched read and write APIs"""
+
+    def test_health_check_is_cached_and_shared(self):
+        async def run():
+            service = make_service(delay=0.05, health_ttl=60)
+            results = await asyncio.gather(*(service.health_check() for _ in range(10)))
+            results.append(await service.health_check())
+            return service, results
+
+        service, results = asyncio.run(run())
+        assert all(results)
+        assert len(calls(service.pool.conn, "fetchval")) == 1
+        assert service.stats["health_cache_hits"] == 10
+
+    def test_unhealthy_result_is_cached_too(self):
+        async def run():
+            service = make_service(health_ttl=60)
+            service.pool.conn.fail = True
+            return service, [await service.health_check(), await service.health_check()]
+
+        service, results = asyncio.run(run())
+        assert results == [False, False]
+        assert len(calls(service.pool.conn, "fetchval")) == 1
+
+    def test_lookups_and_bulk_inserts_take_one_round_trip(self):
+        async def run():
+            service = make_service()
+            users = await service.get_users_by_email(["a@x.sa", "b@x.sa", "a@x.sa"])
+            copied = await service.bulk_insert("users", [
+                {"email": "c@x.sa", "preferred_language": "ar"},
+                {"email": "d@x.sa", "preferred_language": "en"},
+            ])
+            return service, users, copied
+
+        service, users, copied = asyncio.run(run())
+        assert sorted(users) == ["a@x.sa", "b@x.sa"]
+        assert copied == 2
+        assert [call[0] for call in service.pool.conn.calls] == ["fetch", "copy"]
+        assert calls(service.pool.conn, "copy")[0][2] == (
+            [("c@x.sa", "ar"), ("d@x.sa", "en")], ["email", "preferred_language"]
+        )
+
+    def test_inserts_reject_unknown_tables_and_columns(self):
+        service = make_service()
+        with pytest.raises(ValueError):
+            asyncio.run(service.bulk_insert("pg_authid", [{"rolname": "x"}]))
+        with pytest.raises(ValueError):
+            asyncio.run(service.store_time_gate_link({"token; DROP TABLE users": "x"}))
+        with pytest.raises(ValueError, match="session"):
+            asyncio.run(service.store_time_gate_link({"user_id": "u1", "session": "s1"}))
+        with pytest.raises(ValueError, match="description"):
+            asyncio.run(service.store_evidence("u1", {"evidence_id": "e1", "description": "x"}))
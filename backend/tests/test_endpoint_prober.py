@@ -0,0 +1,136 @@
+"""
+Endpoint Prober Tests
+Latency histogram accuracy and concurrent, deadline-bounded probing
+"""
+import asyncio
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from aiohttp import web
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from health.endpoint_prober import EndpointProber, LatencyHistogram, ProbeTarget
+
+
+class LocalServer:
+    """aiohttp app on a background thread: /ok, /slow (sleeps 5 s), /error (500)"""
+
+    def __init__(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        self.port = sock.getsockname()[1]
+        sock.close()
+        self.loop = asyncio.new_event_loop()
+        self.started = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+        self.started.wait(5)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def _run(self):
+        async def ok(request):
+            return web.Response(text="ok")
+
+        async def slow(request):
+            await asyncio.sleep(5)
+            return web.Response(text="late")
+
+        async def error(request):
+            return web.Response(status=500)
+
+        async def start():
+            app = web.Application()
+            app.router.add_get("/ok", ok)
+            app.router.add_get("/slow", slow)
+            app.router.add_get("/error", error)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.TCPSite(runner, "127.0.0.1", self.port).start()
+            self.started.set()
+
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(start())
+        self.loop.run_forever()
+
+
+_server = None
+
+
+def _get_server():
+    global _server
+    if _server is None:
+        _server = LocalServer()
+    return _server
+
+
+class TestLatencyHistogram:
+    """Test LatencyHistogram"""
+
+    def test_percentiles_within_relative_error(self):
+        rng = np.random.default_rng(7)
+        values = rng.lognormal(mean=3.0, sigma=1.0, size=20000)  # ms
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        for p in (50, 90, 99):
+            expected = np.percentile(values, p)
+            assert abs(histogram.percentile(p) - expected) / expected < 0.02
+        assert histogram.summary()["count"] == 20000
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        for value in (1.0, 2.0, 3.0):
+            a.record(value)
+        b.record(100.0)
+        a.merge(b)
+        assert a.total == 4 and a.summary()["max"] == 100.0
+
+
+class TestEndpointProber:
+    """Test EndpointProber against a local server"""
+
+    def test_run_takes_max_probe_time_not_sum(self):
+        server = _get_server()
+        prober = EndpointProber()
+        try:
+            endpoints = [server.url("/slow"), server.url("/ok"), server.url("/error"),
+                         "http://127.0.0.1:9/unreachable"]
+            started = time.perf_counter()
+            probes = prober.probe(endpoints, timeout=0.3, samples=3)
+            elapsed = time.perf_counter() - started
+        finally:
+            prober.close()
+
+        assert elapsed < 0.9  # three blocking calls per endpoint would take far longer
+        assert probes[server.url("/slow")].error == "timeout"
+        assert probes[server.url("/ok")].success_rate == 1.0
+        assert probes[server.url("/ok")].percentiles["count"] == 3
+        assert probes[server.url("/error")].success_rate == 0.0
+        assert probes[server.url("/error")].status_codes == [500, 500, 500]
+        assert probes["http://127.0.0.1:9/unreachable"].error == "connection_error"
+
+    def test_async_callers_and_schedules(self):
+        server = _get_server()
+        prober = EndpointProber()
+
+        async def run():
+            probes = await prober.aprobe([server.url("/ok")], samples=2)
+            prober.schedule(ProbeTarget(url=server.url("/ok"), interval=0.02, samples=1))
+            await asyncio.sleep(0.2)
+            return probes
+
+        try:
+            probes = asyncio.run(run())
+            stats = prober.get_stats()
+        finally:
+            prober.close()
+
+        assert probes[server.url("/ok")].success_count == 2
+        assert stats[server.url("/ok")]["scheduled"]
+        assert stats[server.url("/ok")]["latency_ms"]["count"] >= 5
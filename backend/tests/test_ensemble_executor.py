@@ -0,0 +1,146 @@
+"""
+Ensemble Executor Tests
+Concurrent detectors, per-detector timeouts, shared-memory process detectors
+"""
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.ensemble_executor import Detector, EnsembleExecutor, shutdown_process_pool
+from logic import ultimate_algorithms
+from logic.ultimate_algorithms import UltimateAlgorithms
+
+
+def sleeper(seconds: float, score: float):
+    def detect(*_):
+        time.sleep(seconds)
+        return score
+    return detect
+
+
+def failing(*_):
+    raise ValueError("boom")
+
+
+def rendezvous(barrier: threading.Barrier, score: float):
+    """Only returns if every party of the barrier is running at the same time"""
+    def detect(*_):
+        barrier.wait()
+        return score
+    return detect
+
+
+def blocked(release: threading.Event, started: list, name: str):
+    def detect(*_):
+        started.append(name)
+        release.wait()
+        return 1.0
+    return detect
+
+
+@pytest.fixture(scope="module", autouse=True)
+def process_pool():
+    yield
+    shutdown_process_pool()
+
+
+class TestEnsembleExecutor:
+    """Test EnsembleExecutor"""
+
+    def setup_method(self):
+        self.executor = EnsembleExecutor(ThreadPoolExecutor(max_workers=4), default_timeout=2.0)
+
+    def test_thread_detectors_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=1.0)
+        run = self.executor.run([Detector("a", rendezvous(barrier, 0.1)), Detector("b", rendezvous(barrier, 0.3)),
+                                 Detector("c", sleeper(0.0, 0.5), mode="inline")])
+        assert run.scores == {"a": 0.1, "b": 0.3, "c": 0.5} and not run.degraded
+        assert [t["mode"] for t in run.timings.values()] == ["thread", "thread", "inline"]
+        assert all(t["status"] == "ok" for t in run.timings.values())
+
+    def test_timeouts_and_errors_degrade_gracefully(self):
+        release, started = threading.Event(), []
+        executor = EnsembleExecutor(ThreadPoolExecutor(max_workers=1), default_timeout=2.0)
+        try:
+            run = executor.run([
+                Detector("broken", failing),
+                Detector("slow", blocked(release, started, "slow"), timeout=0.1),
+                Detector("queued", blocked(release, started, "queued"), timeout=0.1),
+                Detector("fast", sleeper(0.0, 0.4), mode="inline"),
+            ])
+            # run() came back while "slow" was still blocked: its deadline was hit and
+            # "queued", stuck behind it on the single worker, was cancelled before starting
+            assert not release.is_set() and started == ["slow"]
+        finally:
+            release.set()
+            executor.thread_pool.shutdown(wait=True)
+        assert started == ["slow"]
+        assert run.scores == {"fast": 0.4}
+        assert run.missing == ["broken", "slow", "queued"]
+        assert {name: t["status"] for name, t in run.timings.items()} == {
+            "broken": "error", "slow": "timeout", "queued": "timeout", "fast": "ok"}
+        assert run.timings["slow"]["seconds"] >= 0.1
+
+    def test_process_detectors_read_shared_memory(self):
+        values = np.arange(1000, dtype=np.float64)
+        run = self.executor.run(
+            [Detector("total", lambda *_: -1.0, mode="process", process_fn=np.sum, timeout=60)],
+            arrays={"a": values}
+        )
+        assert run.scores == {"total": float(values.sum())}
+        assert run.timings["total"]["mode"] == "process" and run.timings["total"]["status"] == "ok"
+
+    def test_sequential_mode_runs_inline_in_order(self):
+        run = self.executor.run([Detector("x", sleeper(0, 1.0)), Detector("y", failing)], parallel=False)
+        assert run.scores == {"x": 1.0} and run.timings["y"]["status"] == "error"
+        assert {t["mode"] for t in run.timings.values()} == {"inline"}
+
+    def test_process_detector_needs_process_fn(self):
+        with pytest.raises(ValueError):
+            Detector("p", failing, mode="process")
+
+
+class TestParallelUltimateMutationDetection:
+    """Test the parallel ensemble against the sequential one"""
+
+    @staticmethod
+    def record():
+        rng = np.random.default_rng(0)
+        names = [f"m{j}" for j in range(6)]
+        baseline = {name: float(rng.uniform(10, 50)) for name in names}
+        history = [{name: value * rng.uniform(0.9, 1.1) for name, value in baseline.items() if rng.random() > 0.1}
+                   for _ in range(300)]
+        return {'timestamp': 0, 'metrics': {n: v * 1.2 for n, v in baseline.items()},
+                'baseline': baseline, 'historical_data': history}
+
+    @pytest.mark.parametrize("process_min_history, scan_mode", [(None, 'thread'), (0, 'process')])
+    def test_parallel_matches_sequential(self, process_min_history, scan_mode):
+        record = self.record()
+        sequential = UltimateAlgorithms()
+        sequential.parallel_processing = False
+        parallel = UltimateAlgorithms()
+        parallel.parallel_min_history = 0
+        parallel.process_min_history = process_min_history
+        parallel.ensemble.default_timeout = 60
+
+        expected = sequential.ultimate_mutation_detection(record)
+        result = parallel.ultimate_mutation_detection(record)
+
+        assert result['individual_scores'] == expected['individual_scores']
+        assert result['mutation_score'] == expected['mutation_score']
+        assert result['degraded_detectors'] == []
+        assert {name: t['mode'] for name, t in result['detector_timings'].items()} == {
+            'statistical': 'inline', 'machine_learning': 'thread',
+            'time_series': scan_mode, 'pattern_recognition': scan_mode
+        }
+
+    def test_process_pool_is_off_by_default(self, monkeypatch):
+        monkeypatch.setattr(ultimate_algorithms, "PROCESS_MIN_HISTORY", None)
+        assert UltimateAlgorithms().process_min_history is None
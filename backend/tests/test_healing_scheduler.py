@@ -0,0 +1,261 @@
+"""
+Healing Scheduler Tests
+Severity ordering, per-type limits, coalescing, timeouts and the bounded healing store
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.aeon_evolution_core import AeonEvolutionCore
+from logic.healing_scheduler import HealingEvent, HealingScheduler, HealingStatus, HealingStore, MutationType
+
+
+def make_event(event_id: str, severity: float = 0.5, mutation_type: MutationType = MutationType.MODEL_DRIFT,
+               target: str = None, timestamp: datetime = None) -> HealingEvent:
+    return HealingEvent(id=event_id, mutation_type=mutation_type, severity=severity,
+                        timestamp=timestamp or datetime.now(), status=HealingStatus.PENDING, duration=0.0,
+                        success_rate=0.0, recovery_metrics={}, metadata={'target': target or event_id})
+
+
+class Recorder:
+    """Healing strategy that records start order and peak concurrency"""
+
+    def __init__(self, delay: float = 0.0, gate: asyncio.Event = None):
+        self.delay = delay
+        self.gate = gate
+        self.started = []
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, event: HealingEvent):
+        self.started.append(event.id)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            if self.gate is not None:
+                await self.gate.wait()
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return {'success': True, 'success_rate': 0.9, 'recovery_metrics': {'event': event.id}}
+
+
+def strategies(recorder):
+    return {mutation_type: recorder for mutation_type in MutationType}
+
+
+class TestHealingScheduler:
+    """Test HealingScheduler"""
+
+    def test_most_severe_waiting_event_starts_first(self):
+        async def scenario():
+            gate = asyncio.Event()
+            recorder = Recorder(gate=gate)
+            scheduler = HealingScheduler(strategies(recorder), concurrency=1)
+            first = scheduler.submit(make_event("first", 0.4))
+            for event_id, severity in (("low", 0.4), ("high", 0.9), ("mid", 0.6)):
+                scheduler.submit(make_event(event_id, severity))
+            await asyncio.sleep(0)
+            gate.set()
+            await scheduler.join()
+            return recorder, await first
+
+        recorder, first = asyncio.run(scenario())
+        assert first is True
+        assert recorder.started == ["first", "high", "mid", "low"]
+        assert recorder.peak == 1
+
+    def test_concurrency_limit_is_per_type(self):
+        async def scenario():
+            drift, network = Recorder(delay=0.01), Recorder(delay=0.01)
+            scheduler = HealingScheduler({MutationType.MODEL_DRIFT: drift, MutationType.NETWORK_FAILURE: network},
+                                         concurrency={MutationType.MODEL_DRIFT: 2, MutationType.NETWORK_FAILURE: 3})
+            for i in range(10):
+                scheduler.submit(make_event(f"d{i}"))
+                scheduler.submit(make_event(f"n{i}", mutation_type=MutationType.NETWORK_FAILURE))
+            assert scheduler.get_stats()['running'] == {**{t.value: 0 for t in MutationType},
+                                                        'model_drift': 2, 'network_failure': 3}
+            await scheduler.join()
+            return drift, network, scheduler
+
+        drift, network, scheduler = asyncio.run(scenario())
+        assert (drift.peak, network.peak) == (2, 3)
+        assert scheduler.counts['completed'] == 20 and scheduler.pending == 0
+
+    def test_repeats_coalesce_into_the_queued_or_running_healing(self):
+        async def scenario():
+            gate = asyncio.Event()
+            recorder = Recorder(gate=gate)
+            scheduler = HealingScheduler(strategies(recorder), concurrency=1)
+            scheduler.submit(make_event("blocker", 0.9, target="other"))
+            queued = make_event("queued", 0.3, target="db")
+            futures = [scheduler.submit(queued)]
+            futures += [scheduler.submit(make_event(f"repeat{i}", 0.3 + i / 10, target="db")) for i in range(1, 5)]
+            assert all(future is futures[0] for future in futures)
+            gate.set()
+            await scheduler.join()
+            return recorder, queued, scheduler, await futures[0]
+
+        recorder, queued, scheduler, result = asyncio.run(scenario())
+        assert result is True and recorder.started == ["blocker", "queued"]
+        assert queued.metadata['coalesced'] == 4 and queued.severity == pytest.approx(0.7)
+        assert scheduler.counts['coalesced'] == 4 and scheduler.counts['started'] == 2
+
+    def test_timeout_and_cancellation(self):
+        async def scenario():
+            finished = []
+            scheduler = HealingScheduler(strategies(Recorder(delay=10)), on_finished=finished.append,
+                                         concurrency=1, timeout=0.02)
+            slow = make_event("slow")
+            timed_out = scheduler.submit(slow)
+            running = scheduler.submit(make_event("running", mutation_type=MutationType.DATA_CORRUPTION),
+                                       timeout=10)
+            waiting = scheduler.submit(make_event("waiting", mutation_type=MutationType.DATA_CORRUPTION))
+            await asyncio.sleep(0)
+            assert scheduler.cancel("waiting") and scheduler.cancel("running")
+            assert not scheduler.cancel("unknown")
+            results = await asyncio.gather(timed_out, running, waiting)
+            return slow, finished, results, scheduler
+
+        slow, finished, results, scheduler = asyncio.run(scenario())
+        assert results == [False, False, False]
+        assert slow.status == HealingStatus.FAILED and "timed out" in slow.metadata['error']
+        assert {event.id: event.status for event in finished} == {
+            "slow": HealingStatus.FAILED, "running": HealingStatus.CANCELLED, "waiting": HealingStatus.CANCELLED}
+        assert scheduler.counts['timed_out'] == 1 and scheduler.counts['cancelled'] == 2 and len(scheduler) == 0
+
+    def test_full_queue_rejects(self):
+        async def scenario():
+            scheduler = HealingScheduler(strategies(Recorder(delay=0.01)), concurrency=1, max_pending=2)
+            events = [make_event(f"e{i}") for i in range(5)]
+            futures = [scheduler.submit(event) for event in events]
+            assert [future.done() for future in futures] == [False, False, False, True, True]
+            await scheduler.join()
+            return events, await asyncio.gather(*futures), scheduler
+
+        events, results, scheduler = asyncio.run(scenario())
+        assert results == [True, True, True, False, False] and scheduler.counts['rejected'] == 2
+        assert [event.status for event in events[3:]] == [HealingStatus.FAILED] * 2
+        assert all(event.metadata['error'] == "rejected: queue full" for event in events[3:])
+
+
+class TestHealingStore:
+    """Test HealingStore"""
+
+    def test_bounded_history_with_running_metrics(self):
+        store = HealingStore(capacity=10)
+        start = datetime(2026, 1, 1)
+        for i in range(50):
+            event = make_event(f"e{i}", timestamp=start + timedelta(seconds=i))
+            event.status = HealingStatus.COMPLETED if i % 5 else HealingStatus.FAILED
+            event.duration, event.success_rate = float(i), 0.5
+            store.record(event)
+
+        completed = [i for i in range(50) if i % 5]
+        metrics = store.metrics
+        assert len(store) == 10
+        assert (metrics.total_healing_events, metrics.successful_healings, metrics.failed_healings) == (50, 40, 10)
+        assert metrics.average_healing_time == pytest.approx(sum(completed) / len(completed))
+        assert metrics.evolution_score == pytest.approx(80.0)
+        assert metrics.last_healing == start + timedelta(seconds=49)
+        assert [event.id for event in store.recent(3)] == ["e49", "e48", "e47"]
+
+
+class TestAeonScheduling:
+    """Test AeonEvolutionCore on top of the scheduler"""
+
+    @staticmethod
+    def fast_core(**options):
+        core = AeonEvolutionCore(scheduler_options=options)
+        recorder = Recorder()
+        core.healing_strategies.update(strategies(recorder))
+        return core, recorder
+
+    def test_detect_then_initiate(self):
+        core, recorder = self.fast_core()
+        notified = []
+        core.add_healing_callback(notified.append)
+        assert core.detect_mutation({'mutation_type': 'model_drift', 'severity': 0.8, 'timestamp': datetime.now()})
+        assert not core.detect_mutation({'mutation_type': 'model_drift', 'severity': 0.1, 'timestamp': datetime.now()})
+        event_id = next(iter(core.active_healings))
+
+        assert asyncio.run(core.initiate_healing(event_id)) is True
+        assert core.active_healings == {} and [event.id for event in notified] == [event_id]
+        assert core.get_healing_history()[0]['status'] == 'completed'
+        assert core.get_evolution_metrics()['successful_healings'] == 1
+
+    def test_coalesced_healing_is_recorded_not_dropped(self):
+        core, recorder = self.fast_core()
+        notified = []
+        core.add_healing_callback(notified.append)
+        for _ in range(2):
+            assert core.detect_mutation({'mutation_type': 'model_drift', 'severity': 0.8, 'timestamp': datetime.now(),
+                                         'metadata': {'target': 'db'}})
+        first_id, repeat_id = core.active_healings
+
+        async def scenario():
+            return await asyncio.gather(core.initiate_healing(first_id), core.initiate_healing(repeat_id))
+
+        assert asyncio.run(scenario()) == [True, True]
+        assert recorder.started == [first_id] and core.active_healings == {}
+        history = {event['id']: event for event in core.get_healing_history()}
+        assert history[first_id]['status'] == 'completed' and history[first_id]['metadata']['coalesced'] == 1
+        assert history[repeat_id]['status'] == 'coalesced'
+        assert history[repeat_id]['metadata']['coalesced_into'] == first_id
+        assert sorted(event.id for event in notified) == sorted([first_id, repeat_id])
+        metrics = core.get_evolution_metrics()
+        assert (metrics['total_healing_events'], metrics['successful_healings'], metrics['failed_healings'],
+                metrics['coalesced_healings']) == (1, 1, 0, 1)
+
+    def test_rejected_healing_is_recorded_not_dropped(self):
+        core, recorder = self.fast_core(max_pending=0)
+        notified = []
+        core.add_healing_callback(notified.append)
+        assert core.detect_mutation({'mutation_type': 'model_drift', 'severity': 0.8, 'timestamp': datetime.now()})
+        detected_id = next(iter(core.active_healings))
+
+        async def scenario():
+            submitted = core.submit_mutation({'mutation_type': 'data_corruption', 'severity': 0.8,
+                                              'timestamp': datetime.now()})
+            return await core.initiate_healing(detected_id), await submitted
+
+        assert asyncio.run(scenario()) == (False, False)
+        assert recorder.started == [] and core.active_healings == {} and len(notified) == 2
+        history = core.get_healing_history()
+        assert [event['status'] for event in history] == ['failed', 'failed']
+        assert {event['metadata']['error'] for event in history} == {"rejected: queue full"}
+        assert detected_id in {event['id'] for event in history}
+        metrics = core.get_evolution_metrics()
+        assert (metrics['total_healing_events'], metrics['failed_healings']) == (2, 2)
+
+    def test_stress_ten_thousand_mutations(self):
+        """10k mutation events over 200 targets: all resolved, each started, coalesced or rejected"""
+        core, recorder = self.fast_core(concurrency=4)
+        mutation_types = [mutation_type.value for mutation_type in MutationType]
+        now = datetime.now()
+        mutations = [{'mutation_type': mutation_types[i % 5], 'severity': 0.3 + (i * 7 % 70) / 100,
+                      'timestamp': now, 'metadata': {'target': f"service-{i % 200}"}} for i in range(10_000)]
+
+        async def scenario():
+            futures = []
+            for i, mutation in enumerate(mutations):
+                futures.append(core.submit_mutation(mutation))
+                if i % 500 == 499:
+                    await asyncio.sleep(0)    # let healings finish between bursts
+            results = await asyncio.gather(*futures)
+            await core.scheduler.join()
+            return results
+
+        results = asyncio.run(scenario())
+        counts = core.scheduler.counts
+        assert all(results) and recorder.peak <= 4 * len(MutationType)
+        assert counts['submitted'] == counts['coalesced'] + counts['started'] + counts['rejected'] == 10_000
+        assert counts['completed'] == counts['started'] > 200
+        assert core.evolution_metrics.total_healing_events == counts['completed'] + counts['rejected']
+        assert core.evolution_metrics.coalesced_healings == counts['coalesced']
+        assert len(core.healing_store) <= core.healing_store.events.maxlen and core.active_healings == {}
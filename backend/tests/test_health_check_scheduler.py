@@ -0,0 +1,128 @@
+"""
+Health Check Scheduler Tests
+Cached serving, single-flight fresh reads, cost limits, timeouts and dependencies
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from health.check_scheduler import CheckSpec, CostClass, HealthCheckScheduler, RunStatus
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingCheck:
+    def __init__(self, result="ok", delay=0.0):
+        self.calls = 0
+        self.result = result
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.result
+
+
+class TestHealthCheckScheduler:
+    """Test HealthCheckScheduler"""
+
+    def test_results_are_cached_until_stale(self):
+        async def run():
+            clock = FakeClock()
+            check = CountingCheck()
+            scheduler = HealthCheckScheduler(clock=clock)
+            scheduler.register(CheckSpec("db", check, interval=30, timeout=1, staleness_budget=60))
+
+            for _ in range(20):
+                await scheduler.get("db")
+            cached_calls = check.calls
+            clock.now += 61
+            state = await scheduler.get("db")  # stale: served now, refreshed behind
+            served_stale = scheduler.is_stale("db")
+            await scheduler.states["db"].inflight
+            return cached_calls, served_stale, state, check.calls, scheduler.is_stale("db")
+
+        cached_calls, served_stale, state, calls, stale_after = asyncio.run(run())
+        assert cached_calls == 1
+        assert served_stale and state.status == RunStatus.OK
+        assert calls == 2 and not stale_after
+
+    def test_fresh_reads_are_single_flight_and_cost_limited(self):
+        async def run():
+            clock = FakeClock()
+            cheap, paid = CountingCheck(delay=0.01), CountingCheck(delay=0.01)
+            scheduler = HealthCheckScheduler(clock=clock)
+            scheduler.register(CheckSpec("db", cheap, interval=30, timeout=1, cost=CostClass.CHEAP))
+            scheduler.register(CheckSpec("openai", paid, interval=300, timeout=1, cost=CostClass.EXPENSIVE))
+
+            await scheduler.collect()
+            clock.now += 5
+            await asyncio.gather(*(scheduler.collect(fresh=True) for _ in range(50)))
+            return cheap.calls, paid.calls
+
+        cheap_calls, paid_calls = asyncio.run(run())
+        assert cheap_calls == 2  # one cold run + one shared forced refresh
+        assert paid_calls == 1   # inside the expensive check's minimum refresh interval
+
+    def test_timeout_keeps_previous_result(self):
+        async def run():
+            check = CountingCheck()
+            scheduler = HealthCheckScheduler()
+            scheduler.register(CheckSpec("slow", check, interval=30, timeout=0.02, cost=CostClass.FREE))
+            await scheduler.get("slow")
+            check.delay, check.result = 1.0, "never"
+            return await scheduler.get("slow", fresh=True)
+
+        state = asyncio.run(run())
+        assert state.status == RunStatus.TIMEOUT
+        assert state.result == "ok" and "timed out" in state.error
+
+    def test_unhealthy_dependency_skips_dependent(self):
+        async def run():
+            db, memory = CountingCheck(result="down"), CountingCheck()
+            scheduler = HealthCheckScheduler()
+            scheduler.register(CheckSpec("db", db, interval=30, timeout=1, is_healthy=lambda r: r == "up"))
+            scheduler.register(CheckSpec("memory", memory, interval=30, timeout=1, depends_on=("db",)))
+            skipped = (await scheduler.get("memory")).status
+            db.result = "up"
+            for state in scheduler.states.values():
+                state.finished_at -= 5  # past the cheap checks' minimum refresh interval
+            await scheduler.get("db", fresh=True)
+            ran = await scheduler.get("memory", fresh=True)
+            return skipped, ran.status, db.calls, memory.calls
+
+        skipped, ran, db_calls, memory_calls = asyncio.run(run())
+        assert skipped == RunStatus.SKIPPED
+        assert ran == RunStatus.OK
+        assert db_calls == 2 and memory_calls == 1
+
+    def test_unknown_dependency_rejected(self):
+        scheduler = HealthCheckScheduler()
+        try:
+            scheduler.register(CheckSpec("memory", CountingCheck(), interval=1, timeout=1, depends_on=("db",)))
+        except ValueError:
+            return
+        raise AssertionError("expected ValueError")
+
+    def test_background_loops_run_on_their_own_cadence(self):
+        async def run():
+            fast, slow = CountingCheck(), CountingCheck()
+            scheduler = HealthCheckScheduler()
+            scheduler.register(CheckSpec("fast", fast, interval=0.01, timeout=1, jitter=0.0))
+            scheduler.register(CheckSpec("slow", slow, interval=10, timeout=1, jitter=0.0))
+            scheduler.start()
+            await asyncio.sleep(0.1)
+            await scheduler.stop()
+            return fast.calls, slow.calls
+
+        fast_calls, slow_calls = asyncio.run(run())
+        assert fast_calls >= 4
+        assert slow_calls == 1
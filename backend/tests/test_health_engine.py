@@ -0,0 +1,152 @@
+"""
+Health Engine Tests
+Shared probes, the alert pipeline and views over one engine
+"""
+import gc
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from health.anomaly_detector import StreamingAnomalyDetector
+from health.endpoint_prober import EndpointProbe
+from health.engine import HealthEngine, as_enum, get_health_engine
+from health.resource_sampler import ResourceSampler
+from health.timeseries_store import TimeSeriesStore
+
+
+class FakeProber:
+    """Counts prober runs; each probe takes `delay` seconds"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.runs = []
+
+    def probe(self, endpoints, timeout=None, samples=None):
+        self.runs.append((list(endpoints), samples))
+        time.sleep(self.delay)
+        return {
+            url: EndpointProbe(url=url, samples=samples, request_times=[5.0] * samples,
+                               status_codes=[200] * samples, success_count=samples)
+            for url in endpoints
+        }
+
+
+def make_engine(prober=None, **kwargs):
+    return HealthEngine(
+        sampler=ResourceSampler(collector=lambda: None),
+        prober=prober or FakeProber(),
+        history=TimeSeriesStore(tempfile.mkdtemp()),
+        detector=StreamingAnomalyDetector(),
+        **kwargs
+    )
+
+
+class TestSharedProbes:
+    """Test HealthEngine.probe"""
+
+    def test_views_within_ttl_share_one_probe(self):
+        prober = FakeProber()
+        engine = make_engine(prober, probe_ttl=60)
+        urls = ["http://a/health", "http://b/health"]
+
+        engine.probe(urls, samples=3)
+        engine.probe(urls, samples=1)               # fewer samples: served from cache
+        engine.probe(urls + ["http://c/health"], samples=3)
+        engine.probe(urls, samples=10)              # more samples than cached: probed again
+
+        assert prober.runs == [(urls, 3), (["http://c/health"], 3), (urls, 10)]
+        assert engine.get_stats()["probe_hits"] == 4
+
+    def test_concurrent_callers_join_the_probe_in_flight(self):
+        prober = FakeProber(delay=0.2)
+        engine = make_engine(prober)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(engine.probe(["http://a/health"], samples=1)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(prober.runs) == 1
+        assert len({id(result["http://a/health"]) for result in results}) == 1
+
+
+class TestAlertPipeline:
+    """Test HealthEngine.emit"""
+
+    def test_repeats_fold_and_subscribers_see_each_alert_once(self):
+        engine = make_engine(dedup_window=60)
+        received = []
+        engine.subscribe(received.append)
+
+        first = engine.emit("critical", "CPU 95%", "system_check")
+        again = engine.emit("critical", "CPU 97%", "system_check")
+        other = engine.emit("warning", "CPU 85%", "system_check")
+
+        assert again is first and first.occurrences == 2 and first.message == "CPU 97%"
+        assert received == [first, other]
+        assert engine.get_stats()["alerts_folded"] == 1
+
+    def test_views_are_held_weakly_and_can_unsubscribe(self):
+        engine = make_engine()
+
+        class View:
+            def __init__(self):
+                self.received = []
+                engine.subscribe(self.receive)
+
+            def receive(self, event):
+                self.received.append(event)
+
+        kept, closed, dropped = View(), View(), View()
+        assert engine.unsubscribe(closed.receive) and not engine.unsubscribe(closed.receive)
+        del dropped
+        gc.collect()
+
+        event = engine.emit("warning", "disk 85%", "disk_check")
+        assert kept.received == [event] and closed.received == []
+        assert engine.get_stats()["subscribers"] == 1
+
+    def test_anomalies_reach_subscribers(self):
+        engine = make_engine()
+        received = []
+        engine.subscribe(received.append)
+        for i in range(100):
+            engine.detector.observe({"system.cpu_percent": 20.0 + (i % 3)}, timestamp=i)
+        engine.detector.observe({"system.cpu_percent": 95.0}, timestamp=100)
+
+        assert [event.source for event in received] == ["anomaly_detector"]
+        assert received[0].metadata["metric"] == "system.cpu_percent"
+
+    def test_as_enum_falls_back_for_unknown_values(self):
+        from health.expanded_monitoring import AlertLevel
+        assert as_enum(AlertLevel, "warning", AlertLevel.CRITICAL) is AlertLevel.WARNING
+        assert as_enum(AlertLevel, "emergency", AlertLevel.CRITICAL) is AlertLevel.CRITICAL
+
+
+class TestHealthViews:
+    """Test the health classes as views over the process engine"""
+
+    def test_views_share_one_engine_and_alert_pipeline(self):
+        from health.comprehensive_health_checks import comprehensive_health_checks
+        from health.expanded_monitoring import health_monitor
+        from health.ultimate_health_system import AlertSeverity, CheckCategory, ultimate_health_system
+
+        engine = get_health_engine()
+        assert health_monitor.engine is engine
+        assert ultimate_health_system.engine is engine
+        assert comprehensive_health_checks.engine is engine
+        assert ultimate_health_system.executor is engine.executor
+
+        alert = ultimate_health_system._create_health_alert(
+            AlertSeverity.EMERGENCY, CheckCategory.DATABASE, "pool exhausted", "test_views_share_engine"
+        )
+        assert alert.id in [a.id for a in ultimate_health_system.health_alerts]
+        mirrored = [a for a in health_monitor.alerts if a.id == alert.id]
+        assert len(mirrored) == 1 and mirrored[0].level.value == "critical"
@@ -0,0 +1,118 @@
+"""
+Algorithm Instrumentation Tests
+Histogram timing, sampled size logging, captures and async-aware wrapping
+"""
+import asyncio
+import logging
+import sys
+import time
+from inspect import iscoroutinefunction
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.aeon_evolution_core import AeonEvolutionCore
+from logic.instrumentation import AlgorithmInstrumentation, size_summary
+from metrics.exporter import MetricsRegistry
+
+log = logging.getLogger("tests.instrumentation")
+
+
+class Sized:
+    """Counts how often it is stringified"""
+
+    def __init__(self):
+        self.rendered = 0
+
+    def __str__(self):
+        self.rendered += 1
+        return "x" * 10
+
+    __repr__ = __str__
+
+
+def make(sample_rate=0.0, **kwargs):
+    histogram = MetricsRegistry().histogram("duration_seconds", "test", ("algorithm", "outcome"))
+    return AlgorithmInstrumentation(sample_rate=sample_rate, histogram=histogram, **kwargs)
+
+
+class TestAlgorithmInstrumentation:
+    """Test AlgorithmInstrumentation"""
+
+    def test_every_call_is_timed_into_the_histogram(self):
+        instrumentation = make()
+
+        def double(x):
+            return x * 2
+
+        work = instrumentation.instrument(double, log)
+        assert [work(i) for i in range(5)] == [0, 2, 4, 6, 8]
+
+        stats = instrumentation.get_stats()[double.__qualname__]
+        assert stats["calls"] == 5 and stats["errors"] == 0 and stats["total_seconds"] >= 0
+
+    def test_size_measurement_and_logging_are_sampled(self, caplog):
+        instrumentation = make(sample_rate=0.25)
+        arg = Sized()
+        work = instrumentation.instrument(lambda value: None, log, "Perf", size_summary)
+
+        with caplog.at_level(logging.INFO, logger=log.name):
+            for _ in range(8):
+                work(arg)
+        assert arg.rendered == 2
+        lines = [r.getMessage() for r in caplog.records if r.name == log.name]
+        assert len(lines) == 2 and lines[0].startswith("Perf - <lambda>: ") and "Input: " in lines[0]
+
+        instrumentation.configure(sample_rate=0)
+        work(arg)
+        assert arg.rendered == 2
+
+    def test_failures_are_logged_counted_and_reraised(self, caplog):
+        instrumentation = make()
+
+        def broken():
+            raise ValueError("boom")
+
+        work = instrumentation.instrument(broken, log)
+        with caplog.at_level(logging.ERROR, logger=log.name), pytest.raises(ValueError):
+            work()
+        assert "broken failed after" in caplog.records[0].getMessage()
+        assert instrumentation.get_stats()[broken.__qualname__]["errors"] == 1
+
+    def test_coroutines_are_timed_until_awaited(self):
+        instrumentation = make()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        work = instrumentation.instrument(slow, log)
+        assert iscoroutinefunction(work)
+        assert asyncio.run(work()) == "done"
+        assert instrumentation.get_stats()[slow.__qualname__]["total_seconds"] >= 0.05
+
+    def test_profile_and_tracemalloc_captures(self):
+        instrumentation = make(profile_every=2, tracemalloc_every=3, max_captures=4)
+
+        def allocate():
+            return [0] * 100_000
+
+        work = instrumentation.instrument(allocate, log)
+        for _ in range(6):
+            work()
+
+        kinds = [c["kind"] for c in instrumentation.get_captures(allocate.__qualname__)]
+        assert kinds == ["cprofile", "cprofile", "tracemalloc", "cprofile"]      # calls 0, 2, 3, 4
+        capture = instrumentation.get_captures()[2]
+        assert capture["peak_bytes"] >= 800_000
+        assert "allocate" in instrumentation.get_captures()[0]["profile"]
+
+
+class TestAeonHealingInstrumentation:
+    """Test the Aeon decorator on a coroutine"""
+
+    def test_initiate_healing_stays_a_coroutine_function(self):
+        assert iscoroutinefunction(AeonEvolutionCore.initiate_healing)
+        assert asyncio.run(AeonEvolutionCore().initiate_healing("missing")) is False
@@ -0,0 +1,138 @@
+"""
+Feature Index Tests
+KD-tree + tail kNN against brute force, incremental growth and the per-dict ML detector
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.knn_index import FeatureIndex, HistoryIndexCache, knn_score
+from logic.ultimate_algorithms import UltimateAlgorithms
+
+
+def brute_force(rows: np.ndarray, query: np.ndarray, k: int):
+    distances = np.sqrt(((rows.astype(np.float64) - query.astype(np.float32)) ** 2).sum(axis=1))
+    return np.sort(distances)[:k], distances.max()
+
+
+class TestFeatureIndex:
+    """Test FeatureIndex"""
+
+    def test_incremental_adds_match_brute_force(self):
+        rng = np.random.default_rng(0)
+        index = FeatureIndex(6, capacity=16, min_rebuild=64, rebuild_ratio=0.25, shell_size=4096)
+        rows = rng.normal(0, 0.1, (3000, 6))
+        for chunk in np.array_split(rows, 97):
+            index.add(chunk)
+
+        assert len(index) == 3000 and index.rebuilds > 1
+        assert len(index._segments) == 2 and 0 < index.indexed < 3000   # both trees and the tail are searched
+        stored = rows.astype(np.float32)
+        np.testing.assert_array_equal(index.data, stored)
+        for query in rng.normal(0, 0.15, (25, 6)):
+            nearest, farthest = index.query(query, k=5)
+            expected_nearest, expected_farthest = brute_force(stored, query, 5)
+            np.testing.assert_allclose(nearest[0], expected_nearest, rtol=1e-6)
+            assert farthest[0] == pytest.approx(expected_farthest, rel=1e-6)
+
+    def test_outer_shell_bounds_the_farthest_distance(self):
+        rng = np.random.default_rng(1)
+        index = FeatureIndex(4, shell_size=256)
+        rows = rng.normal(0, 1.0, (20_000, 4))
+        index.add(rows)
+
+        for query in rng.normal(0, 1.0, (20, 4)):
+            _, farthest = index.query(query)
+            _, exact = brute_force(rows.astype(np.float32), query, 1)
+            assert farthest[0] <= exact * (1 + 1e-6)
+            assert farthest[0] == pytest.approx(exact, rel=1e-6)
+
+    def test_batch_queries_match_single_queries(self):
+        rng = np.random.default_rng(2)
+        index = FeatureIndex(3, min_rebuild=100)
+        index.add(rng.uniform(-1, 1, (1500, 3)))
+        queries = rng.uniform(-1, 1, (40, 3))
+
+        batch = index.score(queries, k=5)
+        single = np.array([index.score(query, k=5)[0] for query in queries])
+        np.testing.assert_allclose(batch, single, rtol=1e-12)
+
+    def test_small_and_empty_indexes(self):
+        index = FeatureIndex(2)
+        assert index.score(np.zeros(2)).tolist() == [0.0]
+        index.add([[1.0, 0.0], [0.0, 3.0]])
+        nearest, farthest = index.query([0.0, 0.0], k=5)
+        np.testing.assert_allclose(nearest[0], [1.0, 3.0])
+        assert index.score([0.0, 0.0])[0] == pytest.approx(2.0 / 3.0)
+        assert knn_score(np.array([[1.0, 0.0], [0.0, 3.0]]), np.zeros(2)) == pytest.approx(2.0 / 3.0)
+
+
+class TestIndexedMLMutationDetection:
+    """Test the indexed path of UltimateAlgorithms._ml_mutation_detection"""
+
+    def setup_method(self):
+        rng = np.random.default_rng(3)
+        self.names = [f"m{j}" for j in range(5)]
+        self.baseline = {name: float(v) for name, v in zip(self.names, rng.uniform(10, 50, 5))}
+        self.history = [
+            {name: value * rng.uniform(0.9, 1.1) for name, value in self.baseline.items() if rng.random() > 0.05}
+            for _ in range(5000)
+        ]
+        self.current = {name: value * 1.2 for name, value in self.baseline.items()}
+
+    def test_indexed_scores_match_brute_force(self):
+        indexed, brute = UltimateAlgorithms(), UltimateAlgorithms()
+        indexed.knn_index_min_history = 0
+        brute.knn_index_min_history = 10 ** 9
+
+        expected = brute._ml_mutation_detection(self.current, self.baseline, self.history)
+        assert expected > 0
+        assert indexed._ml_mutation_detection(self.current, self.baseline, self.history) == \
+            pytest.approx(expected, rel=1e-5)
+
+    def test_appended_history_is_indexed_incrementally(self):
+        algorithms = UltimateAlgorithms()
+        algorithms.knn_index_min_history = 0
+        history = self.history[:4000]
+        algorithms._ml_mutation_detection(self.current, self.baseline, history)
+        index = next(iter(algorithms.history_index._entries.values()))['index']
+
+        history.extend(self.history[4000:])
+        score = algorithms._ml_mutation_detection(self.current, self.baseline, history)
+
+        entry = next(iter(algorithms.history_index._entries.values()))
+        assert entry['index'] is index and entry['consumed'] == 5000
+        assert score == pytest.approx(knn_score(*self._brute_inputs(history)), rel=1e-5)
+
+        # A different list is indexed on its own
+        algorithms._ml_mutation_detection(self.current, self.baseline, list(history))
+        assert len(algorithms.history_index._entries) == 2
+
+    def _brute_inputs(self, history):
+        base = np.array([self.baseline[name] for name in self.names])
+        rows = np.array([[point[name] for name in self.names] for point in history
+                         if all(name in point for name in self.names)])
+        current = np.array([self.current[name] for name in self.names])
+        return (rows - base) / base, (current - base) / base
+
+
+class TestHistoryIndexCache:
+    """Test HistoryIndexCache invalidation"""
+
+    def test_rewritten_history_is_reindexed(self):
+        cache = HistoryIndexCache(max_entries=1)
+        base = np.array([10.0])
+        history = [{"x": 10.0}, {"x": 11.0}, {"y": 1.0}]
+        index, partial = cache.get(history, ["x"], base)
+        assert len(index) == 2 and partial == 0
+
+        history[-1] = {"x": 12.0}                       # same length, different last point
+        rebuilt, _ = cache.get(history, ["x"], base)
+        assert rebuilt is not index and len(rebuilt) == 3
+
+        history.pop()
+        assert len(cache.get(history, ["x"], base)[0]) == 2
@@ -0,0 +1,118 @@
+"""
+Event Loop Monitor Tests
+Lag measurement, stack and route attribution, and the blocking test mode
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from metrics.loop_monitor import BlockingCallError, LoopMonitor, LoopMonitorMiddleware
+
+
+def blocking_helper(seconds: float):
+    """A synchronous call made from a coroutine"""
+    time.sleep(seconds)
+
+
+def make_app(monitor: LoopMonitor) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(LoopMonitorMiddleware, monitor=monitor)
+
+    @app.on_event("startup")
+    async def start():
+        monitor.start()
+
+    @app.on_event("shutdown")
+    async def stop():
+        await monitor.stop()
+
+    @app.get("/items/{item_id}")
+    async def slow_item(item_id: int):
+        blocking_helper(0.2)
+        return {"id": item_id}
+
+    @app.get("/fast")
+    async def fast():
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    return app
+
+
+class TestLoopMonitor:
+    """Test LoopMonitor"""
+
+    def test_blocking_callback_is_captured_with_its_stack(self):
+        async def scenario():
+            monitor = LoopMonitor(interval=0.01, threshold=0.05)
+            monitor.start()
+            await asyncio.sleep(0.05)
+            blocking_helper(0.2)
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+            return monitor.get_report()
+
+        report = asyncio.run(scenario())
+        assert report["stalls"] == 1
+        stall = report["recent_stalls"][0]
+        assert stall["duration_ms"] >= 50
+        assert stall["module"] == __name__
+        assert stall["route"] == "background"
+        assert any("blocking_helper" in line for line in stall["stack"])
+        assert report["lag_ms"]["max"] >= 50
+        assert list(report["blocked_seconds_by_module"]) == [__name__]
+
+    def test_short_awaits_are_not_stalls(self):
+        async def scenario():
+            monitor = LoopMonitor(interval=0.01, threshold=0.05)
+            monitor.start()
+            for _ in range(20):
+                await asyncio.sleep(0.005)
+            await monitor.stop()
+            return monitor.get_report()
+
+        report = asyncio.run(scenario())
+        assert report["stalls"] == 0
+        assert report["lag_ms"]["samples"] >= 5
+
+    def test_watch_raises_when_the_block_exceeds_the_limit(self):
+        async def scenario():
+            monitor = LoopMonitor(interval=0.01, threshold=0.1)
+            async with monitor.watch(max_block_ms=20):
+                await asyncio.sleep(0.02)
+            with pytest.raises(BlockingCallError, match="blocking_helper"):
+                async with monitor.watch(max_block_ms=20):
+                    await asyncio.sleep(0.02)
+                    blocking_helper(0.1)
+            assert monitor.threshold == 0.1 and not monitor.running
+
+        asyncio.run(scenario())
+
+
+class TestLoopMonitorMiddleware:
+    """Test route attribution and the request test mode"""
+
+    def test_stalls_are_attributed_to_the_route_template(self):
+        monitor = LoopMonitor(interval=0.01, threshold=0.05)
+        with TestClient(make_app(monitor)) as client:
+            assert client.get("/items/7").json() == {"id": 7}
+            assert client.get("/fast").status_code == 200
+            report = monitor.get_report()
+
+        assert list(report["blocked_seconds_by_route"]) == ["/items/{item_id}"]
+        assert report["recent_stalls"][0]["module"] == __name__
+
+    def test_test_mode_fails_a_blocking_handler(self):
+        monitor = LoopMonitor(interval=0.01, threshold=0.05, fail_after=0.05)
+        with TestClient(make_app(monitor)) as client:
+            assert client.get("/fast").status_code == 200
+            with pytest.raises(BlockingCallError, match="/items/{item_id}"):
+                client.get("/items/1")
@@ -0,0 +1,161 @@
+"""
+Metrics Exporter Tests
+Exposition format, lock-free shards, multiprocess merge and route labels
+"""
+import gc
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from metrics.exporter import HTTP_REQUEST_DURATION, MetricsRegistry
+from metrics.middleware import MetricsMiddleware
+
+
+class TestMetricsRegistry:
+    """Test MetricsRegistry"""
+
+    def test_openmetrics_exposition(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("route",))
+        depth = registry.gauge("queue_depth", "Depth", ("queue",))
+        latency = registry.histogram("latency_seconds", "Latency", unit="seconds", buckets=(0.1, 1.0))
+
+        requests.labels("/a").inc()
+        requests.labels(route="/a").inc(2)
+        depth.labels("jobs").set_function(lambda: 7)
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value)
+
+        text = registry.render()
+        assert 'requests_total{route="/a"} 3' in text
+        assert "# TYPE requests counter" in text
+        assert 'queue_depth{queue="jobs"} 7' in text
+        assert "# UNIT latency_seconds seconds" in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1.0"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "latency_seconds_count 3" in text
+        assert text.endswith("# EOF\n")
+        assert "# EOF" not in registry.render(openmetrics=False)
+
+    def test_threads_never_lose_observations(self):
+        registry = MetricsRegistry()
+        child = registry.histogram("work_seconds", "Work").labels()
+
+        def worker():
+            for _ in range(50_000):
+                child.observe(0.01)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert "work_seconds_count 200000" in registry.render()
+
+    def test_hot_path_takes_no_lock_after_the_first_observation(self):
+        class ForbiddenLock:
+            def __enter__(self):
+                raise AssertionError("observation took the shard lock")
+
+            def __exit__(self, *exc):
+                return False
+
+        child = MetricsRegistry().histogram("hot_seconds", "Hot", ("route",)).labels("/x")
+        child.observe(0.003)
+        lock, child._shards.lock = child._shards.lock, ForbiddenLock()
+        for _ in range(1000):
+            child.observe(0.003)
+        child._shards.lock = lock
+        assert sum(child.values()[:-1]) == 1001
+
+    def test_exited_threads_are_folded_into_retired_totals(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs").labels()
+        histogram = registry.histogram("job_seconds", "Jobs", buckets=(1.0,)).labels()
+
+        def worker():
+            counter.inc()
+            histogram.observe(0.5)
+
+        for _ in range(200):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        gc.collect()
+
+        assert counter._shards.lists == {} and histogram._shards.lists == {}
+        assert counter.values() == [200.0]
+        assert histogram.values() == [200.0, 0.0, 100.0]
+
+    def test_gauge_updates_are_atomic(self):
+        gauge = MetricsRegistry().gauge("inflight", "Inflight").labels()
+
+        def worker():
+            for _ in range(20_000):
+                gauge.inc()
+                gauge.dec(0.5)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert gauge.values() == [40_000.0]
+
+    def test_multiprocess_merge(self):
+        directory = tempfile.mkdtemp()
+        registry = MetricsRegistry(multiproc_dir=directory, flush_interval=3600)
+        registry.counter("jobs_total", "Jobs").inc(2)
+        registry.gauge("workers_busy", "Busy").set(1)
+        registry.gauge("inflight", "Inflight", multiprocess_mode="all").set(4)
+
+        def worker_file(pid, jobs, busy):
+            snapshot = {
+                "jobs_total": {"kind": "counter", "help": "Jobs", "labelnames": [], "unit": "",
+                               "samples": [[[], [jobs]]]},
+                "workers_busy": {"kind": "gauge", "help": "Busy", "labelnames": [], "unit": "",
+                                 "mode": "sum", "samples": [[[], [busy]]]},
+            }
+            Path(directory, f"{pid}.json").write_text(json.dumps(snapshot))
+
+        worker_file(os.getppid(), 3, 1)   # live worker
+        worker_file(999_999_999, 5, 10)   # exited worker: counters kept, gauges dropped
+
+        text = registry.render()
+        assert "jobs_total 10" in text
+        assert "workers_busy 2" in text
+        assert f'inflight{{pid="{os.getpid()}"}} 4' in text
+
+        registry.flush()
+        assert json.loads(Path(directory, f"{os.getpid()}.json").read_text())["jobs_total"]["samples"] == [[[], [2.0]]]
+
+
+class TestMetricsMiddleware:
+    """Test MetricsMiddleware"""
+
+    def test_requests_are_labelled_by_route_template(self):
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: int):
+            return {"id": item_id}
+
+        app.add_middleware(MetricsMiddleware)
+        client = TestClient(app)
+        for item_id in range(3):
+            assert client.get(f"/items/{item_id}").status_code == 200
+        client.get("/missing")
+
+        samples = HTTP_REQUEST_DURATION.samples()
+        bounds = len(HTTP_REQUEST_DURATION.bounds) + 1
+        assert sum(samples[("GET", "/items/{item_id}", "200")][:bounds]) == 3
+        assert sum(samples[("GET", "unmatched", "404")][:bounds]) == 1
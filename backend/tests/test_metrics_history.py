@@ -0,0 +1,92 @@
+"""
+Metrics History Tests
+Struct-of-arrays ring buffer, vectorized aggregation and zero-copy snapshots
+"""
+import statistics
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.metrics_history import ALGORITHM_FIELDS, MetricsHistory
+from logic.ultimate_algorithms import AlgorithmType, ProcessingMode, UltimateAlgorithms
+
+
+def entry(value: float):
+    return {field: value for field in ALGORITHM_FIELDS}
+
+
+class TestMetricsHistory:
+    """Test MetricsHistory"""
+
+    def test_ring_keeps_the_last_capacity_entries(self):
+        history = MetricsHistory(capacity=4)
+        for i in range(6):
+            history.append("algo", AlgorithmType.MUTATION_DETECTION, ProcessingMode.REAL_TIME, entry(i), timestamp=i)
+
+        assert len(history) == 4 and history.appended == 6
+        snapshot = history.snapshot()
+        assert snapshot.timestamps[snapshot.order].tolist() == [2, 3, 4, 5]
+        assert history.aggregate()['means']['accuracy'] == pytest.approx(3.5)
+
+    def test_aggregate_matches_python_means_per_type(self):
+        rng = np.random.default_rng(0)
+        history = MetricsHistory(capacity=50)
+        kept = []
+        for i in range(80):
+            algorithm_type = list(AlgorithmType)[i % 3]
+            values = {field: float(rng.uniform(0, 2)) for field in ALGORITHM_FIELDS}
+            history.append(f"algo_{i % 3}", algorithm_type, ProcessingMode.BATCH, values)
+            kept = (kept + [(algorithm_type, values)])[-50:]
+
+        stats = history.aggregate(['execution_time', 'error_rate'])
+        assert stats['count'] == 50 and set(stats['means']) == {'execution_time', 'error_rate'}
+        for algorithm_type, group in stats['by_type'].items():
+            expected = [v['execution_time'] for t, v in kept if t == algorithm_type]
+            assert group['count'] == len(expected)
+            assert group['means']['execution_time'] == pytest.approx(statistics.mean(expected), rel=1e-6)
+
+    def test_snapshot_views_are_read_only_and_uncopied(self):
+        history = MetricsHistory(capacity=3)
+        history.append("algo", AlgorithmType.NEURAL_ROUTING, ProcessingMode.STREAMING, entry(1.0), timestamp=1)
+        snapshot = history.snapshot()
+
+        assert np.shares_memory(snapshot.values['accuracy'], history._values)
+        with pytest.raises(ValueError):
+            snapshot.values['accuracy'][0] = 2.0
+        assert snapshot.type_labels[snapshot.types[0]] is AlgorithmType.NEURAL_ROUTING
+
+        stable = snapshot.copy()
+        for t in range(2, 5):
+            history.append("algo", AlgorithmType.NEURAL_ROUTING, ProcessingMode.STREAMING, entry(t), timestamp=t)
+        assert stable.timestamps.tolist() == [1] and snapshot.timestamps.tolist() == [4]
+
+    def test_memory_per_entry(self):
+        stats = MetricsHistory(capacity=1000).get_stats()
+        assert stats['bytes_per_entry'] <= 60
+        with pytest.raises(KeyError):
+            MetricsHistory().append("algo", AlgorithmType.MUTATION_DETECTION, ProcessingMode.BATCH, {})
+
+
+class TestUltimatePerformanceReport:
+    """Test the report built from the ring buffer"""
+
+    def test_report_from_stored_metrics(self):
+        algorithms = UltimateAlgorithms()
+        assert algorithms.get_algorithm_performance_report() == {'error': 'No metrics available'}
+
+        for seconds in (0.1, 0.3):
+            algorithms._store_algorithm_metrics("ultimate_vitality_calculation", AlgorithmType.VITALITY_CALCULATION,
+                                                {'processing_time': seconds, 'throughput': 10.0})
+        algorithms._store_algorithm_metrics("ultimate_mutation_detection", AlgorithmType.MUTATION_DETECTION,
+                                            {'processing_time': 0.5, 'error_rate': 1.0})
+
+        report = algorithms.get_algorithm_performance_report()
+        vitality = report['performance_by_type']['vitality_calculation']
+        assert vitality['count'] == 2 and vitality['avg_execution_time'] == pytest.approx(0.2)
+        assert list(report['performance_by_type']) == ['mutation_detection', 'vitality_calculation']
+        assert report['overall_stats']['total_executions'] == 3
+        assert report['overall_stats']['total_error_rate'] == pytest.approx(1 / 3)
@@ -0,0 +1,91 @@
+"""
+Model Registry Tests
+Versioned artifacts, checksums, lazy memory-mapped loads and hot swaps
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.dummy import DummyClassifier
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.enhanced_perfect_algorithms import ENHANCED_MODELS, EnhancedPerfectAlgorithms
+from logic.model_registry import ModelIntegrityError, ModelRegistry, main
+
+
+def dummy_models(constant: int = 1):
+    X = np.zeros((8, 10))
+    models = {}
+    for name in ENHANCED_MODELS:
+        y = np.arange(8) % 4 if name == 'neural_router' else np.arange(8) % (3 if name == 'vitality_predictor' else 2)
+        models[name] = DummyClassifier(strategy='constant', constant=constant).fit(X, y)
+    return models
+
+
+class TestModelRegistry:
+    """Test ModelRegistry"""
+
+    def test_publish_then_load_lazily_with_mmap(self, tmp_path):
+        registry = ModelRegistry(tmp_path, refresh_interval=0)
+        version = registry.publish({"weights": {"w": np.arange(100_000, dtype=np.float64)}}, metadata={"seed": 1})
+
+        assert registry.active_version() == version
+        assert registry.loads == 0
+        manifest = registry.manifest(version)
+        assert manifest["metadata"] == {"seed": 1} and len(manifest["models"]["weights"]["sha256"]) == 64
+
+        weights = registry.get("weights")["w"]
+        assert isinstance(weights, np.memmap) and not weights.flags.writeable
+        assert weights[-1] == 99_999
+        assert registry.get("weights")["w"] is weights and registry.loads == 1
+        with pytest.raises(LookupError):
+            registry.get("missing")
+
+    def test_corrupted_artifact_is_rejected(self, tmp_path):
+        registry = ModelRegistry(tmp_path, refresh_interval=0)
+        version = registry.publish({"model": {"a": 1}})
+        path = tmp_path / version / "model.joblib"
+        path.write_bytes(path.read_bytes() + b"x")
+
+        with pytest.raises(ModelIntegrityError):
+            registry.get("model")
+        with pytest.raises(ModelIntegrityError):
+            registry.activate(version)
+        assert main(["--root", str(tmp_path), "verify"]) == 1
+
+    def test_hot_swap_to_a_new_version(self, tmp_path):
+        registry = ModelRegistry(tmp_path, refresh_interval=0)
+        first = registry.publish({"model": {"v": 1}})
+        held = registry.get("model")
+
+        # Another process (the CLI) publishes and activates a new version
+        second = ModelRegistry(tmp_path).publish({"model": {"v": 2}}, metadata={"n": 2})
+        assert second != first
+        assert registry.get("model") == {"v": 2} and registry.version == second
+        assert held == {"v": 1} and registry.swaps == 1
+
+        assert main(["--root", str(tmp_path), "activate", first]) == 0
+        assert registry.get("model") == {"v": 1}
+        assert [m["version"] for m in registry.versions()] == [first, second]
+
+    def test_refresh_interval_limits_current_reads(self, tmp_path):
+        registry = ModelRegistry(tmp_path, refresh_interval=3600)
+        assert registry.version is None
+        ModelRegistry(tmp_path).publish({"model": 1})
+        with pytest.raises(LookupError):
+            registry.get("model")                         # CURRENT not re-read yet
+        registry.reload()
+        assert registry.get("model") == 1
+
+    def test_enhanced_algorithms_use_registry_models(self, tmp_path):
+        registry = ModelRegistry(tmp_path, refresh_interval=0)
+        registry.publish(dummy_models(constant=1))
+        algorithms = EnhancedPerfectAlgorithms(model_registry=registry)
+
+        scores = algorithms.model_mutation_scores(np.zeros((3, 4)))
+        assert scores['random_forest'].tolist() == [1.0, 1.0, 1.0]
+        assert scores['gradient_boosting'].tolist() == pytest.approx([0.6] * 3)
+        assert algorithms._fallback_models is None
+        assert registry.get_stats()['loaded'] == sorted(ENHANCED_MODELS)
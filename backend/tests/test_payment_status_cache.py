@@ -0,0 +1,146 @@
+"""
+Payment Status Cache Tests
+Final-state caching, pending and settled TTLs, single-flight and webhook invalidation
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from payment.status_cache import PaymentStatusCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingLoader:
+    def __init__(self, status: str = "pending", delay: float = 0.01):
+        self.status = status
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, payment_id):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"status": self.status, "transaction": None, "metadata": {}}
+
+
+class TestPaymentStatusCache:
+    """Test PaymentStatusCache"""
+
+    def test_concurrent_polls_share_one_upstream_call(self):
+        async def run():
+            loader = CountingLoader()
+            cache = PaymentStatusCache(loader)
+            results = await asyncio.gather(*(cache.get("pay_1") for _ in range(50)))
+            return loader, results
+
+        loader, results = asyncio.run(run())
+        assert loader.calls == 1
+        assert all(r["status"] == "pending" for r in results)
+
+    def test_pending_expires_final_does_not(self):
+        async def run():
+            clock = FakeClock()
+            loader = CountingLoader(delay=0)
+            cache = PaymentStatusCache(loader, pending_ttl=3.0, clock=clock)
+
+            await cache.get("pay_1")
+            clock.now = 2.0
+            await cache.get("pay_1")
+            pending_calls = loader.calls
+            clock.now = 3.5
+            loader.status = "failed"
+            await cache.get("pay_1")
+            clock.now = 10_000.0
+            await cache.get("pay_1")
+            return pending_calls, loader.calls
+
+        pending_calls, total_calls = asyncio.run(run())
+        assert pending_calls == 1
+        assert total_calls == 2
+
+    def test_refund_reaches_workers_that_missed_the_webhook(self):
+        async def run():
+            clock = FakeClock()
+            loader = CountingLoader(status="success", delay=0)
+            # Two workers, each with its own per-process cache
+            handling, other = (PaymentStatusCache(loader, settled_ttl=300.0, clock=clock) for _ in range(2))
+            await handling.get("pay_1")
+            await other.get("pay_1")
+
+            # The refund webhook lands on one worker only
+            loader.status = "refunded"
+            handling.invalidate("pay_1")
+            clock.now = 60.0
+            seen = [(await handling.get("pay_1"))["status"], (await other.get("pay_1"))["status"]]
+            clock.now = 301.0
+            seen.append((await other.get("pay_1"))["status"])
+            clock.now = 100_000.0
+            seen.append((await other.get("pay_1"))["status"])
+            return seen, loader.calls
+
+        seen, calls = asyncio.run(run())
+        assert seen == ["refunded", "success", "refunded", "refunded"]
+        assert calls == 4
+
+    def test_invalidate_during_load_is_not_cached(self):
+        async def run():
+            loader = CountingLoader(delay=0.02)
+            cache = PaymentStatusCache(loader, pending_ttl=60.0)
+            pending = asyncio.ensure_future(cache.get("pay_1"))
+            await asyncio.sleep(0.005)
+            cache.invalidate("pay_1")  # webhook settled the payment mid-load
+            await pending
+            loader.status = "success"
+            return (await cache.get("pay_1"))["status"], loader.calls
+
+        status, calls = asyncio.run(run())
+        assert status == "success" and calls == 2
+
+    def test_errors_propagate_and_are_not_cached(self):
+        async def run():
+            calls = 0
+
+            async def failing(payment_id):
+                nonlocal calls
+                calls += 1
+                await asyncio.sleep(0.01)
+                raise RuntimeError("moyasar down")
+
+            cache = PaymentStatusCache(failing)
+            results = await asyncio.gather(*(cache.get("pay_1") for _ in range(5)), return_exceptions=True)
+            with pytest.raises(RuntimeError):
+                await cache.get("pay_1")
+            return results, calls
+
+        results, calls = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert calls == 2
+
+    def test_polling_load_cuts_upstream_by_an_order_of_magnitude(self):
+        async def run():
+            loader = CountingLoader(delay=0.002)
+            cache = PaymentStatusCache(loader, pending_ttl=0.05)
+
+            async def poller(payment_id):
+                for _ in range(40):
+                    await cache.get(payment_id)
+                    await asyncio.sleep(0.005)
+
+            # 20 checkout pages x 5 tabs each, polling every 5 ms
+            await asyncio.gather(*(poller(f"pay_{i % 20}") for i in range(100)))
+            return loader.calls, cache.get_stats()
+
+        upstream_calls, stats = asyncio.run(run())
+        polls = 100 * 40
+        assert upstream_calls * 10 <= polls
+        assert stats["upstream_loads"] == upstream_calls
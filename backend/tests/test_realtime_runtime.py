@@ -0,0 +1,124 @@
+"""
+Real-Time Runtime Tests
+Non-blocking collectors, supervision, CPU budgets, load shedding and overruns
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from health.realtime import LoopSpec, RealtimeRuntime
+
+
+def busy(seconds: float):
+    """Burn CPU on the calling thread"""
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+async def run_for(runtime: RealtimeRuntime, seconds: float):
+    runtime.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        await runtime.stop()
+
+
+class TestRealtimeRuntime:
+    """Test RealtimeRuntime"""
+
+    def test_blocking_collectors_do_not_stall_the_event_loop(self):
+        async def scenario():
+            runtime = RealtimeRuntime(load=lambda: 0.0)
+            runtime.add(LoopSpec("blocking", collect=lambda: time.sleep(0.2), interval=0.05, cpu_budget=1.0))
+            handled = []
+
+            async def record(result):
+                handled.append(result)
+
+            runtime.add(LoopSpec("fast", collect=lambda: "ok", handle=record, interval=0.02, cpu_budget=1.0))
+
+            heartbeats = []
+            runtime.start()
+            started = time.perf_counter()
+            while time.perf_counter() - started < 0.5:
+                before = time.perf_counter()
+                await asyncio.sleep(0.005)
+                heartbeats.append(time.perf_counter() - before)
+            await runtime.stop()
+            return heartbeats, handled, runtime.get_stats()["loops"]
+
+        heartbeats, handled, loops = asyncio.run(scenario())
+        assert max(heartbeats) < 0.1
+        assert len(handled) >= 10 and set(handled) == {"ok"}
+        assert loops["blocking"]["overruns"] >= 1
+        assert loops["blocking"]["missed_ticks"] >= loops["blocking"]["overruns"]
+
+    def test_failures_are_contained_and_crashed_loops_restarted(self):
+        async def scenario():
+            calls = {"clock": 0}
+
+            def flaky_clock():
+                calls["clock"] += 1
+                if calls["clock"] == 5:
+                    raise RuntimeError("clock failure")  # escapes the tick: the loop itself dies
+                return time.monotonic()
+
+            runtime = RealtimeRuntime(load=lambda: 0.0, clock=flaky_clock)
+
+            async def explode(result):
+                raise RuntimeError("boom")
+
+            runtime.add(LoopSpec("flaky", collect=lambda: 1, handle=explode, interval=0.01, cpu_budget=1.0))
+            await run_for(runtime, 0.2)
+            return runtime.stats["flaky"]
+
+        stats = asyncio.run(scenario())
+        assert stats.restarts == 1
+        assert stats.errors >= 2          # handler errors are contained per tick
+        assert stats.last_error == "boom"
+
+    def test_cpu_budget_skips_ticks(self):
+        async def scenario():
+            runtime = RealtimeRuntime(load=lambda: 0.0)
+            # 10 ms of CPU every 20 ms against a 10% budget: most ticks must be skipped
+            runtime.add(LoopSpec("hungry", collect=lambda: busy(0.01), interval=0.02, cpu_budget=0.1, burst=1))
+            await run_for(runtime, 0.6)
+            return runtime.stats["hungry"]
+
+        stats = asyncio.run(scenario())
+        assert stats.skipped_budget > stats.ticks
+        assert stats.cpu_seconds < 0.6 * 0.1 + 0.03
+
+    def test_ticks_are_shed_under_load(self):
+        async def scenario():
+            runtime = RealtimeRuntime(load=lambda: 99.0, load_threshold=90)
+            calls = []
+            runtime.add(LoopSpec("shed", collect=lambda: calls.append(1), interval=0.01))
+            await run_for(runtime, 0.1)
+            return calls, runtime.stats["shed"]
+
+        calls, stats = asyncio.run(scenario())
+        assert calls == []
+        assert stats.skipped_load >= 5
+
+    def test_ultimate_health_system_schedules_its_loops(self):
+        from health.ultimate_health_system import UltimateHealthSystem
+
+        async def scenario():
+            system = UltimateHealthSystem()
+            system.realtime.load = lambda: 0.0
+            started = await system.start_real_time_monitoring()
+            await asyncio.sleep(0.3)
+            status = system.get_real_time_monitoring_status()
+            await system.stop_real_time_monitoring()
+            return started, status
+
+        started, status = asyncio.run(scenario())
+        assert started["status"] == "real_time_monitoring_active"
+        assert started["active_tasks"] == 8
+        assert status["monitoring_status"] == "active"
+        assert status["runtime"]["loops"]["ultimate_network"]["ticks"] >= 1
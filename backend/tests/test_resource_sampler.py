@@ -0,0 +1,130 @@
+"""
+Resource Sampler Tests
+Ring buffer wrap-around, windowed aggregates and non-blocking reads
+"""
+import asyncio
+import sys
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from health.resource_sampler import ResourceSampler, ResourceSnapshot, collect_snapshot
+
+Memory = namedtuple("Memory", "percent available total")
+Disk = namedtuple("Disk", "percent free total used")
+DiskIO = namedtuple("DiskIO", "read_bytes write_bytes")
+NetIO = namedtuple("NetIO", "bytes_sent bytes_recv")
+
+
+class FakeCollector:
+    """Deterministic snapshots: CPU climbs by 1%, 1000 bytes sent per sample"""
+
+    def __init__(self, start: float):
+        self.calls = 0
+        self.start = start
+
+    def __call__(self):
+        i = self.calls
+        self.calls += 1
+        return ResourceSnapshot(
+            timestamp=self.start + i,
+            cpu_percent=float(i),
+            cpu_count=4,
+            cpu_freq=None,
+            load_avg=(0.5, 0.4, 0.3),
+            memory=Memory(50.0, 4e9, 8e9),
+            swap=Memory(0.0, 0, 0),
+            disk=Disk(40.0, 6e10, 1e11, 4e10),
+            disk_io=DiskIO(0, 0),
+            network_io=NetIO(1000 * i, 0),
+            network_connections=10,
+            process_count=100,
+            process_status_counts={"running": 2, "sleeping": 98},
+        )
+
+
+class TestResourceSampler:
+    """Test ResourceSampler"""
+
+    def test_ring_buffer_wraps_and_keeps_order(self):
+        sampler = ResourceSampler(capacity=5, collector=FakeCollector(time.time() - 100))
+        for _ in range(8):
+            sampler.sample_once()
+        assert list(sampler.series("cpu_percent")) == [3.0, 4.0, 5.0, 6.0, 7.0]
+        assert sampler.get_stats()["buffered"] == 5
+
+    def test_window_aggregates_and_counter_rates(self):
+        sampler = ResourceSampler(capacity=100, collector=FakeCollector(time.time() - 9))
+        for _ in range(10):
+            sampler.sample_once()
+        window = sampler.window(4.5)
+        assert window["samples"] == 5
+        assert window["cpu_percent"] == {"mean": 7.0, "min": 5.0, "max": 9.0, "last": 9.0}
+        assert window["net_bytes_sent_per_sec"] == 1000.0
+        assert sampler.window(0.0)["samples"] in (0, 1)
+
+    def test_snapshot_is_served_without_resampling(self):
+        collector = FakeCollector(time.time())
+        sampler = ResourceSampler(interval=60, collector=collector)
+        first = sampler.snapshot()
+        for _ in range(1000):
+            assert sampler.snapshot() is first
+        assert collector.calls == 1
+
+    def test_stale_snapshot_is_refreshed_off_the_event_loop(self):
+        class ThreadRecorder(FakeCollector):
+            def __init__(self, start):
+                super().__init__(start)
+                self.threads = []
+                self.release = threading.Event()
+                self.entered = threading.Event()
+
+            def __call__(self):
+                self.threads.append(threading.get_ident())
+                if self.calls:
+                    self.entered.set()
+                    self.release.wait(5)
+                return super().__call__()
+
+        collector = ThreadRecorder(time.time() - 100)
+        sampler = ResourceSampler(interval=1, collector=collector)
+        stale = sampler.snapshot()
+
+        async def read():
+            return [sampler.snapshot() for _ in range(10)]
+
+        # The collector is blocked: reads on the loop must not wait for it
+        reads = asyncio.run(read())
+        assert all(snapshot is stale for snapshot in reads) and stale.age > 1
+        assert collector.entered.wait(5)
+        assert len(collector.threads) == 2    # one refresh in flight, not one per read
+        collector.release.set()
+        for _ in range(500):
+            if sampler.snapshot() is not stale:
+                break
+            time.sleep(0.01)
+        assert sampler.snapshot() is not stale
+        assert threading.get_ident() not in collector.threads[1:]
+
+    def test_background_task_samples_off_the_loop(self):
+        async def run():
+            collector = FakeCollector(time.time())
+            sampler = ResourceSampler(interval=0.01, collector=collector)
+            sampler.start()
+            await asyncio.sleep(0.1)
+            await sampler.stop()
+            return collector.calls, sampler.get_stats()
+
+        calls, stats = asyncio.run(run())
+        assert calls >= 3
+        assert not stats["running"] and stats["errors"] == 0
+
+    def test_real_collection_does_not_block_for_cpu_interval(self):
+        started = time.perf_counter()
+        snapshot = collect_snapshot()
+        assert time.perf_counter() - started < 0.9
+        assert snapshot.process_count > 0
+        assert 0.0 <= snapshot.cpu_percent <= 100.0 * snapshot.cpu_count
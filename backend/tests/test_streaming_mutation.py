@@ -0,0 +1,77 @@
+"""
+Streaming Mutation Detector Tests
+Incremental parity with ultimate_mutation_detection, reservoir bounds and checkpoints
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from logic.streaming_mutation import StreamingMutationDetector
+from logic.ultimate_algorithms import UltimateAlgorithms
+
+NAMES = ["cpu", "memory", "latency", "errors"]
+
+
+def stream(steps: int, seed: int, missing: float = 0.0):
+    rng = np.random.default_rng(seed)
+    base = np.array([40.0, 60.0, 120.0, 0.0])
+    for t in range(steps):
+        values = base + np.array([0.2, 0.1, 1.5, 0.0]) * t + rng.normal(0, [2, 3, 10, 0.5])
+        yield {name: float(v) for name, v in zip(NAMES, values) if rng.random() >= missing}
+
+
+class TestStreamingMutationDetector:
+    """Test StreamingMutationDetector"""
+
+    @pytest.mark.parametrize("missing", [0.0, 0.25])
+    def test_scores_match_the_full_history_computation(self, missing):
+        algorithms = UltimateAlgorithms()
+        baseline = {"cpu": 40.0, "memory": 60.0, "latency": 120.0, "errors": 0.0}
+        detector = StreamingMutationDetector(NAMES, baseline, reservoir_size=64, seed=1)
+        history = []
+
+        for observation in stream(40, seed=2, missing=missing):
+            result = detector.update(observation)
+            if history and observation:        # the per-dict API rejects empty collections
+                expected = algorithms.ultimate_mutation_detection({
+                    'timestamp': 0, 'metrics': observation, 'baseline': baseline, 'historical_data': history
+                })
+                for name, score in expected['individual_scores'].items():
+                    assert result['individual_scores'][name] == pytest.approx(score, rel=1e-9, abs=1e-12), name
+                assert result['mutation_score'] == pytest.approx(expected['mutation_score'], rel=1e-9, abs=1e-12)
+                assert result['severity'] == expected['severity']
+            history = history + [observation]
+
+    def test_reservoir_bounds_memory_and_tracks_quantiles(self):
+        detector = StreamingMutationDetector(["x"], {"x": 50.0}, reservoir_size=128, seed=0)
+        rng = np.random.default_rng(0)
+        for value in rng.normal(50, 5, 20_000):
+            detector.absorb({"x": value})
+
+        assert detector.reservoir.shape == (128, 1) and detector.seen == 20_000
+        stats = detector.robust_stats()["x"]
+        assert stats["count"] == 20_000
+        assert stats["median"] == pytest.approx(50, abs=1.5)
+        assert stats["iqr"] == pytest.approx(2 * 0.6745 * 5, rel=0.25)
+        assert detector.score({"x": 95.0})["individual_scores"]["pattern_recognition"] == 1.0
+
+    def test_checkpoint_round_trip_continues_identically(self, tmp_path):
+        baseline = {"cpu": 40.0, "memory": 60.0, "latency": 120.0, "errors": 1.0}
+        detector = StreamingMutationDetector(NAMES, baseline, reservoir_size=16, seed=3)
+        observations = list(stream(60, seed=4, missing=0.1))
+        for observation in observations[:30]:
+            detector.update(observation)
+
+        path = tmp_path / "stream.npz"
+        detector.checkpoint(path)
+        restored = StreamingMutationDetector.load(path)
+
+        for observation in observations[30:]:
+            a, b = detector.update(observation), restored.update(observation)
+            assert a['individual_scores'] == b['individual_scores']
+        np.testing.assert_array_equal(detector.reservoir, restored.reservoir)
+        assert not (tmp_path / "stream.npz.tmp").exists()
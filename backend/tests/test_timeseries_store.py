@@ -0,0 +1,99 @@
+"""
+Time-Series Store Tests
+Column codecs, persistence across reopen, rollup tiers and forecasts
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from health.timeseries_store import (
+    TimeSeriesStore,
+    decode_floats,
+    decode_timestamps,
+    encode_floats,
+    encode_timestamps,
+)
+
+
+class TestCodecs:
+    """Test the column codecs"""
+
+    def test_round_trip_is_lossless(self):
+        rng = np.random.default_rng(3)
+        timestamps = 1.7e9 + np.cumsum(rng.integers(4900, 5100, size=2000)) / 1000
+        values = rng.normal(50, 10, size=2000)
+        assert np.array_equal(decode_timestamps(encode_timestamps(timestamps)), np.round(timestamps, 3))
+        assert np.array_equal(decode_floats(encode_floats(values)), values)
+
+    def test_regular_series_compress_well(self):
+        timestamps = 1.7e9 + np.arange(4096) * 5.0
+        values = np.repeat([42.0, 43.5], 2048)
+        assert len(encode_timestamps(timestamps)) < 200
+        assert len(encode_floats(values)) < 200
+
+
+class TestTimeSeriesStore:
+    """Test TimeSeriesStore"""
+
+    def test_queries_span_sealed_and_head_chunks_and_survive_reopen(self):
+        root = tempfile.mkdtemp()
+        now = time.time()
+        store = TimeSeriesStore(root, chunk_size=64)
+        for i in range(300):
+            store.append("system.cpu_percent", float(i % 100), now - 300 + i)
+        assert store.get_stats()["sealed_chunks"] > 0
+        assert store.aggregate("system.cpu_percent", now - 400, now, agg="count") == 300
+        assert store.latest("system.cpu_percent") == (now - 1, 99.0)
+        store.close()
+
+        reopened = TimeSeriesStore(root, chunk_size=64)
+        timestamps, values = reopened.range("system.cpu_percent", now - 400, now, tier="raw")
+        assert len(values) == 300 and np.all(np.diff(timestamps) > 0)
+        assert reopened.aggregate("system.cpu_percent", now - 400, now, agg="max") == 99.0
+        assert reopened.percentile("system.cpu_percent", 50, now - 400, now) == np.percentile(
+            [float(i % 100) for i in range(300)], 50)
+        # Rollup buckets written on close are merged back exactly
+        assert reopened.aggregate("system.cpu_percent", now - 400, now, agg="count", tier="1m") == 300
+
+    def test_rollup_tiers_aggregate_exactly(self):
+        store = TimeSeriesStore(tempfile.mkdtemp())
+        start = 1_700_000_400.0  # on an hour boundary
+        for i in range(7200):
+            store.append("latency", float(i % 10), start + i)
+        assert store.aggregate("latency", start, start + 7200, agg="count", tier="1m") == 7200
+        assert store.aggregate("latency", start, start + 7200, agg="mean", tier="1h") == 4.5
+        timestamps, _ = store.range("latency", start, start + 7200, tier="1m")
+        assert len(timestamps) == 120
+
+    def test_torn_segment_is_truncated_on_open(self):
+        root = tempfile.mkdtemp()
+        store = TimeSeriesStore(root, chunk_size=16)
+        for i in range(32):
+            store.append("m", float(i), 1_700_000_000.0 + i)
+        segment = next(Path(root, "raw").rglob("*.seg"))
+        size = segment.stat().st_size
+        with open(segment, "ab") as f:
+            f.write(b"TSC1garbage")
+
+        reopened = TimeSeriesStore(root, chunk_size=16)
+        assert segment.stat().st_size == size
+        assert reopened.aggregate("m", tier="raw", agg="count") == 32
+
+    def test_forecast_and_project(self):
+        store = TimeSeriesStore(tempfile.mkdtemp())
+        now = time.time()
+        for i in range(360):  # an hour of 10 s samples rising 6 points per hour
+            store.append("system.memory_percent", 50 + i / 60, now - 3600 + i * 10)
+
+        forecast = store.forecast("system.memory_percent", horizon=3600, current=56.0)
+        assert forecast["trend"] == "increasing"
+        assert abs(forecast["prediction"] - 62.0) < 0.1
+        assert forecast["confidence"] > 0.95
+
+        trend, prediction, confidence = store.project("system.disk_percent", 40.0, 3600, ("stable", 40.0))
+        assert (trend, prediction, confidence) == ("stable", 40.0, 0.0)
@@ -0,0 +1,109 @@
+"""
+Transaction Logs Service Tests
+Incremental revenue rollups and rollup-backed stats
+"""
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from database import transaction_logs as tl
+from database.transaction_logs import TransactionLogsService, TransactionRecord
+
+
+class FakeConnection:
+    """Just enough of asyncpg to run the service's queries against dicts"""
+
+    def __init__(self):
+        self.transactions = {}
+        self.rollups = {}
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def fetchrow(self, query, *args):
+        if query is tl._INSERT_TRANSACTION:
+            created = datetime(2026, 10, 19, 23, 30, tzinfo=timezone.utc)
+            row = dict(zip(("payment_id", "tier", "amount", "currency", "customer_email",
+                            "customer_name", "status", "provider", "metadata"), args))
+            row.update(id=len(self.transactions) + 1, created_at=created, updated_at=created)
+            self.transactions[row["payment_id"]] = row
+            return row
+        if query is tl._UPDATE_TRANSACTION_STATUS:
+            row = self.transactions.get(args[0])
+            if row is None:
+                return None
+            previous = row["status"]
+            row.update(status=args[1], metadata=args[2])
+            return {**row, "previous_status": previous}
+        if query is tl._TRANSACTION_STATS:
+            rows = list(self.rollups.values())
+            return {
+                "total_transactions": sum(r[0] for r in rows),
+                "successful_transactions": sum(r[1] for r in rows),
+                "failed_transactions": sum(r[2] for r in rows),
+                "pending_transactions": sum(r[3] for r in rows),
+                "total_revenue": sum(r[4] for r in rows),
+            }
+        raise AssertionError(f"unexpected query: {query}")
+
+    async def execute(self, query, *args):
+        assert query is tl._APPLY_ROLLUP_DELTA
+        day, tier, _currency, *delta = args
+        current = self.rollups.get((day, tier), [0, 0, 0, 0, 0])
+        self.rollups[(day, tier)] = [a + b for a, b in zip(current, delta)]
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def _record(payment_id, status="pending", amount=4900.0, tier="discovery"):
+    return TransactionRecord(payment_id=payment_id, tier=tier, amount=amount, currency="SAR",
+                             customer_email="a@example.sa", customer_name="A", status=status,
+                             provider="moyasar")
+
+
+class TestTransactionLogsService:
+    """Test TransactionLogsService rollup maintenance"""
+
+    def test_rollups_follow_status_transitions(self):
+        async def run():
+            service = TransactionLogsService()
+            service.pool = FakePool()
+            await service.create_transaction(_record("pay_1"))
+            await service.create_transaction(_record("pay_2"))
+            await service.create_transaction(_record("pay_3", tier="professional", amount=12500.0))
+            await service.update_transaction_status("pay_1", "success")
+            await service.update_transaction_status("pay_1", "success")  # no-op transition
+            await service.update_transaction_status("pay_2", "failed")
+            await service.update_transaction_status("pay_3", "success")
+            await service.update_transaction_status("pay_3", "refunded")
+            missing = await service.update_transaction_status("pay_404", "success")
+            return service, missing, await service.get_transaction_stats()
+
+        service, missing, stats = asyncio.run(run())
+        rollups = service.pool.conn.rollups
+        day = datetime(2026, 10, 19).date()
+        assert rollups[(day, "discovery")] == [2, 1, 1, 0, 4900.0]
+        assert rollups[(day, "professional")] == [1, 0, 0, 0, 0.0]
+        assert not missing["success"]
+        assert stats["total_transactions"] == 3
+        assert stats["successful_transactions"] == 1
+        assert stats["total_revenue"] == 4900.0
+        assert stats["avg_transaction_amount"] == 4900.0
+
+    def test_requires_initialized_pool(self):
+        async def run():
+            return await TransactionLogsService().get_transaction("pay_1")
+
+        assert asyncio.run(run()) is None
@@ -0,0 +1,110 @@
+"""
+FLUX-DNA Forensic Vault Store Tests
+Per-user index, cursor pagination and persistence
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from services.vault_store import GENESIS_HASH, SQLiteVaultStore, VaultStore, decode_cursor, encode_cursor
+
+
+def _record(evidence_id: str, user_id: str, second: int) -> dict:
+    return {
+        "evidence_id": evidence_id,
+        "user_id": user_id,
+        "evidence_type": "text",
+        "created_at": f"2026-01-01T00:00:{second:02d}+00:00",
+        "risk_level": "LOW",
+        "exif_stripped": False,
+        "content_hash": "0" * 64
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteVaultStore(str(tmp_path / "vault.db"))
+    yield store
+    store.close()
+
+
+class TestVaultStore:
+    """Test SQLiteVaultStore behaviour"""
+
+    def test_cursor_roundtrip(self):
+        cursor = encode_cursor("2026-01-01T00:00:00+00:00", "abc|def")
+        assert decode_cursor(cursor) == ("2026-01-01T00:00:00+00:00", "abc|def")
+
+        with pytest.raises(ValueError):
+            decode_cursor("!!not-a-cursor!!")
+
+    def test_list_is_paginated_newest_first_per_user(self, store):
+        async def run():
+            for i in range(7):
+                await store.put(_record(f"ev-{i}", "user-a", i))
+            await store.put(_record("ev-other", "user-b", 30))
+
+            seen = []
+            cursor = None
+            while True:
+                page = await store.list_by_user("user-a", limit=3, cursor=cursor)
+                seen.extend(item["evidence_id"] for item in page["items"])
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+            return seen
+
+        seen = asyncio.run(run())
+        assert seen == [f"ev-{i}" for i in reversed(range(7))]
+
+    def test_get_and_delete(self, store):
+        async def run():
+            await store.put(_record("ev-1", "user-a", 1))
+            fetched = await store.get("ev-1")
+            deleted = await store.delete("ev-1")
+            deleted_again = await store.delete("ev-1")
+            return fetched, deleted, deleted_again, await store.get("ev-1")
+
+        fetched, deleted, deleted_again, missing = asyncio.run(run())
+        assert fetched["user_id"] == "user-a"
+        assert deleted is True
+        assert deleted_again is False
+        assert missing is None
+
+    def test_records_survive_reopen(self, tmp_path):
+        path = str(tmp_path / "vault.db")
+        first = SQLiteVaultStore(path)
+        asyncio.run(first.put(_record("ev-1", "user-a", 1)))
+        first.close()
+
+        second = SQLiteVaultStore(path)
+        page = asyncio.run(second.list_by_user("user-a"))
+        second.close()
+        assert [item["evidence_id"] for item in page["items"]] == ["ev-1"]
+
+    def test_submit_is_one_transaction(self, store):
+        custody = {"action": "submitted", "actor": "user", "timestamp": "2026-01-01T00:00:01+00:00"}
+
+        async def run():
+            genesis = await store.submit(_record("ev-1", "user-a", 1), b"content", custody)
+            # A repeated submit violates the custody primary key and must roll back the record too
+            with pytest.raises(Exception):
+                await store.submit({**_record("ev-1", "user-b", 2)}, b"other", custody)
+            return genesis, await store.get("ev-1"), await store.get_custody("ev-1")
+
+        genesis, record, chain = asyncio.run(run())
+        assert genesis["seq"] == 0 and genesis["prev_hash"] == GENESIS_HASH
+        assert record["user_id"] == "user-a" and len(chain) == 1
+        assert b"".join(store.read_blob_chunks("ev-1")) == b"content"
+
+    def test_incomplete_store_fails_at_construction(self):
+        class PartialStore(VaultStore):
+            async def get(self, evidence_id):
+                return None
+
+        with pytest.raises(TypeError):
+            PartialStore()
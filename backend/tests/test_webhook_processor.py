@@ -0,0 +1,156 @@
+"""
+Payment Webhook Processor Tests
+Idempotent ingestion, per-payment coalescing and retry with backoff
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from payment import PaymentResponse, PaymentStatus
+from payment.webhook_processor import WebhookProcessor, webhook_idempotency_key
+
+
+class FakeGateway:
+    def __init__(self, fail_times: int = 0, delay: float = 0.0):
+        self.calls = []
+        self.fail_times = fail_times
+        self.delay = delay
+
+    async def verify_payment(self, payment_id):
+        self.calls.append(payment_id)
+        await asyncio.sleep(self.delay)
+        if self.fail_times:
+            self.fail_times -= 1
+            return PaymentResponse(success=False, error="gateway timeout")
+        return PaymentResponse(success=True, payment_id=payment_id, status=PaymentStatus.SUCCESS, metadata={})
+
+
+class FakeTransactions:
+    def __init__(self):
+        self.status = {}
+        self.updates = 0
+
+    async def get_transaction(self, payment_id):
+        if payment_id not in self.status:
+            return None
+        return {"payment_id": payment_id, "status": self.status[payment_id]}
+
+    async def update_transaction_status(self, payment_id, status, metadata=None):
+        self.status[payment_id] = status
+        self.updates += 1
+        return {"success": True}
+
+
+class FakeWebhookLogs:
+    """In-memory stand-in for webhook_logs with the same queue semantics"""
+
+    def __init__(self):
+        self.rows = {}
+        self.by_key = {}
+
+    async def enqueue(self, webhook_id, provider, event_type, payment_id, payload, signature, lease_seconds):
+        if webhook_id in self.by_key:
+            return None
+        row = {"id": len(self.rows) + 1, "webhook_id": webhook_id, "payment_id": payment_id,
+               "event_type": event_type, "payload": payload, "attempts": 0,
+               "processed": False, "due": False}
+        self.rows[row["id"]] = row
+        self.by_key[webhook_id] = row["id"]
+        return dict(row)
+
+    async def claim_due(self, limit, lease_seconds):
+        due = [r for r in self.rows.values() if not r["processed"] and r["due"]][:limit]
+        for row in due:
+            row["due"] = False
+        return [dict(row) for row in due]
+
+    async def mark_processed(self, ids):
+        for i in ids:
+            self.rows[i]["processed"] = True
+
+    async def schedule_retry(self, ids, error, delay_seconds):
+        for i in ids:
+            self.rows[i]["attempts"] += 1
+            self.rows[i]["due"] = delay_seconds is not None
+
+
+def _event(event_id, payment_id):
+    return {"id": event_id, "type": "payment_paid", "data": {"id": payment_id, "metadata": {}}}
+
+
+async def _drain(processor, logs):
+    for _ in range(200):
+        if all(row["processed"] for row in logs.rows.values()):
+            return
+        await asyncio.sleep(0.005)
+
+
+class TestWebhookProcessor:
+    """Test WebhookProcessor with in-memory collaborators"""
+
+    def test_idempotency_key(self):
+        assert webhook_idempotency_key("moyasar", {"id": "evt_1"}, b"{}") == "moyasar:evt_1"
+        assert webhook_idempotency_key("moyasar", {}, b"{}") == webhook_idempotency_key("moyasar", {}, b"{}")
+
+    def test_duplicates_dropped_and_events_coalesced(self):
+        async def run():
+            gateway, txns, logs = FakeGateway(delay=0.02), FakeTransactions(), FakeWebhookLogs()
+            emails = []
+
+            async def on_success(payload, payment_id):
+                emails.append(payment_id)
+
+            processor = WebhookProcessor(gateway, txns, logs, workers=2, sweep_interval=0.005,
+                                         on_payment_success=on_success)
+            processor.start()
+            results = []
+            for event_id in ["e1", "e1", "e2", "e3", "e4"]:
+                results.append(await processor.ingest("moyasar", _event(event_id, "pay_1"), "sig", b""))
+            await _drain(processor, logs)
+            await processor.stop()
+            return gateway, txns, emails, results, processor.get_stats()
+
+        gateway, txns, emails, results, stats = asyncio.run(run())
+        assert [r["duplicate"] for r in results] == [False, True, False, False, False]
+        assert len(gateway.calls) <= 2  # first event, then one call for everything queued behind it
+        assert txns.updates == 1
+        assert emails == ["pay_1"]
+        assert stats["processed"] == 4 and stats["duplicates"] == 1
+
+    def test_failures_retry_then_succeed(self):
+        async def run():
+            gateway, txns, logs = FakeGateway(fail_times=2), FakeTransactions(), FakeWebhookLogs()
+            processor = WebhookProcessor(gateway, txns, logs, workers=1, sweep_interval=0.005)
+            processor.start()
+            await processor.ingest("moyasar", _event("e1", "pay_2"), "sig", b"")
+            await _drain(processor, logs)
+            await processor.stop()
+            return gateway, txns, logs, processor.get_stats()
+
+        gateway, txns, logs, stats = asyncio.run(run())
+        assert len(gateway.calls) == 3
+        assert txns.status["pay_2"] == "success"
+        assert logs.rows[1]["processed"] and logs.rows[1]["attempts"] == 2
+        assert stats["retries"] == 2
+
+    def test_dead_letter_after_max_attempts(self):
+        async def run():
+            gateway, txns, logs = FakeGateway(fail_times=100), FakeTransactions(), FakeWebhookLogs()
+            processor = WebhookProcessor(gateway, txns, logs, workers=1, max_attempts=3, sweep_interval=0.005)
+            processor.start()
+            await processor.ingest("moyasar", _event("e1", "pay_3"), "sig", b"")
+            await asyncio.sleep(0.1)
+            await processor.stop()
+            return gateway, logs, processor.get_stats()
+
+        gateway, logs, stats = asyncio.run(run())
+        assert len(gateway.calls) == 3
+        assert not logs.rows[1]["processed"]
+        assert stats["dead_lettered"] == 1
+
+    def test_backoff_grows_and_is_capped(self):
+        processor = WebhookProcessor(None, None, None, base_backoff=1.0, max_backoff=10.0)
+        assert 1.0 <= processor.backoff_delay(1) <= 2.0
+        assert 5.0 <= processor.backoff_delay(10) <= 10.0
@@ -82,14 +82,27 @@ CREATE TABLE IF NOT EXISTS webhook_logs (
     signature VARCHAR(500),
     processed BOOLEAN DEFAULT FALSE,
     error_message TEXT,
+    payment_id VARCHAR(255),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    processed_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Queue columns for deployments created before the webhook worker pool
+ALTER TABLE webhook_logs ADD COLUMN IF NOT EXISTS payment_id VARCHAR(255);
+ALTER TABLE webhook_logs ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE webhook_logs ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE webhook_logs ADD COLUMN IF NOT EXISTS processed_at TIMESTAMP WITH TIME ZONE;
+
 -- Create indexes for webhook logs
 CREATE INDEX IF NOT EXISTS idx_webhook_logs_provider ON webhook_logs(provider);
 CREATE INDEX IF NOT EXISTS idx_webhook_logs_processed ON webhook_logs(processed);
 CREATE INDEX IF NOT EXISTS idx_webhook_logs_event_type ON webhook_logs(event_type);
 CREATE INDEX IF NOT EXISTS idx_webhook_logs_created_at ON webhook_logs(created_at);
+CREATE INDEX IF NOT EXISTS idx_webhook_logs_payment_id ON webhook_logs(payment_id);
+-- Due-event scans by the webhook sweeper only touch unprocessed rows
+CREATE INDEX IF NOT EXISTS idx_webhook_logs_due ON webhook_logs(next_attempt_at) WHERE processed = FALSE;
 
 -- Create revenue_analytics table for reporting
 CREATE TABLE IF NOT EXISTS revenue_analytics (
@@ -99,6 +112,7 @@ CREATE TABLE IF NOT EXISTS revenue_analytics (
     total_transactions INTEGER DEFAULT 0,
     successful_transactions INTEGER DEFAULT 0,
     failed_transactions INTEGER DEFAULT 0,
+    pending_transactions INTEGER DEFAULT 0,
     total_revenue DECIMAL(15,2) DEFAULT 0.00,
     currency VARCHAR(3) NOT NULL DEFAULT 'SAR',
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
@@ -110,6 +124,33 @@ CREATE TABLE IF NOT EXISTS revenue_analytics (
 CREATE INDEX IF NOT EXISTS idx_revenue_analytics_date ON revenue_analytics(date);
 CREATE INDEX IF NOT EXISTS idx_revenue_analytics_tier ON revenue_analytics(tier);
 
+-- revenue_analytics is maintained incrementally by TransactionLogsService
+-- (one (date, tier) row per UTC day); upgrade existing databases and
+-- backfill the rollups once from the ledger
+ALTER TABLE revenue_analytics ADD COLUMN IF NOT EXISTS pending_transactions INTEGER DEFAULT 0;
+
+INSERT INTO revenue_analytics (
+    date, tier, currency, total_transactions, successful_transactions,
+    failed_transactions, pending_transactions, total_revenue
+)
+SELECT
+    DATE(created_at AT TIME ZONE 'UTC'),
+    tier,
+    MIN(currency),
+    COUNT(*),
+    COUNT(*) FILTER (WHERE status = 'success'),
+    COUNT(*) FILTER (WHERE status = 'failed'),
+    COUNT(*) FILTER (WHERE status = 'pending'),
+    COALESCE(SUM(amount) FILTER (WHERE status = 'success'), 0)
+FROM transaction_logs
+GROUP BY 1, 2
+ON CONFLICT (date, tier) DO UPDATE SET
+    total_transactions = EXCLUDED.total_transactions,
+    successful_transactions = EXCLUDED.successful_transactions,
+    failed_transactions = EXCLUDED.failed_transactions,
+    pending_transactions = EXCLUDED.pending_transactions,
+    total_revenue = EXCLUDED.total_revenue;
+
 -- Create function to automatically update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
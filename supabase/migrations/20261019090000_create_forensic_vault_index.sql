@@ -0,0 +1,19 @@
+-- Forensic Vault metadata store for FLUX-DNA
+-- Per-user secondary index ordered by created_at for cursor pagination
+
+CREATE TABLE IF NOT EXISTS forensic_vault (
+    evidence_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    evidence_type TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    exif_stripped BOOLEAN NOT NULL DEFAULT FALSE,
+    record JSONB NOT NULL
+);
+
+-- Keyset pagination: WHERE user_id = $1 AND (created_at, evidence_id) < ($2, $3)
+CREATE INDEX IF NOT EXISTS idx_forensic_vault_user_created
+    ON forensic_vault(user_id, created_at DESC, evidence_id DESC);
+
+-- Enable Row Level Security (backend uses the service key)
+ALTER TABLE forensic_vault ENABLE ROW LEVEL SECURITY;
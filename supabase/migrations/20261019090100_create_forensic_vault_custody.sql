@@ -0,0 +1,43 @@
+-- Forensic Vault chain of custody and Merkle period tracking for FLUX-DNA
+
+-- Content hash promoted out of the record for Merkle leaves and audits
+ALTER TABLE forensic_vault ADD COLUMN IF NOT EXISTS content_hash TEXT;
+UPDATE forensic_vault SET content_hash = record->>'content_hash' WHERE content_hash IS NULL;
+
+-- Per-period leaf scans and full-vault audit paging
+CREATE INDEX IF NOT EXISTS idx_forensic_vault_created
+    ON forensic_vault(created_at, evidence_id);
+
+-- Append-only, hash-chained custody log
+CREATE TABLE IF NOT EXISTS forensic_vault_custody (
+    evidence_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    actor TEXT NOT NULL,
+    timestamp TEXT NOT NULL,  -- hashed verbatim; kept as the exact ISO string
+    details JSONB NOT NULL DEFAULT '{}'::jsonb,
+    prev_hash TEXT NOT NULL,
+    entry_hash TEXT NOT NULL,
+    PRIMARY KEY (evidence_id, seq)
+);
+
+-- Change counter per UTC day; cached Merkle trees are keyed by it
+CREATE TABLE IF NOT EXISTS forensic_vault_periods (
+    period DATE PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION bump_forensic_vault_period(p_period DATE)
+RETURNS BIGINT AS $$
+    INSERT INTO forensic_vault_periods (period, version) VALUES (p_period, 1)
+    ON CONFLICT (period) DO UPDATE SET version = forensic_vault_periods.version + 1
+    RETURNING version;
+$$ LANGUAGE sql;
+
+-- Blob storage bucket (private)
+INSERT INTO storage.buckets (id, name, public) VALUES ('forensic-vault', 'forensic-vault', false)
+ON CONFLICT (id) DO NOTHING;
+
+-- Enable Row Level Security (backend uses the service key)
+ALTER TABLE forensic_vault_custody ENABLE ROW LEVEL SECURITY;
+ALTER TABLE forensic_vault_periods ENABLE ROW LEVEL SECURITY;
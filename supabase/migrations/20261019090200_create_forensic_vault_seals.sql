@@ -0,0 +1,27 @@
+-- Forensic Vault sealed Merkle roots for FLUX-DNA
+-- The root of each closed UTC day is recorded once per period version;
+-- verification compares rebuilt trees against it
+
+CREATE TABLE IF NOT EXISTS forensic_vault_seals (
+    period DATE NOT NULL,
+    version BIGINT NOT NULL,
+    root TEXT NOT NULL,
+    leaf_count INTEGER NOT NULL,
+    sealed_at TEXT NOT NULL,
+    PRIMARY KEY (period, version)
+);
+
+-- Append-only: seals are never edited or removed
+CREATE OR REPLACE FUNCTION reject_forensic_vault_seal_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    RAISE EXCEPTION 'forensic_vault_seals is append-only';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS forensic_vault_seals_append_only ON forensic_vault_seals;
+CREATE TRIGGER forensic_vault_seals_append_only
+    BEFORE UPDATE OR DELETE ON forensic_vault_seals
+    FOR EACH ROW EXECUTE FUNCTION reject_forensic_vault_seal_change();
+
+ALTER TABLE forensic_vault_seals ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,38 @@
+-- Forensic Vault atomic evidence submission for FLUX-DNA
+-- Record, genesis custody entry and period bump commit together: an item is
+-- never stored without the first link of its custody chain
+
+CREATE OR REPLACE FUNCTION submit_forensic_evidence(p_row JSONB, p_custody JSONB)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO forensic_vault (
+        evidence_id, user_id, created_at, evidence_type,
+        risk_level, exif_stripped, content_hash, record
+    ) VALUES (
+        p_row->>'evidence_id',
+        p_row->>'user_id',
+        (p_row->>'created_at')::timestamptz,
+        p_row->>'evidence_type',
+        p_row->>'risk_level',
+        (p_row->>'exif_stripped')::boolean,
+        p_row->>'content_hash',
+        p_row->'record'
+    );
+
+    INSERT INTO forensic_vault_custody (
+        evidence_id, seq, action, actor, timestamp,
+        details, prev_hash, entry_hash
+    ) VALUES (
+        p_row->>'evidence_id',
+        (p_custody->>'seq')::integer,
+        p_custody->>'action',
+        p_custody->>'actor',
+        p_custody->>'timestamp',
+        COALESCE(p_custody->'details', '{}'::jsonb),
+        p_custody->>'prev_hash',
+        p_custody->>'entry_hash'
+    );
+
+    PERFORM bump_forensic_vault_period(((p_row->>'created_at')::timestamptz AT TIME ZONE 'UTC')::date);
+END;
+$$ LANGUAGE plpgsql;